@@ -26,6 +26,8 @@ alertLog : List
 """
 
 _activeAlertHandlers = []
+# lists to append the arguments of each alert to, while they're being recorded
+_alertRecorders = []
 
 
 class AlertCatalog:
@@ -150,6 +152,10 @@ def alert(code=None, obj=object, strFields=None, trace=None):
             The traceback
     """
 
+    for recorder in _alertRecorders:
+        recorder.append(
+            dict(code=code, obj=obj, strFields=strFields, trace=trace))
+
     msg = AlertEntry(code, obj, strFields, trace)
 
     # format the warning into a string for console and logging targets
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Benchmarks for timing parts of PsychoPy which are performance critical.
+
+Each module in this package can be run as a script, e.g.::
+
+    python -m psychopy.benchmarks.trials
+
+which will print a table of timings. Benchmarks are not run as part of the
+test suite, they're for comparing implementations and catching regressions
+by hand.
+"""
+
+__all__ = ["timeCall", "printTable"]
+
+import timeit
+
+
+def timeCall(func, repeat=5, number=1):
+    """Time how long it takes to call a function.
+
+    Parameters
+    ----------
+    func : callable
+        Function to call, with no arguments.
+    repeat : int
+        How many times to repeat the measurement, the fastest is returned.
+    number : int
+        How many times to call `func` per measurement.
+
+    Returns
+    -------
+    float
+        Fastest time (s) taken per call of `func`.
+    """
+    times = timeit.repeat(func, repeat=repeat, number=number)
+
+    return min(times) / number
+
+
+def printTable(title, header, rows):
+    """Print the results of a benchmark as a plain text table.
+
+    Parameters
+    ----------
+    title : str
+        Title to print above the table.
+    header : list[str]
+        Name of each column.
+    rows : list[list]
+        Values for each row, floats are printed in ms.
+    """
+    def _fmt(val):
+        if isinstance(val, float):
+            return "%.3f ms" % (val * 1000)
+        return str(val)
+
+    cells = [[str(col) for col in header]]
+    cells += [[_fmt(val) for val in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+
+    print(title)
+    print("=" * len(title))
+    for n, row in enumerate(cells):
+        print("  ".join(val.rjust(width) for val, width in zip(row, widths)))
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
+    print("")
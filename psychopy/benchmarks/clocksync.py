@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Accuracy of the ioHub clock sync estimate against a skewed clock.
+
+Starts a second process which answers ioHub time sync requests as the ioHub
+server does, but from a clock with a known offset and drift from this
+process's, and which delays some of its replies (as a busy process would).
+`ClockSyncService` syncs with it for a while, then the offset and drift it
+estimated, and the remote time it gives for the current time, are compared
+with the true ones.
+
+The error in the remote time should be within the model's uncertainty (x3)
+or half the round trip time; if not, the script exits with status 1. The
+duration (s), offset (s) and drift (parts per million) can be given on the
+command line::
+
+    python -m psychopy.benchmarks.clocksync 10 0.25 50
+"""
+
+import multiprocessing
+import socket
+import sys
+import time
+
+import numpy as np
+
+from psychopy.benchmarks import printTable
+
+syncInterval = 0.02
+delayedProportion = 0.1  # of replies, delayed by 1-20 ms
+
+
+def _serveSkewedClock(port, ready, offset, drift, seed=0):
+    """Answer SYNC_REQ messages on `port` with the time of a clock
+    `offset + drift * psychopy.clock.getTime()`, until sent 'STOP'.
+    """
+    import msgpack
+    from psychopy import clock
+
+    rng = np.random.default_rng(seed)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', port))
+    ready.set()
+    unpacker = msgpack.Unpacker(use_list=True)
+    while True:
+        data, address = sock.recvfrom(4096)
+        unpacker.feed(data)
+        for request in unpacker:
+            if request[0] == 'STOP':
+                sock.close()
+                return
+            if request[0] != 'SYNC_REQ':
+                continue
+            # delay some replies before or after reading the clock
+            delay = rng.uniform(0.001, 0.02) \
+                if rng.random() < delayedProportion else 0
+            before = rng.random() < 0.5
+            if delay and before:
+                time.sleep(delay)
+            reply = ['SYNC_REPLY', offset + drift * clock.getTime()]
+            if delay and not before:
+                time.sleep(delay)
+            sock.sendto(msgpack.packb(reply + request[1:2]), address)
+
+
+def _freePort():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def run(duration=10.0, offset=0.25, driftPPM=50.0):
+    import msgpack
+    from psychopy.iohub.clocksync import ClockSyncService
+    from psychopy.iohub.devices import Computer
+
+    drift = 1.0 + driftPPM * 1e-6
+    port = _freePort()
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=_serveSkewedClock, args=(port, ready, offset, drift))
+    server.start()
+    ready.wait(10)
+
+    service = ClockSyncService(('127.0.0.1', port), interval=syncInterval)
+    try:
+        service.start()
+        time.sleep(duration)
+        service.stop()
+    finally:
+        stopper = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        stopper.sendto(msgpack.packb(['STOP']), ('127.0.0.1', port))
+        stopper.close()
+        server.join(5)
+
+    model = service.model
+    # Computer.getTime() is psychopy.clock.getTime() less the time the
+    # global clock was last reset, which the remote clock doesn't subtract
+    zero = Computer.global_clock.getLastResetTime()
+    now = Computer.getTime()
+    trueRemote = offset + drift * (now + zero)
+    error = model.local2RemoteTime(now) - trueRemote
+    printTable(
+        "Clock sync over %.0f s, to a clock offset by %g s with %g ppm drift"
+        % (duration, offset, driftPPM),
+        ["", "true", "estimated", "error"],
+        [["offset at t=0 (ms)", "%.3f" % ((offset + drift * zero) * 1000),
+          "%.3f" % (model.offset * 1000),
+          "%.3f" % ((model.offset - offset - drift * zero) * 1000)],
+         ["drift (ppm)", "%.2f" % driftPPM,
+          "%.2f" % ((model.drift - 1) * 1e6),
+          "%.2f" % ((model.drift - drift) * 1e6)],
+         ["remote time now (ms)", "", "", "%.4f" % (error * 1000)]])
+    print("Uncertainty %.4f ms, median round trip %.4f ms, %i of %i samples"
+          " used" % (model.uncertainty * 1000, model.rtt * 1000,
+                     model.sample_count, len(model._rtts)))
+
+    limit = max(3 * model.uncertainty, model.rtt / 2)
+    if abs(error) > limit:
+        print("Error is over %.4f ms" % (limit * 1000))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(*[float(arg) for arg in sys.argv[1:]]))
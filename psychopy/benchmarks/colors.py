@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to set and convert colors.
+
+Compares:
+
+    * setting a `Color` (as stimuli do whenever their color is set) and
+      rendering it, with and without the cache of colors set and rendered
+      before, for a color set over and over (e.g. on every frame);
+    * converting many colors from one space to another with `convertColors`,
+      against making a `Color` of each.
+"""
+
+import numpy as np
+
+from psychopy import colors
+from psychopy.benchmarks import timeCall, printTable
+
+nColorsList = [10, 100, 1000]
+
+
+def _setAndRender(value, space):
+    def _set():
+        colors.Color(value, space).render('rgba1')
+    return _set
+
+
+def run():
+    rows = []
+    for value, space in [('crimson', 'named'), ('#F2545B', 'hex'),
+                         ((0.89, -0.35, -0.28), 'rgb'),
+                         ((242, 84, 91), 'rgb255'), ((356, 0.65, 0.95), 'hsv')]:
+        func = _setAndRender(value, space)
+        colors._setCache.maxSize = colors._renderCache.maxSize = 0
+        colors.clearColorCache()
+        uncached = timeCall(func, repeat=5, number=200)
+        colors._setCache.maxSize = colors._renderCache.maxSize = 1024
+        cached = timeCall(func, repeat=5, number=200)
+        rows.append([space, uncached, cached])
+    printTable(
+        "Setting and rendering the same color again",
+        ["space", "without cache", "with cache"],
+        rows)
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for nColors in nColorsList:
+        hsv = np.column_stack([rng.integers(0, 360, nColors),
+                               rng.uniform(0, 1, (nColors, 2))])
+        hexColors = colors.convertColors(hsv, 'hsv', 'hex')
+        for values, space in [(hsv, 'hsv'), (hexColors, 'hex')]:
+            # (without the cache, as each color would only be set once)
+            colors._setCache.maxSize = colors._renderCache.maxSize = 0
+            perColor = timeCall(
+                lambda: [colors.Color(val, space).rgb for val in values],
+                repeat=3)
+            colors._setCache.maxSize = colors._renderCache.maxSize = 1024
+            batch = timeCall(
+                lambda: colors.convertColors(values, space, 'rgb'), repeat=5)
+            rows.append([nColors, space, perColor, batch])
+    printTable(
+        "Converting colors to rgb",
+        ["colors", "from", "Color each", "convertColors"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to compile Builder experiments to Python and JavaScript.
+
+Compares a full compile (`Experiment.writeScript()`) against an incremental
+compile (`incremental=True`) when nothing has changed since the last compile,
+and when one param of one Component has changed. Experiments are the `.psyexp`
+files in a folder given on the command line (e.g. the demos), plus a large
+experiment made by repeating the Routines of Builder's Routine templates::
+
+    python -m psychopy.benchmarks.compile path/to/demos
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+from psychopy import logging, experiment
+from psychopy.experiment.loops import TrialHandler
+from psychopy.benchmarks import timeCall, printTable
+
+templatesFolder = (Path(experiment.__file__).parent.parent / "app" /
+                   "Resources" / "routine_templates")
+
+
+def _templateExperiment(nRoutines=60, loopEvery=10):
+    """Make an experiment with `nRoutines` Routines copied from the Routine
+    templates, in loops of `loopEvery` Routines.
+    """
+    templates = []
+    for file in sorted(templatesFolder.glob("*.psyexp")):
+        thisExp = experiment.Experiment.fromFile(file)
+        templates += [
+            rt for rt in thisExp.routines.values()
+            if isinstance(rt, experiment.routines.Routine)]
+
+    exp = experiment.Experiment()
+    for n in range(nRoutines):
+        template = templates[n % len(templates)]
+        routine = experiment.routines.Routine("routine%i" % n, exp)
+        for comp in template:
+            # Static Components refer to other Components by name
+            if comp is template.settings or comp.type == 'Static':
+                continue
+            comp = copy.deepcopy(comp)
+            comp.exp = exp
+            comp.parentName = routine.name
+            comp.params['name'].val = "%s_%i" % (comp.name, n)
+            routine.addComponent(comp)
+        exp.addRoutine(routine.name, routine)
+        exp.flow.addRoutine(routine, len(exp.flow))
+        if n % loopEvery == loopEvery - 1:
+            loop = TrialHandler(exp, name="trials%i" % n, nReps=2)
+            exp.flow.addLoop(loop, len(exp.flow) - loopEvery, len(exp.flow))
+
+    return exp
+
+
+def _changeParam(exp):
+    """Change one param of one Component in the middle of the experiment,
+    as if it had been edited in Builder.
+    """
+    comps = [comp for rt in exp.routines.values()
+             if isinstance(rt, experiment.routines.Routine)
+             for comp in rt if 'durationEstim' in comp.params]
+    if not comps:
+        return
+    param = comps[len(comps) // 2].params['durationEstim']
+    param.val = "%s1" % param.val
+
+
+def _compileTimes(exp, target, repeat=3):
+    """Fastest full compile, incremental compile with nothing changed and
+    incremental compile with one param changed.
+    """
+    full = timeCall(
+        lambda: exp.writeScript(target=target), repeat=repeat)
+    exp.writeScript(target=target, incremental=True)
+    unchanged = timeCall(
+        lambda: exp.writeScript(target=target, incremental=True),
+        repeat=repeat)
+    changed = timeCall(
+        lambda: (_changeParam(exp),
+                 exp.writeScript(target=target, incremental=True)),
+        repeat=repeat)
+
+    return full, unchanged, changed
+
+
+def run(folders=()):
+    logging.console.setLevel(logging.CRITICAL)
+    experiments = [("60 template Routines", _templateExperiment())]
+    for folder in folders:
+        for file in sorted(Path(folder).glob("**/*.psyexp")):
+            try:
+                exp = experiment.Experiment.fromFile(file)
+                exp.writeScript()
+            except Exception as err:
+                print("Skipping %s: %s" % (file.name, err))
+                continue
+            experiments.append((file.stem, exp))
+
+    rows = []
+    for name, exp in experiments:
+        for target in ("PsychoPy", "PsychoJS"):
+            try:
+                times = _compileTimes(exp, target)
+            except Exception as err:
+                print("Skipping %s (%s): %s" % (name, target, err))
+                continue
+            rows.append([name, target] + list(times))
+    printTable(
+        "Experiment.writeScript",
+        ["experiment", "target", "full", "incremental (unchanged)",
+         "incremental (1 param changed)"],
+        rows)
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken by `data.importConditions` to load conditions files.
+
+Compares parsing a file from scratch against fetching it from the in-memory
+cache and from a sidecar file, for conditions files of increasing length in
+both US (comma separated) and EU (semicolon separated, comma decimal) styles.
+"""
+
+import os
+import tempfile
+
+from psychopy import logging
+from psychopy.data import utils
+from psychopy.benchmarks import timeCall, printTable
+
+nRowsList = [10, 100, 1000, 10000]
+
+
+def _writeConditions(fileName, nRows, sep=",", dec="."):
+    with open(fileName, "w", encoding="utf-8") as f:
+        f.write(sep.join(["word", "ori", "contrast", "pos"]) + "\n")
+        for n in range(nRows):
+            contrast = ("%.2f" % (n / nRows)).replace(".", dec)
+            f.write(sep.join(
+                ["word%i" % n, str(n % 360), contrast, '"[%i, 0]"' % n]
+            ) + "\n")
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    cache = utils.conditionsCache
+    with tempfile.TemporaryDirectory() as folder:
+        for style, sep, dec in [("US", ",", "."), ("EU", ";", ",")]:
+            rows = []
+            for nRows in nRowsList:
+                fileName = os.path.join(folder, "conds%i%s.csv" % (nRows, style))
+                _writeConditions(fileName, nRows, sep=sep, dec=dec)
+                # from scratch
+                uncached = timeCall(
+                    lambda: utils.importConditions(fileName, useCache=False),
+                    repeat=3
+                )
+                # from memory
+                utils.importConditions(fileName)
+                inMemory = timeCall(
+                    lambda: utils.importConditions(fileName), repeat=3
+                )
+                # from sidecar (as in a new session)
+                cache.useSidecar = True
+                cache.clear()
+                utils.importConditions(fileName)  # writes the sidecar
+
+                def _fromSidecar():
+                    cache.clear()
+                    utils.importConditions(fileName)
+                sidecar = timeCall(_fromSidecar, repeat=3)
+                cache.useSidecar = False
+                rows.append([nRows, uncached, inMemory, sidecar])
+            printTable(
+                "importConditions (%s style csv)" % style,
+                ["nRows", "parse", "memory cache", "sidecar cache"],
+                rows
+            )
+    cache.clear()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to draw a frame of a DotStim with a custom `element`, and to
+move the dots on each frame.
+
+Compares drawing the element once per dot against drawing all the dots in a
+single call (`batchElements=True`), for increasing numbers of dots. Times
+include waiting for the graphics card to finish drawing (but not for the
+screen refresh), so they're comparable with the frame duration. Then compares
+moving the dots as each frame is drawn against playing back frames from
+`DotStim.precomputeFrames`. Needs a display to open a window on.
+"""
+
+import pyglet
+
+from psychopy import logging, visual
+from psychopy.benchmarks import timeCall, printTable
+
+nDotsList = [10, 100, 500, 1000, 5000]
+
+
+def _frameTime(win, stim, nFrames=10):
+    """Fastest time (s) to draw `stim` and wait for it to be rendered.
+    """
+    def _frame():
+        stim.draw()
+        pyglet.gl.glFinish()
+        win.clearBuffer()
+
+    _frame()  # first draw creates textures etc.
+
+    return timeCall(_frame, repeat=5, number=nFrames)
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    win = visual.Window(
+        (800, 800), units='pix', waitBlanking=False, checkTiming=False)
+    element = visual.GratingStim(
+        win, tex='sin', mask='gauss', size=16, sf=0.1, units='pix')
+    rows = []
+    for nDots in nDotsList:
+        times = [nDots]
+        for batchElements in (False, True):
+            dots = visual.DotStim(
+                win, units='pix', nDots=nDots, fieldSize=700, dotLife=20,
+                speed=2, element=element, batchElements=batchElements)
+            times.append(_frameTime(win, dots))
+        rows.append(times)
+    win.close()
+    printTable(
+        "DotStim with a GratingStim element, per frame",
+        ["dots", "draw per dot", "batched"],
+        rows)
+
+
+def runUpdate():
+    logging.console.setLevel(logging.ERROR)
+    win = visual.Window(
+        (800, 800), units='pix', waitBlanking=False, checkTiming=False)
+    rows = []
+    for nDots in nDotsList:
+        for noiseDots, signalDots in [('direction', 'same'),
+                                      ('walk', 'different')]:
+            dots = visual.DotStim(
+                win, units='pix', nDots=nDots, fieldSize=700,
+                fieldShape='circle', dotLife=20, speed=2, coherence=0.5,
+                noiseDots=noiseDots, signalDots=signalDots, seed=0)
+            live = timeCall(dots._update_dotsXY, repeat=5, number=20)
+            dots.precomputeFrames(200)
+            played = timeCall(dots._update_dotsXY, repeat=5, number=20)
+            rows.append([nDots, noiseDots, signalDots, live, played])
+    win.close()
+    printTable(
+        "Moving the dots, per frame",
+        ["dots", "noiseDots", "signalDots", "live", "precomputed"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
+    runUpdate()
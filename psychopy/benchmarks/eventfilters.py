@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to filter ioHub event fields one value at a time and a batch at
+a time.
+
+Compares, for the field filters in `psychopy.iohub.devices.eventfilters`,
+adding each value of a batch with `add` (as the eye tracker event parser does
+for each sample) against adding the whole batch with `addValues`, and times
+the filters for structured event arrays on the gaze fields of binocular eye
+samples. Batches are of the size of one poll of a 1000 Hz eye tracker (and
+larger). Also checks that the Stampe filters remove a single sample spike on
+a flat signal, and that filtering a batch gives the same values as adding
+each value.
+"""
+
+import numpy as np
+
+from psychopy.benchmarks import timeCall, printTable
+
+batchSizes = [10, 100, 1000]
+
+
+def _checkStampe():
+    """Check the Stampe filters on a single sample spike on a flat signal,
+    and that batch and online filtering agree.
+    """
+    from psychopy.iohub.devices import eventfilters
+    from psychopy.iohub.devices.eyetracker.eye_events import (
+        MonocularEyeSampleEvent)
+
+    spike = np.array([0, 0, 5, 0, 0], dtype=float)
+    online = eventfilters.StampFilter(level=1)
+    results = [online.add(val) for val in spike]
+    assert [r[1] for r in results if r] == [0, 0, 0]
+    assert list(eventfilters.StampFilter(level=1).addValues(spike)) == [0, 0, 0]
+
+    samples = np.zeros(len(spike), dtype=MonocularEyeSampleEvent.NUMPY_DTYPE)
+    samples['gaze_x'] = spike
+    arrayFilter = eventfilters.StampeEventFilter('gaze_x')
+    filtered = np.concatenate(
+        [arrayFilter.filterEvents(samples), arrayFilter.flush()])
+    assert list(filtered['gaze_x']) == [0, 0, 0, 0, 0]
+
+    values = np.random.default_rng(1).normal(0, 100, 50)
+    for level in (1, 2, 3):
+        online = eventfilters.StampFilter(level=level)
+        results = [online.add(val) for val in values]
+        batch = eventfilters.StampFilter(level=level).addValues(values)
+        assert np.allclose([r[1] for r in results if r], batch)
+
+
+def run():
+    from psychopy.iohub.devices import eventfilters
+    from psychopy.iohub.devices.eyetracker.eye_events import (
+        BinocularEyeSampleEvent)
+
+    _checkStampe()
+
+    rng = np.random.default_rng(0)
+    fieldFilters = [
+        ("MovingWindowFilter", eventfilters.MovingWindowFilter,
+         dict(length=5, knot_pos='center')),
+        ("MedianFilter", eventfilters.MedianFilter,
+         dict(length=3, knot_pos='center')),
+        ("WeightedAverageFilter", eventfilters.WeightedAverageFilter,
+         dict(weights=(25, 50, 25), knot_pos=1)),
+        ("StampFilter", eventfilters.StampFilter, dict(level=1)),
+    ]
+    rows = []
+    for batchSize in batchSizes:
+        values = rng.normal(0, 100, batchSize)
+        for name, filterClass, kwargs in fieldFilters:
+            fieldFilter = filterClass(**kwargs)
+            each = timeCall(lambda: [fieldFilter.add(val) for val in values],
+                            repeat=3, number=5)
+            batch = timeCall(lambda: fieldFilter.addValues(values),
+                             repeat=3, number=5)
+            rows.append([batchSize, name, each, batch,
+                         "%.0fx" % (each / batch)])
+    printTable(
+        "Filtering a field, per batch",
+        ["values", "filter", "add each", "addValues", "speed up"],
+        rows)
+
+    fields = ['left_gaze_x', 'left_gaze_y', 'right_gaze_x', 'right_gaze_y']
+    arrayFilters = [
+        ("MedianEventFilter", eventfilters.MedianEventFilter(fields, 5)),
+        ("SavitzkyGolayEventFilter",
+         eventfilters.SavitzkyGolayEventFilter(fields, 7, 2)),
+        ("ButterworthEventFilter",
+         eventfilters.ButterworthEventFilter(fields, 50, 1000)),
+        ("StampeEventFilter", eventfilters.StampeEventFilter(fields, 2)),
+    ]
+    rows = []
+    for batchSize in batchSizes:
+        samples = np.zeros(batchSize, dtype=BinocularEyeSampleEvent.NUMPY_DTYPE)
+        for field in fields:
+            samples[field] = rng.normal(0, 100, batchSize)
+        for name, arrayFilter in arrayFilters:
+            rows.append([batchSize, name, timeCall(
+                lambda: arrayFilter.filterEvents(samples), repeat=3, number=5)])
+    printTable(
+        "Filtering the gaze fields of binocular eye samples, per batch",
+        ["samples", "filter", "filterEvents"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
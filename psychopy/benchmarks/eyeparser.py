@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to parse eye samples into fixations, saccades and blinks.
+
+Makes a synthetic recording of 1000 Hz binocular eye samples (fixations joined
+by saccades, with blinks and samples missing one eye), then parses it with the
+ioHub eye tracker event parser one sample at a time, as it runs online, and
+all at once with the batch parser
+(`psychopy.iohub.devices.eyetracker.filters.batch`). The parsed samples and
+events are compared as they'd be stored in a DataStore file (i.e. ignoring
+event IDs, which the online parser numbers as it goes), and should be the
+same.
+
+The batch parser is then timed on a longer recording. The durations (s) of
+both recordings can be given on the command line::
+
+    python -m psychopy.benchmarks.eyeparser 60 3600
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from psychopy.benchmarks import printTable
+
+rate = 1000
+display = dict(mm_size=dict(width=500, height=280), pixel_res=(1920, 1080),
+               eye_distance=600)
+
+
+def _makeSamples(duration, seed=0):
+    """BinocularEyeSampleEvent array of a recording `duration` seconds long.
+    """
+    from psychopy.iohub.devices.eyetracker.eye_events import (
+        BinocularEyeSampleEvent)
+
+    rng = np.random.default_rng(seed)
+    nSamples = int(duration * rate)
+    samples = np.zeros(nSamples, dtype=BinocularEyeSampleEvent.NUMPY_DTYPE)
+    # fixations of 150-400 ms, joined by saccades of 20-60 ms
+    # (with room for the last fixation and saccade to run over)
+    x = np.zeros(nSamples + 500)
+    y = np.zeros(nSamples + 500)
+    pos = np.zeros(2)
+    n = 0
+    while n < nSamples:
+        fixation = rng.integers(150, 400)
+        x[n:n + fixation], y[n:n + fixation] = pos
+        n += fixation
+        saccade = rng.integers(20, 60)
+        target = rng.uniform((-800, -400), (800, 400))
+        ramp = np.linspace(0, 1, saccade + 2)[1:-1, None]
+        path = pos + (target - pos) * (3 * ramp ** 2 - 2 * ramp ** 3)
+        x[n:n + saccade], y[n:n + saccade] = path.T
+        n += saccade
+        pos = target
+    x = x[:nSamples]
+    y = y[:nSamples]
+    status = np.zeros(nSamples, dtype=int)
+    # blinks of 80-150 ms every few seconds, and samples missing one eye
+    for start in rng.integers(0, nSamples, size=max(1, nSamples // 3000)):
+        status[start:start + rng.integers(80, 150)] = 22
+    for missing in (2, 20):
+        for start in rng.integers(0, nSamples, size=max(1, nSamples // 5000)):
+            stop = start + rng.integers(5, 50)
+            status[start:stop] = np.where(
+                status[start:stop] == 22, 22, missing)
+    # start and end with both eyes missing
+    status[:5] = status[-5:] = 22
+
+    t = 10.0 + np.arange(nSamples) / rate
+    samples['experiment_id'] = samples['session_id'] = 1
+    samples['event_id'] = np.arange(nSamples)
+    samples['type'] = BinocularEyeSampleEvent.EVENT_TYPE_ID
+    samples['device_time'] = samples['logged_time'] = samples['time'] = t
+    for eye, offset in (('left', -2.0), ('right', 2.0)):
+        samples[eye + '_gaze_x'] = x + offset + rng.normal(0, 0.3, nSamples)
+        samples[eye + '_gaze_y'] = y + rng.normal(0, 0.3, nSamples)
+        samples[eye + '_pupil_measure1'] = rng.normal(4, 0.05, nSamples)
+        for field in ('angle_x', 'angle_y', 'raw_x', 'raw_y', 'velocity_x',
+                      'velocity_y', 'velocity_xy'):
+            samples[eye + '_' + field] = rng.uniform(0, 10, nSamples)
+    missingGaze = (status == 22)[:, None] | np.column_stack(
+        [status == 20, status == 2])
+    for e, eye in enumerate(('left', 'right')):
+        for field in ('gaze_x', 'gaze_y', 'pupil_measure1'):
+            samples[eye + '_' + field][missingGaze[:, e]] = 0
+    samples['status'] = status
+
+    return samples
+
+
+def _parseOnline(samples):
+    """Parse samples one at a time, returning the output event lists."""
+    from psychopy.iohub.constants import EventConstants
+    from psychopy.iohub.devices.eyetracker import eye_events
+    from psychopy.iohub.devices.eyetracker.filters.parser import (
+        EyeTrackerEventParser)
+
+    # as the ioHub server does for the eye tracker's events
+    eventClasses = {name: cls for name, cls in vars(eye_events).items()
+                    if getattr(cls, 'EVENT_TYPE_ID', None)}
+    EventConstants.addClassMappings(
+        [cls.EVENT_TYPE_ID for cls in eventClasses.values()], eventClasses)
+    parser = EyeTrackerEventParser(display_device=display, sampling_rate=rate)
+    for row in samples.tolist():
+        parser._addInputEvent(list(row))
+
+    return parser._removeOutputEvents()
+
+
+def _compare(samples, onlineEvents, batchSamples, batchEvents):
+    """Names of the event types (and fields) which differ between the online
+    and batch parsers, once stored.
+    """
+    from psychopy.iohub.constants import EventConstants
+    from psychopy.iohub.devices import DeviceEvent
+
+    typeIndex = DeviceEvent.EVENT_TYPE_ID_INDEX
+    parsed = dict(batchEvents)
+    # the online parser outputs samples missing both eyes before they're
+    # interpolated, so only compare those with data
+    monoType = EventConstants.MONOCULAR_EYE_SAMPLE
+    parsed[monoType] = batchSamples[samples['status'] != 22]
+    differences = []
+    for eventType, batch in parsed.items():
+        dtype = EventConstants.getClass(eventType).NUMPY_DTYPE
+        online = np.array(
+            [tuple(e) for e in onlineEvents
+             if e[typeIndex] == eventType and
+             (eventType != monoType or e[-1] != 22)],
+            dtype=dtype)
+        name = EventConstants.getName(eventType)
+        if len(online) != len(batch):
+            differences.append("%s (%i vs %i events)" % (
+                name, len(online), len(batch)))
+            continue
+        for field in dtype.names:
+            if field == 'event_id':
+                continue
+            if not np.array_equal(online[field], batch[field],
+                                  equal_nan=dtype[field].kind == 'f'):
+                differences.append("%s.%s" % (name, field))
+
+    return differences
+
+
+def run(compareDuration=60, batchDuration=3600):
+    from psychopy.iohub.devices.eyetracker.filters.batch import parseSamples
+
+    samples = _makeSamples(compareDuration)
+    t0 = time.perf_counter()
+    onlineEvents = _parseOnline(samples)
+    t1 = time.perf_counter()
+    batchSamples, batchEvents = parseSamples(samples, display, rate)
+    t2 = time.perf_counter()
+    differences = _compare(samples, onlineEvents, batchSamples, batchEvents)
+    nEvents = sum(len(events) for events in batchEvents.values())
+    printTable(
+        "Parsing %i s of samples (%i samples, %i events)" % (
+            compareDuration, len(samples), nEvents),
+        ["parser", "time", "samples / s"],
+        [["online", t1 - t0, "%.0f" % (len(samples) / (t1 - t0))],
+         ["batch", t2 - t1, "%.0f" % (len(samples) / (t2 - t1))]])
+    print("Differences between parsers: %s\n" % (
+        ", ".join(differences) or "none"))
+
+    samples = _makeSamples(batchDuration, seed=1)
+    t0 = time.perf_counter()
+    batchSamples, batchEvents = parseSamples(samples, display, rate)
+    t1 = time.perf_counter()
+    nEvents = sum(len(events) for events in batchEvents.values())
+    printTable(
+        "Parsing %i s of samples in batch (%i samples, %i events)" % (
+            batchDuration, len(samples), nEvents),
+        ["parser", "time", "samples / s"],
+        [["batch", t1 - t0, "%.0f" % (len(samples) / (t1 - t0))]])
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
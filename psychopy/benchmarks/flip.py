@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time `Window.flip` spends on its own bookkeeping, besides drawing and
+swapping buffers.
+
+Flips a window with increasing numbers of stimuli set to autoDraw, whose
+`draw` does nothing, so all that's timed is the work done per stimulus and per
+flip. Each flip is timed by phase with `Window.recordFrameTiming`, leaving out
+the buffer swap and the wait for it (which depend on the graphics card), and
+the median of each phase is given.
+
+When no stimulus is draggable or clickable and there are no validators, flip
+just draws each stimulus from a list it keeps until autoDraw (or dragging or
+clicking) is changed. To compare with the full path, which checks each stimulus
+for validators, dragging and clicking on every flip, a validator is added for
+a stimulus that isn't drawn.
+
+Needs a display (or a virtual framebuffer, e.g. with `xvfb-run`).
+"""
+
+import numpy as np
+
+from psychopy import logging, visual
+from psychopy.benchmarks import printTable
+from psychopy.visual.basevisual import MinimalStim
+
+nStimsList = [1, 10, 100, 1000]
+nFlips = 500
+
+
+class _NoDrawStim(MinimalStim):
+    """Stimulus which draws nothing."""
+    def __init__(self, win):
+        self.win = win
+        self.depth = 0
+        MinimalStim.__init__(self, autoLog=False)
+
+    def draw(self, win=None):
+        pass
+
+
+def _flipPhases(win):
+    """Median time (s) in the autoDraw phase and in the other phases besides
+    the buffer swap, over `nFlips` flips.
+    """
+    win.frameTiming.clear()
+    win.recordFrameTiming = True
+    for n in range(nFlips):
+        win.flip()
+    win.recordFrameTiming = False
+    durations = win.frameTiming.phaseDurations()
+    others = durations['editables'] + durations['callbacks'] + durations['end']
+    return np.median(durations['autoDraw']), np.median(others)
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    win = visual.Window((400, 400), units='pix', waitBlanking=False,
+                        checkTiming=False)
+    notDrawn = _NoDrawStim(win)
+    rows = []
+    try:
+        for nStims in nStimsList:
+            stims = [_NoDrawStim(win) for n in range(nStims)]
+            for stim in stims:
+                stim.autoDraw = True
+            win.validators[notDrawn] = notDrawn
+            fullDraw, fullOthers = _flipPhases(win)
+            del win.validators[notDrawn]
+            fastDraw, fastOthers = _flipPhases(win)
+            rows.append([nStims, fullDraw, fastDraw, fullOthers, fastOthers])
+            win.clearAutoDraw()
+    finally:
+        win.close()
+
+    printTable(
+        "Flip bookkeeping per frame, with stimuli which draw nothing",
+        ["stimuli", "autoDraw (full)", "autoDraw (fast)",
+         "other phases (full)", "other phases (fast)"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to import `psychopy.visual`, and each of its stimulus modules.
+
+Compares importing `psychopy.visual` with its stimuli imported on first use
+(the default) against importing all of them up front (as when
+`PSYCHOPYEAGERVISUAL=1`), then reports how long the first use of each
+stimulus module takes once `psychopy.visual` has been imported. Every import
+is timed in a fresh Python process, so that nothing is already cached in
+`sys.modules`.
+"""
+
+import os
+import subprocess
+import sys
+
+from psychopy.benchmarks import printTable
+
+_script = """
+import time
+{setup}
+t0 = time.perf_counter()
+import {module}
+print(time.perf_counter() - t0)
+"""
+
+
+def _importTime(module, setup="", env=None, repeat=3):
+    """Fastest time (s) to import `module` in a new Python process, after
+    running `setup`.
+    """
+    environ = os.environ.copy()
+    environ.update(env or {})
+    times = []
+    for n in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _script.format(setup=setup, module=module)],
+            env=environ, capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+
+    return min(times)
+
+
+def _stimulusModules():
+    """Modules imported on first use of the stimuli in `psychopy.visual`.
+    """
+    from psychopy.contrib.lazy_import import ImportProcessor
+    from psychopy import visual
+
+    proc = ImportProcessor()
+    proc._build_map(visual.lazyImports)
+    modules = {".".join(path) for path, member, children
+               in proc.imports.values()}
+
+    return sorted(modules)
+
+
+def run(repeat=3):
+    rows = [
+        ["on first use", _importTime("psychopy.visual", repeat=repeat)],
+        ["up front", _importTime(
+            "psychopy.visual", env={"PSYCHOPYEAGERVISUAL": "1"},
+            repeat=repeat)],
+    ]
+    printTable(
+        "import psychopy.visual",
+        ["stimuli imported", "time"],
+        rows)
+
+    rows = []
+    for module in _stimulusModules():
+        rows.append([module, _importTime(
+            module, setup="import psychopy.visual", repeat=repeat)])
+    rows.sort(key=lambda row: row[1], reverse=True)
+    printTable(
+        "First use of each stimulus module (after import psychopy.visual)",
+        ["module", "time"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Events per second the ioHub client can decode from a getEvents() reply.
+
+Makes synthetic mouse move events and binocular eye samples as the ioHub
+server holds them (lists of values), packs them into a reply with msgpack as
+the server does, then times decoding the reply in the experiment process:
+
+    * namedtuple : unpacking the reply, converting any bytes to str
+      (`ioHubConnection._convertList`) and making a namedtuple of each event,
+      as `getEvents()` does by default;
+    * numpy : unpacking the reply sent for `getEvents(asType='numpy')` and
+      making a structured array of each event type from it without copying
+      (`EventArrays`);
+    * numpy, iterated : as numpy, then iterating over all the events, which
+      makes a namedtuple of each.
+
+Also given is the time the server takes to pack each reply. No ioHub server
+is started, so socket transfer isn't included.
+"""
+
+import msgpack
+import numpy as np
+
+from psychopy.benchmarks import timeCall, printTable
+
+nEventsList = [10, 100, 1000, 10000]
+
+
+def _makeEvents(eventClass, nEvents, seed=0):
+    """Events of `eventClass` in list form, with random values."""
+    rng = np.random.default_rng(seed)
+    events = np.zeros(nEvents, dtype=eventClass.NUMPY_DTYPE)
+    for name in events.dtype.names:
+        if events.dtype[name].kind == 'f':
+            events[name] = rng.uniform(0, 1000, nEvents)
+    events['type'] = eventClass.EVENT_TYPE_ID
+    events['event_id'] = np.arange(nEvents)
+    events['time'] = np.sort(rng.uniform(0, 10, nEvents))
+    return [list(event) for event in events.tolist()]
+
+
+def run():
+    from psychopy.iohub.client import ioHubConnection
+    from psychopy.iohub.client.eventarrays import EventArrays
+    from psychopy.iohub.constants import EventConstants
+    from psychopy.iohub.devices import packEventArrays
+    from psychopy.iohub.devices.eyetracker.eye_events import (
+        BinocularEyeSampleEvent)
+    from psychopy.iohub.devices.mouse import MouseMoveEvent
+
+    eventClasses = [MouseMoveEvent, BinocularEyeSampleEvent]
+    EventConstants.addClassMappings(
+        [cls.EVENT_TYPE_ID for cls in eventClasses],
+        {cls.__name__: cls for cls in eventClasses})
+    # (only its conversion methods are used)
+    connection = ioHubConnection.__new__(ioHubConnection)
+    packer = msgpack.Packer()
+
+    rows = []
+    for eventClass in eventClasses:
+        for nEvents in nEventsList:
+            events = _makeEvents(eventClass, nEvents)
+
+            def _asNamedTuples():
+                reply = msgpack.unpackb(listReply, use_list=True)
+                reply = connection._convertList(reply)
+                return [ioHubConnection.eventListToNamedTuple(e)
+                        for e in reply[1]]
+
+            def _asArrays():
+                reply = msgpack.unpackb(arrayReply, use_list=True)
+                return EventArrays.fromReply(reply[1])
+
+            packList = timeCall(
+                lambda: packer.pack(('GET_EVENTS_RESULT', events)), repeat=3)
+            packArrays = timeCall(
+                lambda: packer.pack(
+                    ('GET_EVENTS_RESULT', packEventArrays(events))), repeat=3)
+            listReply = packer.pack(('GET_EVENTS_RESULT', events))
+            arrayReply = packer.pack(
+                ('GET_EVENTS_RESULT', packEventArrays(events)))
+            # make sure both give the same events
+            assert list(_asArrays()) == _asNamedTuples()
+
+            for name, func in [
+                    ("namedtuple", _asNamedTuples),
+                    ("numpy", _asArrays),
+                    ("numpy, iterated", lambda: list(_asArrays()))]:
+                t = timeCall(func, repeat=3)
+                pack = packList if name == "namedtuple" else packArrays
+                rows.append([eventClass.__name__, nEvents, name, pack, t,
+                             "%.0f" % (nEvents / t)])
+    printTable(
+        "Decoding getEvents() replies in the client",
+        ["event type", "events", "as", "server pack", "client decode",
+         "events / s"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to get eye samples out of an ioHub DataStore (HDF5) file.
+
+Writes a synthetic DataStore file of several million 1000 Hz eye samples,
+split into trials by a conditions table, then times:
+
+    * saving a report of the samples in each trial with `saveEventReport`,
+      which reads them a chunk at a time (see `psychopy.iohub.datastore.query`),
+      against reading and formatting them one row at a time, as
+      `saveEventReport` used to (and checks the reports are the same, as is
+      a report of the experiment messages);
+    * getting the values of several attributes for each row of the conditions
+      table with `getEventAttributeValues`, which reads all attributes at once,
+      against one `read_where` per row and attribute (timed for the first
+      few rows, and scaled up).
+
+The number of samples can be given on the command line (the default is 3
+million, about 200 MB on disk)::
+
+    python -m psychopy.benchmarks.iohubquery 3000000
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from psychopy.benchmarks import printTable
+
+nTrials = 500
+nTimedRows = 10
+eventFields = ['time', 'x', 'y', 'pupil']
+
+
+def _makeFile(folder, nSamples, chunkSize=2 ** 18):
+    """Write a DataStore file of `nSamples` eye samples (one session, split
+    into `nTrials` trials), returning its name.
+    """
+    import tables
+    from psychopy.iohub.datastore import (
+        ClassTableMappings, ExperimentMetaData, SessionMetaData)
+    from psychopy.iohub.devices.eyetracker.eye_events import EyeSampleEvent
+    from psychopy.iohub.devices.experiment import MessageEvent
+
+    fileName = "benchmark.hdf5"
+    with tables.open_file(os.path.join(folder, fileName), 'w') as f:
+        mappings = f.create_table(f.root, 'class_table_mapping',
+                                  ClassTableMappings)
+        collection = f.create_group(f.root, 'data_collection')
+        events = f.create_group(collection, 'events')
+        cvGroup = f.create_group(collection, 'condition_variables')
+        f.create_table(collection, 'experiment_meta_data', ExperimentMetaData
+                       ).append([(1, b"bench", b"", b"", b"1")])
+        f.create_table(collection, 'session_meta_data', SessionMetaData
+                       ).append([(1, 1, b"s1", b"", b"", b"{}")])
+        tablesByClass = {}
+        for eventClass, groupName in ((EyeSampleEvent, 'eyetracker'),
+                                      (MessageEvent, 'experiment')):
+            group = f.create_group(events, groupName)
+            tableName = eventClass.__name__
+            tablesByClass[eventClass] = f.create_table(
+                group, tableName, np.dtype(eventClass.NUMPY_DTYPE))
+            mappings.append([(eventClass.EVENT_TYPE_ID, 1, tableName,
+                              "/data_collection/events/%s/%s" % (
+                                  groupName, tableName))])
+        # samples at 1000 Hz
+        samples = tablesByClass[EyeSampleEvent]
+        rng = np.random.default_rng(0)
+        for start in range(0, nSamples, chunkSize):
+            n = min(chunkSize, nSamples - start)
+            rows = np.zeros(n, dtype=samples.dtype)
+            rows['experiment_id'] = 1
+            rows['session_id'] = 1
+            rows['type'] = EyeSampleEvent.EVENT_TYPE_ID
+            rows['event_id'] = np.arange(start, start + n)
+            rows['time'] = np.arange(start, start + n) / 1000.0
+            rows['x'] = rng.normal(0, 100, n)
+            rows['y'] = rng.normal(0, 100, n)
+            rows['pupil'] = rng.normal(4, 0.1, n)
+            samples.append(rows)
+        # trials take up the whole session, with a gap between them
+        trialDur = nSamples / 1000.0 / nTrials
+        starts = np.arange(nTrials) * trialDur
+        stops = starts + trialDur * 0.9
+        cvTable = f.create_table(cvGroup, 'EXP_CV_1', np.dtype([
+            ('EXPERIMENT_ID', 'i4'), ('SESSION_ID', 'i4'),
+            ('trial_id', 'i4'), ('trial_start', 'f8'), ('trial_stop', 'f8')]))
+        # (offset so times aren't on a sample, which may round either way)
+        cvTable.append([(1, 1, n + 1, start + 0.00025, stop + 0.00025)
+                        for n, (start, stop) in enumerate(zip(starts, stops))])
+        messages = tablesByClass[MessageEvent]
+        rows = np.zeros(nTrials * 2, dtype=messages.dtype)
+        rows['type'] = MessageEvent.EVENT_TYPE_ID
+        rows['time'][0::2] = starts
+        rows['time'][1::2] = stops
+        rows['text'][0::2] = b"TRIAL_START"
+        rows['text'][1::2] = b"TRIAL_END"
+        rows['msg_offset'] = 0.3
+        # (out of time order, as messages can be)
+        messages.append(rows[::-1].copy())
+
+    return fileName
+
+
+def _rowByRowReport(folder, fileName):
+    """Save a report of the samples in each trial one row at a time, as
+    `saveEventReport` did before reading events in chunks. Returns the number
+    of samples saved.
+    """
+    from psychopy.iohub.datastore.util import ExperimentDataAccessUtility
+
+    datafile = ExperimentDataAccessUtility(folder, fileName)
+    table = datafile.getEventTable('EyeSampleEvent')
+    cvTable = datafile.getConditionVariablesTable()
+    columnNames = datafile.getConditionVariableNames()[2:]
+    count = 0
+    with open(os.path.join(folder, "rowByRow.txt"), 'w') as f:
+        f.write('\t'.join(columnNames + eventFields) + '\n')
+        for tindex, r in enumerate(cvTable):
+            rows = table.where("(time >= %f) & (time <= %f)" % (
+                r['trial_start'], r['trial_stop']))
+            for event in rows:
+                eventData = [str(event[c]) for c in eventFields]
+                cvRow = cvTable.read(tindex, tindex + 1)
+                prefix = [str(cvRow[c][0]) for c in columnNames]
+                f.write('\t'.join(prefix + eventData))
+                f.write('\n')
+                count += 1
+    datafile.close()
+
+    return count
+
+
+def _checkMessageReport(folder, fileName):
+    """Check a report of the experiment messages is the same as when
+    `saveEventReport` sorted the whole table and formatted each row.
+    """
+    from psychopy.iohub.datastore.util import (
+        ExperimentDataAccessUtility, saveEventReport)
+
+    fields = ['time', 'text', 'msg_offset']
+    datafile = ExperimentDataAccessUtility(folder, fileName)
+    messages = datafile.getEventTable('MessageEvent').read()
+    datafile.close()
+    messages.sort(order='time')
+    lines = ['\t'.join(fields)]
+    for event in messages:
+        eventData = []
+        for c in fields:
+            cv = event[c]
+            if type(cv) == np.bytes_:
+                cv = cv.decode('utf-8')
+            eventData.append(str(cv))
+        lines.append('\t'.join(eventData))
+    outputName, count = saveEventReport(
+        os.path.join(folder, fileName), eventType='MessageEvent',
+        eventFields=fields)
+    with open(outputName) as f:
+        assert f.read() == '\n'.join(lines) + '\n', \
+            "Message reports are different"
+
+
+def _timeReports(folder, fileName):
+    from psychopy.iohub.datastore.util import saveEventReport
+
+    t0 = time.perf_counter()
+    before = _rowByRowReport(folder, fileName)
+    t1 = time.perf_counter()
+    outputName, after = saveEventReport(
+        os.path.join(folder, fileName), eventType='EyeSampleEvent',
+        eventFields=eventFields, useConditionsTable=True,
+        trialStart='trial_start', trialStop='trial_stop')
+    t2 = time.perf_counter()
+    assert before == after, "Reports have different numbers of samples"
+    with open(os.path.join(folder, "rowByRow.txt")) as f:
+        with open(outputName) as g:
+            assert f.read() == g.read(), "Reports are different"
+
+    return t1 - t0, t2 - t1, after
+
+
+def _timeAttributeValues(folder, fileName):
+    from psychopy.iohub.datastore.util import ExperimentDataAccessUtility
+    from psychopy.iohub.devices.eyetracker.eye_events import EyeSampleEvent
+
+    datafile = ExperimentDataAccessUtility(folder, fileName)
+    typeId = EyeSampleEvent.EVENT_TYPE_ID
+    table = datafile.getEventTable('EyeSampleEvent')
+    # one read per condition variable row and attribute, which is slow enough
+    # to only time for the first few rows
+    cvs = datafile.getConditionVariables()
+    t0 = time.perf_counter()
+    for cv in cvs[:nTimedRows]:
+        wclause = ('( experiment_id == 1 ) & ( session_id == %d ) & '
+                   '( type == %d )' % (cv.SESSION_ID, typeId))
+        for name in eventFields:
+            table.read_where(wclause, field=name)
+    t1 = time.perf_counter()
+    datafile.getEventAttributeValues(typeId, eventFields)
+    t2 = time.perf_counter()
+    datafile.close()
+
+    return (t1 - t0) * len(cvs) / nTimedRows, t2 - t1
+
+
+def run(nSamples=3000000):
+    with tempfile.TemporaryDirectory() as folder:
+        print("Writing %i samples..." % nSamples)
+        fileName = _makeFile(folder, nSamples)
+        rowByRow, chunked, nSaved = _timeReports(folder, fileName)
+        _checkMessageReport(folder, fileName)
+        printTable(
+            "Saving a report of %i samples in %i trials" % (nSaved, nTrials),
+            ["method", "time", "samples / s"],
+            [["row by row", rowByRow, "%.0f" % (nSaved / rowByRow)],
+             ["saveEventReport", chunked, "%.0f" % (nSaved / chunked)]])
+        perRead, oneRead = _timeAttributeValues(folder, fileName)
+        printTable(
+            "Getting %i attributes for %i condition variable rows" % (
+                len(eventFields), nTrials),
+            ["method", "time"],
+            [["read per row and attribute (est.)", perRead],
+             ["getEventAttributeValues", oneRead]])
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
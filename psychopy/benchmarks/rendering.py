@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to draw and flip the core visual stimuli, at increasing sizes
+and numbers of elements, saved to a JSON file and compared with a baseline.
+
+For each case (e.g. a GratingStim 256 pixels across, or an ElementArrayStim
+of 10000 elements) this measures:
+
+    * draw : the fastest time to draw the stimulus and wait for the graphics
+      card to finish (`glFinish`), without flipping;
+    * flip : the same, followed by `Window.flip` (with `waitBlanking=False`,
+      though the driver may still wait for the screen refresh);
+    * glCalls : the number of OpenGL calls made through `pyglet.gl` to draw
+      and flip, which doesn't depend on the machine, so catches changes such
+      as extra calls per frame even where timings are noisy.
+
+Results can be saved as JSON with `--output`, and compared with those saved
+before with `--baseline`, in which case any case which is more than
+`--tolerance` (a proportion) slower, or makes more GL calls, is listed as a
+regression and the script exits with status 1 (e.g. to fail a CI job)::
+
+    python -m psychopy.benchmarks.rendering --output baseline.json
+    ...  # change something
+    python -m psychopy.benchmarks.rendering --baseline baseline.json
+
+Timings are only comparable between runs on the same machine and renderer
+(stored with the results). The window needs an OpenGL context but not a GPU:
+on Linux without a display (e.g. on CI) run it on a virtual framebuffer,
+which renders in software with Mesa's llvmpipe::
+
+    xvfb-run -s "-screen 0 1920x1080x24" python -m psychopy.benchmarks.rendering
+
+The MovieStim case plays `default.mp4` from PsychoPy's assets, so needs a
+movie library (ffpyplayer); cases whose stimuli can't be made are skipped
+(and listed in the results).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import sys
+
+import numpy as np
+import pyglet
+
+import psychopy
+from psychopy import logging, prefs, visual
+from psychopy.benchmarks import timeCall, printTable
+
+GL = pyglet.gl
+
+winSize = (1024, 768)
+nFrames = 10
+
+_win = None  # the window the cases are drawn in, while running
+
+
+def _image(size):
+    return visual.ImageStim(
+        _win, image=np.random.default_rng(0).uniform(-1, 1, (size, size)),
+        size=size, units='pix')
+
+
+def _grating(size):
+    return visual.GratingStim(
+        _win, tex='sin', mask='gauss', size=size, sf=5.0 / size, units='pix')
+
+
+def _text(nChars):
+    return visual.TextStim(
+        _win, text=_words(nChars), height=16, wrapWidth=900, units='pix')
+
+
+def _textBox(nChars):
+    return visual.TextBox2(
+        _win, text=_words(nChars), letterHeight=16, size=(900, None),
+        units='pix')
+
+
+def _elements(nElements):
+    rng = np.random.default_rng(0)
+    return visual.ElementArrayStim(
+        _win, nElements=nElements, sizes=16, sfs=0.1, elementTex='sin',
+        elementMask='gauss', xys=rng.uniform(-350, 350, (nElements, 2)),
+        oris=rng.uniform(0, 360, nElements), units='pix')
+
+
+def _dots(nDots):
+    return visual.DotStim(
+        _win, nDots=nDots, fieldSize=700, dotSize=4, dotLife=20, speed=2,
+        coherence=0.5, units='pix')
+
+
+def _shape(nVertices):
+    angles = np.linspace(0, 2 * np.pi, nVertices, endpoint=False)
+    radii = 300 + 50 * np.sin(angles * 7)
+    return visual.ShapeStim(
+        _win, vertices=np.column_stack(
+            [radii * np.cos(angles), radii * np.sin(angles)]),
+        fillColor='red', lineColor='white', units='pix')
+
+
+def _movie(size):
+    movie = visual.MovieStim(
+        _win, os.path.join(prefs.paths['assets'], 'default.mp4'),
+        size=(size, size * 9 // 16), loop=True, noAudio=True, units='pix')
+    movie.play()
+    return movie
+
+
+def _slider(nTicks):
+    return visual.Slider(
+        _win, ticks=list(range(nTicks)),
+        labels=[str(tick) for tick in range(nTicks)], size=(900, 40),
+        labelHeight=12, units='pix')
+
+
+# (name, function making the stimulus, sizes or numbers of elements)
+cases = [
+    ("ImageStim", _image, [64, 256, 1024]),
+    ("GratingStim", _grating, [64, 256, 1024]),
+    ("TextStim", _text, [10, 100, 1000]),
+    ("TextBox2", _textBox, [10, 100, 1000]),
+    ("ElementArrayStim", _elements, [100, 1000, 10000]),
+    ("DotStim", _dots, [100, 1000, 10000]),
+    ("ShapeStim", _shape, [4, 100, 1000]),
+    ("MovieStim", _movie, [320, 960]),
+    ("Slider", _slider, [5, 20, 100]),
+]
+
+
+def _words(nChars):
+    text = "The quick brown fox jumps over the lazy dog. " * (nChars // 45 + 1)
+    return text[:nChars]
+
+
+def _countGLCalls(func):
+    """Number of OpenGL calls made through `pyglet.gl` by calling `func`.
+    """
+    count = [0]
+    originals = {}
+    for name, glFunc in vars(GL).items():
+        if name.startswith('gl') and callable(glFunc) \
+                and not isinstance(glFunc, type):
+            originals[name] = glFunc
+
+    def _counted(glFunc):
+        def _call(*args, **kwargs):
+            count[0] += 1
+            return glFunc(*args, **kwargs)
+        return _call
+
+    for name, glFunc in originals.items():
+        setattr(GL, name, _counted(glFunc))
+    try:
+        func()
+    finally:
+        for name, glFunc in originals.items():
+            setattr(GL, name, glFunc)
+
+    return count[0]
+
+
+def _measure(stim):
+    """Draw and flip times (s) and GL calls per frame for a stimulus.
+    """
+    def _draw():
+        stim.draw()
+        GL.glFinish()
+        _win.clearBuffer()
+
+    def _flip():
+        stim.draw()
+        _win.flip()
+        GL.glFinish()
+
+    _flip()  # the first draw makes textures etc.
+    return {
+        'draw': timeCall(_draw, repeat=5, number=nFrames),
+        'flip': timeCall(_flip, repeat=5, number=nFrames),
+        'glCalls': _countGLCalls(_flip),
+    }
+
+
+def run(pattern=None):
+    """Run the cases whose names match the regular expression `pattern` (or
+    all of them), returning the results as a dict ready to save as JSON.
+    """
+    global _win
+
+    logging.console.setLevel(logging.ERROR)
+    _win = visual.Window(
+        winSize, units='pix', waitBlanking=False, checkTiming=False,
+        allowGUI=False)
+    results = {}
+    skipped = {}
+    try:
+        for name, makeStim, sizes in cases:
+            for size in sizes:
+                caseName = "%s/%i" % (name, size)
+                if pattern and not re.search(pattern, caseName):
+                    continue
+                try:
+                    stim = makeStim(size)
+                    results[caseName] = _measure(stim)
+                except Exception as err:
+                    skipped[caseName] = "%s: %s" % (type(err).__name__, err)
+                    continue
+                if hasattr(stim, 'unload'):
+                    stim.unload()
+        info = {
+            'psychopy': psychopy.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'renderer': GL.gl_info.get_renderer(),
+            'glVersion': str(GL.gl_info.get_version()),
+            'winSize': list(winSize),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+    finally:
+        _win.close()
+        _win = None
+
+    return {'info': info, 'results': results, 'skipped': skipped}
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Compare results with a baseline from an earlier run.
+
+    Parameters
+    ----------
+    results, baseline : dict
+        Results from `run` (or loaded from their JSON files).
+    tolerance : float
+        Proportion by which a case can be slower than the baseline before
+        it's a regression.
+
+    Returns
+    -------
+    rows : list of list
+        Case, baseline and current flip time, ratio, and baseline and
+        current GL calls, for cases in both.
+    regressions : list of str
+        Descriptions of the cases which are slower, or make more GL calls.
+    """
+    rows = []
+    regressions = []
+    for caseName, current in results['results'].items():
+        before = baseline['results'].get(caseName)
+        if before is None:
+            continue
+        ratio = current['flip'] / before['flip']
+        rows.append([caseName, before['flip'], current['flip'],
+                     "%.2f" % ratio, before['glCalls'], current['glCalls']])
+        for metric in ('draw', 'flip'):
+            if current[metric] > before[metric] * (1 + tolerance):
+                regressions.append("%s %s %.3f ms (was %.3f ms)" % (
+                    caseName, metric, current[metric] * 1000,
+                    before[metric] * 1000))
+        if current['glCalls'] > before['glCalls']:
+            regressions.append("%s makes %i GL calls (was %i)" % (
+                caseName, current['glCalls'], before['glCalls']))
+
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time drawing and flipping the core visual stimuli.")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline",
+                        help="compare with results saved in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="proportion slower than the baseline allowed")
+    parser.add_argument("--only", help="only run cases matching this regex")
+    args = parser.parse_args(argv)
+
+    results = run(args.only)
+    printTable(
+        "Drawing stimuli, per frame (%s)" % results['info']['renderer'],
+        ["case", "draw", "flip", "GL calls"],
+        [[caseName, r['draw'], r['flip'], r['glCalls']]
+         for caseName, r in results['results'].items()])
+    for caseName, reason in results['skipped'].items():
+        print("Skipped %s (%s)" % (caseName, reason))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['info'].get('renderer') != results['info']['renderer']:
+        print("Baseline was run with a different renderer (%s), so timings "
+              "may not be comparable" % baseline['info'].get('renderer'))
+    rows, regressions = compare(results, baseline, args.tolerance)
+    printTable(
+        "Flip time compared with %s (%s)" % (
+            args.baseline, baseline['info'].get('date')),
+        ["case", "baseline", "now", "ratio", "GL calls before", "now"],
+        rows)
+    for regression in regressions:
+        print("Regression: %s" % regression)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken for a SerialDevice to get the reply to a message.
+
+A pseudo-terminal pair stands in for the device: a thread replies to each
+line sent to it after a fixed delay. Compares `awaitResponse()` polling the
+port (`receiveMode="poll"`) against waiting to be woken by the receive
+thread (`receiveMode="thread"`), along with the CPU time used while waiting.
+Only runs on systems with pseudo-terminals (i.e. not Windows).
+"""
+
+import os
+import threading
+import time
+import tty
+
+from psychopy import logging
+from psychopy.hardware import serialdevice
+from psychopy.benchmarks import printTable
+
+replyDelays = [0.001, 0.005, 0.02]
+
+
+def _fakeDevice(fd, delay):
+    """Reply to each line written to `fd` with "ok", after `delay` (s).
+    """
+    buffer = b""
+    while True:
+        try:
+            data = os.read(fd, 1024)
+        except OSError:
+            return  # closed
+        if not data:
+            return
+        buffer += data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            time.sleep(delay)
+            os.write(fd, b"ok " + line + b"\n")
+
+
+def _replyTimes(port, receiveMode, nMessages=50):
+    """Mean wall time and CPU time (s) to send a message and get its reply.
+    """
+    dev = serialdevice.SerialDevice(
+        port=port, receiveMode=receiveMode, pauseDuration=0.01)
+    try:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        for n in range(nMessages):
+            dev.sendMessage("msg%i" % n, autoLog=False)
+            dev.awaitResponse()
+        wall = (time.perf_counter() - wall) / nMessages
+        cpu = (time.process_time() - cpu) / nMessages
+    finally:
+        dev.close()
+        serialdevice.ports.pop(port, None)
+
+    return wall, cpu
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    rows = []
+    for delay in replyDelays:
+        master, slave = os.openpty()
+        tty.setraw(master)
+        tty.setraw(slave)
+        threading.Thread(
+            target=_fakeDevice, args=(master, delay), daemon=True).start()
+        port = os.ttyname(slave)
+        for receiveMode in ("poll", "thread"):
+            wall, cpu = _replyTimes(port, receiveMode)
+            rows.append([delay, receiveMode, wall, cpu])
+        os.close(slave)
+        os.close(master)
+    printTable(
+        "SerialDevice.awaitResponse, per message",
+        ["reply delay", "receiveMode", "time", "CPU time"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
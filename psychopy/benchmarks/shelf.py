@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Speed and safety of the Shelf backends.
+
+First times reading and writing one entry of an experiment Shelf with
+increasing numbers of entries, for a JSON Shelf (`backend="json"`) and an
+SQLite Shelf (`backend="sqlite"`). Then runs a stress test of counterbalancing:
+many processes at once each claim slots from the same Counterbalancer, and
+the slots claimed are compared with the slots left on the Shelf afterwards.
+Any difference is updates which were lost; errors (e.g. reading a JSON file
+while another process is writing it) are counted too. The SQLite backend
+should lose no updates and raise no errors::
+
+    python -m psychopy.benchmarks.shelf
+"""
+
+import multiprocessing
+import tempfile
+import traceback
+
+from psychopy import logging
+from psychopy.data import shelf, Counterbalancer
+from psychopy.benchmarks import timeCall, printTable
+
+nEntriesList = [10, 100, 1000]
+groups = ["A", "B", "C"]
+
+
+def _accessTimes(backend, nEntries):
+    """Fastest time (s) to read and to write one entry of a Shelf with
+    `nEntries` entries.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        expShelf = shelf.Shelf(scope="experiment", expPath=folder,
+                               backend=backend)
+        expShelf.data.write({
+            "entry%i" % n: {group: 10 for group in groups}
+            for n in range(nEntries)})
+        read = timeCall(lambda: expShelf.data["entry0"], repeat=5, number=20)
+        write = timeCall(
+            lambda: expShelf.data.__setitem__("entry0", {"A": 1}),
+            repeat=5, number=20)
+        if backend == "sqlite":
+            expShelf.data.close()
+
+    return read, write
+
+
+def _claimSlots(folder, backend, nClaims, cap):
+    """Claim `nClaims` slots from the Shelf in `folder`, returning how many
+    were claimed from each group and how many claims failed with an error.
+    """
+    logging.console.setLevel(logging.CRITICAL)
+    claimed = {group: 0 for group in groups}
+    errors = 0
+    conditions = [{'group': group, 'cap': cap} for group in groups]
+    for n in range(nClaims):
+        try:
+            expShelf = shelf.Shelf(scope="experiment", expPath=folder,
+                                   backend=backend)
+            balancer = Counterbalancer(
+                shelf=expShelf, entry="stress", conditions=conditions)
+            group = balancer.allocateGroup()
+            if group is not None:
+                claimed[group] += 1
+        except Exception:
+            errors += 1
+            logging.debug(traceback.format_exc())
+
+    return claimed, errors
+
+
+def _stressTest(backend, nProcesses=16, nClaims=25):
+    """Run `nProcesses` processes at once, each claiming `nClaims` slots.
+    Returns the number of slots claimed, updates lost and errors.
+    """
+    cap = nProcesses * nClaims  # enough that no group runs out
+    with tempfile.TemporaryDirectory() as folder:
+        # create the entry before starting, so it's only created once
+        Counterbalancer(
+            shelf=shelf.Shelf(scope="experiment", expPath=folder,
+                              backend=backend),
+            entry="stress",
+            conditions=[{'group': group, 'cap': cap} for group in groups])
+        with multiprocessing.Pool(nProcesses) as pool:
+            results = pool.starmap(
+                _claimSlots, [(folder, backend, nClaims, cap)] * nProcesses)
+        try:
+            left = shelf.Shelf(scope="experiment", expPath=folder,
+                               backend=backend).data["stress"]
+            taken = sum(cap - left[group] for group in groups)
+        except Exception:
+            # shelf file left corrupted
+            taken = 0
+
+    claimed = sum(sum(counts.values()) for counts, errors in results)
+    errors = sum(errors for counts, errors in results)
+
+    return claimed, claimed - taken, errors
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    rows = []
+    for nEntries in nEntriesList:
+        row = [nEntries]
+        for backend in ("json", "sqlite"):
+            row.extend(_accessTimes(backend, nEntries))
+        rows.append(row)
+    printTable(
+        "Reading and writing one Shelf entry",
+        ["entries", "JSON read", "JSON write", "SQLite read", "SQLite write"],
+        rows)
+
+    rows = []
+    for backend in ("json", "sqlite"):
+        rows.append([backend, *_stressTest(backend)])
+    printTable(
+        "Counterbalancing from 16 processes at once, 25 claims each",
+        ["backend", "slots claimed", "updates lost", "errors"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to set a Sound from a file, as done on every trial.
+
+Compares reading, resampling and converting a sound file each time (as a
+Sound not using the sound bank does) with taking it from the sound bank
+(see `psychopy.sound.soundbank`), for files of increasing duration recorded
+at 44.1 kHz and played at 48 kHz. If psychtoolbox and a speaker are
+available, also times `setSound` of a PTB Sound with and without the sound
+bank, which includes filling the track on the audio device::
+
+    python -m psychopy.benchmarks.sound
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from psychopy import logging
+from psychopy.benchmarks import timeCall, printTable
+from psychopy.sound.soundbank import SoundBank, BankedSound
+
+durations = [0.1, 0.5, 2.0, 10.0]
+fileRate = 44100
+playRate = 48000
+
+
+def _makeFiles(folder):
+    """Write a stereo WAV file of each duration, returning their paths.
+    """
+    import soundfile as sf
+
+    files = []
+    for dur in durations:
+        t = np.arange(int(dur * fileRate)) / fileRate
+        tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+        filename = os.path.join(folder, "tone%gs.wav" % dur)
+        sf.write(filename, np.column_stack([tone, tone]), fileRate)
+        files.append(filename)
+
+    return files
+
+
+def _ptbTimes(files):
+    """Fastest time (s) of `setSound` for each file with and without the
+    sound bank, or None if PTB or a speaker isn't available.
+    """
+    try:
+        from psychopy.sound import backend_ptb
+        snd = backend_ptb.SoundPTB(files[0])
+    except Exception as err:
+        logging.error("Skipping PTB Sound: {}".format(err))
+        return None
+    times = []
+    for filename in files:
+        snd.preBuffer = -1
+        backend_ptb.soundBank.clear()
+        snd.setSound(filename)
+        withBank = timeCall(lambda: snd.setSound(filename), repeat=5, number=5)
+        # a preBuffer other than -1 means files don't come from the bank
+        snd.preBuffer = 0
+        withoutBank = timeCall(
+            lambda: snd.setSound(filename), repeat=5, number=5)
+        times.append((withoutBank, withBank))
+
+    return times
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as folder:
+        files = _makeFiles(folder)
+        rows = []
+        for dur, filename in zip(durations, files):
+            bank = SoundBank()
+            decode = timeCall(
+                lambda: BankedSound(filename, playRate, 2), repeat=5, number=3)
+            bank.get(filename, playRate, 2)
+            lookup = timeCall(
+                lambda: bank.get(filename, playRate, 2), repeat=5, number=100)
+            rows.append(["%g s" % dur, decode, lookup, "%.0fx" % (decode / lookup)])
+        printTable(
+            "Getting a 44.1 kHz sound file ready to play at 48 kHz",
+            ["duration", "decode", "sound bank", "speedup"],
+            rows)
+
+        ptbTimes = _ptbTimes(files)
+        if ptbTimes is None:
+            return
+        rows = [["%g s" % dur, without, withBank, "%.0fx" % (without / withBank)]
+                for dur, (without, withBank) in zip(durations, ptbTimes)]
+        printTable(
+            "SoundPTB.setSound from a file",
+            ["duration", "without bank", "with bank", "speedup"],
+            rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to simulate staircases with many observers, and time spent
+updating a PsiHandler between trials.
+
+Compares running a handler once per simulated observer against the batch
+simulations in `psychopy.data.simulation`, in one and several processes,
+then the time `PsiHandler.addResponse` and `next()` block for with each
+`updateMode` and grid setting.
+"""
+
+import numpy as np
+
+from psychopy import logging, data
+from psychopy.data import simulation
+from psychopy.benchmarks import timeCall, printTable
+
+nObserversList = [10, 100, 1000]
+
+
+def _handlerLoop(makeHandler, observers, seed):
+    """Simulate each observer with its own handler, one at a time.
+    """
+    rng = np.random.default_rng(seed)
+    for observer in observers.split(len(observers)):
+        handler = makeHandler()
+        for intensity in handler:
+            handler.addResponse(int(observer.respond([intensity], rng)[0]))
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    designs = {
+        "StairHandler": lambda: data.StairHandler(
+            startVal=0.5, stepSizes=[8, 4, 2], nTrials=40, nReversals=8,
+            nUp=1, nDown=3, stepType='db', minVal=0.001, maxVal=1),
+        "QuestHandler": lambda: data.QuestHandler(
+            startVal=-1, startValSd=0.5, pThreshold=0.82, nTrials=40,
+            minVal=-3, maxVal=0),
+        "PsiHandler": lambda: data.PsiHandler(
+            nTrials=40, intensRange=[0.01, 0.5], alphaRange=[0.01, 0.5],
+            betaRange=[0.01, 0.2], intensPrecision=0.01,
+            alphaPrecision=0.01, betaPrecision=0.01, delta=0.02),
+    }
+    scales = {"StairHandler": "linear", "QuestHandler": "log10",
+              "PsiHandler": "linear"}
+    ranges = {"StairHandler": (0.05, 0.3), "QuestHandler": (-1.5, -0.5),
+              "PsiHandler": (0.05, 0.3)}
+    for name, makeHandler in designs.items():
+        rows = []
+        for nObservers in nObserversList:
+            rng = np.random.default_rng(0)
+            observers = simulation.SimulatedObservers(
+                rng.uniform(*ranges[name], nObservers),
+                stimScale=scales[name])
+            looped = timeCall(
+                lambda: _handlerLoop(makeHandler, observers, 0), repeat=1)
+            batch = timeCall(
+                lambda: simulation.simulateHandler(
+                    makeHandler(), observers, seed=0), repeat=3)
+            batch4 = timeCall(
+                lambda: simulation.simulateHandler(
+                    makeHandler(), observers, seed=0, nProcesses=4), repeat=3)
+            rows.append([nObservers, looped, batch, batch4])
+        printTable(
+            "%s (40 trials)" % name,
+            ["observers", "handler loop", "batch", "batch (4 processes)"],
+            rows)
+
+
+def _psiLatency(nTrials=20, trialDur=0.03, **kwargs):
+    """Time spent in `addResponse` and `next()` per trial, with each trial
+    (and the interval after it) simulated by sleeping for `trialDur`.
+    """
+    import time
+    handler = data.PsiHandler(
+        nTrials=nTrials, intensRange=[0.01, 0.5], alphaRange=[0.01, 0.5],
+        betaRange=[0.01, 0.2], intensPrecision=0.005, alphaPrecision=0.005,
+        betaPrecision=0.005, delta=0.02, **kwargs)
+    rng = np.random.default_rng(0)
+    blocked = 0
+    t0 = time.perf_counter()
+    for intensity in handler:
+        blocked += time.perf_counter() - t0  # in next()
+        time.sleep(trialDur)
+        t1 = time.perf_counter()
+        handler.addResponse(int(rng.random() < 0.75))
+        blocked += time.perf_counter() - t1  # in addResponse()
+        time.sleep(trialDur)
+        t0 = time.perf_counter()
+    return blocked / nTrials
+
+
+def runLatency():
+    logging.console.setLevel(logging.ERROR)
+    rows = []
+    for updateMode in ['sync', 'background', 'speculative']:
+        for dtype, lowMemory in [('float64', False), ('float64', True),
+                                 ('float32', True)]:
+            rows.append([updateMode, dtype, lowMemory, _psiLatency(
+                updateMode=updateMode, dtype=dtype, lowMemory=lowMemory)])
+    printTable(
+        "PsiHandler time blocked between trials (99x99x39 grid)",
+        ["updateMode", "dtype", "lowMemory", "per trial"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
+    runLatency()
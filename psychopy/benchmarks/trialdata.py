@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Time taken to inspect the data of a TrialHandler2 on each trial.
+
+Compares building a DataFrame from the list of elapsed trials (as
+`TrialHandler2.data` used to), getting `TrialHandler2.data` from its
+column-wise store, and getting a running mean from the store directly, after
+increasing numbers of trials. Also checks that `TrialHandler2.data` is the
+same as the DataFrame from the list (including dtypes, with missed responses
+and changes to earlier trials), and that changing the DataFrame it returns
+doesn't change the next one.
+"""
+
+import pandas as pd
+
+from psychopy import logging, data
+from psychopy.benchmarks import timeCall, printTable
+
+nTrialsList = [100, 1000, 10000]
+
+
+def _runTrials(trials, n):
+    """Run `n` trials, adding some typical data to each.
+    """
+    for i in range(n):
+        next(trials)
+        if i % 10 == 0:
+            # missed response
+            trials.addData('key_resp.keys', None)
+            trials.addData('key_resp.corr', 0)
+            trials.addData('key_resp.rt', None)
+            continue
+        trials.addData('key_resp.keys', 'left' if i % 2 else 'right')
+        trials.addData('key_resp.corr', bool(i % 3))
+        trials.addData('key_resp.rt', 0.4 + (i % 7) / 10)
+
+
+def _checkData(trials):
+    """Check that `trials.data` is the same as the DataFrame from the list.
+    """
+    expected = pd.DataFrame(trials.elapsedTrials)
+    frame = trials.data
+    pd.testing.assert_frame_equal(frame, expected)
+    frame.loc[0, 'key_resp.rt'] = -1
+    frame['extra'] = 1
+    pd.testing.assert_frame_equal(trials.data, expected)
+
+
+def run():
+    logging.console.setLevel(logging.ERROR)
+    conditions = [{'ori': ori, 'word': word}
+                  for ori in [0, 90, 180, 270] for word in ['red', 'green']]
+    rows = []
+    for nTrials in nTrialsList:
+        trials = data.TrialHandler2(
+            conditions, nReps=nTrials // len(conditions) + 4)
+        _runTrials(trials, nTrials)
+        _checkData(trials)
+        # change an earlier trial
+        trials.elapsedTrials[nTrials // 2]['key_resp.rt'] = 1
+        _checkData(trials)
+
+        def _nextTrial():
+            # one more trial, so there's a new row to convert
+            _runTrials(trials, 1)
+
+        fromList = timeCall(
+            lambda: (_nextTrial(), pd.DataFrame(trials.elapsedTrials)),
+            repeat=5)
+        fromColumns = timeCall(
+            lambda: (_nextTrial(), trials.data), repeat=5)
+        runningMean = timeCall(
+            lambda: (_nextTrial(),
+                     trials.dataColumns.mean('key_resp.corr')),
+            repeat=5)
+        rows.append([nTrials, fromList, fromColumns,
+                     "%.1fx" % (fromList / fromColumns), runningMean])
+    printTable(
+        "Per-trial cost of inspecting TrialHandler2 data",
+        ["trials so far", "DataFrame from list", ".data", "speed-up",
+         "running mean"],
+        rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Scaling of `TrialHandler2` sequencing with the number of trials.
+
+Times creating a handler and getting the first trial, skipping ahead and
+rewinding, for each sampling method, at increasing numbers of trials. All of
+these should be roughly constant as the number of trials grows.
+"""
+
+from psychopy import logging
+from psychopy.data import TrialHandler2
+from psychopy.benchmarks import timeCall, printTable
+
+nConds = 10
+nTrialsList = [100, 1000, 10000, 20000, 100000]
+methods = ['sequential', 'random', 'fullRandom']
+
+
+def _makeHandler(nTrials, method):
+    conditions = [{'cond': n, 'ori': n * 10} for n in range(nConds)]
+    trials = TrialHandler2(
+        conditions, nReps=nTrials // nConds, method=method, autoLog=False
+    )
+    next(trials)
+
+    return trials
+
+
+def run():
+    # skipping logs a warning per skip past the end, keep output clean
+    logging.console.setLevel(logging.ERROR)
+    for method in methods:
+        rows = []
+        for nTrials in nTrialsList:
+            trials = _makeHandler(nTrials, method)
+            rows.append([
+                nTrials,
+                timeCall(lambda: _makeHandler(nTrials, method), repeat=3),
+                timeCall(lambda: trials.skipTrials(1), repeat=3),
+                timeCall(lambda: trials.rewindTrials(1), repeat=3),
+                timeCall(lambda: trials.getFutureTrials(10), repeat=3),
+            ])
+        printTable(
+            "TrialHandler2 (method=%s)" % method,
+            ["nTrials", "start", "skipTrials", "rewindTrials",
+             "getFutureTrials(10)"],
+            rows
+        )
+
+
+if __name__ == "__main__":
+    run()
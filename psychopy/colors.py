@@ -10,10 +10,13 @@ __all__ = [
     "colorSpaces",
     "isValidColor",
     "hex2rgb255",
-    "Color"
+    "Color",
+    "convertColors",
+    "clearColorCache",
 ]
 
 import re
+from collections import OrderedDict
 from math import inf
 from psychopy import logging
 import psychopy.tools.colorspacetools as ct
@@ -240,6 +243,77 @@ for val in alphaSpaces:
     nonAlphaSpaces.remove(val)
 
 
+class _BoundedCache:
+    """Dict of the most recently used values, up to `maxSize` of them.
+    """
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self._values = OrderedDict()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key):
+        value = self._values.get(key)
+        if value is not None:
+            self._values.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.maxSize <= 0:
+            return
+        self._values[key] = value
+        self._values.move_to_end(key)
+        while len(self._values) > self.maxSize:
+            self._values.popitem(last=False)
+
+    def clear(self):
+        self._values.clear()
+
+
+# values of colors set (franca, alpha and cache of the Color) and rendered, so
+# setting the same color again (e.g. on every frame) doesn't redo the work
+_setCache = _BoundedCache(1024)
+_renderCache = _BoundedCache(1024)
+
+
+def clearColorCache():
+    """Forget the values of colors set and rendered before, which `Color`
+    keeps (for the last 1024 of each) so that setting the same color again is
+    quick.
+    """
+    _setCache.clear()
+    _renderCache.clear()
+
+
+def _valueKey(value):
+    """Hashable key for a color value (or conematrix), or None if it's not
+    worth caching (e.g. the colors of thousands of elements).
+    """
+    if value is None or isinstance(value, (str, bool, int)):
+        return type(value), value
+    if isinstance(value, float):
+        return None if value != value else (type(value), value)
+    if isinstance(value, (tuple, list)):
+        if len(value) > 4 or not all(
+                isinstance(val, (str, int, float)) for val in value):
+            return None
+        return type(value), tuple((type(val), val) for val in value)
+    if isinstance(value, np.ndarray):
+        if value.size > 9 or value.dtype.kind not in 'biufU':
+            return None
+        return np.ndarray, value.dtype.str, value.shape, value.tobytes()
+    return None
+
+
+def _copyValue(value):
+    """Copy of a cached value, so changing it doesn't change the cache.
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    return value
+
+
 class Color:
     """A class to store color details, knows what colour space it's in and can
     supply colours in any space.
@@ -291,15 +365,11 @@ class Color:
             for i in range((len(color[:, 0]))):
                 color[i, 0] = color[i, 0].replace("\"", "").replace("'", "")
             # If colors are all named, override color space
-            namedMatch = np.vectorize(
-                lambda col: bool(colorSpaces['named'].fullmatch(
-                    str(col).lower())))  # match regex against named
-            if all(namedMatch(color[:, 0])):
+            if all(str(col).lower() in colorNames for col in color[:, 0]):
                 space = 'named'
             # If colors are all hex, override color space
-            hexMatch = np.vectorize(
-                lambda col: bool(colorSpaces['hex'].fullmatch(str(col))))  # match regex against hex
-            if all(hexMatch(color[:, 0])):
+            hexMatch = colorSpaces['hex'].fullmatch
+            if all(hexMatch(str(col)) for col in color[:, 0]):
                 space = 'hex'
             # If color is a string but does not match any string space, it's invalid
             if space not in strSpaces:
@@ -361,15 +431,41 @@ class Color:
         # Store requested colour and space (or defaults, if none given)
         self._requested = color
         self._requestedSpace = space
-        # Validate and prepare values
-        color, space = self.validate(color, space)
-        # Convert to lingua franca
-        if space in colorSpaces:
-            self.valid = True
-            setattr(self, space, color)
-        else:
-            self.valid = False
-            raise ValueError("{} is not a valid color space.".format(space))
+        # If the same colour has been set before, reuse the values from then
+        key = _valueKey(color)
+        if key is not None:
+            key = (key, space, _valueKey(self.conematrix))
+            cached = _setCache.get(key)
+            if cached is not None:
+                franca, alpha, cache = cached
+                self._franca = _copyValue(franca)
+                if alpha is not None:
+                    self._alpha = _copyValue(alpha)
+                self._cache = {name: _copyValue(val)
+                               for name, val in cache.items()}
+                self._renderCache = {}
+                self.valid = True
+                return
+        # Note whether setting the colour sets alpha, so it can be cached
+        oldAlpha = self.__dict__.pop('_alpha', None)
+        try:
+            # Validate and prepare values
+            color, space = self.validate(color, space)
+            # Convert to lingua franca
+            if space in colorSpaces:
+                self.valid = True
+                setattr(self, space, color)
+            else:
+                self.valid = False
+                raise ValueError(
+                    "{} is not a valid color space.".format(space))
+        finally:
+            alpha = self.__dict__.get('_alpha')
+            if alpha is None and oldAlpha is not None:
+                self._alpha = oldAlpha
+        if key is not None:
+            _setCache.put(key, (_copyValue(self._franca), _copyValue(alpha), {
+                name: _copyValue(val) for name, val in self._cache.items()}))
 
     def render(self, space='rgb'):
         """Apply contrast to the base color value and return the adjusted color
@@ -380,10 +476,21 @@ class Color:
         # If value is cached, return it rather than doing calculations again
         if space in self._renderCache:
             return self._renderCache[space]
-        # Transform contrast to match rgb
         contrast = self.contrast
         if contrast is None:
             contrast = 1
+        # If the same colour has been rendered before, reuse the value
+        key = None
+        if isinstance(contrast, (int, float)):
+            key = (space, contrast, _valueKey(self.rgb), _valueKey(self.alpha))
+            if None in key:
+                key = None
+        if key is not None:
+            cached = _renderCache.get(key)
+            if cached is not None:
+                self._renderCache[space] = _copyValue(cached)
+                return self._renderCache[space]
+        # Transform contrast to match rgb
         contrast = np.reshape(contrast, (-1, 1))
         contrast = np.hstack((contrast, contrast, contrast))
         # Multiply
@@ -391,6 +498,8 @@ class Color:
         buffer = self.copy()
         buffer.rgb = adj
         self._renderCache[space] = getattr(buffer, space)
+        if key is not None:
+            _renderCache.put(key, _copyValue(self._renderCache[space]))
         return self._renderCache[space]
 
     def __repr__(self):
@@ -922,8 +1031,7 @@ class Color:
         """Color value expressed as a DKL triplet.
         """
         if 'dkl' not in self._cache:
-            raise NotImplementedError(
-                "Conversion from rgb to dkl is not yet implemented.")
+            self._cache['dkl'] = ct.rgb2dkl(self.rgb, self.conematrix)
         return self._cache['dkl']
 
     @dkl.setter
@@ -1014,6 +1122,169 @@ class Color:
     #     self._renderCache = {}
 
 
+# ------------------------------------------------------------------------------
+# Converting many colors at once
+#
+
+# hex digit values by character code
+_hexDigits = np.full(256, -1, dtype=np.int16)
+for _digit in '0123456789abcdefABCDEF':
+    _hexDigits[ord(_digit)] = int(_digit, 16)
+# rgb of each named color, and the name of each rgb (the last name if several
+# colors have the same value, as for Color.named)
+_namedRGBA = {name: np.append(val, 1)[:4] for name, val in colorNames.items()}
+_rgbNames = {tuple(np.asarray(val[:3], dtype=float)): name
+             for name, val in colorNames.items() if len(val) == 3}
+
+
+def _hex2rgb(hexColors):
+    hexColors = np.char.strip(hexColors.astype('U'))
+    # as character codes, where any invalid digit is -1
+    valid = np.char.str_len(hexColors) == 7
+    codes = np.zeros((len(hexColors), 7), dtype=np.uint8)
+    try:
+        codes[valid] = hexColors[valid].astype('S7').view(np.uint8).reshape(
+            -1, 7)
+    except UnicodeEncodeError:
+        valid[:] = False
+    digits = _hexDigits[codes[:, 1:]]
+    valid &= (codes[:, 0] == ord('#')) & (digits >= 0).all(axis=1)
+    if not valid.all():
+        raise ValueError("Invalid hex colors: {}".format(
+            [str(val) for val in hexColors[~valid]]))
+    rgb255 = digits[:, 0::2] * 16 + digits[:, 1::2]
+    return 2 * (rgb255 / 255 - 0.5)
+
+
+def _named2rgba(names):
+    try:
+        return np.array([_namedRGBA[str(name).lower().strip()]
+                         for name in names], dtype=float)
+    except KeyError as err:
+        raise ValueError("{} is not a named color".format(err))
+
+
+def _rgb2hex(rgb):
+    rgb255 = np.clip(np.round(255 * (rgb + 1) / 2), 0, 255).astype(int)
+    return np.array(["#%02x%02x%02x" % tuple(row) for row in rgb255.tolist()])
+
+
+def _rgb2named(rgb):
+    return np.array([_rgbNames.get(tuple(row)) for row in rgb.tolist()],
+                    dtype=object)
+
+
+# functions converting Nx3 arrays to and from rgb, given a conematrix
+_toRGB = {
+    'rgb': lambda val, cm: val,
+    'rgb1': lambda val, cm: 2 * (val - 0.5),
+    'rgb255': lambda val, cm: 2 * (val / 255 - 0.5),
+    'hsv': lambda val, cm: ct.hsv2rgb(val),
+    'lms': lambda val, cm: ct.lms2rgb(val, cm),
+    'dkl': lambda val, cm: ct.dkl2rgb(val, cm),
+    'dklCart': lambda val, cm: ct.dklCart2rgb(
+        val[:, 0], val[:, 1], val[:, 2], cm),
+    'srgb': lambda val, cm: ct.srgbTF(val, reverse=True),
+}
+_fromRGB = {
+    'rgb': lambda rgb, cm: rgb,
+    'rgb1': lambda rgb, cm: (rgb + 1) / 2,
+    'rgb255': lambda rgb, cm: np.round(255 * (rgb + 1) / 2),
+    'hsv': lambda rgb, cm: ct.rgb2hsv(rgb),
+    'lms': lambda rgb, cm: ct.rgb2lms(rgb, cm),
+    'dkl': lambda rgb, cm: ct.rgb2dkl(rgb, cm),
+    'dklCart': lambda rgb, cm: ct.rgb2dklCart(rgb[np.newaxis], cm)[0],
+    'srgb': lambda rgb, cm: ct.srgbTF(rgb),
+    'hex': lambda rgb, cm: _rgb2hex(rgb),
+    'named': lambda rgb, cm: _rgb2named(rgb),
+}
+# spaces with alpha, and the space without
+_alphaSpaceBases = {
+    'rgba': 'rgb', 'rgba1': 'rgb1', 'rgba255': 'rgb255', 'hsva': 'hsv',
+    'srgba': 'srgb', 'lmsa': 'lms', 'dkla': 'dkl', 'dklaCart': 'dklCart'}
+
+
+def convertColors(colors, fromSpace, toSpace, conematrix=None):
+    """Convert many colors from one color space to another in one go.
+
+    Unlike making a `Color` of each (or of them all), this converts whole
+    arrays at once, so is much quicker for e.g. the colors of thousands of
+    elements of an ElementArrayStim.
+
+    Parameters
+    ----------
+    colors : ArrayLike or str
+        Colors to convert: an Nx3 array (or Nx4, with alpha, for spaces with
+        alpha) for numeric spaces, or a list of strings for 'hex' and 'named'.
+        A single color (a triplet or string) can be given too.
+    fromSpace : str
+        Color space of `colors`: 'rgb', 'rgb1', 'rgb255', 'hex', 'named',
+        'hsv', 'lms', 'dkl', 'dklCart' or 'srgb', or any of those with alpha
+        (e.g. 'rgba').
+    toSpace : str
+        Color space to convert to, from the same list. Colors with no name
+        are None in the 'named' space.
+    conematrix : ArrayLike or None
+        Cone matrix for the 'lms', 'dkl' and 'dklCart' spaces, as for `Color`.
+
+    Returns
+    -------
+    ndarray or str
+        Converted colors, an Nx3 (or Nx4) array of floats for numeric spaces
+        and an array of N strings for 'hex' and 'named', or a single color if
+        a single color was given. Going to a space with alpha from one
+        without, alpha is 1 (or 0 for 'none').
+
+    Examples
+    --------
+    Convert the hues of 1000 elements to rgb::
+
+        hsv = np.column_stack([np.linspace(0, 360, 1000), np.ones((1000, 2))])
+        rgb = convertColors(hsv, 'hsv', 'rgb')
+
+    Get a list of hex colors as rgb255::
+
+        convertColors(['#ff0000', '#00ff80'], 'hex', 'rgb255')
+
+    """
+    fromBase = _alphaSpaceBases.get(fromSpace, fromSpace)
+    toBase = _alphaSpaceBases.get(toSpace, toSpace)
+    if fromBase not in _toRGB and fromBase not in ('hex', 'named'):
+        raise ValueError("{} is not a valid color space.".format(fromSpace))
+    if toBase not in _fromRGB:
+        raise ValueError("{} is not a valid color space.".format(toSpace))
+    # get colors as Nx3 rgb, and alpha
+    alpha = None
+    if fromBase in ('hex', 'named'):
+        single = isinstance(colors, str)
+        colors = np.atleast_1d(np.asarray(colors))
+        if fromBase == 'hex':
+            rgb = _hex2rgb(colors)
+        else:
+            rgba = _named2rgba(colors)
+            rgb, alpha = rgba[:, :3], rgba[:, 3]
+    else:
+        colors = np.asarray(colors, dtype=float)
+        single = colors.ndim == 1
+        colors = np.atleast_2d(colors)
+        nCols = 4 if fromSpace in _alphaSpaceBases else 3
+        if colors.ndim != 2 or colors.shape[1] != nCols:
+            raise ValueError(
+                "Colors in the {} space should be an Nx{} array".format(
+                    fromSpace, nCols))
+        if nCols == 4:
+            alpha = colors[:, 3]
+        rgb = _toRGB[fromBase](colors[:, :3], conematrix)
+    # convert to the new space
+    converted = _fromRGB[toBase](np.asarray(rgb, dtype=float), conematrix)
+    if toSpace in _alphaSpaceBases:
+        if alpha is None:
+            alpha = np.ones(len(converted))
+        converted = np.column_stack([converted, alpha])
+
+    return converted[0] if single else converted
+
+
 # ------------------------------------------------------------------------------
 # Legacy functions
 #
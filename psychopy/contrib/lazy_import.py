@@ -14,8 +14,9 @@
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
 
-# NB This file comes unaltered (apart from this sentence) from the bzrlib
-# by Canonical (the library supporting the Bazaar code versioning system)
+# NB This file comes unaltered (apart from this sentence and the PsychoPy
+# additions at the end, from `lazy_attributes`) from the bzrlib by Canonical
+# (the library supporting the Bazaar code versioning system)
 
 """Functionality to create lazy evaluation objects.
 
@@ -400,3 +401,80 @@ def lazy_import(scope, text, lazy_import_class=None):
     # This is just a helper around ImportProcessor.lazy_import
     proc = ImportProcessor(lazy_import_class=lazy_import_class)
     return proc.lazy_import(scope, text)
+
+# PsychoPy additions ----------------------------------------------------------
+
+def _import_children(children):
+    """Import the submodules in a map of children (as made by
+    ImportProcessor), so that they're available as attributes of their parent.
+    """
+    import importlib
+    for child_path, child_member, grandchildren in children.values():
+        importlib.import_module('.'.join(child_path))
+        _import_children(grandchildren)
+
+
+def lazy_attributes(scope, text):
+    """Make the imports in text available as attributes of a module, but only
+    import them when they are first accessed.
+
+    Unlike `lazy_import`, nothing is put into the scope until it is used, so
+    there are no placeholder objects: the module gets a ``__getattr__`` (see
+    PEP 562) which does the import the first time a name is looked up, then
+    stores the real object in the scope so later lookups are as fast as any
+    other attribute. This makes it safe to lazily import classes as well as
+    modules, e.g.::
+
+        lazy_attributes(globals(), '''
+        from psychopy.visual.grating import GratingStim
+        ''')
+
+    after which ``from psychopy.visual import GratingStim``,
+    ``isinstance(stim, visual.GratingStim)`` and subclassing all get the real
+    class.
+
+    If the scope is a package, other names are looked up as its submodules
+    (imported then), so that e.g. ``visual.textbox2`` still works when nothing
+    has imported the submodule yet.
+
+    :param scope: The module's globals()
+    :param text: Import statements, in the same form as for `lazy_import`
+    :return: Names which will be imported on first access
+    """
+    import importlib
+    import importlib.util
+
+    proc = ImportProcessor()
+    proc._build_map(text)
+    imports = proc.imports
+    module_name = scope.get('__name__')
+    # if the module already has a __getattr__, fall back to it
+    previous_getattr = scope.get('__getattr__')
+
+    def __getattr__(name):
+        if name not in imports:
+            if previous_getattr is not None:
+                return previous_getattr(name)
+            if '__path__' in scope and not name.startswith('__'):
+                submodule_name = '%s.%s' % (module_name, name)
+                if importlib.util.find_spec(submodule_name) is not None:
+                    # importing binds it in the scope
+                    return importlib.import_module(submodule_name)
+            raise AttributeError(
+                "module %r has no attribute %r" % (module_name, name))
+        module_path, member, children = imports[name]
+        module = importlib.import_module('.'.join(module_path))
+        if member is not None:
+            obj = getattr(module, member)
+        else:
+            _import_children(children)
+            obj = module
+        scope[name] = obj
+        return obj
+
+    def __dir__():
+        return sorted(set(scope) | set(imports))
+
+    scope['__getattr__'] = __getattr__
+    scope['__dir__'] = __dir__
+    return list(imports)
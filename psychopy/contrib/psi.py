@@ -21,11 +21,15 @@ class PsiObject():
 
     """Special class to handle internal array and functions of Psi adaptive psychophysical method (Kontsevich & Tyler, 1999)."""
     
-    def __init__(self, x, alpha, beta, xPrecision, aPrecision, bPrecision, delta=0, stepType='lin', TwoAFC=False, prior=None):
+    def __init__(self, x, alpha, beta, xPrecision, aPrecision, bPrecision, delta=0, stepType='lin', TwoAFC=False, prior=None, dtype='float64', lowMemory=False):
         global stats
         from scipy import stats  # takes a while to load so do it lazy
 
         self._TwoAFC = TwoAFC
+        #dtype of the grids, float32 halves their memory use
+        self.dtype = dtype
+        #If lowMemory, only P(r | lambda, x) is stored as a 4D array
+        self.lowMemory = lowMemory
         #Save dimensions
         if stepType == 'lin':
             self.x = linspace(x[0], x[1], int(round((x[1]-x[0])/xPrecision)+1), True)
@@ -62,26 +66,71 @@ class PsiObject():
             self._probResponseGivenLambdaX = (1-self._r) + (2*self._r-1) * ((.5 + .5 * stats.norm.cdf(self._x, self._alpha, self._beta)) * (1 - self.delta) + self.delta / 2)
         else: # Yes/No
             self._probResponseGivenLambdaX = (1-self._r) + (2*self._r-1) * (stats.norm.cdf(self._x, self._alpha, self._beta)*(1-self.delta)+self.delta/2)
+        self._probLambda = self._probLambda.astype(self.dtype)
+        self._probResponseGivenLambdaX = self._probResponseGivenLambdaX.astype(self.dtype)
         
     def update(self, response=None):
-        if response is not None:    #response should only be None when Psi is first initialized
-            self._probLambda = self._probLambdaGivenXResponse[response,:,:,self.nextIntensityIndex].reshape((1,len(self.alpha),len(self.beta),1))
-            
-        #Create P(r | x)
-        self._probResponseGivenX = sum(self._probResponseGivenLambdaX * self._probLambda, axis=(1,2)).reshape((len(self.r),1,1,len(self.x)))
-        
-        #Create P(lambda | x, r)
-        self._probLambdaGivenXResponse = self._probLambda*self._probResponseGivenLambdaX/self._probResponseGivenX
+        self.applyUpdate(self.computeUpdate(response))
         
-        #Create H(x, r)
-        self._entropyXResponse = -1* sum(self._probLambdaGivenXResponse * log10(self._probLambdaGivenXResponse), axis=(1,2)).reshape((len(self.r),1,1,len(self.x)))
+    def computeUpdate(self, response=None):
+        """Compute the new state after a response, without changing this object. The result can be passed to applyUpdate."""
+        state = {}
+        if response is None:    #response should only be None when Psi is first initialized
+            probLambda = self._probLambda
+        elif self._probLambdaGivenXResponse is not None:
+            probLambda = self._probLambdaGivenXResponse[response,:,:,self.nextIntensityIndex].reshape((1,len(self.alpha),len(self.beta),1))
+        else:
+            probLambda = self._probLambda * self._probResponseGivenLambdaX[response,:,:,self.nextIntensityIndex].reshape((1,len(self.alpha),len(self.beta),1))
+            probLambda = probLambda / sum(probLambda)
+        state['_probLambda'] = probLambda
         
-        #Create E[H(x)]
-        self._expectedEntropyX = sum(self._entropyXResponse * self._probResponseGivenX, axis=0).reshape((1,1,1,len(self.x)))
+        if self.lowMemory:
+            expectedEntropyX = self._lowMemoryExpectedEntropy(probLambda, state)
+        else:
+            #Create P(r | x)
+            probResponseGivenX = sum(self._probResponseGivenLambdaX * probLambda, axis=(1,2)).reshape((len(self.r),1,1,len(self.x)))
+            
+            #Create P(lambda | x, r)
+            probLambdaGivenXResponse = probLambda*self._probResponseGivenLambdaX/probResponseGivenX
+            
+            #Create H(x, r), taking 0 * log(0) as 0
+            entropyXResponse = -1* sum(probLambdaGivenXResponse * log10(where(probLambdaGivenXResponse > 0, probLambdaGivenXResponse, 1)), axis=(1,2)).reshape((len(self.r),1,1,len(self.x)))
+            
+            #Create E[H(x)]
+            expectedEntropyX = sum(entropyXResponse * probResponseGivenX, axis=0).reshape((1,1,1,len(self.x)))
+            state['_probResponseGivenX'] = probResponseGivenX
+            state['_probLambdaGivenXResponse'] = probLambdaGivenXResponse
+            state['_entropyXResponse'] = entropyXResponse
+        state['_expectedEntropyX'] = expectedEntropyX
         
         #Generate next intensity
-        self.nextIntensityIndex = argmin(self._expectedEntropyX, axis=3)[0][0][0]
-        self.nextIntensity = self.x[self.nextIntensityIndex]
+        state['nextIntensityIndex'] = argmin(expectedEntropyX, axis=3)[0][0][0]
+        state['nextIntensity'] = self.x[state['nextIntensityIndex']]
+        return state
+        
+    def applyUpdate(self, state):
+        """Apply a state returned by computeUpdate."""
+        for name, value in state.items():
+            setattr(self, name, value)
+        
+    def _lowMemoryExpectedEntropy(self, probLambda, state):
+        """E[H(x)] using matrix products over the flattened lambda grid, rather than building P(lambda | x, r) for every x and r."""
+        nR, nA, nB, nX = self._probResponseGivenLambdaX.shape
+        lik = self._probResponseGivenLambdaX.transpose((1,2,0,3)).reshape((nA*nB, nR*nX))
+        post = probLambda.reshape(nA*nB)
+        logLik = log10(where(lik > 0, lik, 1))
+        logPost = log10(where(post > 0, post, 1))
+        #P(r | x)
+        probResponseGivenX = dot(post, lik)
+        #sum over lambda of q*log(q) with q = P(lambda)P(r | lambda, x)
+        qLogQ = dot(post*logPost, lik) + dot(post, lik*logLik)
+        pLogP = probResponseGivenX * log10(where(probResponseGivenX > 0, probResponseGivenX, 1))
+        #E[H(x)] = sum over r of (P(r | x)log(P(r | x)) - sum over lambda of q*log(q))
+        expectedEntropyX = sum((pLogP - qLogQ).reshape((nR, nX)), axis=0)
+        state['_probResponseGivenX'] = probResponseGivenX.reshape((nR,1,1,nX))
+        state['_probLambdaGivenXResponse'] = None
+        state['_entropyXResponse'] = None
+        return expectedEntropyX.reshape((1,1,1,nX))
         
     def estimateLambda(self):
         return (sum(sum(self._alpha.reshape((len(self.alpha),1))*self._probLambda.squeeze(), axis=1)), sum(sum(self._beta.reshape((1,len(self.beta)))*self._probLambda.squeeze(), axis=1)))
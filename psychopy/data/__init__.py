@@ -12,6 +12,7 @@ from .trial import TrialHandler, TrialHandler2, TrialHandlerExt, TrialType
 from .staircase import (StairHandler, QuestHandler, PsiHandler,
                         MultiStairHandler)
 from .counterbalance import Counterbalancer
+from .columns import DataColumns
 from . import shelf
 
 if sys.version_info.major == 3 and sys.version_info.minor >= 6:
@@ -25,6 +26,10 @@ from .utils import (checkValidFilePath, isValidVariableName, importTrialTypes,
 from .fit import (FitFunction, FitCumNormal, FitLogistic, FitNakaRushton,
                   FitWeibull)
 
+from .simulation import (SimulatedObservers, SimulationResults,
+                         StairSimulation, QuestSimulation, PsiSimulation,
+                         QuestPlusSimulation, simulateHandler)
+
 try:
     # import openpyxl
     import openpyxl
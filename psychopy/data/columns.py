@@ -0,0 +1,506 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Column-wise storage of trial data.
+
+Handlers collect data as one dict per trial. Converting a growing list of
+dicts to a DataFrame every time the data are inspected costs O(trials) each
+time, so `DataColumns` keeps a copy of the rows as columns. Running
+summaries (counts, sums, means) are kept up to date as rows are added, and
+the DataFrame is built incrementally - only rows added since it was last
+requested are converted. The DataFrame is the same as pandas would make from
+the list of dicts, including the dtype of each column.
+
+The dtype pandas infers for a column depends only on which kinds of value
+(bool, small int, float, NaN, None, str...) are in it, so the kinds in each
+column are kept and new rows are converted to the dtype for all the kinds
+seen so far. A column is only converted again from its first row when a new
+kind of value changes its dtype (or if it has other kinds of value, e.g.
+datetimes, whose dtype may depend on the values themselves).
+"""
+
+__all__ = ["DataColumns"]
+
+import numbers
+
+import numpy as np
+import pandas as pd
+from packaging.version import Version
+
+# with copy-on-write (always on from pandas 3), the cached DataFrame can be
+# shared with a shallow copy, as changes to either don't affect the other
+_pandasCopyOnWrite = Version(pd.__version__) >= Version('3.0')
+
+# a value of each kind (see `_valueKind`), to find the dtype pandas infers for
+# a column with values of those kinds
+_representatives = {
+    'bool': True,
+    'int': 1,
+    'negint': -1,
+    'float': 0.5,
+    'nan': np.nan,
+    'none': None,
+    'str': "a",
+}
+_dtypes = {}  # dtype by frozenset of kinds
+
+
+def _kindOf(value):
+    """Which kind of value (bool, int, float or object) a value is.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return 'bool'
+    if isinstance(value, (numbers.Integral, np.integer)):
+        return 'int'
+    if isinstance(value, (float, np.floating)):
+        return 'float'
+    return 'object'
+
+
+def _copyOnWrite():
+    """Whether pandas copies data shared by DataFrames when it's changed.
+    """
+    if _pandasCopyOnWrite:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except KeyError:
+        # (OptionError is a KeyError) pandas before copy-on-write
+        return False
+
+
+def _valueKind(value):
+    """Which kind of value a value is, as far as pandas' dtype inference is
+    concerned, or None for other values. Kinds are keys of `_representatives`
+    or, for numpy scalars (whose dtype pandas may keep), their type and key.
+    """
+    if value is None:
+        return 'none'
+    if isinstance(value, (bool, np.bool_)):
+        kind = 'bool'
+    elif isinstance(value, str):
+        kind = 'str'
+    elif isinstance(value, (numbers.Integral, np.integer)):
+        if (isinstance(value, np.unsignedinteger) or
+                not -2 ** 63 <= value < 2 ** 63):
+            # the dtype for these can depend on which values come first
+            return None
+        kind = 'negint' if value < 0 else 'int'
+    elif isinstance(value, (float, np.floating)):
+        kind = 'nan' if value != value else 'float'
+    else:
+        return None
+    if isinstance(value, np.generic) and type(value) is not np.float64:
+        return (type(value), kind)
+    return kind
+
+
+def _representative(kind):
+    if isinstance(kind, tuple):
+        scalarType, kind = kind
+        return scalarType(_representatives[kind])
+    return _representatives[kind]
+
+
+def _valueKinds(values):
+    """Set of the kinds of the values in an object array, or None if any is
+    of another kind.
+    """
+    kinds = set(map(_valueKind, values))
+    if None in kinds:
+        return None
+    return kinds
+
+
+def _kindsDtype(kinds):
+    """dtype pandas infers for a column with values of the given kinds.
+    """
+    kinds = frozenset(kinds)
+    if kinds not in _dtypes:
+        values = np.empty((len(kinds), 1), dtype=object)
+        values[:, 0] = [_representative(kind) for kind in sorted(kinds, key=str)]
+        frame = _inferFrame(values, [0], pd.RangeIndex(len(kinds)))
+        _dtypes[kinds] = frame[0].dtype
+    return _dtypes[kinds]
+
+
+def _asDtype(values, dtype):
+    """Convert values (an object array, NaN where missing) to an array of the
+    given dtype, as pandas does when it infers that dtype for them.
+    """
+    if dtype == object:
+        return values
+    if isinstance(dtype, np.dtype):
+        return values.astype(dtype)
+    return pd.array(values, dtype=dtype)
+
+
+def _concatArrays(first, second):
+    if isinstance(first, np.ndarray):
+        return np.concatenate([first, second])
+    return type(first)._concat_same_type([first, second])
+
+
+def _inferArray(values, name):
+    """Array of the values (an object array) with the dtype pandas infers for
+    them, however they're converted.
+    """
+    frame = _inferFrame(
+        values[:, np.newaxis], [name], pd.RangeIndex(len(values)))
+    array = frame[name].array
+    if isinstance(array, pd.arrays.NumpyExtensionArray):
+        array = array.to_numpy()
+    return array
+
+
+def _inferFrame(values, names, index):
+    """DataFrame of a 2D object array (rows x columns), with the dtype of each
+    column inferred from its values as pandas does for a list of dicts (where
+    missing values are NaN).
+    """
+    if not len(index):
+        return pd.DataFrame(index=index, columns=names)
+    # a list of lists goes through the same dtype inference as a list of dicts
+    return pd.DataFrame(values.tolist(), columns=names, index=index)
+
+
+class _Column:
+    """A single column of values, stored as given in a numpy object buffer
+    which grows as needed, with a mask of the rows which have a value.
+    """
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=object)
+        self.valid = np.zeros(0, dtype=bool)
+        # running totals of the numeric values
+        self.count = 0
+        self.total = 0.0
+
+    def _reserve(self, n):
+        """Make sure the buffers can hold at least n rows.
+        """
+        if n <= len(self.values):
+            return
+        size = max(n, 2 * len(self.values), 16)
+        values = np.empty(size, dtype=object)
+        values[:len(self.values)] = self.values
+        valid = np.zeros(size, dtype=bool)
+        valid[:len(self.valid)] = self.valid
+        self.values, self.valid = values, valid
+
+    def _isNumeric(self, value):
+        return (_kindOf(value) != 'object' and
+                not (isinstance(value, float) and np.isnan(value)))
+
+    def set(self, row, value):
+        self._reserve(row + 1)
+        self.unset(row)
+        self.values[row] = value
+        self.valid[row] = True
+        if self._isNumeric(value):
+            self.count += 1
+            self.total += float(value)
+
+    def unset(self, row):
+        if row >= len(self.valid) or not self.valid[row]:
+            return
+        value = self.values[row]
+        if self._isNumeric(value):
+            self.count -= 1
+            self.total -= float(value)
+        self.valid[row] = False
+        self.values[row] = None  # don't keep a reference
+
+    def get(self, start, stop):
+        """Values for rows `start` to `stop`, as an object array with NaN in
+        place of missing values.
+        """
+        self._reserve(stop)
+        values = self.values[start:stop].copy()
+        values[~self.valid[start:stop]] = np.nan
+        return values
+
+    def anyValid(self, start, stop):
+        return self.valid[start:stop].any()
+
+
+class _FrameColumns:
+    """Columns of the DataFrame of the first `nRows` rows of a DataColumns,
+    with the kinds of value in each, so that rows can be added without
+    converting every row again.
+    """
+
+    def __init__(self):
+        self.nRows = 0
+        self.names = []  # in the order pandas gives the columns
+        self.arrays = {}
+        self.kinds = {}  # set of value kinds by name, or None if unknown
+        self.frame = None
+
+    def extended(self, stop, newValues, newKeys, getValues):
+        """Columns with rows added up to `stop`.
+
+        Parameters
+        ----------
+        stop : int
+            Number of rows once they're added.
+        newValues : dict
+            Values of the added rows (object arrays, NaN where missing) of
+            each column they have.
+        newKeys : list of tuple
+            Names in each added row, in order.
+        getValues : callable
+            Gives all the values of a column (as an object array), for when
+            it has to be converted from the first row.
+        """
+        extended = _FrameColumns()
+        extended.nRows = stop
+        extended.names = list(self.names)
+        # new columns go after the others, in the order they first appear
+        seen = set(self.names)
+        for keys in newKeys:
+            for name in keys:
+                if name not in seen:
+                    seen.add(name)
+                    extended.names.append(name)
+        nNew = stop - self.nRows
+        for name in extended.names:
+            values = newValues.get(name)
+            if values is None:
+                values = np.full(nNew, np.nan, dtype=object)
+            if name in self.kinds:
+                oldKinds = self.kinds[name]
+            else:
+                oldKinds = {'nan'} if self.nRows else set()
+            newKinds = _valueKinds(values)
+            if oldKinds is None or newKinds is None:
+                # dtype may depend on the values, so infer it from all of them
+                extended.kinds[name] = None
+                extended.arrays[name] = _inferArray(getValues(name), name)
+                continue
+            kinds = oldKinds | newKinds
+            dtype = _kindsDtype(kinds)
+            old = self.arrays.get(name)
+            if old is not None and old.dtype == dtype:
+                array = _concatArrays(old, _asDtype(values, dtype))
+            else:
+                array = _asDtype(getValues(name), dtype)
+            extended.kinds[name] = kinds
+            extended.arrays[name] = array
+        if stop:
+            extended.frame = pd.DataFrame(
+                {name: extended.arrays[name] for name in extended.names},
+                index=pd.RangeIndex(stop), copy=False)
+            if not extended.names:
+                # as pandas makes from rows with no values
+                extended.frame.columns = pd.Index([])
+        else:
+            # as pandas makes from an empty list
+            extended.frame = pd.DataFrame([])
+        return extended
+
+
+class DataColumns:
+    """Rows of data (dicts) stored column-wise, with running summaries and
+    an incrementally built DataFrame.
+
+    Examples
+    --------
+    Check accuracy on each trial without rebuilding a DataFrame::
+
+        store = DataColumns()
+        for corr in [1, 0, 1, 1]:
+            store.appendRow({'corr': corr})
+        store.mean('corr')  # 0.75
+    """
+
+    def __init__(self, rows=None):
+        self._columns = {}
+        self._nRows = 0
+        # names in each row, in order, to order the columns as pandas would
+        self._rowKeys = []
+        # DataFrame of the first rows, by column
+        self._frame = _FrameColumns()
+        for row in rows or []:
+            self.appendRow(row)
+
+    def __len__(self):
+        return self._nRows
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __eq__(self, other):
+        if not isinstance(other, DataColumns):
+            return False
+        return self.getDataFrame().equals(other.getDataFrame())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __getstate__(self):
+        # the cached DataFrame can be rebuilt, so don't copy or pickle it
+        state = self.__dict__.copy()
+        state['_frame'] = _FrameColumns()
+        return state
+
+    @property
+    def names(self):
+        """Names of the columns, in the order they were first added.
+        """
+        return list(self._columns)
+
+    def _invalidate(self, row):
+        """Forget the cached DataFrame if it includes `row`. It's rebuilt from
+        scratch (rather than truncated) as the dtypes of the remaining rows
+        may differ.
+        """
+        if row < self._frame.nRows:
+            self._frame = _FrameColumns()
+
+    def appendRow(self, row):
+        """Add a row (dict of values by column name) to the end.
+        """
+        rowN = self._nRows
+        for name, value in row.items():
+            if name not in self._columns:
+                self._columns[name] = _Column()
+            self._columns[name].set(rowN, value)
+        self._rowKeys.append(tuple(row))
+        self._nRows += 1
+
+    def popRow(self):
+        """Remove the last row.
+        """
+        if not self._nRows:
+            raise IndexError("pop from empty DataColumns")
+        self._nRows -= 1
+        self._rowKeys.pop()
+        self._invalidate(self._nRows)
+        for name, column in list(self._columns.items()):
+            column.unset(self._nRows)
+            if not column.anyValid(0, self._nRows):
+                # as if the column had never been added
+                del self._columns[name]
+
+    def setValue(self, row, name, value):
+        """Set the value of one column in a row which has been added already.
+        """
+        row = self._checkRow(row)
+        if name not in self._columns:
+            self._columns[name] = _Column()
+        self._columns[name].set(row, value)
+        if name not in self._rowKeys[row]:
+            self._rowKeys[row] += (name,)
+        self._invalidate(row)
+
+    def setRow(self, row, values):
+        """Replace the values of a row which has been added already (e.g.
+        after the dict it was copied from has been changed).
+        """
+        row = self._checkRow(row)
+        for name, column in list(self._columns.items()):
+            if name not in values:
+                column.unset(row)
+                if not column.anyValid(0, self._nRows):
+                    del self._columns[name]
+        for name, value in values.items():
+            if name not in self._columns:
+                self._columns[name] = _Column()
+            self._columns[name].set(row, value)
+        self._rowKeys[row] = tuple(values)
+        self._invalidate(row)
+
+    def _checkRow(self, row):
+        if row < 0:
+            row += self._nRows
+        if not 0 <= row < self._nRows:
+            raise IndexError("row %i out of range" % row)
+        return row
+
+    def clear(self):
+        self.__init__()
+
+    def getColumn(self, name):
+        """All values of a column as a numpy array, with the dtype pandas
+        would give it (missing values are NaN).
+        """
+        values = self._columns[name].get(0, self._nRows)
+        frame = _inferFrame(
+            values[:, np.newaxis], [name], pd.RangeIndex(self._nRows))
+        return frame[name].to_numpy()
+
+    def count(self, name):
+        """Number of numeric (including bool) values in a column.
+        """
+        if name not in self._columns:
+            return 0
+        return self._columns[name].count
+
+    def sum(self, name):
+        """Sum of the numeric (including bool) values in a column.
+        """
+        if name not in self._columns:
+            return 0.0
+        return self._columns[name].total
+
+    def mean(self, name):
+        """Mean of the numeric (including bool) values in a column, or NaN if
+        there are none.
+        """
+        count = self.count(name)
+        if not count:
+            return np.nan
+        return self.sum(name) / count
+
+    def getDataFrame(self, extraRows=None):
+        """Get the data as a pandas DataFrame, which can be safely modified.
+
+        Only rows added since the DataFrame was last requested are converted.
+        With copy-on-write (always on from pandas 3) the DataFrame shares its
+        data with the cached one until either is changed, otherwise it's a
+        copy.
+
+        Parameters
+        ----------
+        extraRows : list of dict or None
+            Rows to include at the end of the DataFrame without storing them
+            (e.g. a row which is still being filled in).
+        """
+        frame = self._frame
+        if frame.nRows < self._nRows or frame.frame is None:
+            start, stop = frame.nRows, self._nRows
+            newValues = {
+                name: column.get(start, stop)
+                for name, column in self._columns.items()
+                if column.anyValid(start, stop)}
+            frame = self._frame = frame.extended(
+                stop, newValues, self._rowKeys[start:stop],
+                lambda name: self._columns[name].get(0, stop))
+        if extraRows:
+            extraRows = list(extraRows)
+            nRows = self._nRows
+            stop = nRows + len(extraRows)
+            extraKeys = [tuple(row) for row in extraRows]
+            newValues = {}
+            for keys in extraKeys:
+                for name in keys:
+                    if name not in newValues:
+                        values = np.empty(len(extraRows), dtype=object)
+                        for i, row in enumerate(extraRows):
+                            values[i] = row.get(name, np.nan)
+                        newValues[name] = values
+
+            def _getValues(name):
+                values = np.empty(stop, dtype=object)
+                values[:nRows] = (self._columns[name].get(0, nRows)
+                                  if name in self._columns else np.nan)
+                values[nRows:] = newValues.get(name, np.nan)
+                return values
+
+            return frame.extended(stop, newValues, extraKeys, _getValues).frame
+        return frame.frame.copy(deep=not _copyOnWrite())
@@ -53,11 +53,12 @@ class Counterbalancer:
         self.params = {}
         # store total nReps
         self.nReps = nReps
-        # make sure entry exists
-        if self.entry not in self.shelf.data:
-            self.makeNewEntry()
-        # get remaining reps
-        self.reps = self.shelf.data[self.entry].get("_reps", nReps)
+        # make sure entry exists (and isn't created by anyone else in the meantime)
+        with self.shelf.data.transaction():
+            if self.entry not in self.shelf.data:
+                self.makeNewEntry()
+            # get remaining reps
+            self.reps = self.shelf.data[self.entry].get("_reps", nReps)
         # update data for remaining in conditions
         self.updateRemaining()
 
@@ -161,7 +162,16 @@ class Counterbalancer:
         str
             Name of the chosen group.
         """
+        # check and claim slots in one go, so another session can't claim the same slot (if the Shelf supports it)
+        with self.shelf.data.transaction():
+            if self.entry not in self.shelf.data:
+                self.makeNewEntry()
+            # another session may have used up a repetition since we last looked
+            self.__dict__['reps'] = self.shelf.data[self.entry].get("_reps", self.nReps)
+
+            return self._allocateGroup()
 
+    def _allocateGroup(self):
         if self.finished:
             # log warning
             msg = (f"All groups in shelf entry '{self.entry}' are now finished, with no "
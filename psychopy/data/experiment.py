@@ -15,6 +15,60 @@ from psychopy.tools.filetools import (openOutputFile, genDelimiter,
 from psychopy.localization import _translate
 from .utils import checkValidFilePath
 from .base import _ComparisonMixin
+from .columns import DataColumns
+
+
+class _Entry(dict):
+    """An entry of an ExperimentHandler. Once it has ended, changes to it are
+    copied to its row of the handler's `.dataColumns`, so that `.data` stays
+    up to date. It's copied and pickled as a plain dict.
+    """
+    # handler and row of its entries this entry was added as when it ended
+    _exp = None
+    _dataRow = None
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def _updateDataRow(self):
+        exp = self._exp
+        if exp is None:
+            return
+        row = self._dataRow
+        if row >= len(exp.entries) or exp.entries[row] is not self:
+            return
+        exp._getDataColumns().setRow(row, self)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._updateDataRow()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._updateDataRow()
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._updateDataRow()
+
+    def setdefault(self, key, default=None):
+        value = dict.setdefault(self, key, default)
+        self._updateDataRow()
+        return value
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self._updateDataRow()
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self._updateDataRow()
+        return item
+
+    def clear(self):
+        dict.clear(self)
+        self._updateDataRow()
 
 
 class ExperimentHandler(_ComparisonMixin):
@@ -98,8 +152,10 @@ class ExperimentHandler(_ComparisonMixin):
         self.saveWideText = saveWideText
         self.dataFileName = handleFileCollision(dataFileName, "rename")
         self.sortColumns = sortColumns
-        self.thisEntry = {}
+        self.thisEntry = _Entry()
         self.entries = []  # chronological list of entries
+        self.dataColumns = DataColumns()  # column-wise copy of entries
+        self._dataEntries = []  # entries copied to dataColumns
         self._paramNamesSoFar = []
         self.dataNames = ['thisRow.t', 'notes']  # names of all the data (eg. resp.keys)
         self.columnPriority = {
@@ -306,6 +362,9 @@ class ExperimentHandler(_ComparisonMixin):
                 ).format(row, len(self.entries)))
             # get entry from row
             entry = self.entries[row]
+            if not isinstance(entry, _Entry):
+                # (an _Entry updates dataColumns itself when changed)
+                self._getDataColumns().setValue(row, name, value)
         entry[name] = value
 
         # set priority if given
@@ -682,9 +741,14 @@ class ExperimentHandler(_ComparisonMixin):
         # add the extraInfo dict to the data
         if type(self.extraInfo) == dict:
             this.update(self.extraInfo)
+        self._getDataColumns().appendRow(this)
         self.entries.append(this)
+        self._dataEntries.append(this)
+        if isinstance(this, _Entry):
+            this._exp = self
+            this._dataRow = len(self.entries) - 1
         # add new entry with its
-        self.thisEntry = {}
+        self.thisEntry = _Entry()
 
     def updateEntryFromLoop(self, thisLoop):
         """
@@ -704,6 +768,43 @@ class ExperimentHandler(_ComparisonMixin):
             if name not in self.dataNames:
                 self.dataNames.append(name)
 
+    def _getDataColumns(self):
+        """Get `.dataColumns`, rebuilding it if it's out of step with
+        `.entries` (e.g. if loaded from an older psydat file or if entries
+        were added to, removed from or replaced in `.entries` directly).
+        """
+        dataColumns = getattr(self, 'dataColumns', None)
+        dataEntries = getattr(self, '_dataEntries', None)
+        # (entries which are the same objects are compared by identity)
+        if (dataColumns is None or dataEntries is None or
+                len(dataColumns) != len(self.entries) or
+                dataEntries != self.entries):
+            self.dataColumns = DataColumns(self.entries)
+            self._dataEntries = list(self.entries)
+            for row, entry in enumerate(self.entries):
+                if isinstance(entry, _Entry):
+                    entry._exp = self
+                    entry._dataRow = row
+        return self.dataColumns
+
+    @property
+    def data(self):
+        """Returns a pandas DataFrame of all the entries so far, including the
+        current entry (if it has any data).
+
+        The DataFrame is built from `.dataColumns`, a column-wise copy of
+        the entries, so only entries added since it was last accessed need
+        converting. For running summaries use `.dataColumns` directly, e.g.
+        ``exp.dataColumns.mean('key_resp.corr')``.
+
+        Entries ended by `nextEntry()` update `.dataColumns` when they're
+        changed, as do changes made with `addData(row=...)`. Entries added
+        to `.entries` directly are copied the next time the data are
+        requested, but later changes to them in place aren't seen.
+        """
+        extraRows = [self.thisEntry] if self.thisEntry else None
+        return self._getDataColumns().getDataFrame(extraRows=extraRows)
+
     def getAllEntries(self):
         """Fetches a copy of all the entries including a final (orphan) entry
         if that exists. This allows entries to be saved even if nextEntry() is
@@ -1018,8 +1119,9 @@ class ExperimentHandler(_ComparisonMixin):
         """
         # get columns which meet threshold
         cols = [col for col in self.dataNames if self.getPriority(col) >= priorityThreshold]
-        # convert just relevant entries to a DataFrame
-        trials = pd.DataFrame(self.entries, columns=cols).fillna(value="")
+        # get just relevant columns of the entries as a DataFrame
+        trials = self._getDataColumns().getDataFrame().reindex(
+            columns=cols).fillna(value="")
         # put in context
         context = {
             'type': "trials_data",
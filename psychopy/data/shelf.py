@@ -1,7 +1,11 @@
+import contextlib
 import json
 import os
+import sqlite3
+import threading
 import numpy as np
 from pathlib import Path
+from psychopy import logging
 from psychopy.preferences import prefs
 
 
@@ -22,6 +26,13 @@ class Shelf:
         Path to the experiment folder, if scope is "experiment". Can also accept a path to the experiment file.
     participant : str
         Participant ID, if scope is "participant".
+    backend : str
+        How the Shelf is stored, one of:
+        - "json": As a JSON file (`shelf.json`), which is read and rewritten whenever the Shelf is accessed. Simple
+          to inspect and edit, but changes made by experiments running at the same time can be lost.
+        - "sqlite": As an SQLite database (`shelf.db`), in which each entry can be read or changed without reading
+          the rest, and counterbalancing is safe when several experiments run at the same time. If there's already
+          a JSON file for this scope, its entries are copied into the database the first time it's opened.
     """
 
     # other names which scopes can be referred to as
@@ -31,7 +42,13 @@ class Shelf:
         'participant': ["participant", "p", "par", "subject"]
     }
 
-    def __init__(self, scope="experiment", expPath=None, participant=None):
+    # file extension for each backend
+    backendExts = {
+        'json': ".json",
+        'sqlite': ".db",
+    }
+
+    def __init__(self, scope="experiment", expPath=None, participant=None, backend="json"):
         # handle scope aliases
         scope = self.scopeFromAlias(scope)
 
@@ -43,10 +60,16 @@ class Shelf:
             if not expPath.is_dir():
                 expPath = expPath.parent
 
-        # work out path of scope file from scope and params
+        if backend not in self.backendExts:
+            raise ValueError(
+                f"Unknown Shelf backend '{backend}', should be one of: {', '.join(self.backendExts)}"
+            )
+        self.backend = backend
+
+        # work out folder and name of scope file from scope and params
         if scope == "designer":
             # access shelf from user folder
-            self.path = Path(prefs.paths['userPrefsDir']) / "shelf.json"
+            folder, name = Path(prefs.paths['userPrefsDir']), "shelf"
         elif scope in "experiment":
             # make sure we have the information we need to get scope file
             assert expPath is not None, (
@@ -54,7 +77,7 @@ class Shelf:
                 "supply a value for 'expPath' when creating an experiment-scope Shelf object."
             )
             # access shelf from experiment folder
-            self.path = expPath / "shelf.json"
+            folder, name = expPath, "shelf"
         elif scope in "participant":
             # make sure we have the information we need to get scope file
             assert participant is not None, (
@@ -62,10 +85,14 @@ class Shelf:
                 "supply a value for 'participant' when creating a participant-scope Shelf object."
             )
             # access shelf from a participant shelf file in the user folder
-            self.path = Path(prefs.paths['userPrefsDir']) / "shelf" / f"{participant}.json"
+            folder, name = Path(prefs.paths['userPrefsDir']) / "shelf", str(participant)
+        self.path = folder / f"{name}{self.backendExts[backend]}"
 
         # open file(s)
-        self.data = ShelfData(self.path)
+        if backend == "sqlite":
+            self.data = SQLiteShelfData(self.path, migrateFrom=folder / f"{name}.json")
+        else:
+            self.data = ShelfData(self.path)
 
     @staticmethod
     def scopeFromAlias(alias):
@@ -110,6 +137,11 @@ class Shelf:
         bool
             True if the given group is now at 0, False otherwise
         """
+        # read, choose and write back in one go, so no one else can take the same slot
+        with self.data.transaction():
+            return self._counterBalanceSelect(key, groups, groupSizes)
+
+    def _counterBalanceSelect(self, key, groups, groupSizes):
         # get entry
         try:
             entry = self.data[key]
@@ -235,3 +267,230 @@ class ShelfData:
         data[key] = value
         # write data to file
         self.write(data)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Context in which to read and then change data. For compatibility with SQLiteShelfData only - JSON files
+        can't be locked, so changes made by other processes in the meantime may still be overwritten.
+        """
+        yield self
+
+
+class SQLiteShelfData:
+    """
+    Dict-like object representing the data on a Shelf, stored in an SQLite database. Each entry is stored (as JSON)
+    in its own row, so it can be read or changed without reading the rest of the Shelf, and changes made within a
+    `transaction()` happen all at once, even if other processes are using the same Shelf.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the database file which this SQLiteShelfData corresponds to.
+    migrateFrom : str, Path or None
+        Path to a JSON shelf file whose entries should be copied into the database, if the database is new.
+    journalMode : str
+        SQLite journal mode. "WAL" (the default) lets experiments read the Shelf while another is writing to it, but
+        needs all processes using the Shelf to be on the same computer - for a Shelf on a network drive, use
+        "DELETE".
+    timeout : float
+        How long (s) to wait for another process to finish changing the Shelf before giving up.
+    """
+    def __init__(self, path, migrateFrom=None, journalMode="WAL", timeout=30):
+        path = Path(path)
+        # make sure folder exists
+        if not path.parent.is_dir():
+            os.makedirs(str(path.parent), exist_ok=True)
+        self._path = path
+        self.journalMode = journalMode
+        self.timeout = timeout
+        # connections can't be shared between processes, so note which process this one belongs to
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._depth = 0
+        # create table
+        with self.transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS shelf (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            migrated = conn.execute("SELECT value FROM meta WHERE key = 'migratedFrom'").fetchone()
+            if migrateFrom is not None and migrated is None:
+                self._migrate(conn, Path(migrateFrom))
+
+    @property
+    def connection(self):
+        """
+        Connection to the database, for this process.
+        """
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                str(self._path), timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute(f"PRAGMA journal_mode={self.journalMode}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn, self._pid = conn, os.getpid()
+
+        return self._conn
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Context in which data can be read and then changed without any other process changing it in the meantime.
+        Transactions can be nested, in which case changes are saved at the end of the outermost one (and discarded
+        if it raises an error).
+
+        Examples
+        --------
+        Add 1 to an entry without losing any additions made at the same time::
+
+            with shelf.data.transaction():
+                shelf.data['count'] = shelf.data.get('count', 0) + 1
+        """
+        with self._lock:
+            conn = self.connection
+            if self._depth == 0:
+                # take the write lock now, so no one can change what we read before we write it
+                conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield conn
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                conn.execute("COMMIT")
+
+    @staticmethod
+    def _key(key):
+        """
+        Key as it would be stored in JSON (e.g. 1 -> "1"), so it's the same as for ShelfData.
+        """
+        if isinstance(key, str):
+            return key
+        return next(iter(json.loads(json.dumps({key: None}))))
+
+    def _migrate(self, conn, jsonPath):
+        """
+        Copy the entries from a JSON shelf file into the database, unless there are entries already.
+        """
+        if not jsonPath.is_file():
+            return
+        if conn.execute("SELECT 1 FROM shelf LIMIT 1").fetchone() is None:
+            data = ShelfData(jsonPath).read()
+            conn.executemany(
+                "INSERT INTO shelf (key, value) VALUES (?, ?)",
+                [(self._key(key), json.dumps(value)) for key, value in data.items()]
+            )
+            logging.info(f"Copied {len(data)} entries from shelf file '{jsonPath}' to '{self._path}'")
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('migratedFrom', ?)", (str(jsonPath),)
+        )
+
+    def __repr__(self):
+        return repr(self.read())
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM shelf").fetchone()[0]
+
+    def __contains__(self, item):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM shelf WHERE key = ?", (self._key(item),)
+            ).fetchone()
+
+        return row is not None
+
+    def __getitem__(self, key):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value FROM shelf WHERE key = ?", (self._key(key),)
+            ).fetchone()
+        if row is None:
+            raise KeyError(key)
+
+        return json.loads(row[0])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO shelf (key, value) VALUES (?, ?)", (self._key(key), json.dumps(value))
+            )
+
+    def __delitem__(self, key):
+        with self.transaction() as conn:
+            if conn.execute("DELETE FROM shelf WHERE key = ?", (self._key(key),)).rowcount == 0:
+                raise KeyError(key)
+
+    def keys(self):
+        with self._lock:
+            return [row[0] for row in self.connection.execute("SELECT key FROM shelf")]
+
+    def read(self):
+        """
+        Get all data from the database.
+
+        Returns
+        -------
+        dict
+            All entries on the Shelf.
+        """
+        with self._lock:
+            rows = self.connection.execute("SELECT key, value FROM shelf").fetchall()
+
+        return {key: json.loads(value) for key, value in rows}
+
+    def write(self, data):
+        """
+        Replace all data in the database.
+
+        Parameters
+        ----------
+        data : dict
+            Data to write.
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM shelf")
+            conn.executemany(
+                "INSERT INTO shelf (key, value) VALUES (?, ?)",
+                [(self._key(key), json.dumps(value)) for key, value in data.items()]
+            )
+
+    def modify(self, key, func, default=None):
+        """
+        Change an entry based on its current value, without any other process changing it in the meantime.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry to change.
+        func : callable
+            Function which is given the current value of the entry (or `default` if there isn't one) and returns
+            its new value.
+        default
+            Value to give `func` if there is no entry for `key`.
+
+        Returns
+        -------
+        object
+            The new value of the entry.
+        """
+        with self.transaction():
+            value = func(self.get(key, default))
+            self[key] = value
+
+        return value
@@ -0,0 +1,872 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Batch simulation of adaptive staircases.
+
+Evaluating a staircase design (step sizes, number of reversals, priors etc.)
+means running it against many simulated observers. Rather than running a
+handler once per observer, the classes here run N simulated observers in
+lock-step, with the state of every staircase (intensities, reversals,
+posteriors) held in NumPy arrays and updated for all observers at once.
+
+Each simulation follows the same rules as the corresponding handler::
+
+    from psychopy import data
+
+    stairs = data.StairHandler(startVal=0.5, stepSizes=[8, 4, 2],
+                               nTrials=40, nUp=1, nDown=3, stepType='db')
+    observers = data.SimulatedObservers(
+        thresholds=np.random.uniform(0.05, 0.2, 5000),
+        psychometricFunc='weibull', stimScale='linear', slope=3.5,
+        guessRate=0.5, lapseRate=0.01)
+    results = data.simulateHandler(stairs, observers, seed=1, nProcesses=4)
+    print(results.bias, results.rmse)
+
+"""
+
+__all__ = [
+    "SimulatedObservers",
+    "SimulationResults",
+    "StairSimulation",
+    "QuestSimulation",
+    "PsiSimulation",
+    "QuestPlusSimulation",
+    "simulateHandler",
+]
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from psychopy.contrib.quest import QuestObject
+from psychopy.contrib.psi import PsiObject
+
+
+class SimulatedObservers:
+    """A group of simulated observers, each with their own threshold, whose
+    responses follow a psychometric function.
+
+    Parameters
+    ----------
+    thresholds : array-like of float
+        Threshold of each observer, in the same units as the intensities
+        the staircase will present.
+    psychometricFunc : str
+        Shape of the psychometric function, one of 'weibull', 'normal' or
+        'logistic'.
+    stimScale : str
+        Scale of the intensities for a Weibull function, one of 'log10', 'dB'
+        or 'linear' (as in :class:`~psychopy.data.QuestPlusHandler`). Ignored
+        for other functions, which are applied to intensities as they are.
+    slope : float or array-like of float
+        Slope of the psychometric function (beta for a Weibull, the standard
+        deviation for a cumulative normal, the scale for a logistic).
+    guessRate : float
+        Lower asymptote, e.g. 0.5 for a 2-AFC task or 0 for yes/no.
+    lapseRate : float
+        Rate of lapses, the upper asymptote is `1 - lapseRate`.
+    """
+
+    def __init__(self, thresholds, psychometricFunc='weibull',
+                 stimScale='log10', slope=3.5, guessRate=0.5, lapseRate=0.01):
+        if psychometricFunc not in ('weibull', 'normal', 'logistic'):
+            raise ValueError(
+                "Unknown psychometricFunc '%s', should be 'weibull', "
+                "'normal' or 'logistic'." % psychometricFunc)
+        if stimScale not in ('log10', 'dB', 'linear'):
+            raise ValueError(
+                "Unknown stimScale '%s', should be 'log10', 'dB' or "
+                "'linear'." % stimScale)
+        self.thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+        self.psychometricFunc = psychometricFunc
+        self.stimScale = stimScale
+        self.slope = np.broadcast_to(
+            np.asarray(slope, dtype=float), self.thresholds.shape)
+        self.guessRate = guessRate
+        self.lapseRate = lapseRate
+
+    def __len__(self):
+        return len(self.thresholds)
+
+    def pCorrect(self, intensities):
+        """Probability of each observer responding correctly (or 'yes') to
+        the given intensities (one per observer).
+        """
+        x = np.asarray(intensities, dtype=float)
+        t = self.thresholds
+        if self.psychometricFunc == 'weibull':
+            if self.stimScale == 'log10':
+                core = 1 - np.exp(-10 ** (self.slope * (x - t)))
+            elif self.stimScale == 'dB':
+                core = 1 - np.exp(-10 ** (self.slope * (x - t) / 20))
+            else:
+                core = 1 - np.exp(-(np.clip(x, 0, None) / t) ** self.slope)
+        elif self.psychometricFunc == 'normal':
+            from scipy.special import ndtr
+            core = ndtr((x - t) / self.slope)
+        else:
+            core = 1 / (1 + np.exp(-(x - t) / self.slope))
+        return self.guessRate + (1 - self.guessRate - self.lapseRate) * core
+
+    def respond(self, intensities, rng):
+        """Simulate a response (1 or 0) from each observer to the given
+        intensities, using the numpy random Generator `rng`.
+        """
+        p = self.pCorrect(intensities)
+        return (rng.random(len(p)) < p).astype(int)
+
+    def split(self, n):
+        """Split these observers into (at most) `n` roughly equal groups.
+        """
+        groups = []
+        for indices in np.array_split(np.arange(len(self)), n):
+            if not len(indices):
+                continue
+            group = SimulatedObservers(
+                self.thresholds[indices],
+                psychometricFunc=self.psychometricFunc,
+                stimScale=self.stimScale,
+                slope=self.slope[indices],
+                guessRate=self.guessRate,
+                lapseRate=self.lapseRate)
+            groups.append(group)
+        return groups
+
+
+class SimulationResults:
+    """Results of a batch simulation.
+
+    Arrays with a trial dimension are shaped (nTrials, nObservers), padded
+    with NaN after each observer's staircase finished.
+
+    Attributes
+    ----------
+    thresholds : np.ndarray
+        Final threshold estimate for each observer.
+    trueThresholds : np.ndarray
+        Actual threshold of each simulated observer.
+    intensities : np.ndarray
+        Intensity presented on each trial.
+    responses : np.ndarray
+        Response (1 or 0) given on each trial.
+    estimates : np.ndarray
+        Threshold estimate after each trial, i.e. the convergence curve of
+        each staircase.
+    nTrials : np.ndarray
+        Number of trials run for each observer.
+    params : dict
+        Any other per-observer estimates (e.g. slope) by name.
+    """
+
+    def __init__(self, thresholds, trueThresholds, intensities, responses,
+                 estimates, nTrials, params=None):
+        self.thresholds = thresholds
+        self.trueThresholds = trueThresholds
+        self.intensities = intensities
+        self.responses = responses
+        self.estimates = estimates
+        self.nTrials = nTrials
+        self.params = params or {}
+
+    def __len__(self):
+        return len(self.thresholds)
+
+    @property
+    def errors(self):
+        """Error in the final threshold estimate for each observer.
+        """
+        return self.thresholds - self.trueThresholds
+
+    @property
+    def bias(self):
+        """Mean error in threshold estimates across observers.
+        """
+        return np.nanmean(self.errors)
+
+    @property
+    def rmse(self):
+        """Root mean squared error of threshold estimates across observers.
+        """
+        return np.sqrt(np.nanmean(self.errors ** 2))
+
+    def convergence(self):
+        """Root mean squared error of the threshold estimate after each
+        trial, across observers still running at that trial.
+        """
+        sqErrors = (self.estimates - self.trueThresholds[np.newaxis, :]) ** 2
+        nValid = np.sum(~np.isnan(sqErrors), axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(np.nansum(sqErrors, axis=1) / nValid)
+
+    @staticmethod
+    def concatenate(results):
+        """Combine the results of several simulations (e.g. of different
+        groups of observers) into one.
+        """
+        results = list(results)
+        nTrials = max(res.intensities.shape[0] for res in results)
+
+        def _pad(arr):
+            padded = np.full((nTrials, arr.shape[1]), np.nan)
+            padded[:arr.shape[0]] = arr
+            return padded
+
+        params = {}
+        for key in results[0].params:
+            params[key] = np.concatenate([res.params[key] for res in results])
+
+        return SimulationResults(
+            thresholds=np.concatenate([res.thresholds for res in results]),
+            trueThresholds=np.concatenate(
+                [res.trueThresholds for res in results]),
+            intensities=np.hstack([_pad(res.intensities) for res in results]),
+            responses=np.hstack([_pad(res.responses) for res in results]),
+            estimates=np.hstack([_pad(res.estimates) for res in results]),
+            nTrials=np.concatenate([res.nTrials for res in results]),
+            params=params,
+        )
+
+
+def _simulateGroup(simulation, observers, seed):
+    """Run a simulation on one group of observers (in a worker process).
+    """
+    return simulation._simulate(observers, np.random.default_rng(seed))
+
+
+class _BaseSimulation:
+    """Base class for batch simulations. Subclasses implement `_simulate`,
+    which runs every observer in lock-step and returns SimulationResults.
+    """
+
+    def __init__(self, maxTrials=1000):
+        # safety net for staircases which would otherwise never stop
+        self.maxTrials = maxTrials
+
+    def run(self, observers, seed=None, nProcesses=1):
+        """Run the simulation.
+
+        Parameters
+        ----------
+        observers : SimulatedObservers
+            Observers to simulate.
+        seed : int or None
+            Seed for the random number generator, for reproducible results.
+        nProcesses : int
+            Number of processes to split the observers across. Results for a
+            given seed are the same for a given `nProcesses`.
+
+        Returns
+        -------
+        SimulationResults
+        """
+        if nProcesses <= 1:
+            return _simulateGroup(self, observers, seed)
+        groups = observers.split(nProcesses)
+        seeds = np.random.SeedSequence(seed).spawn(len(groups))
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            results = list(pool.map(
+                _simulateGroup, itertools.repeat(self), groups, seeds))
+        return SimulationResults.concatenate(results)
+
+    @staticmethod
+    def _makeResults(observers, intensities, responses, estimates,
+                     thresholds, nTrials, params=None):
+        """Stack per-trial lists of arrays into a SimulationResults.
+        """
+        n = len(observers)
+
+        def _stack(rows):
+            if not rows:
+                return np.empty((0, n))
+            return np.vstack(rows)
+
+        return SimulationResults(
+            thresholds=thresholds,
+            trueThresholds=observers.thresholds.copy(),
+            intensities=_stack(intensities),
+            responses=_stack(responses),
+            estimates=_stack(estimates),
+            nTrials=nTrials,
+            params=params,
+        )
+
+
+class StairSimulation(_BaseSimulation):
+    """Batch simulation of :class:`~psychopy.data.StairHandler`.
+
+    Parameters are as for :class:`~psychopy.data.StairHandler`, with the
+    addition of:
+
+    nLastReversals : int or None
+        How many of the final reversals to average to estimate threshold (all
+        reversals if None).
+    maxTrials : int
+        Maximum number of trials to run for each observer.
+    """
+
+    def __init__(self, startVal, nReversals=None, stepSizes=4, nTrials=0,
+                 nUp=1, nDown=3, applyInitialRule=True, stepType='db',
+                 minVal=None, maxVal=None, nLastReversals=6, maxTrials=1000):
+        _BaseSimulation.__init__(self, maxTrials=maxTrials)
+        if stepType not in ('db', 'log', 'lin'):
+            raise ValueError("Unknown stepType '%s'" % stepType)
+        try:
+            self.stepSizes = np.array(list(stepSizes), dtype=float)
+        except TypeError:
+            self.stepSizes = np.array([stepSizes], dtype=float)
+        if nReversals is None or len(self.stepSizes) > nReversals:
+            nReversals = len(self.stepSizes)
+        self.startVal = startVal
+        self.nReversals = nReversals
+        self.nTrials = nTrials or 0
+        self.nUp = nUp
+        self.nDown = nDown
+        self.applyInitialRule = applyInitialRule
+        self.stepType = stepType
+        self.minVal = minVal
+        self.maxVal = maxVal
+        self.nLastReversals = nLastReversals
+
+    @classmethod
+    def fromHandler(cls, handler, **kwargs):
+        """Create a simulation with the same settings as a StairHandler.
+        """
+        return cls(
+            startVal=handler.startVal, nReversals=handler.nReversals,
+            stepSizes=handler.stepSizes, nTrials=handler.nTrials,
+            nUp=handler.nUp, nDown=handler.nDown,
+            applyInitialRule=handler.applyInitialRule,
+            stepType=handler.stepType, minVal=handler.minVal,
+            maxVal=handler.maxVal, **kwargs)
+
+    def _step(self, intensity, stepSize, up):
+        """Step intensities up (or down) by the current step sizes.
+        """
+        if self.stepType == 'db':
+            factor = 10.0 ** (stepSize / 20.0)
+        elif self.stepType == 'log':
+            factor = 10.0 ** stepSize
+        if up:
+            if self.stepType == 'lin':
+                intensity = intensity + stepSize
+            else:
+                intensity = intensity * factor
+            if self.maxVal is not None:
+                intensity = np.minimum(intensity, self.maxVal)
+        else:
+            if self.stepType == 'lin':
+                intensity = intensity - stepSize
+            else:
+                intensity = intensity / factor
+            if self.minVal is not None:
+                intensity = np.maximum(intensity, self.minVal)
+        return intensity
+
+    def _simulate(self, observers, rng):
+        n = len(observers)
+        START, UP, DOWN = 0, 1, -1
+        # state of every staircase
+        intensity = np.full(n, self.startVal, dtype=float)
+        direction = np.full(n, START)
+        correctCounter = np.zeros(n, dtype=int)
+        nRev = np.zeros(n, dtype=int)
+        stepSize = np.full(n, self.stepSizes[0])
+        initialRule = np.zeros(n, dtype=bool)
+        lastResp = np.full(n, -1)
+        finished = np.zeros(n, dtype=bool)
+        nDone = np.zeros(n, dtype=int)
+        # per-trial records
+        intensities, responses, reversals = [], [], []
+
+        while not finished.all() and len(intensities) < self.maxTrials:
+            active = ~finished
+            presented = intensity.copy()
+            nDone += active
+            resp = observers.respond(presented, rng)
+            # count runs of correct (+) or incorrect (-) responses
+            same = lastResp == resp
+            counter = np.where(
+                resp == 1,
+                np.where(same, correctCounter + 1, 1),
+                np.where(same, correctCounter - 1, -1))
+            # work out direction and reversals
+            initPhase = (nRev == 0) & self.applyInitialRule
+            goDown = counter >= self.nDown
+            goUp = counter <= -self.nUp
+            reversal = np.where(
+                initPhase,
+                np.where(resp == 1, direction == UP, direction == DOWN),
+                (goDown & (direction == UP)) |
+                (~goDown & goUp & (direction == DOWN)))
+            reversal &= active
+            newDirection = np.where(
+                initPhase,
+                np.where(resp == 1, DOWN, UP),
+                np.where(goDown, DOWN, np.where(goUp, UP, direction)))
+            initialRule |= reversal & initPhase
+            nRev += reversal
+            finished |= active & (nRev >= self.nReversals) & (nDone >= self.nTrials)
+            # new step size if necessary
+            if len(self.stepSizes) > 1:
+                nextStep = self.stepSizes[np.minimum(nRev, len(self.stepSizes) - 1)]
+                stepSize = np.where(reversal, nextStep, stepSize)
+            # apply new step size
+            useInitial = ((nRev == 0) | initialRule) & self.applyInitialRule
+            stepDown = active & np.where(useInitial, resp == 1, goDown)
+            stepUp = active & np.where(useInitial, resp != 1, ~goDown & goUp)
+            initialRule &= ~(active & useInitial)
+            intensity = np.where(stepDown, self._step(intensity, stepSize, up=False), intensity)
+            intensity = np.where(stepUp, self._step(intensity, stepSize, up=True), intensity)
+            correctCounter = np.where(
+                active, np.where(stepDown | stepUp, 0, counter), correctCounter)
+            direction = np.where(active, newDirection, direction)
+            lastResp = np.where(active, resp, lastResp)
+            # store
+            intensities.append(np.where(active, presented, np.nan))
+            responses.append(np.where(active, resp, np.nan))
+            reversals.append(reversal)
+
+        # estimate threshold (after every trial) as the mean of the last few
+        # reversals so far
+        if intensities:
+            allIntensities = np.vstack(intensities)
+            isReversal = np.vstack(reversals)
+            revCount = np.cumsum(isReversal, axis=0)
+            revSum = np.cumsum(np.where(isReversal, allIntensities, 0), axis=0)
+            # running sum of reversal intensities by number of reversals
+            sumAtRev = np.zeros((revCount.max() + 1, n))
+            trialN, obsN = np.nonzero(isReversal)
+            sumAtRev[revCount[trialN, obsN], obsN] = revSum[trialN, obsN]
+            nLast = self.nLastReversals or revCount.max() + 1
+            first = np.maximum(revCount - nLast, 0)
+            cols = np.arange(n)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                running = ((sumAtRev[revCount, cols] - sumAtRev[first, cols]) /
+                           (revCount - first))
+            running[np.isnan(allIntensities)] = np.nan
+            estimates = list(running)
+            thresholds = running[nDone - 1, cols]
+        else:
+            thresholds = np.full(n, np.nan)
+            estimates = []
+
+        return self._makeResults(
+            observers, intensities, responses, estimates, thresholds, nDone)
+
+
+class QuestSimulation(_BaseSimulation):
+    """Batch simulation of :class:`~psychopy.data.QuestHandler`.
+
+    Parameters are as for :class:`~psychopy.data.QuestHandler`, with the
+    addition of:
+
+    estimateMethod : str
+        How to get the final threshold estimate from the posterior, one of
+        'mean', 'mode' or 'quantile' (median).
+    maxTrials : int
+        Maximum number of trials to run for each observer.
+    """
+
+    def __init__(self, startVal, startValSd, pThreshold=0.82, nTrials=None,
+                 stopInterval=None, method='quantile', beta=3.5, delta=0.01,
+                 gamma=0.5, grain=0.01, range=None, minVal=None, maxVal=None,
+                 estimateMethod='mean', maxTrials=1000):
+        _BaseSimulation.__init__(self, maxTrials=maxTrials)
+        if method not in ('mean', 'mode', 'quantile'):
+            raise TypeError(
+                f"Requested method for QUEST: {method} is not a valid method. "
+                f"Please use mean, mode or quantile")
+        self.startVal = startVal
+        self.nTrials = nTrials
+        self.stopInterval = stopInterval
+        self.method = method
+        self.minVal = minVal
+        self.maxVal = maxVal
+        self.estimateMethod = estimateMethod
+        # a single QuestObject supplies the tables shared by every observer
+        self._quest = QuestObject(
+            startVal, startValSd, pThreshold, beta, delta, gamma,
+            grain=grain, range=range)
+
+    @classmethod
+    def fromHandler(cls, handler, **kwargs):
+        """Create a simulation with the same settings as a QuestHandler.
+        """
+        return cls(
+            startVal=handler.startVal, startValSd=handler.startValSd,
+            pThreshold=handler.pThreshold, nTrials=handler.nTrials,
+            stopInterval=handler.stopInterval, method=handler.method,
+            beta=handler.beta, delta=handler.delta, gamma=handler.gamma,
+            grain=handler.grain, range=handler.range, minVal=handler.minVal,
+            maxVal=handler.maxVal, **kwargs)
+
+    def _mean(self, pdf):
+        q = self._quest
+        return q.tGuess + pdf @ q.x / pdf.sum(axis=1)
+
+    def _mode(self, pdf):
+        q = self._quest
+        # last of any tied maxima, as QuestObject.mode
+        iMode = pdf.shape[1] - 1 - np.argmax(pdf[:, ::-1], axis=1)
+        return q.x[iMode] + q.tGuess
+
+    def _quantile(self, pdf, quantileOrder=None):
+        """Vectorised equivalent of QuestObject.quantile.
+        """
+        q = self._quest
+        if quantileOrder is None:
+            quantileOrder = q.quantileOrder
+        p = np.cumsum(pdf, axis=1)
+        target = quantileOrder * p[:, -1]
+        rows = np.arange(len(pdf))
+        cols = np.arange(pdf.shape[1])
+        # interpolation is only over points where the cdf increases
+        increases = pdf != 0
+        lastIncrease = np.maximum.accumulate(
+            np.where(increases, cols, -1), axis=1)
+        # first increasing point at or above the target
+        above = increases & (p >= target[:, np.newaxis])
+        hi = np.where(above.any(axis=1), np.argmax(above, axis=1), lastIncrease[:, -1])
+        lo = lastIncrease[rows, np.maximum(hi - 1, 0)]
+        lo = np.where((hi > 0) & (lo >= 0), lo, hi)
+        pLo, pHi = p[rows, lo], p[rows, hi]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frac = np.where(pHi > pLo, (target - pLo) / (pHi - pLo), 0)
+        frac = np.clip(frac, 0, 1)
+        return q.tGuess + q.x[lo] + frac * (q.x[hi] - q.x[lo])
+
+    def _estimate(self, pdf, method):
+        if method == 'mean':
+            return self._mean(pdf)
+        elif method == 'mode':
+            return self._mode(pdf)
+        else:
+            return self._quantile(pdf, 0.5 if method == 'median' else None)
+
+    def _clamp(self, intensity):
+        if self.maxVal is not None:
+            intensity = np.where(intensity > self.maxVal, self.maxVal, intensity)
+        if self.minVal is not None:
+            intensity = np.where(intensity < self.minVal, self.minVal, intensity)
+        return intensity
+
+    def _simulate(self, observers, rng):
+        q = self._quest
+        n = len(observers)
+        pdf = np.tile(q.pdf, (n, 1))
+        nBins = pdf.shape[1]
+        intensity = np.full(n, self.startVal, dtype=float)
+        finished = np.zeros(n, dtype=bool)
+        nDone = np.zeros(n, dtype=int)
+        intensities, responses, estimates = [], [], []
+        finalMethod = {'quantile': 'median'}.get(self.estimateMethod,
+                                                 self.estimateMethod)
+
+        while not finished.all() and len(intensities) < self.maxTrials:
+            active = ~finished
+            nDone += active
+            resp = observers.respond(intensity, rng)
+            # update each posterior (as QuestObject.update)
+            inten = np.clip(intensity, -1e10, 1e10)
+            first = nBins - 1 + q.i[0] - np.round((inten - q.tGuess) / q.grain)
+            first = np.where(first < 0, 0, first)
+            last = first + len(q.i) - 1
+            first = np.where(last >= q.s2.shape[1], first + q.s2.shape[1] - last - 1, first)
+            cols = first.astype(int)[:, np.newaxis] + np.arange(len(q.i))
+            likelihood = q.s2[resp[:, np.newaxis], cols]
+            pdf = np.where(active[:, np.newaxis], pdf * likelihood, pdf)
+            # store
+            intensities.append(np.where(active, intensity, np.nan))
+            responses.append(np.where(active, resp, np.nan))
+            estimates.append(np.where(active, self._estimate(pdf, finalMethod), np.nan))
+            # check whether finished
+            done = np.zeros(n, dtype=bool)
+            if self.nTrials is not None:
+                done |= nDone >= self.nTrials
+            if self.stopInterval is not None:
+                interval = np.abs(self._quantile(pdf, 0.05) - self._quantile(pdf, 0.95))
+                done |= interval < self.stopInterval
+            finished |= active & done
+            # next intensity
+            intensity = np.where(
+                active & ~finished,
+                self._clamp(self._estimate(pdf, self.method)),
+                intensity)
+
+        return self._makeResults(
+            observers, intensities, responses, estimates,
+            self._estimate(pdf, finalMethod), nDone)
+
+
+def _gridNextIndex(posterior, likelihood):
+    """Index of the intensity which minimises the expected entropy of the
+    posterior, for each row of `posterior`.
+
+    Parameters
+    ----------
+    posterior : np.ndarray
+        Posterior over parameter combinations, shape (nObservers, nParams).
+    likelihood : np.ndarray
+        Probability of each response given the parameters and intensity,
+        shape (nResponses, nParams, nIntensities).
+
+    Notes
+    -----
+    The expected entropy over responses `r` at intensity `x` is
+    ``sum_r P(r|x) log P(r|x) - sum_r sum_p q log q`` where
+    ``q = P(p) P(r|p,x)``, which needs only matrix products of the posterior
+    rather than the full (observer, response, param, intensity) array.
+    """
+    nResp, nParams, nX = likelihood.shape
+    lik = likelihood.transpose(1, 0, 2).reshape(nParams, nResp * nX)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logPost = np.where(posterior > 0, np.log(posterior), 0)
+        logLik = np.where(lik > 0, np.log(lik), 0)
+        pRespX = posterior @ lik
+        qLogQ = (posterior * logPost) @ lik + posterior @ (lik * logLik)
+        pLogP = np.where(pRespX > 0, pRespX * np.log(pRespX), 0)
+    expectedEntropy = (pLogP - qLogQ).reshape(len(posterior), nResp, nX).sum(axis=1)
+    return np.argmin(expectedEntropy, axis=1)
+
+
+def _gridUpdate(posterior, likelihood, resp, xIndex, active):
+    """Update each observer's posterior given their response at the intensity
+    they were shown.
+    """
+    updated = posterior * likelihood[resp, :, xIndex]
+    updated /= updated.sum(axis=1, keepdims=True)
+    return np.where(active[:, np.newaxis], updated, posterior)
+
+
+class PsiSimulation(_BaseSimulation):
+    """Batch simulation of :class:`~psychopy.data.PsiHandler`.
+
+    Parameters are as for :class:`~psychopy.data.PsiHandler`. Threshold
+    estimates are the estimated location (alpha), the estimated slope (beta)
+    is stored in `params['slope']` of the results.
+    """
+
+    def __init__(self, nTrials, intensRange, alphaRange, betaRange,
+                 intensPrecision, alphaPrecision, betaPrecision, delta,
+                 stepType='lin', expectedMin=0.5, prior=None):
+        _BaseSimulation.__init__(self, maxTrials=nTrials)
+        if expectedMin not in [0, 0.5]:
+            raise NotImplementedError(
+                'Currently, only Yes/No and 2-AFC designs are '
+                'supported. Please specify either `expectedMin=0` '
+                '(Yes/No) or `expectedMin=0.5` (2-AFC).')
+        self.nTrials = nTrials
+        # a single PsiObject supplies the grids shared by every observer
+        self._psi = PsiObject(
+            intensRange, alphaRange, betaRange, intensPrecision,
+            alphaPrecision, betaPrecision, delta=delta, stepType=stepType,
+            TwoAFC=expectedMin == 0.5, prior=prior)
+
+    @classmethod
+    def fromHandler(cls, handler, nTrials=None, maxTrials=None):
+        """Create a simulation with the same settings (and current posterior
+        as the prior) as a PsiHandler.
+
+        The other settings come from the handler's grids, so only the number
+        of trials can be changed: `nTrials` (default is the handler's), or
+        `maxTrials` to run at most that many.
+        """
+        if nTrials is None:
+            nTrials = handler.nTrials
+        if maxTrials is not None:
+            nTrials = min(nTrials, maxTrials)
+        handler._waitForUpdate()
+        psi = handler._psi
+        sim = cls.__new__(cls)
+        _BaseSimulation.__init__(sim, maxTrials=nTrials)
+        sim.nTrials = nTrials
+        sim._psi = psi
+        return sim
+
+    def _simulate(self, observers, rng):
+        psi = self._psi
+        n = len(observers)
+        nA, nB = len(psi.alpha), len(psi.beta)
+        # P(r | lambda, x) with lambda flattened
+        likelihood = psi._probResponseGivenLambdaX.reshape(2, nA * nB, len(psi.x))
+        posterior = np.tile(psi._probLambda.reshape(1, nA * nB), (n, 1))
+        alphas = np.repeat(psi.alpha, nB)
+        betas = np.tile(psi.beta, nA)
+        nDone = np.zeros(n, dtype=int)
+        intensities, responses, estimates = [], [], []
+        active = np.ones(n, dtype=bool)
+
+        for trialN in range(self.nTrials):
+            xIndex = _gridNextIndex(posterior, likelihood)
+            intensity = psi.x[xIndex]
+            resp = observers.respond(intensity, rng)
+            posterior = _gridUpdate(posterior, likelihood, resp, xIndex, active)
+            nDone += 1
+            intensities.append(intensity)
+            responses.append(resp.astype(float))
+            estimates.append(posterior @ alphas)
+
+        return self._makeResults(
+            observers, intensities, responses, estimates,
+            posterior @ alphas, nDone, params={'slope': posterior @ betas})
+
+
+class QuestPlusSimulation(_BaseSimulation):
+    """Batch simulation of :class:`~psychopy.data.QuestPlusHandler`, using a
+    Weibull psychometric function.
+
+    Parameters are as for :class:`~psychopy.data.QuestPlusHandler` (only
+    `stimSelectionMethod='minEntropy'` is supported). Threshold estimates
+    are the estimated threshold parameter, other parameter estimates are
+    stored in `params` of the results.
+    """
+
+    def __init__(self, nTrials, intensityVals, thresholdVals, slopeVals,
+                 lowerAsymptoteVals, lapseRateVals, prior=None,
+                 startIntensity=None, stimScale='log10',
+                 stimSelectionMethod='minEntropy',
+                 paramEstimationMethod='mean'):
+        _BaseSimulation.__init__(self, maxTrials=nTrials)
+        if stimSelectionMethod != 'minEntropy':
+            raise NotImplementedError(
+                "Batch simulation only supports stimSelectionMethod="
+                "'minEntropy'.")
+        if paramEstimationMethod not in ('mean', 'mode'):
+            raise ValueError('Unknown paramEstimationMethod requested.')
+        self.nTrials = nTrials
+        self.startIntensity = startIntensity
+        self.stimScale = stimScale
+        self.paramEstimationMethod = paramEstimationMethod
+        self.intensityVals = np.atleast_1d(np.asarray(intensityVals, dtype=float))
+        self.paramVals = {
+            'threshold': np.atleast_1d(np.asarray(thresholdVals, dtype=float)),
+            'slope': np.atleast_1d(np.asarray(slopeVals, dtype=float)),
+            'lowerAsymptote': np.atleast_1d(np.asarray(lowerAsymptoteVals, dtype=float)),
+            'lapseRate': np.atleast_1d(np.asarray(lapseRateVals, dtype=float)),
+        }
+        # grid of every parameter combination, flattened
+        grids = np.meshgrid(*self.paramVals.values(), indexing='ij')
+        self._paramGrid = {key: grid.ravel() for key, grid in zip(self.paramVals, grids)}
+        # prior is the product of the marginal priors
+        prior = prior or {}
+        jointPrior = np.ones(grids[0].shape)
+        for axis, key in enumerate(self.paramVals):
+            if key in prior:
+                shape = [1] * len(self.paramVals)
+                shape[axis] = -1
+                jointPrior = jointPrior * np.asarray(prior[key], dtype=float).reshape(shape)
+        self._prior = jointPrior.ravel() / jointPrior.sum()
+        # P(r | params, x) for r = (success, failure)
+        x = self.intensityVals[np.newaxis, :]
+        p = self._paramGrid
+        t = p['threshold'][:, np.newaxis]
+        slope = p['slope'][:, np.newaxis]
+        if stimScale == 'log10':
+            core = 1 - np.exp(-10 ** (slope * (x - t)))
+        elif stimScale == 'dB':
+            core = 1 - np.exp(-10 ** (slope * (x - t) / 20))
+        elif stimScale == 'linear':
+            core = 1 - np.exp(-(x / t) ** slope)
+        else:
+            raise ValueError("Unknown stimScale '%s'" % stimScale)
+        lower = p['lowerAsymptote'][:, np.newaxis]
+        lapse = p['lapseRate'][:, np.newaxis]
+        success = lower + (1 - lower - lapse) * core
+        self._likelihood = np.stack([success, 1 - success])
+
+    @classmethod
+    def fromHandler(cls, handler, **kwargs):
+        """Create a simulation with the same settings as a QuestPlusHandler.
+        """
+        if handler.psychometricFunc != 'weibull':
+            raise ValueError('Currently only the Weibull psychometric '
+                             'function is supported.')
+        return cls(
+            nTrials=handler.nTrials, intensityVals=handler.intensityVals,
+            thresholdVals=handler.thresholdVals, slopeVals=handler.slopeVals,
+            lowerAsymptoteVals=handler.lowerAsymptoteVals,
+            lapseRateVals=handler.lapseRateVals, prior=handler._prior,
+            startIntensity=handler.startIntensity,
+            stimScale=handler.stimScale,
+            stimSelectionMethod=handler.stimSelectionMethod,
+            paramEstimationMethod=handler.paramEstimationMethod, **kwargs)
+
+    def _paramEstimates(self, posterior):
+        if self.paramEstimationMethod == 'mean':
+            return {key: posterior @ vals for key, vals in self._paramGrid.items()}
+        iMax = np.argmax(posterior, axis=1)
+        return {key: vals[iMax] for key, vals in self._paramGrid.items()}
+
+    def _simulate(self, observers, rng):
+        n = len(observers)
+        posterior = np.tile(self._prior, (n, 1))
+        nDone = np.zeros(n, dtype=int)
+        intensities, responses, estimates = [], [], []
+        active = np.ones(n, dtype=bool)
+
+        for trialN in range(self.nTrials):
+            if trialN == 0 and self.startIntensity is not None:
+                xIndex = np.full(
+                    n, np.argmin(np.abs(self.intensityVals - self.startIntensity)))
+            else:
+                xIndex = _gridNextIndex(posterior, self._likelihood)
+            intensity = self.intensityVals[xIndex]
+            resp = observers.respond(intensity, rng)
+            # first response value is success
+            posterior = _gridUpdate(
+                posterior, self._likelihood, 1 - resp, xIndex, active)
+            nDone += 1
+            intensities.append(intensity)
+            responses.append(resp.astype(float))
+            estimates.append(self._paramEstimates(posterior)['threshold'])
+
+        params = self._paramEstimates(posterior)
+        thresholds = params.pop('threshold')
+        return self._makeResults(
+            observers, intensities, responses, estimates, thresholds, nDone,
+            params=params)
+
+
+def simulateHandler(handler, observers, seed=None, nProcesses=1, **kwargs):
+    """Simulate running a staircase handler with many observers at once.
+
+    The handler itself is not changed, it just supplies the settings for the
+    batch simulation.
+
+    Parameters
+    ----------
+    handler : StairHandler, QuestHandler, PsiHandler or QuestPlusHandler
+        Handler whose design to simulate.
+    observers : SimulatedObservers
+        Observers to simulate.
+    seed : int or None
+        Seed for the random number generator, for reproducible results.
+    nProcesses : int
+        Number of processes to split the observers across.
+    kwargs
+        Passed to the `fromHandler` method of the simulation class (e.g.
+        `maxTrials`).
+
+    Returns
+    -------
+    SimulationResults
+    """
+    # import here to avoid circular import
+    from .staircase import (StairHandler, QuestHandler, PsiHandler,
+                            QuestPlusHandler)
+    # check subclasses before StairHandler
+    for handlerClass, simClass in [
+        (QuestHandler, QuestSimulation),
+        (PsiHandler, PsiSimulation),
+        (QuestPlusHandler, QuestPlusSimulation),
+        (StairHandler, StairSimulation),
+    ]:
+        if isinstance(handler, handlerClass):
+            simulation = simClass.fromHandler(handler, **kwargs)
+            return simulation.run(observers, seed=seed, nProcesses=nProcesses)
+    raise TypeError("Can't simulate a %s" % type(handler).__name__)
@@ -7,6 +7,7 @@ import pickle
 import copy
 import warnings
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from packaging.version import Version
 
 import psychopy
@@ -1095,13 +1096,108 @@ class QuestHandler(StairHandler):
             self.finished = False
 
 
+# worker threads shared by all staircases updating in the background
+_updateExecutor = None
+
+
+def _getUpdateExecutor():
+    """Get the thread pool which runs background posterior updates, creating
+    it the first time it's needed.
+    """
+    global _updateExecutor
+    if _updateExecutor is None:
+        _updateExecutor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix='StaircaseUpdate')
+    return _updateExecutor
+
+
+class _BackgroundUpdateMixin:
+    """Lets a staircase update its posterior (and choose the next intensity)
+    off the critical path between trials.
+
+    `updateMode` can be:
+
+    - 'sync': update when the response is added (the default).
+    - 'background': start the update in a worker thread when the response
+      is added, and only wait for it when the next intensity is needed.
+    - 'speculative': when a trial starts, compute the update for every
+      possible response in worker threads, then keep the one matching the
+      response which is actually added.
+    """
+    updateModes = ('sync', 'background', 'speculative')
+    # defaults for handlers pickled before these attributes existed
+    updateMode = 'sync'
+    _pendingUpdate = None
+    _speculativeUpdates = None
+
+    def _initUpdateMode(self, updateMode):
+        if updateMode not in self.updateModes:
+            raise ValueError(
+                "Unknown updateMode '%s', should be one of: %s" %
+                (updateMode, ', '.join(self.updateModes)))
+        self.updateMode = updateMode
+        self._pendingUpdate = None
+        self._speculativeUpdates = None
+
+    def _submitUpdate(self, func, *args, **kwargs):
+        """Run `func` in a worker thread, to be waited for by
+        `_waitForUpdate`.
+        """
+        self._waitForUpdate()
+        self._pendingUpdate = _getUpdateExecutor().submit(
+            func, *args, **kwargs)
+
+    def _waitForUpdate(self):
+        """Block until any update running in the background has finished.
+        """
+        pending = getattr(self, '_pendingUpdate', None)
+        if pending is not None:
+            self._pendingUpdate = None
+            pending.result()  # re-raises any error from the worker
+
+    def _startSpeculativeUpdates(self, compute, responses):
+        """Start computing `compute(response)` for each possible response.
+        """
+        self._waitForUpdate()
+        executor = _getUpdateExecutor()
+        self._speculativeUpdates = {
+            response: executor.submit(compute, response)
+            for response in responses}
+
+    def _takeSpeculativeUpdate(self, response):
+        """Get the result of the speculative update for `response`, or None
+        if there isn't one (e.g. the response wasn't one of those expected).
+        """
+        updates = getattr(self, '_speculativeUpdates', None)
+        self._speculativeUpdates = None
+        if not updates:
+            return None
+        try:
+            future = updates.pop(response)
+        except (KeyError, TypeError):
+            future = None
+        for other in updates.values():
+            other.cancel()
+        if future is None:
+            return None
+        return future.result()
+
+    def __getstate__(self):
+        # threads and their results can't be copied or pickled
+        self._waitForUpdate()
+        state = self.__dict__.copy()
+        state['_pendingUpdate'] = None
+        state['_speculativeUpdates'] = None
+        return state
+
+
 class PsiObject_(PsiObject, _ComparisonMixin):
     """A PsiObject that implements the == and != operators.
     """
     pass
 
 
-class PsiHandler(StairHandler):
+class PsiHandler(_BackgroundUpdateMixin, StairHandler):
     """Handler to implement the "Psi" adaptive psychophysical method
     (Kontsevich & Tyler, 1999).
 
@@ -1149,7 +1245,10 @@ class PsiHandler(StairHandler):
                  prior=None,
                  fromFile=False,
                  extraInfo=None,
-                 name=''):
+                 name='',
+                 dtype='float64',
+                 lowMemory=False,
+                 updateMode='sync'):
         """Initializes the handler and creates an internal Psi Object for
         grid approximation.
 
@@ -1222,6 +1321,26 @@ class PsiHandler(StairHandler):
                 Optional name for the PsiHandler used in PsychoPy's built-in
                 logging system.
 
+            dtype   (str)
+                Data type of the internal grids. 'float32' halves their
+                memory use (and speeds up updates) at the cost of precision.
+                Defaults to 'float64'.
+
+            lowMemory   (bool)
+                If True, the posterior for every intensity and response is
+                not stored, and the expected entropy is computed from matrix
+                products instead. This keeps a single 4-D array in memory
+                and is usually faster for fine grids.
+
+            updateMode  (str)
+                When to update the posterior and choose the next intensity.
+                'sync' does this in `addResponse`. 'background' does it in a
+                worker thread, started by `addResponse`, so that only
+                `next()` waits for it (if it hasn't finished). 'speculative'
+                computes the update for both possible responses in worker
+                threads while the trial runs, so `addResponse` only needs to
+                pick one of them.
+
         :Raises:
 
             NotImplementedError
@@ -1254,9 +1373,11 @@ class PsiHandler(StairHandler):
         self._psi = PsiObject_(
             intensRange, alphaRange, betaRange, intensPrecision,
             alphaPrecision, betaPrecision, delta=delta,
-            stepType=stepType, TwoAFC=twoAFC, prior=prior)
+            stepType=stepType, TwoAFC=twoAFC, prior=prior,
+            dtype=dtype, lowMemory=lowMemory)
 
         self._psi.update(None)
+        self._initUpdateMode(updateMode)
 
     def addResponse(self, result, intensity=None):
         """Add a 1 or 0 to signify a correct / detected or
@@ -1275,16 +1396,28 @@ class PsiHandler(StairHandler):
         if self.getExp() is not None:
             # update the experiment handler too
             self.getExp().addData(self.name + ".response", result)
-        self._psi.update(result)
+        if self.updateMode == 'speculative':
+            state = self._takeSpeculativeUpdate(result)
+            if state is not None:
+                self._psi.applyUpdate(state)
+            else:
+                self._psi.update(result)
+        elif self.updateMode == 'background':
+            self._submitUpdate(self._psi.update, result)
+        else:
+            self._psi.update(result)
 
     def __next__(self):
         """Advances to next trial and returns it.
         """
+        self._waitForUpdate()
         self._checkFinished()
         if self.finished == False:
             # update pointer for next trial
             self.thisTrialN += 1
             self.intensities.append(self._psi.nextIntensity)
+            if self.updateMode == 'speculative':
+                self._startSpeculativeUpdates(self._psi.computeUpdate, (0, 1))
             return self._psi.nextIntensity
         else:
             self._terminate()
@@ -1303,6 +1436,7 @@ class PsiHandler(StairHandler):
     def estimateLambda(self):
         """Returns a tuple of (location, slope)
         """
+        self._waitForUpdate()
         return self._psi.estimateLambda()
 
     def estimateThreshold(self, thresh, lamb=None):
@@ -1323,6 +1457,7 @@ class PsiHandler(StairHandler):
                        "estimate of lambda will be computed.")
                 warnings.warn(msg, SyntaxWarning)
                 lamb = None
+        self._waitForUpdate()
         return self._psi.estimateThreshold(thresh, lamb)
 
     def savePosterior(self, fileName, fileCollisionMethod='rename'):
@@ -1335,6 +1470,7 @@ class PsiHandler(StairHandler):
             Collision method passed to :func:`~psychopy.tools.fileerrortools.handleFileCollision`
 
         """
+        self._waitForUpdate()
         try:
             if os.path.exists(fileName):
                 fileName = handleFileCollision(
@@ -1347,7 +1483,7 @@ class PsiHandler(StairHandler):
                           "posterior array. Continuing without saving...")
 
 
-class QuestPlusHandler(StairHandler):
+class QuestPlusHandler(_BackgroundUpdateMixin, StairHandler):
     def __init__(self,
                  nTrials,
                  intensityVals, thresholdVals, slopeVals,
@@ -1357,7 +1493,8 @@ class QuestPlusHandler(StairHandler):
                  psychometricFunc='weibull', stimScale='log10',
                  stimSelectionMethod='minEntropy',
                  stimSelectionOptions=None, paramEstimationMethod='mean',
-                 extraInfo=None, name='', label='', **kwargs):
+                 extraInfo=None, name='', label='', updateMode='sync',
+                 **kwargs):
         """
         QUEST+ implementation. Currently only supports parameter estimation of
         a Weibull-shaped psychometric function.
@@ -1467,6 +1604,16 @@ class QuestPlusHandler(StairHandler):
         label : str
             Only used by :class:`MultiStairHandler`, and otherwise ignored.
 
+        updateMode : {'sync', 'background', 'speculative'}
+            When to update the posterior and choose the next stimulus.
+            `sync` does this in `addResponse`. `background` does it in a
+            worker thread, started by `addResponse`, so that only `next()`
+            waits for it (if it hasn't finished). `speculative` updates a
+            copy of the posterior for every possible response in worker
+            threads while the trial runs, so `addResponse` only needs to pick
+            one of them (if a different intensity is supplied to
+            `addResponse`, the update is done there as in `sync` mode).
+
         kwargs : dict
             Additional keyword arguments. These might be passed, for example,
             through a :class:`MultiStairHandler`, and will be ignored. A
@@ -1608,10 +1755,21 @@ class QuestPlusHandler(StairHandler):
         else:
             self._nextIntensity = self._qp.next_intensity
 
+        self._initUpdateMode(updateMode)
+
     @property
     def startIntensity(self):
         return self.startVal
 
+    def _computeUpdate(self, intensityResponse):
+        """Update a copy of the QUEST+ object with an (intensity, response)
+        pair, leaving this handler unchanged.
+        """
+        intensity, response = intensityResponse
+        qp = copy.deepcopy(self._qp)
+        qp.update(intensity=intensity, response=response)
+        return qp
+
     def addResponse(self, response, intensity=None):
         self.data.append(response)
 
@@ -1624,10 +1782,23 @@ class QuestPlusHandler(StairHandler):
         if self.getExp() is not None:
             # update the experiment handler too
             self.getExp().addData(self.name + ".response", response)
-        self._qp.update(intensity=self.intensities[-1],
-                        response=response)
+        if self.updateMode == 'speculative':
+            qp = self._takeSpeculativeUpdate((self.intensities[-1], response))
+            if qp is not None:
+                self._qp = qp
+            else:
+                self._qp.update(intensity=self.intensities[-1],
+                                response=response)
+        elif self.updateMode == 'background':
+            self._submitUpdate(self._qp.update,
+                               intensity=self.intensities[-1],
+                               response=response)
+        else:
+            self._qp.update(intensity=self.intensities[-1],
+                            response=response)
 
     def __next__(self):
+        self._waitForUpdate()
         self._checkFinished()
         if not self.finished:
             # update pointer for next trial
@@ -1641,6 +1812,11 @@ class QuestPlusHandler(StairHandler):
             # QuestPlusHandler; it's mere purpose here is to make the
             # MultiStairHandler happy.
             self._nextIntensity = self.intensities[-1]
+            if self.updateMode == 'speculative':
+                self._startSpeculativeUpdates(
+                    self._computeUpdate,
+                    [(self.intensities[-1], response)
+                     for response in self.responseVals])
             return self.intensities[-1]
         else:
             self._terminate()
@@ -1665,6 +1841,7 @@ class QuestPlusHandler(StairHandler):
             parameters.
 
         """
+        self._waitForUpdate()
         qp_estimate = self._qp.param_estimate
         estimate = dict(threshold=qp_estimate['threshold'],
                         slope=qp_estimate['slope'],
@@ -1683,6 +1860,7 @@ class QuestPlusHandler(StairHandler):
             A dictionary whose keys correspond to the names of the parameters.
 
         """
+        self._waitForUpdate()
         qp_prior = self._qp.prior
 
         threshold = qp_prior.sum(dim=('slope', 'lower_asymptote', 'lapse_rate'))
@@ -1708,6 +1886,7 @@ class QuestPlusHandler(StairHandler):
             parameters.
 
         """
+        self._waitForUpdate()
         qp_posterior = self._qp.posterior
 
         threshold = qp_posterior.sum(dim=('slope', 'lower_asymptote', 'lapse_rate'))
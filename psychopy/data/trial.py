@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import collections
 import json
 import os
 import sys
@@ -13,6 +14,7 @@ from psychopy.tools.filetools import (openOutputFile, genDelimiter,
                                       genFilenameFromDelimiter)
 from .utils import importConditions
 from .base import _BaseTrialHandler, DataHandler
+from .columns import DataColumns
 
 
 class TrialType(dict):
@@ -749,6 +751,9 @@ class TrialHandler(_BaseTrialHandler):
 
 
 class Trial(dict):
+    # row of the parent's dataColumns this trial was copied to when it ended
+    _dataRow = None
+
     def __init__(self, parent, thisN, thisRepN, thisTrialN, thisIndex, data=None):
         dict.__init__(self)
         # TrialHandler containing this trial
@@ -767,6 +772,50 @@ class Trial(dict):
             data = data.copy()
         self.data = data
 
+    def _updateDataRow(self):
+        """If this trial has ended, copy its changed data to its row of the
+        parent's `.dataColumns`, so that `.data` stays up to date.
+        """
+        row = self._dataRow
+        if row is None:
+            return
+        elapsed = getattr(self.parent, 'elapsedTrials', None)
+        if elapsed is None or row >= len(elapsed) or elapsed[row] is not self:
+            # e.g. a copy of the trial
+            return
+        self.parent._getDataColumns().setRow(row, self)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._updateDataRow()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._updateDataRow()
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._updateDataRow()
+
+    def setdefault(self, key, default=None):
+        value = dict.setdefault(self, key, default)
+        self._updateDataRow()
+        return value
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self._updateDataRow()
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self._updateDataRow()
+        return item
+
+    def clear(self):
+        dict.clear(self)
+        self._updateDataRow()
+
     def __repr__(self):
         return (
             f"<Trial {self.thisN} ({self.thisTrialN} in rep {self.thisRepN}) "
@@ -834,6 +883,151 @@ class Trial(dict):
         return data
 
 
+def _countPrevious(values):
+    """For each value in an array, count how many times that value has
+    occurred earlier in the array.
+    """
+    values = np.asarray(values, dtype=int)
+    order = np.argsort(values, kind='stable')
+    sortedValues = values[order]
+    # position at which each run of equal values starts
+    starts = np.flatnonzero(np.r_[True, sortedValues[1:] != sortedValues[:-1]])
+    runLengths = np.diff(np.r_[starts, len(values)])
+    counts = np.empty(len(values), dtype=int)
+    counts[order] = np.arange(len(values)) - np.repeat(starts, runLengths)
+
+    return counts
+
+
+def _removeFirstOccurrences(values, toRemove):
+    """Remove the first occurrence in `values` of each entry in `toRemove`
+    (equivalent to calling `list.remove` for each, but vectorised).
+    """
+    values = np.asarray(values, dtype=int)
+    toRemove = np.asarray(toRemove, dtype=int)
+    if not len(values) or not len(toRemove):
+        return values
+    nRemove = np.bincount(toRemove, minlength=values.max() + 1)
+
+    return values[_countPrevious(values) >= nRemove[values]]
+
+
+class TrialSequence:
+    """Lazily evaluated queue of upcoming trials for a TrialHandler2.
+
+    The order of conditions is stored as arrays of indices (along with the
+    rep and trial numbers for each position), and `Trial` objects are only
+    created when they're first needed - either because the handler has
+    advanced to them, or because they've been looked at via
+    `getFutureTrial`/`getFutureTrials`. Trials which have been created are
+    kept in a deque, so taking the next trial is O(1) however long the
+    sequence.
+
+    Parameters
+    ----------
+    parent : TrialHandler2
+        Handler which these trials belong to.
+    indices : array-like of int
+        Index (in `parent.trialList`) of the condition for each upcoming trial.
+    thisNs, thisRepNs, thisTrialNs : array-like of int
+        Trial number, rep number and trial-within-rep number for each upcoming
+        trial.
+    """
+    def __init__(self, parent, indices=(), thisNs=(), thisRepNs=(),
+                 thisTrialNs=()):
+        self.parent = parent
+        self._indices = np.asarray(indices, dtype=int)
+        self._thisNs = np.asarray(thisNs, dtype=int)
+        self._thisRepNs = np.asarray(thisRepNs, dtype=int)
+        self._thisTrialNs = np.asarray(thisTrialNs, dtype=int)
+        # position in the arrays of the next trial not yet created
+        self._pos = 0
+        # trials which have already been created (or prepended), in order
+        self._made = collections.deque()
+
+    def __len__(self):
+        return len(self._made) + len(self._indices) - self._pos
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        i = 0
+        while i < len(self):
+            yield self[i]
+            i += 1
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        # handle negative indices
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("TrialSequence index out of range")
+        self._makeTrials(item + 1)
+        return self._made[item]
+
+    def __eq__(self, other):
+        if isinstance(other, TrialSequence):
+            other = list(other)
+        return list(self) == other
+
+    def __repr__(self):
+        return f"<TrialSequence ({len(self)} trials)>"
+
+    def _makeTrials(self, n):
+        """Create `Trial` objects until at least `n` have been made (or the
+        sequence is exhausted).
+        """
+        trialList = self.parent.trialList
+        while len(self._made) < n and self._pos < len(self._indices):
+            i = self._pos
+            thisIndex = int(self._indices[i])
+            if len(trialList):
+                # if None then use empty dict
+                condition = trialList[thisIndex] or {}
+            else:
+                condition = {}
+            self._made.append(Trial(
+                self.parent,
+                thisN=int(self._thisNs[i]),
+                thisRepN=int(self._thisRepNs[i]),
+                thisTrialN=int(self._thisTrialNs[i]),
+                thisIndex=thisIndex,
+                data=condition
+            ))
+            self._pos += 1
+
+    def pop(self, index=0):
+        """Remove and return the next trial (only `index=0` is supported, for
+        compatibility with code which treated upcoming trials as a list).
+        """
+        if index != 0:
+            raise ValueError("TrialSequence can only pop the next trial.")
+        return self.popleft()
+
+    def popleft(self):
+        """Remove and return the next trial.
+        """
+        if not self:
+            raise IndexError("pop from an empty TrialSequence")
+        self._makeTrials(1)
+        return self._made.popleft()
+
+    def prepend(self, trials):
+        """Insert already created trials (e.g. rewound ones) at the start of
+        the sequence, keeping their order.
+        """
+        self._made.extendleft(reversed(list(trials)))
+
+    def clear(self):
+        """Remove all upcoming trials.
+        """
+        self._made.clear()
+        self._pos = len(self._indices)
+
+
 class TrialHandler2(_BaseTrialHandler):
     """Class to handle trial sequencing and data storage.
 
@@ -970,8 +1164,9 @@ class TrialHandler2(_BaseTrialHandler):
         self._rng = np.random.default_rng(seed=seed)
         self._trialAborted = False
 
-        # store a list of dicts, convert to pandas DataFrame on access
+        # store a list of dicts, with a column-wise copy for quick access
         self.elapsedTrials = []
+        self.dataColumns = DataColumns()
         self.upcomingTrials = None
         self.thisTrial = None
         self._cancelNextIteration = False
@@ -1046,9 +1241,30 @@ class TrialHandler2(_BaseTrialHandler):
         Read only attribute - you can't directly modify TrialHandler.data
 
         Note that data are stored internally as a list of dictionaries,
-        one per trial. These are converted to a DataFrame on access.
+        one per trial, which are also copied column-wise into
+        `.dataColumns` as each trial ends (and again if an ended trial is
+        changed). The DataFrame is built from those columns and only rows
+        for trials which have ended since it was last accessed need
+        converting. For running summaries (e.g.
+        accuracy so far) use `.dataColumns` directly::
+
+            if trials.dataColumns.mean('key_resp.corr') > 0.8:
+                trials.finished = True
         """
-        return pd.DataFrame(self.elapsedTrials)
+        return self._getDataColumns().getDataFrame()
+
+    def _getDataColumns(self):
+        """Get `.dataColumns`, rebuilding it if it's out of step with
+        `.elapsedTrials` (e.g. if loaded from an older psydat file or if
+        `.elapsedTrials` was changed directly).
+        """
+        dataColumns = getattr(self, 'dataColumns', None)
+        if dataColumns is None or len(dataColumns) != len(self.elapsedTrials):
+            self.dataColumns = DataColumns(self.elapsedTrials)
+            for row, trial in enumerate(self.elapsedTrials):
+                if isinstance(trial, Trial):
+                    trial._dataRow = row
+        return self.dataColumns
 
     def __next__(self):
         """Advances to next trial and returns it.
@@ -1076,6 +1292,10 @@ class TrialHandler2(_BaseTrialHandler):
             return self.thisTrial
         # mark previous trial as elapsed
         if self.thisTrial is not None:
+            dataColumns = self._getDataColumns()
+            # later changes to the trial are copied to its row as they're made
+            self.thisTrial._dataRow = len(dataColumns)
+            dataColumns.appendRow(self.thisTrial)
             self.elapsedTrials.append(self.thisTrial)
         # if upcoming is None, recaculate
         if self.upcomingTrials is None:
@@ -1087,7 +1307,7 @@ class TrialHandler2(_BaseTrialHandler):
             self._terminate()
             raise StopIteration
         # get first upcoming trial
-        self.thisTrial = self.upcomingTrials.pop(0)
+        self.thisTrial = self.upcomingTrials.popleft()
 
         # update data structure with new info
         self.addData('thisN', self.thisN)
@@ -1146,75 +1366,66 @@ class TrialHandler2(_BaseTrialHandler):
     def calculateUpcoming(self, fromIndex=-1):
         """Rebuild the sequence of trial/state info as if running the trials
 
+        The order of conditions is calculated up front as an array of
+        indices, but `Trial` objects are only created as they're needed (see
+        :class:`TrialSequence`), so this is cheap even for very long loops.
+
         Args:
             fromIndex (int, optional): the point in the sequnce from where to rebuild. Defaults to -1.
         """
-        # clear upcoming
-        self.upcomingTrials = []
-        # start off at 0 trial
-        thisTrialN = 0
-        thisN = 0
-        thisRepN = -1
-        # empty array to store indices once taken
-        prevIndices = []
-        # empty array to store remaining indices
-        remainingIndices = []
-        # iterate a while loop until we run out of trials
-        while thisN < (self.nReps * len(self.trialList)):
-            if not remainingIndices:
-                # we've just started, or just starting a new repeat
-                sequence = list(range(len(self.trialList)))
-                if (self.method == 'fullRandom' and
-                        thisN < (self.nReps * len(self.trialList))):
-                    # we've only just started on a fullRandom sequence
-                    sequence *= self.nReps
-                    # NB permutation *returns* a shuffled array
-                    remainingIndices = list(self._rng.permutation(sequence))
-                elif (self.method in ('sequential', 'random') and
-                      thisRepN < self.nReps):
-                    thisTrialN = 0
-                    thisRepN += 1
-                    if self.method == 'random':
-                        self._rng.shuffle(sequence)  # shuffle (is in-place)
-                    remainingIndices = list(sequence)
-                else:
-                    # we've finished
-                    break
-
-            if thisN < len(self.elapsedTrials):
-                # trial has already happened - get its value
-                thisTrial = self.elapsedTrials[thisN]
-                # remove from remaining
-                remainingIndices.pop(remainingIndices.index(thisTrial.thisIndex))
-            else:
-                # fetch the trial info
-                if len(self.trialList) == 0:
-                    thisIndex = 0
-                    thisTrial = {}
-                else:
-                    thisIndex = remainingIndices.pop(0)
-                    # if None then use empty dict
-                    thisTrial = self.trialList[thisIndex] or {}
-                    thisTrial = copy.copy(thisTrial)
-                # make Trial object
-                thisTrial = Trial(
-                    self,
-                    thisN=thisN,
-                    thisRepN=thisRepN,
-                    thisTrialN=thisTrialN,
-                    thisIndex=thisIndex,
-                    data=thisTrial
-                )
-                # otherwise, append trial
-                self.upcomingTrials.append(thisTrial)
-            # for fullRandom check how many times this has come up before
-            if self.method == 'fullRandom':
-                thisTrial.thisRepN = prevIndices.count(thisTrial.thisIndex)
-            # update prev indices
-            prevIndices.append(thisTrial.thisIndex)
-            # update pointer for next trials
-            thisTrialN += 1  # number of trial this pass
-            thisN += 1  # number of trial in total
+        nConds = len(self.trialList)
+        nTotal = self.nReps * nConds
+        # indices of trials which have already happened
+        nElapsed = min(len(self.elapsedTrials), nTotal)
+        elapsedIndices = np.array(
+            [trial.thisIndex for trial in self.elapsedTrials[:nElapsed]],
+            dtype=int
+        )
+        if self.method == 'fullRandom':
+            # one shuffle of all trials across all repeats
+            # NB permutation *returns* a shuffled array
+            sequence = self._rng.permutation(
+                np.tile(np.arange(nConds), self.nReps)
+            )
+            # remove the conditions which have already been run
+            indices = _removeFirstOccurrences(sequence, elapsedIndices)
+            thisNs = nElapsed + np.arange(len(indices))
+            # rep number is how many times this condition has come up before
+            repNs = _countPrevious(np.concatenate([elapsedIndices, indices]))
+            for trial, repN in zip(self.elapsedTrials, repNs[:nElapsed]):
+                trial.thisRepN = int(repN)
+            thisRepNs = repNs[nElapsed:]
+            thisTrialNs = thisNs
+        elif self.method in ('sequential', 'random') and nConds:
+            # one shuffle per repeat
+            sequence = np.tile(np.arange(nConds), (self.nReps, 1))
+            if self.method == 'random':
+                for rep in sequence:
+                    self._rng.shuffle(rep)  # shuffle (is in-place)
+            # the repeat we're part way through - conditions which have already
+            # been run in it are removed, later repeats are used as-is
+            thisRep = nElapsed // nConds
+            indices = np.concatenate([
+                _removeFirstOccurrences(
+                    sequence[thisRep] if thisRep < self.nReps else [],
+                    elapsedIndices[thisRep * nConds:]
+                ),
+                sequence[thisRep + 1:].ravel()
+            ])
+            thisNs = nElapsed + np.arange(len(indices))
+            thisRepNs = thisNs // nConds
+            thisTrialNs = thisNs % nConds
+        else:
+            # nothing to run
+            indices = thisNs = thisRepNs = thisTrialNs = []
+        # store as a lazily evaluated sequence
+        self.upcomingTrials = TrialSequence(
+            self,
+            indices=indices,
+            thisNs=thisNs,
+            thisRepNs=thisRepNs,
+            thisTrialNs=thisTrialNs
+        )
 
     def abortCurrentTrial(self, action='random'):
         """Abort the current trial.
@@ -1258,7 +1469,7 @@ class TrialHandler2(_BaseTrialHandler):
     def finished(self, value):
         # when setting finished to True, skip all remaining trials
         if value:
-            self.upcomingTrials = []
+            self.upcomingTrials = TrialSequence(self)
         else:
             self.calculateUpcoming()
 
@@ -1324,12 +1535,20 @@ class TrialHandler2(_BaseTrialHandler):
             # mark as skipping so routines end
             self.thisTrial.status = constants.STOPPING
         # pop the last n values from elapsed trials
+        dataColumns = self._getDataColumns()
         for i in range(n):
             rewound = [self.elapsedTrials.pop(-1)] + rewound
+            rewound[0]._dataRow = None
+            dataColumns.popRow()
         # clear thisTrial so we progress to the first rewound trial
         self.thisTrial = None
         # prepend rewound trials to upcoming array
-        self.upcomingTrials = rewound + self.upcomingTrials
+        if self.upcomingTrials is None:
+            # upcoming trials have been cleared (e.g. by aborting a trial), so
+            # recalculate them now that the rewound trials aren't elapsed
+            self.calculateUpcoming()
+        else:
+            self.upcomingTrials.prepend(rewound)
         # progress so we get the first upcoming trial
         self.__next__()
         # mark as recently rewound so the next iteration is cancelled
@@ -1360,7 +1579,7 @@ class TrialHandler2(_BaseTrialHandler):
         int
             Index of the current trial in this list
         """
-        return (self.elapsedTrials or []) + [self.thisTrial] + (self.upcomingTrials or []), len(self.elapsedTrials)
+        return (self.elapsedTrials or []) + [self.thisTrial] + list(self.upcomingTrials or []), len(self.elapsedTrials)
 
     def getFutureTrial(self, n=1):
         """
@@ -1743,7 +1962,7 @@ class TrialHandler2(_BaseTrialHandler):
         # make sure we have a thisTrial
         if self.thisTrial is None:
             if self.upcomingTrials:
-                self.thisTrial = self.upcomingTrials.pop(0)
+                self.thisTrial = self.upcomingTrials.popleft()
             else:
                 self.thisTrial = Trial(
                         self,
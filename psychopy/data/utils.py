@@ -5,8 +5,10 @@
 # Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
 # Distributed under the terms of the GNU General Public License (GPL).
 
+import io
 import os
 import re
+import hashlib
 import ast
 import pickle
 import time, datetime
@@ -16,7 +18,7 @@ import pandas as pd
 from collections import OrderedDict
 from packaging.version import Version
 
-from psychopy import logging, exceptions
+from psychopy import logging, exceptions, __version__
 from psychopy.tools.filetools import pathToString
 from psychopy.localization import _translate
 
@@ -241,7 +243,168 @@ def listFromString(val, excludeEmpties=False):
     return asList
 
 
-def importConditions(fileName, returnFieldNames=False, selection=""):
+class ConditionsCache:
+    """Cache of parsed conditions files, keyed by a hash of their contents.
+
+    Conditions are stored pickled, so each load gets its own copy of the
+    trial list which can be modified without affecting the cache. If
+    `useSidecar` is True then parsed conditions are also written to a binary
+    file alongside the conditions file (named e.g. `conditions.csv.psycache`)
+    so they load instantly in other sessions too, as long as the contents of
+    the conditions file haven't changed.
+
+    Parameters
+    ----------
+    maxSize : int
+        Maximum number of files to keep in memory, the least recently used
+        are forgotten first.
+    useSidecar : bool
+        Whether to also store parsed conditions on disk.
+    """
+    sidecarExt = ".psycache"
+
+    def __init__(self, maxSize=64, useSidecar=False):
+        self.maxSize = maxSize
+        self.useSidecar = useSidecar
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def getKey(raw):
+        """Get the key for a conditions file from its (bytes) contents.
+        """
+        return hashlib.sha1(raw).hexdigest()
+
+    def get(self, key, fileName=None):
+        """Get parsed conditions by key, returns None if not cached. If
+        `fileName` is given and sidecars are in use, will also look for a
+        sidecar file.
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return pickle.loads(self._cache[key])
+        if self.useSidecar and fileName is not None:
+            sidecar = str(fileName) + self.sidecarExt
+            try:
+                with open(sidecar, 'rb') as f:
+                    header, stored = pickle.load(f)
+            except Exception:
+                return None
+            if header != (key, __version__):
+                # made from a different file or by a different version
+                return None
+            self._store(key, stored)
+            return pickle.loads(stored)
+
+    def set(self, key, value, fileName=None):
+        """Store parsed conditions by key (and in a sidecar file next to
+        `fileName`, if sidecars are in use).
+        """
+        try:
+            stored = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # some values can't be pickled, so just don't cache them
+            return
+        self._store(key, stored)
+        if self.useSidecar and fileName is not None:
+            sidecar = str(fileName) + self.sidecarExt
+            try:
+                with open(sidecar, 'wb') as f:
+                    pickle.dump(((key, __version__), stored), f)
+            except OSError as err:
+                logging.debug(
+                    u"Could not write conditions cache {}: {}".format(sidecar, err)
+                )
+
+    def _store(self, key, stored):
+        self._cache[key] = stored
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxSize:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        """Forget all conditions held in memory (sidecar files are left).
+        """
+        self._cache.clear()
+
+
+# cache used by importConditions
+conditionsCache = ConditionsCache()
+
+# separator / decimal pairs to try when reading csv files, in order
+_csvDialects = [
+    # most common in US, EU
+    (',', '.'),
+    (';', ','),
+    # other possible formats
+    ('\t', '.'),
+    ('\t', ','),
+    (';', '.')
+]
+
+
+def _sniffCsvDialects(text):
+    """Order the possible separator / decimal pairs for a csv file so that the
+    most likely (going by which delimiter is most common in the header row)
+    is tried first.
+    """
+    header = text.split("\n", 1)[0]
+    counts = {sep: header.count(sep) for sep in (',', ';', '\t')}
+    best = max(counts, key=lambda sep: counts[sep])
+    if not counts[best]:
+        # no delimiters in header (e.g. only one column), use the usual order
+        return list(_csvDialects)
+    # move pairs using the most common delimiter to the front (sorted is stable)
+    return sorted(_csvDialects, key=lambda dialect: dialect[0] != best)
+
+
+def _coerceDecimalStrings(dataframe):
+    """Convert strings in a dataframe which are numbers with comma decimals
+    (e.g. "2,5") to floats, converting each unique value only once.
+    """
+    for col in dataframe.columns:
+        values = dataframe[col]
+        if pd.api.types.is_numeric_dtype(values):
+            # numeric columns can't contain strings
+            continue
+        # work out which unique strings are numbers
+        lookup = {}
+        for val in pd.unique(values):
+            if isinstance(val, str):
+                try:
+                    lookup[val] = float(val.replace(",", "."))
+                except ValueError:
+                    pass
+        if not lookup:
+            continue
+        # swap them all for floats in one go
+        isNum = values.isin(list(lookup)).to_numpy()
+        converted = values.to_numpy(dtype=object, copy=True)
+        converted[isNum] = values[isNum].map(lookup).to_numpy()
+        dataframe[col] = converted
+
+    return dataframe
+
+
+def _convertCell(val):
+    """Convert a single value from an object column in a conditions file
+    (escaped newlines, lists written as strings, bytes and missing values).
+    """
+    if isinstance(val, str):
+        val = val.replace('\\n', '\n')
+        if val.startswith('[') and val.endswith(']'):
+            val = eval(val)
+    elif type(val) == np.bytes_:
+        val = str(val.decode('utf-8-sig'))
+        # if it looks like a list, convert it:
+        if val.startswith('[') and val.endswith(']'):
+            val = eval(val)
+    elif isinstance(val, float) and np.isnan(val):
+        val = None
+    return val
+
+
+def importConditions(fileName, returnFieldNames=False, selection="",
+                     useCache=True):
     """Imports a list of conditions from an .xlsx, .csv, or .pkl file
 
     The output is suitable as an input to :class:`TrialHandler`
@@ -276,13 +439,19 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
     - slice(-10, 2, None)  # the same as above
     - random(5) * 8  # five random vals 0-7
 
+    Each file is only read from disk once per import and, if `useCache` is
+    True, files whose contents haven't changed since they were last imported
+    are fetched from `conditionsCache` rather than parsed again (see
+    :class:`ConditionsCache`).
+
     """
 
-    def _attemptImport(fileName):
+    def _attemptImport(fileName, raw):
         """Attempts to import file with specified settings and raises
         ConditionsImportError if fails due to invalid format
 
         :param filename: str
+        :param raw: bytes contents of the file
         :return: trialList, fieldNames
         """
         if fileName.endswith(('.csv', '.tsv')):
@@ -290,24 +459,19 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
             errs = []
             # list of possible delimiters
             delims = (",", ".", ";", "\t")
-            # try a variety of separator / decimal pairs
-            for sep, dec in [
-                # most common in US, EU
-                (',', '.'), 
-                (';', ','),
-                # other possible formats
-                ('\t', '.'), 
-                ('\t', ','), 
-                (';', '.')
-            ]:
+            # decode once and parse from memory rather than re-reading the
+            # file for each attempt
+            text = raw.decode('utf-8-sig')
+            # try a variety of separator / decimal pairs, most likely first
+            for sep, dec in _sniffCsvDialects(text):
                 # try to load
                 try:
                     thisAttempt = pd.read_csv(
-                        fileName, encoding='utf-8-sig', sep=sep, decimal=dec
+                        io.StringIO(text), sep=sep, decimal=dec
                     )
                     # read in the headers separately to bypass pandas sanitization
                     thisAttempt.columns = pd.read_csv(
-                        fileName, encoding='utf-8-sig', sep=sep, decimal=dec, header=None, nrows=1
+                        io.StringIO(text), sep=sep, decimal=dec, header=None, nrows=1
                     ).iloc[0, :]
                     # if there's only one header, check that it doesn't contain delimiters
                     # (one column with delims probably means it's parsed without error but not
@@ -339,20 +503,13 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
                     _translate("Could not parse file {}.").format(fileName)
                 )
             # if we made it herre, we successfully loaded the file
-            for col in trialsArr.columns:
-                for row, cell in enumerate(trialsArr[col]):
-                    if isinstance(cell, str):
-                        tryVal = cell.replace(",", ".")
-                        try:
-                            trialsArr[col][row] = float(tryVal)
-                        except ValueError:
-                            pass
+            trialsArr = _coerceDecimalStrings(trialsArr)
             logging.debug(u"Read csv file with pandas: {}".format(fileName))
         elif fileName.endswith(('.xlsx', '.xlsm')):
-            trialsArr = pd.read_excel(fileName, engine='openpyxl')
+            trialsArr = pd.read_excel(io.BytesIO(raw), engine='openpyxl')
             logging.debug(u"Read Excel file with pandas: {}".format(fileName))
         elif fileName.endswith('.xls'):
-            trialsArr = pd.read_excel(fileName, engine='xlrd')
+            trialsArr = pd.read_excel(io.BytesIO(raw), engine='xlrd')
             logging.debug(u"Read Excel file with pandas: {}".format(fileName))
         # then try to convert array to trialList and fieldnames
         unnamed = trialsArr.columns.to_series().str.contains('^Unnamed: ')
@@ -405,146 +562,151 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
         """Convert a pandas dataframe to a list of dicts.
         This helper function is used by csv or excel imports via pandas
         """
-        # convert the resulting dataframe to a numpy recarray
-        trialsArr = dataframe.to_records(index=False)
-        # Check for new line characters in strings, and replace escaped characters
-        for record in trialsArr:
-            for idx, element in enumerate(record):
-                if isinstance(element, str):
-                    record[idx] = element.replace('\\n', '\n')
-        if trialsArr.shape == ():
-            # convert 0-D to 1-D with one element:
-            trialsArr = trialsArr[np.newaxis]
-        fieldNames = list(trialsArr.dtype.names)
+        fieldNames = list(dataframe.columns)
         _assertValidVarNames(fieldNames, fileName)
-
-        # convert the record array into a list of dicts
-        trialList = []
-        for trialN, trialType in enumerate(trialsArr):
-            thisTrial = OrderedDict()
-            for fieldN, fieldName in enumerate(fieldNames):
-                val = trialsArr[trialN][fieldN]
-
-                if isinstance(val, str):
-                    if val.startswith('[') and val.endswith(']'):
-                        # val = eval('%s' %unicode(val.decode('utf8')))
-                        val = eval(val)
-                elif type(val) == np.bytes_:
-                    val = str(val.decode('utf-8-sig'))
-                    # if it looks like a list, convert it:
-                    if val.startswith('[') and val.endswith(']'):
-                        # val = eval('%s' %unicode(val.decode('utf8')))
-                        val = eval(val)
-                elif np.isnan(val):
-                    val = None
-                thisTrial[fieldName] = val
-            trialList.append(thisTrial)
+        # convert a column at a time rather than a cell at a time
+        columns = []
+        for fieldName in dataframe.columns:
+            values = dataframe[fieldName].to_numpy()
+            if values.dtype.kind == 'O':
+                # strings, lists as strings, bytes, missing values...
+                col = [_convertCell(val) for val in values]
+            else:
+                # keep as numpy scalars, but swap missing values for None
+                col = list(values)
+                if values.dtype.kind in 'fc':
+                    for i in np.flatnonzero(np.isnan(values)):
+                        col[i] = None
+            columns.append(col)
+        # convert the columns into a list of dicts
+        trialList = [
+            OrderedDict(zip(fieldNames, row)) for row in zip(*columns)
+        ]
         return trialList, fieldNames
 
-    if (fileName.endswith(('.csv', '.tsv'))
-            or (fileName.endswith(('.xlsx', '.xls', '.xlsm')) and haveXlrd)):
-        trialList, fieldNames = _attemptImport(fileName=fileName)
+    def _parseFile(fileName, raw):
+        """Parse the (bytes) contents of a conditions file according to its
+        file extension.
 
-    elif fileName.endswith(('.xlsx','.xlsm')):  # no xlsread so use openpyxl
-        if not haveOpenpyxl:
-            raise exceptions.ConditionsImportError(
-                "openpyxl or xlrd is required for loading excel files, but neither was found.",
-                _translate("openpyxl or xlrd is required for loading excel files, but neither was found.")
-            )
+        :return: trialList, fieldNames
+        """
+        if (fileName.endswith(('.csv', '.tsv'))
+                or (fileName.endswith(('.xlsx', '.xls', '.xlsm')) and haveXlrd)):
+            trialList, fieldNames = _attemptImport(fileName=fileName, raw=raw)
 
-        # data_only was added in 1.8
-        if Version(openpyxl.__version__) < Version('1.8'):
-            wb = load_workbook(filename=fileName)
-        else:
-            wb = load_workbook(filename=fileName, data_only=True)
-        ws = wb.worksheets[0]
+        elif fileName.endswith(('.xlsx','.xlsm')):  # no xlsread so use openpyxl
+            if not haveOpenpyxl:
+                raise exceptions.ConditionsImportError(
+                    "openpyxl or xlrd is required for loading excel files, but neither was found.",
+                    _translate("openpyxl or xlrd is required for loading excel files, but neither was found.")
+                )
 
-        logging.debug(u"Read excel file with openpyxl: {}".format(fileName))
-        try:
-            # in new openpyxl (2.3.4+) get_highest_xx is deprecated
-            nCols = ws.max_column
-            nRows = ws.max_row
-        except Exception:
-            # version openpyxl 1.5.8 (in Standalone 1.80) needs this
-            nCols = ws.get_highest_column()
-            nRows = ws.get_highest_row()
-
-        # get parameter names from the first row header
-        fieldNames = []
-        rangeCols = []
-        for colN in range(nCols):
-            if Version(openpyxl.__version__) < Version('2.0'):
-                fieldName = ws.cell(_getExcelCellName(col=colN, row=0)).value
+            # data_only was added in 1.8
+            if Version(openpyxl.__version__) < Version('1.8'):
+                wb = load_workbook(filename=io.BytesIO(raw))
             else:
-                # From 2.0, cells are referenced with 1-indexing: A1 == cell(row=1, column=1)
-                fieldName = ws.cell(row=1, column=colN + 1).value
-            if fieldName:
-                # If column is named, add its name to fieldNames
-                fieldNames.append(fieldName)
-                rangeCols.append(colN)
-        _assertValidVarNames(fieldNames, fileName)
-
-        # loop trialTypes
-        trialList = []
-        for rowN in range(1, nRows):  # skip header first row
-            thisTrial = {}
-            for rangeColsIndex, colN in enumerate(rangeCols):
+                wb = load_workbook(filename=io.BytesIO(raw), data_only=True)
+            ws = wb.worksheets[0]
+
+            logging.debug(u"Read excel file with openpyxl: {}".format(fileName))
+            try:
+                # in new openpyxl (2.3.4+) get_highest_xx is deprecated
+                nCols = ws.max_column
+                nRows = ws.max_row
+            except Exception:
+                # version openpyxl 1.5.8 (in Standalone 1.80) needs this
+                nCols = ws.get_highest_column()
+                nRows = ws.get_highest_row()
+
+            # get parameter names from the first row header
+            fieldNames = []
+            rangeCols = []
+            for colN in range(nCols):
                 if Version(openpyxl.__version__) < Version('2.0'):
-                    val = ws.cell(_getExcelCellName(col=colN, row=0)).value
+                    fieldName = ws.cell(_getExcelCellName(col=colN, row=0)).value
                 else:
                     # From 2.0, cells are referenced with 1-indexing: A1 == cell(row=1, column=1)
-                    val = ws.cell(row=rowN + 1, column=colN + 1).value
-                # if it looks like a list or tuple, convert it
-                if (isinstance(val, str) and
-                        (val.startswith('[') and val.endswith(']') or
-                                 val.startswith('(') and val.endswith(')'))):
-                    val = eval(val)
-                # if it has any line breaks correct them
-                if isinstance(val, str):
-                    val = val.replace('\\n', '\n')
-                # Convert from eu style decimals: replace , with . and try to make it a float
-                if isinstance(val, str):
-                    tryVal = val.replace(",", ".")
-                    try:
-                        val = float(tryVal)
-                    except ValueError:
-                        pass
-                fieldName = fieldNames[rangeColsIndex]
-                thisTrial[fieldName] = val
-            trialList.append(thisTrial)
-
-    elif fileName.endswith('.pkl'):
-        f = open(fileName, 'rb')
-        # Converting newline characters.
-        # 'b' is necessary in Python3 because byte object is
-        # returned when file is opened in binary mode.
-        buffer = f.read().replace(b'\r\n',b'\n').replace(b'\r',b'\n')
-        try:
-            trialsArr = pickle.loads(buffer)
-        except Exception:
+                    fieldName = ws.cell(row=1, column=colN + 1).value
+                if fieldName:
+                    # If column is named, add its name to fieldNames
+                    fieldNames.append(fieldName)
+                    rangeCols.append(colN)
+            _assertValidVarNames(fieldNames, fileName)
+
+            # loop trialTypes
+            trialList = []
+            for rowN in range(1, nRows):  # skip header first row
+                thisTrial = {}
+                for rangeColsIndex, colN in enumerate(rangeCols):
+                    if Version(openpyxl.__version__) < Version('2.0'):
+                        val = ws.cell(_getExcelCellName(col=colN, row=0)).value
+                    else:
+                        # From 2.0, cells are referenced with 1-indexing: A1 == cell(row=1, column=1)
+                        val = ws.cell(row=rowN + 1, column=colN + 1).value
+                    # if it looks like a list or tuple, convert it
+                    if (isinstance(val, str) and
+                            (val.startswith('[') and val.endswith(']') or
+                                     val.startswith('(') and val.endswith(')'))):
+                        val = eval(val)
+                    # if it has any line breaks correct them
+                    if isinstance(val, str):
+                        val = val.replace('\\n', '\n')
+                    # Convert from eu style decimals: replace , with . and try to make it a float
+                    if isinstance(val, str):
+                        tryVal = val.replace(",", ".")
+                        try:
+                            val = float(tryVal)
+                        except ValueError:
+                            pass
+                    fieldName = fieldNames[rangeColsIndex]
+                    thisTrial[fieldName] = val
+                trialList.append(thisTrial)
+
+        elif fileName.endswith('.pkl'):
+            # Converting newline characters.
+            # 'b' is necessary in Python3 because byte object is
+            # returned when file is opened in binary mode.
+            buffer = raw.replace(b'\r\n',b'\n').replace(b'\r',b'\n')
+            try:
+                trialsArr = pickle.loads(buffer)
+            except Exception:
+                raise exceptions.ConditionsImportError(
+                    'Could not open %s as conditions' % fileName,
+                    translated=_translate('Could not open %s as conditions') % fileName
+                )
+            trialList = []
+            # In Python3, strings returned by pickle() are unhashable so we have to
+            # convert them to str.
+            trialsArr = [[str(item) if isinstance(item, str) else item
+                          for item in row] for row in trialsArr]
+            fieldNames = trialsArr[0]  # header line first
+            _assertValidVarNames(fieldNames, fileName)
+            for row in trialsArr[1:]:
+                thisTrial = {}
+                for fieldN, fieldName in enumerate(fieldNames):
+                    # type is correct, being .pkl
+                    thisTrial[fieldName] = row[fieldN]
+                trialList.append(thisTrial)
+        else:
             raise exceptions.ConditionsImportError(
-                'Could not open %s as conditions' % fileName,
-                translated=_translate('Could not open %s as conditions') % fileName
+                'Your conditions file should be an xlsx, csv, dlm, tsv or pkl file',
+                translated=_translate('Your conditions file should be an xlsx, csv, dlm, tsv or pkl file')
             )
-        f.close()
-        trialList = []
-        # In Python3, strings returned by pickle() are unhashable so we have to
-        # convert them to str.
-        trialsArr = [[str(item) if isinstance(item, str) else item
-                      for item in row] for row in trialsArr]
-        fieldNames = trialsArr[0]  # header line first
-        _assertValidVarNames(fieldNames, fileName)
-        for row in trialsArr[1:]:
-            thisTrial = {}
-            for fieldN, fieldName in enumerate(fieldNames):
-                # type is correct, being .pkl
-                thisTrial[fieldName] = row[fieldN]
-            trialList.append(thisTrial)
+
+        return trialList, fieldNames
+
+    # read the file just once, and only parse it if it's changed
+    with open(fileName, 'rb') as f:
+        raw = f.read()
+    key = conditionsCache.getKey(raw)
+    cached = conditionsCache.get(key, fileName) if useCache else None
+    if cached is not None:
+        trialList, fieldNames = cached
+        logging.debug(u"Fetched conditions from cache: {}".format(fileName))
     else:
-        raise exceptions.ConditionsImportError(
-            'Your conditions file should be an xlsx, csv, dlm, tsv or pkl file',
-            translated=_translate('Your conditions file should be an xlsx, csv, dlm, tsv or pkl file')
-        )
+        trialList, fieldNames = _parseFile(pathToString(fileName), raw)
+        if useCache:
+            conditionsCache.set(key, (trialList, fieldNames), fileName)
 
     # if we have a selection then try to parse it
     if isinstance(selection, str) and len(selection) > 0:
@@ -37,6 +37,9 @@ from .params import _findParam, Param, legacyParams
 from psychopy.experiment.routines._base import Routine, BaseStandaloneRoutine
 from psychopy.experiment.routines import getAllStandaloneRoutines
 from . import utils, py2js
+from .codecache import CodeFragmentCache
+from .resourceindex import ResourceIndex
+from .translationcache import translationCache
 from .components import getComponents, getAllComponents, getInitVals
 
 from psychopy.localization import _translate
@@ -170,6 +173,10 @@ class Experiment:
         self.allCompons = getAllComponents(
             self.prefsBuilder['componentsFolders'], fetchIcons=False)
         self.allRoutines = getAllStandaloneRoutines(fetchIcons=False)
+        # code written for each Routine, reused by incremental compiles
+        self._codeCache = CodeFragmentCache()
+        # files needed by the experiment and what refers to them
+        self.resourceIndex = ResourceIndex()
 
     def __eq__(self, other):
         if isinstance(other, Experiment):
@@ -290,8 +297,30 @@ class Experiment:
         # then check the contents 1-by-1 from the Flow
         self.flow.integrityCheck()
 
-    def writeScript(self, expPath=None, target="PsychoPy", modular=True):
+    def writeScript(self, expPath=None, target="PsychoPy", modular=True,
+                    incremental=False):
         """Write a PsychoPy script for the experiment
+
+        Parameters
+        ----------
+        expPath : str or None
+            Path the script will be saved to.
+        target : str
+            Language to write the script in, either "PsychoPy" or "PsychoJS".
+        modular : bool
+            For PsychoJS, whether to write the script as an ES6 module.
+        incremental : bool
+            If True, reuse the code written for each Routine the last time
+            this experiment was compiled, for any Routines which haven't
+            changed since (see `psychopy.experiment.codecache`). This makes
+            compiling the same experiment repeatedly much faster.
+
+        Notes
+        -----
+        Python code is translated to JavaScript through a cache of
+        translations (see `psychopy.experiment.translationcache`), whose
+        hits and misses for the last compile to PsychoJS are reported by
+        `translationCache.getReport()`.
         """
         # self.integrityCheck()
 
@@ -329,6 +358,12 @@ class Experiment:
                             # If this component isn't implemented in target library, print alert and mute it
                             alertCode = 4335 if target == "PsychoPy" else 4340
                             alert(alertCode, strFields={'comp': type(component).__name__})
+        if incremental:
+            self._codeCache.attach(self_copy, target=target, modular=modular)
+
+        if target == "PsychoJS":
+            # report on translations for this compile only
+            translationCache.resetStats()
 
         if target == "PsychoPy":
             # Imports
@@ -457,9 +492,15 @@ class Experiment:
             # Add JS variable declarations e.g., var msg;
             script = py2js.addVariableDeclarations(script.getvalue(), fileName=self.expPath)
 
+            translationCache.logReport()
+            translationCache.save()
+
             # Reset loop controller ready for next call to writeScript
             self_copy.flow._resetLoopController()
 
+        if incremental:
+            self._codeCache.prune()
+
         return script
 
     @property
@@ -1239,96 +1280,42 @@ class Experiment:
         """Returns a list of known files needed for the experiment
         Interrogates each loop looking for conditions files and each
 
+        Which params and conditions files point to which files is remembered
+        by `self.resourceIndex`, so only params whose values have changed and
+        conditions files which have been modified are examined again on the
+        next call. The index also records what refers to each file (see
+        `getResourceReferrers`).
         """
-        join = os.path.join
-        abspath = os.path.abspath
         srcRoot = os.path.split(self.filename)[0]
-
-        def getPaths(filePath):
-            """Helper to return absolute and relative paths (or None)
-
-            :param filePath: str to a potential file path (rel or abs)
-            :return: dict of 'asb' and 'rel' paths or None
-            """
-            # Only construct paths if filePath is a string
-            if type(filePath) != str:
-              return None
-
-            thisFile = {}
-            # NB: Pathlib might be neater here but need to be careful
-            # e.g. on mac:
-            #    Path('C:/test/test.xlsx').is_absolute() returns False
-            #    Path('/folder/file.xlsx').relative_to('/Applications') gives error
-            #    but os.path.relpath('/folder/file.xlsx', '/Applications') correctly uses ../
-            if filePath in list(ft.defaultStim):
-                # Default/asset stim are a special case as the file doesn't exist in the usual path
-                thisFile['rel'] = thisFile['abs'] = "https://pavlovia.org/assets/default/" + ft.defaultStim[filePath]
-                thisFile['name'] = filePath
-                return thisFile
-            if len(filePath) > 2 and (filePath[0] == "/" or filePath[1] == ":")\
-                    and os.path.isfile(filePath):
-                thisFile['abs'] = filePath
-                thisFile['rel'] = os.path.relpath(filePath, srcRoot)
-                thisFile['name'] = Path(filePath).name
-                return thisFile
-            else:
-                thisFile['rel'] = filePath
-                thisFile['abs'] = os.path.normpath(join(srcRoot, filePath))
-                if len(thisFile['abs']) <= 256 and os.path.isfile(thisFile['abs']):
-                    return thisFile
-
-        def findPathsInFile(filePath):
-            """Recursively search a conditions file (xlsx or csv)
-             extracting valid file paths in any param/cond
-
-            :param filePath: str to a potential file path (rel or abs)
-            :return: list of dicts{'rel','abs'} of valid file paths
+        index = self.resourceIndex
+        index.beginScan(srcRoot, Path(self.filename).parent)
+        getPaths = index.getPaths
+        findPathsInFile = index.findPathsInFile
+
+        def getParamResources(params):
+            """Helper to return files (and survey IDs) named by a dict of
+            params
             """
-            # Clean up filePath that cannot be eval'd
-            if filePath.startswith('$'):
-                try:
-                    filePath = filePath.strip('$')
-                    filePath = eval(filePath)
-                except NameError:
-                    # List files in directory and get condition files
-                    if 'xlsx' in filePath or 'xls' in filePath or 'csv' in filePath:
-                        # Get all xlsx and csv files
-                        expFolder = Path(self.filename).parent
-                        spreadsheets = []
-                        for pattern in ['*.xlsx', '*.xls', '*.csv', '*.tsv']:
-                            # NB potentially make this search recursive with
-                            # '**/*.xlsx' but then need to exclude 'data/*.xlsx'
-                            spreadsheets.extend(expFolder.glob(pattern))
-                        files = []
-                        for condFile in spreadsheets:
-                            # call the function recursively for each excel file
-                            files.extend(findPathsInFile(str(condFile)))
-                        return files
-
-            paths = []
-            # is it a file?
-            thisFile = getPaths(filePath)  # get the abs/rel paths
-            # does it exist?
-            if not thisFile:
-                return paths
-            # OK, this file itself is valid so add to resources
-            if thisFile not in paths:
-                paths.append(thisFile)
-            # does it look at all like an excel file?
-            if (not isinstance(filePath, str)
-                    or not os.path.splitext(filePath)[1] in ['.csv', '.xlsx',
-                                                             '.xls']):
-                return paths
-            conds = data.importConditions(thisFile['abs'])  # load the abs path
-            for thisCond in conds:  # thisCond is a dict
-                for param, val in list(thisCond.items()):
-                    if isinstance(val, str) and len(val):
-                        # only add unique entries (can't use set() on a dict)
-                        for thisFile in findPathsInFile(val):
-                            if thisFile not in paths:
-                                paths.append(thisFile)
-
-            return paths
+            files = []
+            for paramName in params:
+                thisParam = params[paramName]
+                thisFile = ''
+                if isinstance(thisParam, str):
+                    thisFile = getPaths(thisParam)
+                elif isinstance(thisParam.val, str):
+                    thisFile = getPaths(thisParam.val)
+                if paramName == "surveyId" and params.get('surveyType', "") == "id":
+                    # Survey IDs are a special case, they need adding verbatim, no path sanitizing
+                    thisFile = {'surveyId': thisParam.val}
+                # then check if it's a valid path and not yet included
+                if thisFile:
+                    files.append(thisFile)
+                # if param updates on frame/repeat, check its init val too
+                if hasattr(thisParam, "updates") and thisParam.updates != "constant":
+                    thisFile = getPaths(index.getInitVal(paramName, thisParam))
+                    if thisFile:
+                        files.append(thisFile)
+            return files
 
         # Get resources for components
         compResources = []
@@ -1340,52 +1327,22 @@ class Experiment:
                     # if current component is a Resource Manager, we don't need to pre-load ANY resources
                     if isinstance(thisComp, (ResourceManagerComponent, StaticComponent)):
                         handled = True
-                    for paramName in thisComp.params:
-                        thisParam = thisComp.params[paramName]
-                        thisFile = ''
-                        if isinstance(thisParam, str):
-                            thisFile = getPaths(thisParam)
-                        elif isinstance(thisParam.val, str):
-                            thisFile = getPaths(thisParam.val)
-                        if paramName == "surveyId" and thisComp.params.get('surveyType', "") == "id":
-                            # Survey IDs are a special case, they need adding verbatim, no path sanitizing
-                            thisFile = {'surveyId': thisParam.val}
-                        # then check if it's a valid path and not yet included
-                        if thisFile and thisFile not in compResources:
+                    for thisFile in getParamResources(thisComp.params):
+                        index.addReference(thisFile, "Routine", thisEntry.name)
+                        index.addReference(thisFile, "Component", thisComp.name)
+                        if thisFile not in compResources:
                             compResources.append(thisFile)
-                        # if param updates on frame/repeat, check its init val too
-                        if hasattr(thisParam, "updates") and thisParam.updates != "constant":
-                            inits = getInitVals({paramName: thisParam})
-                            thisFile = getPaths(inits[paramName].val)
-                            # then check if it's a valid path and not yet included
-                            if thisFile and thisFile not in compResources:
-                                compResources.append(thisFile)
             elif isinstance(thisEntry, BaseStandaloneRoutine):
-                for paramName in thisEntry.params:
-                    thisParam = thisEntry.params[paramName]
-                    thisFile = ''
-                    if isinstance(thisParam, str):
-                        thisFile = getPaths(thisParam)
-                    elif isinstance(thisParam.val, str):
-                        thisFile = getPaths(thisParam.val)
-                    if paramName == "surveyId" and thisEntry.params.get('surveyType', "") == "id":
-                        # Survey IDs are a special case, they need adding verbatim, no path sanitizing
-                        thisFile = {'surveyId': thisParam.val}
-                    # then check if it's a valid path and not yet included
-                    if thisFile and thisFile not in compResources:
+                for thisFile in getParamResources(thisEntry.params):
+                    index.addReference(thisFile, "Routine", thisEntry.name)
+                    if thisFile not in compResources:
                         compResources.append(thisFile)
-                    # if param updates on frame/repeat, check its init val too
-                    if hasattr(thisParam, "updates") and thisParam.updates != "constant":
-                        inits = getInitVals({paramName: thisParam})
-                        thisFile = getPaths(inits[paramName].val)
-                        # then check if it's a valid path and not yet included
-                        if thisFile and thisFile not in compResources:
-                            compResources.append(thisFile)
             elif thisEntry.getType() == 'LoopInitiator' and "Stair" in thisEntry.loop.type:
                 url = 'https://lib.pavlovia.org/vendors/jsQUEST.min.js'
                 compResources.append({
                     'rel': url, 'abs': url,
                 })
+                index.addReference(compResources[-1], "Loop", thisEntry.loop.name)
         if handled:
             # if resources are handled, clear all component resources
             handledResources = compResources
@@ -1407,6 +1364,8 @@ class Experiment:
                 params = thisEntry.loop.params
                 if 'conditionsFile' in params:
                     condsPaths = findPathsInFile(params['conditionsFile'].val)
+                    for thisPath in condsPaths:
+                        index.addReference(thisPath, "Loop", thisEntry.loop.name)
                     # If handled, remove non-conditions file resources
                     if handled:
                         condsPathsRef = copy(condsPaths)  # copy of condsPaths for reference in loop
@@ -1427,7 +1386,9 @@ class Experiment:
         for thisEntry in val:
             thisFile = getPaths(thisEntry)
             if thisFile:
+                index.addReference(thisFile, "Settings", "Resources")
                 chosenResources.append(thisFile)
+        index.endScan()
 
         # Check for any resources not in experiment path
         resources = loopResources + compResources + chosenResources + self.requiredResources
@@ -1444,6 +1405,33 @@ class Experiment:
 
         return resources
 
+    def getResourceReferrers(self, filePath, kind=None):
+        """What refers to a file needed by the experiment.
+
+        Parameters
+        ----------
+        filePath : str
+            Path to the file, either absolute or relative to the experiment,
+            or the name of a default stimulus.
+        kind : str or None
+            Only include referrers of this kind ("Routine", "Component",
+            "Loop", "ConditionsFile" or "Settings"), otherwise include all.
+
+        Returns
+        -------
+        list of tuple
+            `(kind, name)` of each referrer, e.g. `("Routine", "trial")`.
+
+        Examples
+        --------
+        Find which Routines show an image::
+
+            exp.getResourceReferrers("stims/face.png", kind="Routine")
+        """
+        self.getResourceFiles()
+
+        return self.resourceIndex.getReferrers(filePath, kind=kind)
+
 
 class ExpFile(list):
     """An ExpFile is similar to a Routine except that it generates its code
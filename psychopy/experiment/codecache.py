@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Cache of the code written for each Routine, for incremental compiles.
+
+`Experiment.writeScript(incremental=True)` keeps the code written by each
+method of each Routine (`writeInitCode`, `writeMainCode`,
+`writeRoutineBeginCodeJS`...) along with a fingerprint of everything that
+code depends on: the params of the Routine and its Components, the loops it's
+written inside of, the experiment settings and the indent it's written at.
+When the experiment is compiled again, Routines whose fingerprint hasn't
+changed have their code copied from the cache rather than written again.
+
+Anything else a Routine does while writing code which later code relies on
+(alerts, blocks written once per script, the name of its clock) is recorded
+and replayed along with the code. Routines whose code depends on other
+Routines (i.e. which contain Static Components, or Components updated during
+a Static period or validated by another Routine) are always written afresh.
+"""
+
+__all__ = ["CodeFragmentCache"]
+
+import hashlib
+
+from psychopy import logging, __version__
+from psychopy.alerts import _alerts, alert
+from psychopy.preferences import prefs
+
+# methods of Routine which write code, by target
+_routineMethods = {
+    "PsychoPy": (
+        'writePreCode', 'writeStartCode', 'writeRunOnceInitCode',
+        'writeInitCode', 'writeMainCode', 'writeRoutineEndCode',
+        'writeExperimentEndCode'),
+    "PsychoJS": (
+        'writePreCodeJS', 'writeInitCodeJS', 'writeRoutineBeginCodeJS',
+        'writeEachFrameCodeJS', 'writeRoutineEndCodeJS'),
+}
+
+
+def _paramsFingerprint(params):
+    """Everything about a dict of params which can change the code written.
+    """
+    return [
+        (name, param.val, param.valType, param.updates, param.codeWanted,
+         param.canBePath, param.inputType, param.plugin)
+        for name, param in sorted(params.items())]
+
+
+def _digest(value):
+    return hashlib.md5(repr(value).encode('utf-8')).hexdigest()
+
+
+class _Fragment:
+    """Code written by one call of a Routine method, and what else it did.
+    """
+    __slots__ = ('code', 'indentLevel', 'writtenOnce', 'skippedOnce',
+                 'alerts', 'clockName', 'lastUsed')
+
+    def __init__(self, code, indentLevel, writtenOnce, skippedOnce, alerts,
+                 clockName, lastUsed):
+        self.code = code
+        self.indentLevel = indentLevel
+        self.writtenOnce = writtenOnce
+        self.skippedOnce = skippedOnce
+        self.alerts = alerts
+        self.clockName = clockName
+        self.lastUsed = lastUsed
+
+    def canReplay(self, buff):
+        """Blocks written once per script are written by whichever Routine
+        gets there first, so the code can only be reused if the same ones
+        have (or haven't) been written already.
+        """
+        return (not any(text in buff._writtenOnce
+                        for text in self.writtenOnce) and
+                all(text in buff._writtenOnce for text in self.skippedOnce))
+
+
+class CodeFragmentCache:
+    """Code written by the Routines of an experiment, reused by incremental
+    compiles (see module docs).
+
+    Parameters
+    ----------
+    maxAge : int
+        Number of compiles after which unused code is forgotten. Builder
+        compiles each experiment for up to three targets (Python, and
+        JavaScript with and without modules) so this should be at least 3.
+
+    Attributes
+    ----------
+    hits : int
+        Number of Routine methods whose code was reused in the last compile.
+    misses : int
+        Number of Routine methods whose code was written in the last
+        compile.
+
+    """
+    def __init__(self, maxAge=6):
+        self.maxAge = maxAge
+        self._fragments = {}
+        self._nCompiles = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __deepcopy__(self, memo):
+        # copies of an experiment (e.g. made when compiling) share its cache
+        return self
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def clear(self):
+        self._fragments.clear()
+
+    def _contextFingerprint(self, exp, target, modular):
+        """Fingerprint of things outside of any one Routine which its code
+        may depend on.
+        """
+        standalones = [
+            (rtName, type(rt).__name__, _paramsFingerprint(rt.params))
+            for rtName, rt in exp.routines.items()
+            if not isinstance(rt, list)]
+
+        return _digest((
+            __version__, exp.psychopyVersion, target, modular, exp.expPath,
+            _paramsFingerprint(exp.settings.params), standalones,
+            dict(prefs.piloting), dict(prefs.builder)))
+
+    @staticmethod
+    def _isCacheable(routine):
+        """Can the code for a Routine be cached, i.e. is it written from the
+        Routine alone?
+        """
+        for comp in routine:
+            if comp.type == 'Static':
+                return False
+            if 'validator' in comp.params and \
+                    comp.params['validator'].val not in ("", None, "None",
+                                                         "none"):
+                return False
+            for param in comp.params.values():
+                if param.updates and 'during:' in str(param.updates):
+                    return False
+
+        return True
+
+    def _routineFingerprint(self, routine):
+        return _digest([
+            (type(comp).__module__, type(comp).__name__, comp.parentName,
+             _paramsFingerprint(comp.params))
+            for comp in routine])
+
+    def _loopsFingerprint(self, exp):
+        """Fingerprint of the loops currently being written inside of.
+        """
+        return [(loop.type, _paramsFingerprint(loop.params))
+                for loop in exp.flow._loopList]
+
+    def attach(self, exp, target, modular=True):
+        """Make the Routines of `exp` (a copy of the experiment made for
+        writing a script) reuse code from the cache.
+        """
+        from psychopy.experiment.routines import Routine
+
+        self._nCompiles += 1
+        self.hits = self.misses = 0
+        context = self._contextFingerprint(exp, target, modular)
+        for routine in exp.routines.values():
+            if not isinstance(routine, Routine) or \
+                    not self._isCacheable(routine):
+                continue
+            key = (context, self._routineFingerprint(routine))
+            for method in _routineMethods.get(target, ()):
+                setattr(routine, method,
+                        self._wrap(exp, routine, method, key))
+
+    def _wrap(self, exp, routine, method, key):
+        """Wrap a method of `routine` so its code is taken from the cache if
+        possible, otherwise written as normal and stored.
+        """
+        func = getattr(routine, method)
+
+        def writeCached(buff, *args):
+            fullKey = (key, method, args, buff.target, buff.oneIndent,
+                       buff.indentLevel, routine._clockName,
+                       _digest(self._loopsFingerprint(exp)))
+            fragment = self._fragments.get(fullKey)
+            if fragment is not None and fragment.canReplay(buff):
+                self.hits += 1
+                fragment.lastUsed = self._nCompiles
+                self._replay(fragment, routine, buff)
+                return
+            self.misses += 1
+            fragment = self._record(func, routine, buff, args)
+            self._fragments[fullKey] = fragment
+
+        return writeCached
+
+    def _record(self, func, routine, buff, args):
+        """Call a Routine method, recording what it writes.
+        """
+        start = buff.tell()
+        nWrittenOnce = len(buff._writtenOnce)
+        onceQueries = buff._onceQueries = []
+        alerts = []
+        _alerts._alertRecorders.append(alerts)
+        try:
+            func(buff, *args)
+        finally:
+            _alerts._alertRecorders.remove(alerts)
+            buff._onceQueries = None
+        buff.seek(start)
+        code = buff.read()
+        writtenOnce = buff._writtenOnce[nWrittenOnce:]
+
+        return _Fragment(
+            code=code,
+            indentLevel=buff.indentLevel,
+            writtenOnce=list(writtenOnce),
+            skippedOnce=[text for text in onceQueries
+                         if text not in writtenOnce],
+            alerts=alerts,
+            clockName=routine._clockName,
+            lastUsed=self._nCompiles)
+
+    @staticmethod
+    def _replay(fragment, routine, buff):
+        buff.write(fragment.code)
+        buff.setIndentLevel(fragment.indentLevel)
+        buff._writtenOnce.extend(fragment.writtenOnce)
+        routine._clockName = fragment.clockName
+        for kwargs in fragment.alerts:
+            alert(**kwargs)
+
+    def prune(self):
+        """Forget code which hasn't been used in the last `maxAge` compiles.
+        """
+        oldest = self._nCompiles - self.maxAge
+        for key, fragment in list(self._fragments.items()):
+            if fragment.lastUsed <= oldest:
+                del self._fragments[key]
+        logging.debug(
+            "Reused code for {} of {} Routine sections".format(
+                self.hits, self.hits + self.misses))
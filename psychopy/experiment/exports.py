@@ -36,6 +36,8 @@ class IndentingBuffer(io.StringIO):
         self.oneIndent = "    "
         self.indentLevel = 0
         self._writtenOnce = []
+        # texts passed to writeOnceIndentedLines, while being recorded
+        self._onceQueries = None
         self.target = target  # useful to keep track of what language is written here
 
     def writeIndented(self, text):
@@ -78,6 +80,8 @@ class IndentingBuffer(io.StringIO):
         :meth:~`Experiment.requireImport`,
         :meth:~`Experiment.requirePsychopyLibs`
         """
+        if self._onceQueries is not None:
+            self._onceQueries.append(text)
         if text not in self._writtenOnce:
             self.writeIndentedLines(text)
             self._writtenOnce.append(text)
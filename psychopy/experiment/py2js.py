@@ -19,6 +19,7 @@ from psychopy import logging
 
 from io import StringIO
 from psychopy.experiment.py2js_transpiler import translatePythonToJavaScript
+from psychopy.experiment.translationcache import translationCache
 
 
 class TupleTransformer(ast.NodeTransformer):
@@ -55,6 +56,17 @@ def unparse(tree):
 
 def expression2js(expr):
     """Convert a short expression (e.g. a Component Parameter) Python to JS"""
+    try:
+        return translationCache.translate(
+            str(expr), _expression2js, kind="expression")
+    except SyntaxError as err:
+        logging.error(err)
+        return str(expr)
+
+
+def _expression2js(expr):
+    """Convert a short expression Python to JS (without caching), raising a
+    SyntaxError if it isn't valid Python"""
 
     # if the code contains a tuple (anywhere), convert parenths to be list.
     # This now works for compounds like `(2*(4, 5))` where the inner
@@ -63,12 +75,8 @@ def expression2js(expr):
     # into a list for the number of tuples in the expression.
     try:
         syntaxTree = ast.parse(expr)
-    except Exception:
-        try:
-            syntaxTree = ast.parse(str(expr))
-        except Exception as err:
-            logging.error(err)
-            return str(expr)
+    except Exception as err:
+        raise SyntaxError(err)
 
     for node in ast.walk(syntaxTree):
         TupleTransformer().visit(node)  # Transform tuples to list
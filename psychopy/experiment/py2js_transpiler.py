@@ -16,6 +16,8 @@ except ImportError:
 
 import astunparse
 
+from psychopy.experiment.translationcache import translationCache
+
 
 namesJS = {
     'sin': 'Math.sin',
@@ -542,18 +544,12 @@ def transformPsychoJsCode(psychoJsCode, addons, namespace=[]):
     return transformedPsychoJSCode
 
 
-def translatePythonToJavaScript(psychoPyCode, namespace=[]):
-    """Translate PsychoPy python code into PsychoJS JavaScript code.
-
-    Args:
-        psychoPyCode (str): the input PsychoPy python code
-        namespace (list, None): list of varnames which are already defined
+def _translateCode(psychoPyCode):
+    """Translate PsychoPy python code into PsychoJS JavaScript code, before
+    removing declarations of variables already in the namespace.
 
     Returns:
-        str: the PsychoJS JavaScript code
-
-    Raises:
-        (Exception): whenever a step of the translation process failed
+        tuple: the PsychoJS JavaScript code and the names of the addons it needs
     """
 
     # get the Abstract Syntax Tree (AST)
@@ -587,6 +583,29 @@ def translatePythonToJavaScript(psychoPyCode, namespace=[]):
         raise Exception(
             'unable to translate the transformed PsychoPy code into PsychoJS JavaScript code: ' + str(error))
 
+    return psychoJsCode, tuple(addons)
+
+
+def translatePythonToJavaScript(psychoPyCode, namespace=[]):
+    """Translate PsychoPy python code into PsychoJS JavaScript code.
+
+    Translations are cached (see `psychopy.experiment.translationcache`), so
+    code which has been translated before is only transformed for the given
+    namespace.
+
+    Args:
+        psychoPyCode (str): the input PsychoPy python code
+        namespace (list, None): list of varnames which are already defined
+
+    Returns:
+        str: the PsychoJS JavaScript code
+
+    Raises:
+        (Exception): whenever a step of the translation process failed
+    """
+    psychoJsCode, addons = translationCache.translate(
+        psychoPyCode, _translateCode, kind="code")
+
     # transform the JavaScript code:
     try:
         transformedPsychoJsCode = transformPsychoJsCode(psychoJsCode, addons, namespace=namespace)
@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Index of the files an experiment needs, for `Experiment.getResourceFiles`.
+
+Finding resources means checking whether the value of every param is a path
+to a file, and reading every conditions file (and any conditions files named
+in those). `ResourceIndex` remembers the outcome of each of these checks, so
+that only params whose values have changed, and conditions files which have
+been modified, are looked at again next time:
+
+    * Whether a path points to a file only changes when its folder's contents
+      change, so the outcome is kept along with the modification time of
+      the folder. Each folder is only checked once per call of
+      `getResourceFiles`, rather than each path being checked.
+    * The values in a conditions file are kept along with the modification
+      time and size of the file, so it's only read again once it changes.
+
+While resources are found, the index also records what refers to each of
+them (Routines, Components, loops, conditions files or the experiment
+settings), so tools can ask e.g. which Routines use a file.
+"""
+
+__all__ = ["ResourceIndex"]
+
+import os
+from pathlib import Path
+
+from psychopy import data, logging
+from psychopy.tools import filetools as ft
+
+# extensions of files which may be read as conditions files
+_conditionsExts = ['.csv', '.xlsx', '.xls']
+
+
+def _stamp(path):
+    """Modification time and size of a file or folder, or None if it doesn't
+    exist.
+    """
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ResourceIndex:
+    """Memoised resource discovery for an experiment, along with a graph of
+    what refers to each resource (see module docs).
+
+    Attributes
+    ----------
+    hits : int
+        Number of paths and conditions files whose outcome was reused in the
+        last call of `Experiment.getResourceFiles`.
+    misses : int
+        Number of paths and conditions files which had to be examined in the
+        last call of `Experiment.getResourceFiles`.
+
+    """
+    def __init__(self):
+        # (srcRoot, filePath) -> (folder, folder stamp, paths dict or None)
+        self._paths = {}
+        # abs path of a conditions file -> (file stamp, string values)
+        self._conditions = {}
+        # folder -> (folder stamp, spreadsheets in it)
+        self._spreadsheets = {}
+        # (param name, val, valType, updates) -> initial value
+        self._initVals = {}
+        # stamps of folders and files, checked once per scan
+        self._stamps = {}
+        self._srcRoot = ''
+        self._expFolder = Path('')
+        # resource key -> resource, and resource key -> [(kind, name), ...]
+        self._resources = {}
+        self._referrers = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __deepcopy__(self, memo):
+        # copies of an experiment (e.g. made when compiling) share its index
+        return self
+
+    def clear(self):
+        self.__init__()
+
+    def beginScan(self, srcRoot, expFolder):
+        """Start looking for the resources of an experiment, whose files are
+        relative to `srcRoot`. Files and folders changed since the last scan
+        will be looked at again, and the graph of references is started
+        afresh.
+        """
+        self._srcRoot = srcRoot
+        self._expFolder = expFolder
+        self._stamps = {}
+        self._resources = {}
+        self._referrers = {}
+        self.hits = self.misses = 0
+
+    def endScan(self):
+        logging.debug(
+            "Reused {} of {} checks for resources".format(
+                self.hits, self.hits + self.misses))
+
+    def _getStamp(self, path):
+        if path not in self._stamps:
+            self._stamps[path] = _stamp(path)
+        return self._stamps[path]
+
+    def getPaths(self, filePath):
+        """Absolute and relative paths of a file (or None if `filePath`
+        isn't a path to a file).
+
+        Parameters
+        ----------
+        filePath : str
+            Potential path to a file, either absolute or relative to the
+            experiment.
+
+        Returns
+        -------
+        dict or None
+            With 'rel' and 'abs' paths (and 'name', for absolute paths and
+            default stimuli).
+        """
+        # Only construct paths if filePath is a string
+        if type(filePath) != str:
+            return None
+        if filePath in ft.defaultStim:
+            # Default/asset stim are a special case as the file doesn't
+            # exist in the usual path
+            url = "https://pavlovia.org/assets/default/" + \
+                ft.defaultStim[filePath]
+            return {'rel': url, 'abs': url, 'name': filePath}
+
+        key = (self._srcRoot, filePath)
+        cached = self._paths.get(key)
+        if cached is not None:
+            folder, stamp, thisFile = cached
+            if self._getStamp(folder) == stamp:
+                self.hits += 1
+                return dict(thisFile) if thisFile else None
+        self.misses += 1
+        thisFile, candidate = self._findPaths(filePath)
+        folder = os.path.dirname(os.path.normpath(candidate)) or os.curdir
+        self._paths[key] = (folder, self._getStamp(folder), thisFile)
+
+        return dict(thisFile) if thisFile else None
+
+    def _findPaths(self, filePath):
+        """Check whether `filePath` is a file, returning its paths (or None)
+        and the path which was checked.
+        """
+        srcRoot = self._srcRoot
+        # NB: Pathlib might be neater here but need to be careful
+        # e.g. on mac:
+        #    Path('C:/test/test.xlsx').is_absolute() returns False
+        #    Path('/folder/file.xlsx').relative_to('/Applications') gives error
+        #    but os.path.relpath('/folder/file.xlsx', '/Applications') correctly uses ../
+        if len(filePath) > 2 and (filePath[0] == "/" or filePath[1] == ":") \
+                and os.path.isfile(filePath):
+            thisFile = {
+                'abs': filePath,
+                'rel': os.path.relpath(filePath, srcRoot),
+                'name': Path(filePath).name,
+            }
+            return thisFile, filePath
+        absPath = os.path.normpath(os.path.join(srcRoot, filePath))
+        if len(absPath) <= 256 and os.path.isfile(absPath):
+            return {'rel': filePath, 'abs': absPath}, absPath
+        return None, absPath
+
+    def getInitVal(self, paramName, param):
+        """Initial value of a param which updates during the experiment (see
+        `getInitVals`).
+        """
+        from .components import getInitVals
+
+        key = (paramName, param.val, param.valType, param.updates)
+        try:
+            return self._initVals[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # val can't be hashed, so can't be cached
+            return getInitVals({paramName: param})[paramName].val
+        inits = getInitVals({paramName: param})
+        self._initVals[key] = inits[paramName].val
+
+        return self._initVals[key]
+
+    def _getSpreadsheets(self):
+        """Spreadsheets in the experiment folder.
+        """
+        folder = self._expFolder
+        stamp = self._getStamp(str(folder))
+        cached = self._spreadsheets.get(folder)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        spreadsheets = []
+        for pattern in ['*.xlsx', '*.xls', '*.csv', '*.tsv']:
+            # NB potentially make this search recursive with
+            # '**/*.xlsx' but then need to exclude 'data/*.xlsx'
+            spreadsheets.extend(folder.glob(pattern))
+        self._spreadsheets[folder] = (stamp, spreadsheets)
+
+        return spreadsheets
+
+    def _getConditionsValues(self, absPath):
+        """Non-empty strings in a conditions file, read again only if the file
+        has changed.
+        """
+        stamp = self._getStamp(absPath)
+        cached = self._conditions.get(absPath)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        values = []
+        for thisCond in data.importConditions(absPath):  # thisCond is a dict
+            for param, val in list(thisCond.items()):
+                if isinstance(val, str) and len(val):
+                    values.append(val)
+        self._conditions[absPath] = (stamp, values)
+
+        return values
+
+    def findPathsInFile(self, filePath, _visiting=()):
+        """Recursively search a conditions file (xlsx or csv), extracting
+        valid file paths in any param/cond.
+
+        Parameters
+        ----------
+        filePath : str
+            Potential path to a file, either absolute or relative to the
+            experiment.
+
+        Returns
+        -------
+        list of dict
+            Paths of the file itself and any files named in it (see
+            `getPaths`).
+        """
+        # Clean up filePath that cannot be eval'd
+        if filePath.startswith('$'):
+            try:
+                filePath = filePath.strip('$')
+                filePath = eval(filePath)
+            except NameError:
+                # List files in directory and get condition files
+                if 'xlsx' in filePath or 'xls' in filePath or 'csv' in filePath:
+                    files = []
+                    for condFile in self._getSpreadsheets():
+                        # call the function recursively for each excel file
+                        files.extend(
+                            self.findPathsInFile(str(condFile), _visiting))
+                    return files
+
+        paths = []
+        # is it a file?
+        thisFile = self.getPaths(filePath)  # get the abs/rel paths
+        # does it exist?
+        if not thisFile:
+            return paths
+        # OK, this file itself is valid so add to resources
+        paths.append(thisFile)
+        # does it look at all like an excel file?
+        if (not isinstance(filePath, str)
+                or not os.path.splitext(filePath)[1] in _conditionsExts):
+            return paths
+        if thisFile['abs'] in _visiting:
+            # a conditions file which (indirectly) names itself
+            return paths
+        _visiting = _visiting + (thisFile['abs'],)
+        for val in self._getConditionsValues(thisFile['abs']):
+            # only add unique entries (can't use set() on a dict)
+            for namedFile in self.findPathsInFile(val, _visiting):
+                if namedFile['abs'] != thisFile['abs']:
+                    self.addReference(
+                        namedFile, "ConditionsFile", thisFile['rel'])
+                if namedFile not in paths:
+                    paths.append(namedFile)
+
+        return paths
+
+    @staticmethod
+    def _resourceKey(resource):
+        if 'abs' in resource:
+            return resource['abs']
+        if 'surveyId' in resource:
+            return "sid:" + str(resource['surveyId'])
+
+    def addReference(self, resource, kind, name):
+        """Record that `resource` (as returned by `getPaths`) is referred to
+        by something, e.g. `("Routine", "trial")`.
+        """
+        key = self._resourceKey(resource)
+        if key is None:
+            return
+        self._resources.setdefault(key, resource)
+        referrers = self._referrers.setdefault(key, [])
+        if (kind, name) not in referrers:
+            referrers.append((kind, name))
+
+    @property
+    def graph(self):
+        """What refers to each resource found by the last call of
+        `Experiment.getResourceFiles`, as a dict of lists of `(kind, name)`
+        tuples, by absolute path (or URL, or "sid:" and a survey ID).
+        Kinds are "Routine", "Component", "Loop", "ConditionsFile" (named by
+        its relative path) and "Settings".
+        """
+        return {key: list(referrers)
+                for key, referrers in self._referrers.items()}
+
+    def getReferrers(self, filePath, kind=None):
+        """What refers to a file, according to the last call of
+        `Experiment.getResourceFiles`.
+
+        Parameters
+        ----------
+        filePath : str
+            Path to the file, either absolute or relative to the experiment,
+            or the name of a default stimulus.
+        kind : str or None
+            Only include referrers of this kind (e.g. "Routine"), otherwise
+            include all.
+
+        Returns
+        -------
+        list of tuple
+            `(kind, name)` of each referrer, e.g. `("Routine", "trial")`.
+        """
+        if filePath in ft.defaultStim:
+            key = "https://pavlovia.org/assets/default/" + \
+                ft.defaultStim[filePath]
+        elif filePath in self._referrers:
+            key = filePath
+        else:
+            key = os.path.normpath(os.path.join(self._srcRoot, filePath))
+        referrers = self._referrers.get(key, [])
+
+        return [(thisKind, name) for thisKind, name in referrers
+                if kind in (None, thisKind)]
+
+    def getResources(self, kind, name):
+        """Resources referred to by something (e.g. `("Loop", "trials")`),
+        according to the last call of `Experiment.getResourceFiles`.
+        """
+        return [dict(self._resources[key])
+                for key, referrers in self._referrers.items()
+                if (kind, name) in referrers]
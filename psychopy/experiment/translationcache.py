@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Cache of Python code translated to JavaScript.
+
+Exporting an experiment to JS translates every code param (and every Code
+Component set to auto-translate) through the `py2js` transpiler, which
+parses, transforms and unparses the code each time. The same snippets are
+translated over and over, both within one compile (e.g. the same `$`
+expression in many params) and between compiles, so translations are kept
+in a `TranslationCache`, keyed by a hash of the code. Failed translations are
+kept too, so the error can be raised again without another attempt.
+
+The cache lives in memory for the session and can also be kept on disk
+between sessions (see `TranslationCache.setPath`). Translations on disk are
+discarded whenever the version of PsychoPy or of the transpiler changes.
+"""
+
+__all__ = ["TranslationCache", "translationCache"]
+
+import builtins
+import collections
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from psychopy import logging, __version__
+
+
+def _translatorVersion():
+    """Version of PsychoPy and of the translator, which translations on disk
+    must match.
+    """
+    try:
+        from importlib.metadata import version
+        pjVersion = version("javascripthon")
+    except Exception:
+        pjVersion = None
+
+    return "{} / javascripthon {}".format(__version__, pjVersion)
+
+
+class TranslationCache:
+    """Translations of Python code to JavaScript, by a hash of the code (see
+    module docs).
+
+    Parameters
+    ----------
+    maxEntries : int
+        Most translations to keep in memory; the least recently used are
+        forgotten first.
+    path : str, Path or None
+        JSON file to keep translations in between sessions, or None to only
+        keep them in memory.
+
+    Attributes
+    ----------
+    hits : dict
+        Number of translations taken from the cache, by kind of translation.
+    misses : dict
+        Number of translations made (and added to the cache), by kind of
+        translation.
+
+    """
+    def __init__(self, maxEntries=10000, path=None):
+        self.maxEntries = maxEntries
+        # digest -> (True, translation) or (False, (error type, message))
+        self._entries = collections.OrderedDict()
+        self.hits = collections.Counter()
+        self.misses = collections.Counter()
+        self.path = None
+        self._dirty = False
+        if path is not None:
+            self.setPath(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _digest(code, kind):
+        return hashlib.sha1(
+            "{}\0{}".format(kind, code).encode('utf-8', 'surrogatepass')
+        ).hexdigest()
+
+    def translate(self, code, func, kind="code"):
+        """Get the translation of `code` from the cache, or by calling
+        `func(code)` (and adding it to the cache).
+
+        Parameters
+        ----------
+        code : str
+            Python code to translate.
+        func : callable
+            Function which translates the code, returning a string, or a
+            tuple of strings (or of tuples of strings), or raising an error.
+        kind : str
+            What kind of translation `func` makes, so translations of the
+            same code by different functions are kept apart.
+
+        Returns
+        -------
+        str or tuple
+            Whatever `func` returned.
+
+        Raises
+        ------
+        Exception
+            If `func` raised an error when translating this code (now or
+            when the translation was cached). Built-in exceptions are raised
+            again as the same type, others as `Exception`.
+        """
+        if not isinstance(code, str):
+            # only text can be hashed reliably
+            return func(code)
+        key = self._digest(code, kind)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses[kind] += 1
+            try:
+                entry = (True, func(code))
+            except Exception as err:
+                entry = (False, (type(err).__name__, str(err)))
+            self._add(key, entry)
+        else:
+            self.hits[kind] += 1
+            self._entries.move_to_end(key)
+        success, value = entry
+        if not success:
+            raise self._makeError(*value)
+
+        return value
+
+    @staticmethod
+    def _makeError(errType, message):
+        """Recreate a cached error, as the same type if it's a built-in
+        exception (errors are stored by name so they can be saved to disk).
+        """
+        cls = getattr(builtins, errType, None)
+        if not (isinstance(cls, type) and issubclass(cls, Exception)):
+            cls = Exception
+        return cls(message)
+
+    def _add(self, key, entry):
+        self._entries[key] = entry
+        self._dirty = True
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Forget all translations (including any on disk) and counts of
+        hits and misses.
+        """
+        self._entries.clear()
+        self._dirty = True
+        self.resetStats()
+        self.save()
+
+    def resetStats(self):
+        self.hits.clear()
+        self.misses.clear()
+
+    def getReport(self):
+        """Hits and misses since the last `resetStats`, in total and by kind
+        of translation.
+
+        Returns
+        -------
+        dict
+            With 'hits', 'misses', 'hitRate' and 'entries' (number of
+            translations cached), and 'kinds' (a dict of 'hits' and 'misses'
+            by kind of translation).
+        """
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        kinds = {
+            kind: {'hits': self.hits[kind], 'misses': self.misses[kind]}
+            for kind in sorted(set(self.hits) | set(self.misses))}
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hitRate': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': len(self._entries),
+            'kinds': kinds,
+        }
+
+    def logReport(self):
+        report = self.getReport()
+        logging.debug(
+            "Translated {misses} Python snippets to JS and reused {hits} "
+            "translations ({entries} cached)".format(**report))
+
+    def setPath(self, path):
+        """Keep translations in a JSON file between sessions, loading any
+        translations already in it. Use `path=None` to only keep them in
+        memory.
+
+        Examples
+        --------
+        Keep translations in the user's cache folder::
+
+            from psychopy.preferences import prefs
+            translationCache.setPath(
+                Path(prefs.paths['userCacheDir']) / "py2jsTranslations.json")
+        """
+        self.path = Path(path) if path is not None else None
+        if self.path is None or not self.path.is_file():
+            return
+        try:
+            with self.path.open('r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as err:
+            logging.warning(
+                "Could not read translations from {}: {}".format(
+                    self.path, err))
+            return
+        if stored.get('version') != _translatorVersion():
+            # translated by something else, so may now be different
+            self._dirty = True
+            return
+        for key, (success, value) in stored.get('entries', {}).items():
+            # JSON stores tuples as lists
+            if isinstance(value, list):
+                value = tuple(
+                    tuple(item) if isinstance(item, list) else item
+                    for item in value)
+            self._entries.setdefault(key, (success, value))
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        """Write translations to the file given by `path` (if there is one and
+        anything has changed).
+        """
+        if self.path is None or not self._dirty:
+            return
+        stored = {
+            'version': _translatorVersion(),
+            'entries': dict(self._entries),
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmpPath = self.path.with_name(self.path.name + ".tmp")
+            with tmpPath.open('w', encoding='utf-8') as f:
+                json.dump(stored, f)
+            os.replace(tmpPath, self.path)
+        except OSError as err:
+            logging.warning(
+                "Could not save translations to {}: {}".format(self.path, err))
+            return
+        self._dirty = False
+
+
+# translations for the session, used by py2js and py2js_transpiler
+translationCache = TranslationCache()
@@ -639,22 +639,30 @@ class DeviceManager:
         return list(DeviceManager.getInitialisedDevices(deviceClass))
 
     @staticmethod
-    def getAvailableDevices(deviceClass="*"):
+    def getAvailableDevices(deviceClass="*", refresh=False):
         """
         Get all devices of a given type which are known by the operating system.
 
+        Devices are enumerated using the device inventory cache in
+        `psychopy.tools.systemtools`, so repeated calls don't probe the system
+        again unless devices have been connected or disconnected since.
+
         Parameters
         ----------
         deviceClass : str or list
             Full import path for the class, in PsychoPy, of the device. For example
             `psychopy.hardware.keyboard.Keyboard`. If given a list, will run iteratively for all
             items in the list.
+        refresh : bool
+            If True, forget cached devices and enumerate them again.
 
         Returns
         -------
         list[dict]
             List of dicts specifying parameters needed to initialise each device.
         """
+        if refresh:
+            st.invalidateDeviceCache()
         # if deviceClass is *, call for all types
         if deviceClass == "*":
             DeviceManager.importAllComponentDeviceClasses()
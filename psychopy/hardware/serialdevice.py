@@ -9,10 +9,14 @@
 ports and check for the expected device
 """
 
+import collections
 import sys
+import threading
 import time
 
-from psychopy import logging
+import numpy as np
+
+from psychopy import logging, clock
 import serial
 
 from psychopy.localization import _translate
@@ -59,12 +63,254 @@ def _findPossiblePorts():
 ports = {port: None for port in _findPossiblePorts()}
 
 
+class SerialMessage:
+    """A line received from a serial device, with the times it arrived.
+
+    Attributes
+    ----------
+    data : bytes
+        The line, including its end-of-line characters.
+    tArrival : float
+        Time (on the PsychoPy clock) at which the first byte of the line was
+        received.
+    tComplete : float
+        Time at which the end-of-line characters were received.
+    tRequest : float or None
+        Time at which the last message was sent to the device before this
+        line started arriving, if any.
+
+    """
+    __slots__ = ('data', 'tArrival', 'tComplete', 'tRequest')
+
+    def __init__(self, data, tArrival, tComplete, tRequest=None):
+        self.data = data
+        self.tArrival = tArrival
+        self.tComplete = tComplete
+        self.tRequest = tRequest
+
+    def __repr__(self):
+        return "<SerialMessage %r at %.6f>" % (self.data, self.tArrival)
+
+
+class _SerialReceiver:
+    """Reads from a serial port on a background thread, splitting what's
+    received into timestamped lines and waking anything waiting for them.
+
+    The thread blocks in `com.read()` (which waits on the port's file
+    descriptor or event, not by polling), so bytes are timestamped as soon as
+    the OS hands them over.
+
+    Parameters
+    ----------
+    com : serial.Serial
+        Open port to read from. Nothing else should read from it while the
+        receiver is running.
+    eol : bytes
+        End-of-line characters which separate messages.
+    maxStats : int
+        Number of messages to keep latency statistics for.
+
+    """
+    def __init__(self, com, eol=b"\n", maxStats=1000):
+        self.com = com
+        self.eol = eol
+        self._cond = threading.Condition()
+        self._lines = collections.deque()  # complete SerialMessages
+        self._partial = bytearray()  # bytes received since the last eol
+        self._partialTime = None
+        self._lastTime = None  # time bytes were last received
+        self.tRequest = None  # time of the last message sent
+        # (response time, delivery time) of recent messages
+        self._stats = collections.deque(maxlen=maxStats)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="SerialReceiver", daemon=True)
+        self._thread.start()
+
+    @property
+    def isRunning(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        com = self.com
+        while self._running:
+            try:
+                # blocks until at least one byte arrives (or the timeout)
+                data = com.read(max(1, com.in_waiting))
+            except Exception as err:
+                if self._running:
+                    logging.error(
+                        "Stopped reading from %s: %s" % (com.port, err))
+                break
+            if data:
+                self._receive(data, clock.getTime())
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _receive(self, data, t):
+        """Add bytes received at time `t`, queueing any complete lines.
+        """
+        with self._cond:
+            if not self._partial:
+                self._partialTime = t
+            self._lastTime = t
+            self._partial += data
+            nLines = len(self._lines)
+            while True:
+                end = self._partial.find(self.eol)
+                if end < 0:
+                    break
+                end += len(self.eol)
+                self._lines.append(SerialMessage(
+                    bytes(self._partial[:end]), self._partialTime, t,
+                    self.tRequest))
+                del self._partial[:end]
+                self._partialTime = t
+            if len(self._lines) > nLines:
+                self._cond.notify_all()
+
+    def _pop(self):
+        """Take the next line from the queue, recording its latencies.
+        """
+        msg = self._lines.popleft()
+        if msg.tRequest is not None:
+            self._stats.append((
+                msg.tComplete - msg.tRequest, clock.getTime() - msg.tComplete))
+        else:
+            self._stats.append((None, clock.getTime() - msg.tComplete))
+
+        return msg
+
+    def readLine(self, timeout=None):
+        """Wait for the next line. Returns a `SerialMessage`, or None if
+        `timeout` (s) passed before one arrived.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                    lambda: self._lines or not self._running, timeout):
+                return None
+            if not self._lines:
+                return None  # stopped
+
+            return self._pop()
+
+    def readLines(self, timeout=None, gap=0.1):
+        """Wait for the next line, then for any which follow it within `gap`
+        seconds of each other (stopping at `timeout`). Returns a list of
+        `SerialMessage`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        msg = self.readLine(timeout)
+        if msg is None:
+            return []
+        messages = [msg]
+        while True:
+            wait = gap
+            if deadline is not None:
+                wait = min(gap, deadline - time.monotonic())
+                if wait <= 0:
+                    break
+            msg = self.readLine(wait)
+            if msg is None:
+                break
+            messages.append(msg)
+
+        return messages
+
+    def readPartial(self):
+        """Take any incomplete line (bytes received since the last eol), as a
+        `SerialMessage`, or None if there is none.
+        """
+        with self._cond:
+            if not self._partial:
+                return None
+            msg = SerialMessage(
+                bytes(self._partial), self._partialTime, self._lastTime,
+                self.tRequest)
+            self._partial.clear()
+            self._partialTime = None
+
+        return msg
+
+    def readAll(self):
+        """Take everything received so far, including any incomplete line,
+        as bytes.
+        """
+        with self._cond:
+            data = b"".join(self._pop().data for n in range(len(self._lines)))
+            data += bytes(self._partial)
+            self._partial.clear()
+            self._partialTime = None
+
+        return data
+
+    def getMessages(self, clear=True):
+        """Complete lines received so far, as a list of `SerialMessage`.
+        """
+        with self._cond:
+            if not clear:
+                return list(self._lines)
+            return [self._pop() for n in range(len(self._lines))]
+
+    def getLatencyStats(self):
+        """Summarise the latencies of recent messages (see
+        `SerialDevice.getLatencyStats`).
+        """
+        with self._cond:
+            stats = list(self._stats)
+        toReturn = {'count': len(stats)}
+        responses = np.array(
+            [resp for resp, delivery in stats if resp is not None])
+        deliveries = np.array([delivery for resp, delivery in stats])
+        for name, values in (('response', responses),
+                             ('delivery', deliveries)):
+            if len(values):
+                toReturn[name] = {
+                    'mean': float(values.mean()),
+                    'median': float(np.median(values)),
+                    'min': float(values.min()),
+                    'max': float(values.max()),
+                    'p95': float(np.percentile(values, 95)),
+                }
+            else:
+                toReturn[name] = None
+
+        return toReturn
+
+    def clearLatencyStats(self):
+        with self._cond:
+            self._stats.clear()
+
+    def stop(self):
+        """Stop the reading thread (the port is left open).
+        """
+        self._running = False
+        cancel = getattr(self.com, 'cancel_read', None)
+        if cancel is not None:
+            try:
+                cancel()
+            except Exception:
+                pass
+        self._thread.join(timeout=1)
+        with self._cond:
+            self._cond.notify_all()
+
+
 class SerialDevice(BaseDevice, AttributeGetSetMixin):
     """A base class for serial devices, to be sub-classed by specific devices
 
     If port=None then the SerialDevice.__init__() will search for the device
     on known serial ports on the computer and test whether it has found the
     device using isAwake() (which the sub-classes need to implement).
+
+    By default, replies are read by polling the port when they're asked for
+    (`receiveMode="poll"`). With `receiveMode="thread"`, a background thread
+    reads from the port as soon as bytes arrive, timestamps them and queues
+    complete lines, so `getResponse()` and `awaitResponse()` wake as soon as a
+    reply is complete rather than sleeping between polls. Subclasses which
+    read from `self.com` directly should only use thread mode if they stop the
+    thread (see `stopReceiveThread()`) first.
     """
     name = b'baseSerialClass'
     longName = ""
@@ -94,7 +340,7 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
                  parity="N",  # 'N'one, 'E'ven, 'O'dd, 'M'ask,
                  eol=b"\n",
                  maxAttempts=1, pauseDuration=0.1,
-                 checkAwake=True):
+                 checkAwake=True, receiveMode="poll"):
 
         if not serial:
             raise ImportError('The module serial is needed to connect to this'
@@ -111,6 +357,8 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
 
         self.pauseDuration = pauseDuration
         self.com = None
+        self._receiver = None
+        self._pollTimeout = None  # port timeout to restore after the thread
         self.OK = False
         self.maxAttempts = maxAttempts
         if type(eol) is bytes:
@@ -177,6 +425,12 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
             # store device in ports dict
             global ports
             ports[port] = self
+            if receiveMode == "thread":
+                self.startReceiveThread()
+            elif receiveMode != "poll":
+                raise ValueError(
+                    "Unknown receiveMode %r, expected 'poll' or 'thread'"
+                    % receiveMode)
         else:
             raise DeviceNotConnectedError(
                 _translate(
@@ -200,6 +454,91 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         """
         time.sleep(self.pauseDuration)
 
+    @property
+    def receiveMode(self):
+        """How replies are read from the port: "thread" if they are being read
+        on a background thread, otherwise "poll".
+        """
+        if self._receiver is not None and self._receiver.isRunning:
+            return "thread"
+        return "poll"
+
+    def startReceiveThread(self):
+        """Start reading from the port on a background thread (see
+        `receiveMode`). Anything already on the input buffer is kept.
+        """
+        if self.receiveMode == "thread":
+            return
+        # the thread blocks in read() until bytes arrive, so the timeout only
+        # limits how long it takes to notice the port has been closed
+        self._pollTimeout = self.com.timeout
+        self.com.timeout = 1
+        self._receiver = _SerialReceiver(self.com, eol=self.eol)
+
+    def stopReceiveThread(self):
+        """Stop reading from the port on a background thread, going back to
+        polling with the port's previous timeout. Anything received but not
+        yet read is discarded.
+        """
+        if self._receiver is None:
+            return
+        self._receiver.stop()
+        self.com.timeout = self._pollTimeout
+        leftover = self._receiver.readAll()
+        if leftover:
+            logging.debug(
+                "Discarded %r received from %s" % (leftover, self.name))
+        self._receiver = None
+
+    def getMessages(self, clear=True):
+        """Get the lines received so far, with the times they arrived. Only
+        available when `receiveMode` is "thread".
+
+        Parameters
+        ----------
+        clear : bool
+            If True, remove the returned lines so that they're not returned by
+            `getResponse()` etc.
+
+        Returns
+        -------
+        list[SerialMessage]
+            Lines received, oldest first.
+        """
+        if self._receiver is None:
+            raise RuntimeError(
+                "Timestamped messages are only available when receiveMode is "
+                "'thread'")
+        return self._receiver.getMessages(clear=clear)
+
+    def getLatencyStats(self, clear=False):
+        """Get statistics about the latency of recent replies (the last 1000),
+        for diagnostics. Only available when `receiveMode` is "thread".
+
+        Parameters
+        ----------
+        clear : bool
+            If True, reset the statistics after getting them.
+
+        Returns
+        -------
+        dict
+            `'count'` is the number of replies. `'response'` summarises the
+            time (s) from sending a message to the end of the reply to it,
+            and `'delivery'` the time from the end of a reply to it being
+            read. Each is a dict with `'mean'`, `'median'`, `'min'`, `'max'`
+            and `'p95'` keys, or None if there are no replies to summarise.
+        """
+        if self._receiver is None:
+            raise RuntimeError(
+                "Latency statistics are only available when receiveMode is "
+                "'thread'")
+        stats = self._receiver.getLatencyStats()
+        if clear:
+            self._receiver.clearLatencyStats()
+
+        return stats
+
     def sendMessage(self, message, autoLog=True):
         """
         Send a command to the device (does not wait for a reply or sleep())
@@ -212,14 +551,21 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         autoLog : bool
             If True, then the message sent will be logged at level DEBUG
         """
-        if self.com.inWaiting():
+        if self._receiver is not None:
+            inStr = self._receiver.readAll()
+        elif self.com.inWaiting():
             inStr = self.com.read(self.com.inWaiting())
+        else:
+            inStr = b""
+        if inStr:
             msg = "Sending '%s' to %s but found '%s' on the input buffer"
             logging.warning(msg % (message, self.name, inStr))
         if type(message) is not bytes:
             message = bytes(message, 'utf-8')
         if not message.endswith(self.eol):
             message += self.eol  # append a newline if necess
+        if self._receiver is not None:
+            self._receiver.tRequest = clock.getTime()
         self.com.write(message)
         self.com.flush()
         # log
@@ -246,15 +592,26 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         autoLog : bool
             If True, then the message sent will be logged at level DEBUG
         """
-        # get reply (within timeout limit)
-        self.com.timeout = timeout
-        if length == 1:
-            retVal = self.com.readline()
-        elif length > 1:
-            retVal = self.com.readlines()
-            retVal = [line.decode('utf-8') for line in retVal]
-        else:  # was -1?
-            retVal = self.com.read(self.com.inWaiting())
+        if self._receiver is not None:
+            # get reply from the lines already received
+            if length == 1:
+                msg = self._receiver.readLine(timeout)
+                retVal = msg.data if msg is not None else b""
+            elif length > 1:
+                retVal = self._receiver.readLines(timeout, gap=timeout)
+                retVal = [msg.data.decode('utf-8') for msg in retVal]
+            else:
+                retVal = self._receiver.readAll()
+        else:
+            # get reply (within timeout limit)
+            self.com.timeout = timeout
+            if length == 1:
+                retVal = self.com.readline()
+            elif length > 1:
+                retVal = self.com.readlines()
+                retVal = [line.decode('utf-8') for line in retVal]
+            else:  # was -1?
+                retVal = self.com.read(self.com.inWaiting())
         if type(retVal) is bytes:
             retVal = retVal.decode('utf-8')
         # log
@@ -282,6 +639,26 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         # default timeout
         if timeout is None:
             timeout = 1
+        if self._receiver is not None:
+            # wait to be woken by the receive thread rather than polling. As
+            # when polling, a reply without an eol is returned as it is
+            # once there's nothing more to wait for
+            if multiline:
+                msgs = self._receiver.readLines(
+                    timeout, gap=self.pauseDuration)
+                partial = self._receiver.readPartial()
+                if partial is not None:
+                    msgs.append(partial)
+                if not msgs:
+                    return
+                resp = b"".join(msg.data for msg in msgs).decode('utf-8')
+                return resp.split(self.eol.decode("utf-8"))
+            msg = self._receiver.readLine(timeout)
+            if msg is None:
+                msg = self._receiver.readPartial()
+            if msg is None:
+                return
+            return msg.data.decode('utf-8')
         # set timeout
         self.com.timeout = self.pauseDuration
         # get start time
@@ -366,9 +743,12 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         return devices
 
     def close(self):
+        self.stopReceiveThread()
         self.com.close()
 
     def __del__(self):
+        if getattr(self, '_receiver', None) is not None:
+            self._receiver.stop()
         if self.com is not None:
             self.com.close()
 
@@ -27,6 +27,7 @@ from ..util import isIterable, updateDict, win32MessagePump
 from ..devices import DeviceEvent, import_device
 from ..devices.computer import Computer
 from ..devices.experiment import MessageEvent, LogEvent
+from .eventarrays import EventArrays
 from ..constants import DeviceConstants, EventConstants
 from psychopy import constants
 
@@ -71,6 +72,12 @@ class DeviceRPC():
         return a
 
     def __call__(self, *args, **kwargs):
+        asType = None
+        if self.method_name == 'getEvents':
+            asType = kwargs.get('asType', kwargs.get('as_type', 'namedtuple'))
+        if asType == 'numpy':
+            return self._getEventArrays(args, kwargs)
+
         # Send the device method call request to the ioHub Server and wait
         # for the method return value sent back from the ioHub Server.
         r = self.sendToHub(('EXP_DEVICE', 'DEV_RPC', self.device_class,
@@ -91,12 +98,6 @@ class DeviceRPC():
         # The result of a call to an iohub Device getEvents() method
         # gets some special handling, converting the returned events
         # into the desired object type, etc...
-        asType = 'namedtuple'
-        if 'asType' in kwargs:
-            asType = kwargs['asType']
-        elif 'as_type' in kwargs:
-            asType = kwargs['as_type']
-
         conversionMethod = self._returnarg
         if asType == 'dict':
             conversionMethod = ioHubConnection.eventListToDict
@@ -120,6 +121,26 @@ class DeviceRPC():
                 psycho_logging.log(ltext, llevel, ltime)
         return [conversionMethod(el) for el in r]
 
+    def _getEventArrays(self, args, kwargs):
+        # getEvents(asType='numpy') replies with the bytes of a structured
+        # array per event type, which are used as they are received
+        r = self.sendToHub(('EXP_DEVICE', 'DEV_RPC', self.device_class,
+                            self.method_name, args, kwargs),
+                           convert_result=False)
+        if r is None:
+            return None
+        events = EventArrays.fromReply(r[1])
+
+        if self.device_class == 'Experiment' and \
+                LogEvent.EVENT_TYPE_ID in events:
+            toBeLogged = events.arrays.pop(LogEvent.EVENT_TYPE_ID)
+            if psycho_logging:
+                for l in toBeLogged.tolist():
+                    psycho_logging.log(
+                        l[self._log_text_index].decode('utf-8', 'ignore'),
+                        l[self._log_level_index], l[self._log_time_index])
+        return events
+
 
 # pylint: disable=protected-access
 
@@ -295,6 +316,7 @@ class ioHubConnection():
         self._shutdown_attempted = False
         self._cv_order = None
         self._message_cache = []
+        self._clock_sync = None
         self.iohub_status = self._startServer(ioHubConfig, ioHubConfigAbsPath)
         if self.iohub_status != 'OK':
             raise RuntimeError('Error starting ioHub server: {}'.format(self.iohub_status))
@@ -357,6 +379,13 @@ class ioHubConnection():
             * 'dict': Each event converted to a dict object.
             * 'object': Each event is converted to a DeviceEvent subclass
                         based on the event's type.
+            * 'numpy': Events are returned as an EventArrays, holding a
+                       numpy structured array of the events of each type
+                       (with the event class's NUMPY_DTYPE), which are
+                       only converted to namedtuples when iterated over.
+                       String fields are limited to their width in
+                       NUMPY_DTYPE (e.g. 128 bytes of utf-8 for
+                       MessageEvent.text), so longer values are cut.
 
         Args:
             device_label (str): Name of device to retrieve events for.
@@ -368,6 +397,9 @@ class ioHubConnection():
         Returns:
             tuple: List of event objects; object type controlled by 'as_type'.
         """
+        if as_type == 'numpy':
+            return self._getEventArrays(device_label)
+
         r = None
         if device_label is None:
             events = self._sendToHubServer(('GET_EVENTS',))[1]
@@ -398,6 +430,22 @@ class ioHubConnection():
 
         return []
 
+    def _getEventArrays(self, device_label=None):
+        if device_label is not None:
+            return self.devices.getDevice(device_label).getEvents(
+                asType='numpy')
+
+        reply = self._sendToHubServer(('GET_EVENTS', 'numpy'),
+                                      convert_result=False)
+        events = EventArrays.fromReply(reply[1])
+        if self.allEvents:
+            # events got by other calls (e.g. wait) come first
+            earlier = EventArrays.fromEventLists(self.allEvents)
+            earlier.extend(events)
+            events = earlier
+            self.allEvents = []
+        return events
+
     def clearEvents(self, device_label='all'):
         """Clears unread events from the ioHub Server's Event Buffer(s)
         so that unneeded events are not discarded.
@@ -739,6 +787,46 @@ class ioHubConnection():
         # sync clock in server process
         return self._sendToHubServer(('RPC', 'syncClock', (params,)))
 
+    def startClockSync(self, interval=1.0, store_interval=10.0):
+        """Start estimating the offset and drift between this process's
+        clock and the iohub server's, in a background thread which sends a
+        few time sync requests every interval seconds (see
+        psychopy.iohub.clocksync).
+
+        Args:
+            interval (float): Seconds between syncs.
+            store_interval (float): Seconds between saving the current model
+                                    to the ioDataStore file (if enabled), or
+                                    None not to save it.
+
+        Returns:
+            ClockSyncModel: Model of the iohub server's clock, kept up to date
+            while the sync runs, e.g. to convert event times with
+            remote2LocalTime().
+        """
+        if self._clock_sync is None:
+            from ..clocksync import ClockSyncService
+            server_udp_port = self._iohub_server_config.get('udp_port', 9000)
+            self._clock_sync = ClockSyncService(
+                ('127.0.0.1', server_udp_port), interval,
+                store_interval=store_interval)
+            self._clock_sync.start()
+        return self._clock_sync.model
+
+    def stopClockSync(self):
+        """Stop the clock sync started by startClockSync(), saving the model a
+        last time if it was being saved.
+
+        Returns:
+            ClockSyncModel: Final model, or None if no sync was running.
+        """
+        if self._clock_sync is None:
+            return None
+        self._clock_sync.stop()
+        model = self._clock_sync.model
+        self._clock_sync = None
+        return model
+
     def setPriority(self, level='normal', disable_gc=False):
         """See Computer.setPriority documentation, where current process will
         be the iohub process."""
@@ -1167,13 +1255,15 @@ class ioHubConnection():
                 r.append(i)
         return r
 
-    def _sendToHubServer(self, tx_data):
+    def _sendToHubServer(self, tx_data, convert_result=True):
         """General purpose local <-> iohub server process UDP based
         request - reply code. The method blocks until the request is fulfilled
         and and a response is received from the ioHub server.
 
         Args:
             tx_data (tuple): data to send to iohub server
+            convert_result (bool): Convert any bytes in the response to str.
+                                   False for responses holding binary data.
 
         Return (object): response from the ioHub Server process.
         """
@@ -1210,7 +1300,7 @@ class ioHubConnection():
             raise ioHubError(result)
         # Otherwise return the result
         
-        if result is not None:
+        if result is not None and convert_result:
             # Use recursive conversion funcs                     
             if isinstance(result, list) or  isinstance(result, tuple):
                 result = self._convertList(result)
@@ -1311,6 +1401,7 @@ class ioHubConnection():
         if self._shutdown_attempted is False:
             # send any cached experiment messages
             self.sendMessageEvents()
+            self.stopClockSync()
 
             try:
                 from psychopy.visual import window
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Part of the PsychoPy library
+# Copyright (C) 2012-2020 iSolver Software Solutions (C) 2021 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+"""
+Events returned by getEvents(asType='numpy'), as a numpy structured array for
+each event type instead of an object for each event.
+"""
+import numpy as np
+
+from ..constants import EventConstants
+from ..devices import packEventArrays
+
+
+class EventArrays():
+    """Events returned by ioHubConnection.getEvents(as_type='numpy') or a
+    device's getEvents(asType='numpy'): a numpy structured array for each
+    event type, with the NUMPY_DTYPE of the event class.
+
+    The arrays are made from the reply sent by the iohub server without
+    copying it, so are read only. Fields of all the events of a type can be
+    used directly, without making an object per event::
+
+        events = io.devices.mouse.getEvents(asType='numpy')
+        moves = events[EventConstants.MOUSE_MOVE]
+        x, y = moves['x_position'], moves['y_position']
+
+    Iterating over an EventArrays gives each event as a namedtuple, as
+    getEvents() returns by default, in time order. Each namedtuple is only
+    made when it's reached, so code written for lists of events still works,
+    with one difference: string fields are limited to their width in
+    NUMPY_DTYPE (e.g. 128 bytes of utf-8 for MessageEvent.text, 32 for
+    MessageEvent.category), as in the ioDataStore file. Longer values are cut
+    (and the iohub server prints a warning the first time). len() gives the
+    number of events of all types.
+
+    :param arrays: (dict) Event type id: structured array of events of
+                   that type.
+    """
+
+    def __init__(self, arrays=None):
+        self.arrays = dict(arrays or {})
+
+    @classmethod
+    def fromReply(cls, reply):
+        """Create from the reply to getEvents(asType='numpy'), made by
+        psychopy.iohub.devices.packEventArrays.
+
+        :param reply: (list) [event_type_id, bytes] pairs, or None.
+        :return: (EventArrays)
+        """
+        arrays = {}
+        for event_type, data in reply or []:
+            arrays[event_type] = np.frombuffer(
+                data, dtype=EventConstants.getClass(event_type).NUMPY_DTYPE)
+        return cls(arrays)
+
+    @classmethod
+    def fromEventLists(cls, events):
+        """Create from events in list form.
+
+        :param events: (list) Events in list form.
+        :return: (EventArrays)
+        """
+        return cls.fromReply(packEventArrays(events))
+
+    def extend(self, other):
+        """Add the events of another EventArrays after those of each type in
+        this one.
+
+        :param other: (EventArrays)
+        """
+        for event_type, array in other.arrays.items():
+            if event_type in self.arrays:
+                array = np.concatenate([self.arrays[event_type], array])
+            self.arrays[event_type] = array
+
+    @property
+    def eventTypes(self):
+        """Event type ids of the events held.
+
+        :return: (list)
+        """
+        return list(self.arrays)
+
+    def __getitem__(self, event_type):
+        """Get the array of events of a type, given its event type id or name
+        (e.g. EventConstants.MOUSE_MOVE or 'MOUSE_MOVE'). An empty array is
+        returned if there are no events of the type. Raises KeyError for an
+        unknown event type.
+        """
+        event_type = self._eventTypeID(event_type)
+        array = self.arrays.get(event_type)
+        if array is None:
+            event_class = EventConstants.getClass(event_type)
+            if event_class is None:
+                raise KeyError('Unknown event type: {}'.format(event_type))
+            return np.zeros(0, dtype=event_class.NUMPY_DTYPE)
+        return array
+
+    def __contains__(self, event_type):
+        return self._eventTypeID(event_type) in self.arrays
+
+    def __len__(self):
+        return sum(len(array) for array in self.arrays.values())
+
+    def __iter__(self):
+        arrays = [array for array in self.arrays.values() if len(array)]
+        if not arrays:
+            return
+        classes = [EventConstants.getClass(array['type'][0])
+                   for array in arrays]
+        times = np.concatenate([array['time'] for array in arrays])
+        array_indexes = np.repeat(np.arange(len(arrays)),
+                                  [len(array) for array in arrays])
+        event_indexes = np.concatenate(
+            [np.arange(len(array)) for array in arrays])
+        order = np.argsort(times, kind='stable')
+        for a, e in zip(array_indexes[order].tolist(),
+                        event_indexes[order].tolist()):
+            yield self._asNamedTuple(classes[a], arrays[a][e])
+
+    def __repr__(self):
+        return 'EventArrays({})'.format(', '.join(
+            '{}: {}'.format(EventConstants.getName(event_type), len(array))
+            for event_type, array in self.arrays.items()))
+
+    @staticmethod
+    def _eventTypeID(event_type):
+        """Event type id of an event type id or name, raising KeyError for an
+        unknown name.
+        """
+        if not isinstance(event_type, str):
+            return event_type
+        event_type_id = EventConstants.getID(event_type)
+        if event_type_id is None:
+            raise KeyError('Unknown event type: {}'.format(event_type))
+        return event_type_id
+
+    @staticmethod
+    def _asNamedTuple(event_class, record):
+        values = [value.decode('utf-8', 'ignore')
+                  if isinstance(value, bytes) else value
+                  for value in record.tolist()]
+        return event_class.createEventAsNamedTuple(values)
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+# Part of the psychopy.iohub library.
+# Copyright (C) 2012-2020 iSolver Software Solutions (C) 2021 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+"""
+Continuous estimate of the offset and drift between the clock of the
+experiment process and that of the iohub server.
+
+ioHubConnection.syncClock sets the iohub server's clock to match the
+experiment's once. ClockSyncService keeps checking it: it sends time sync
+requests to the iohub server in the background, and ClockSyncModel fits a
+line to the round trip times, giving the iohub time at any experiment time
+(and back), with an estimate of its uncertainty. The fitted models can be
+saved to the session's ioDataStore file (the data_collection/clock_sync
+table), to realign event times afterwards::
+
+    model = io.startClockSync()
+    ...
+    local_times = model.remote2LocalTime(events['time'])
+
+    # or, from the rows saved in the hdf5 file
+    model = ClockSyncModel.fromRecord(clock_sync_table[-1])
+"""
+import threading
+
+import numpy as np
+
+from .devices import Computer
+from .errors import print2err, printExceptionDetailsToStdErr
+from .net import UDPClientConnection, MAX_PACKET_SIZE
+from .util import NumPyRingBuffer
+
+getTime = Computer.getTime
+
+# scale from the median absolute deviation to the standard deviation, for
+# normally distributed values
+MAD_SCALE = 1.4826
+
+
+class ClockSyncModel():
+    """Linear model of a remote clock (e.g. the iohub server's) against the
+    local one (the experiment process's)::
+
+        remote_time = drift * local_time + offset
+
+    fitted to time sync samples: the local time half way through a round trip
+    to the remote process, the remote time returned, and the round trip time.
+
+    Samples whose round trip took much longer than usual (e.g. because either
+    process wasn't scheduled in time) are left out, as are samples whose
+    remote time is far off the line fitted to the rest; each is judged by
+    the median and median absolute deviation of the samples kept.
+
+    Only the last max_samples samples are used, so the model follows slow
+    changes in drift.
+
+    Attributes (updated by fit()):
+        offset (float): Remote time at local time 0.
+        drift (float): Remote seconds per local second.
+        uncertainty (float): Standard error of the remote time given by the
+            model at the time of the latest sample, or NaN with too few
+            samples. This doesn't include any difference in the time taken
+            by requests and replies, which is at most half the round trip
+            time.
+        rtt (float): Median round trip time (sec) of the samples used.
+        sample_count (int): Number of samples used.
+        time (float): Local time of the latest sample used.
+
+    :param max_samples: (int) Number of most recent samples to fit.
+    :param rtt_threshold: (float) Samples with a round trip time more than
+                          this many (robust) standard deviations over the
+                          median are left out.
+    :param residual_threshold: (float) Samples more than this many (robust)
+                               standard deviations off the fitted line are
+                               left out.
+    """
+    fields = ('time', 'offset', 'drift', 'uncertainty', 'rtt', 'sample_count')
+
+    def __init__(self, max_samples=600, rtt_threshold=3.0,
+                 residual_threshold=3.0):
+        self.max_samples = max_samples
+        self.rtt_threshold = rtt_threshold
+        self.residual_threshold = residual_threshold
+        self._local_times = NumPyRingBuffer(max_samples, dtype=np.float64)
+        self._remote_times = NumPyRingBuffer(max_samples, dtype=np.float64)
+        self._rtts = NumPyRingBuffer(max_samples, dtype=np.float64)
+        self._lock = threading.Lock()
+        # (time, offset, drift, uncertainty, rtt, sample_count), replaced as
+        # a whole so it can be read while the model is being fitted
+        self._params = (np.nan, 0.0, 1.0, np.nan, np.nan, 0)
+
+    def addSample(self, local_time, remote_time, rtt):
+        """Add a time sync sample.
+
+        :param local_time: (float) Local time half way through the round trip.
+        :param remote_time: (float) Remote time returned.
+        :param rtt: (float) Round trip time (sec).
+        """
+        with self._lock:
+            self._local_times.append(local_time)
+            self._remote_times.append(remote_time)
+            self._rtts.append(rtt)
+
+    def clear(self):
+        """Forget all samples (the current parameters are kept until the next
+        fit)."""
+        with self._lock:
+            self._local_times.clear()
+            self._remote_times.clear()
+            self._rtts.clear()
+
+    def _samples(self):
+        with self._lock:
+            count = len(self._rtts)
+            start = self.max_samples - count
+            return (self._local_times.getElements()[start:].copy(),
+                    self._remote_times.getElements()[start:].copy(),
+                    self._rtts.getElements()[start:].copy())
+
+    def fit(self):
+        """Fit the model to the samples added.
+
+        :return: (bool) False if there were no samples to fit.
+        """
+        local_times, remote_times, rtts = self._samples()
+        if len(rtts) == 0:
+            return False
+
+        keep = rtts <= np.median(rtts) + self.rtt_threshold * max(
+            MAD_SCALE * np.median(np.abs(rtts - np.median(rtts))), 1e-6)
+        # fit the difference between the clocks, against time since the mean
+        # sample time, which keeps the numbers small
+        differences = remote_times - local_times
+        mean_time, skew, intercept = self._fitLine(
+            local_times[keep], differences[keep])
+        for _ in range(3):
+            residuals = differences - (
+                intercept + skew * (local_times - mean_time))
+            spread = MAD_SCALE * np.median(np.abs(residuals[keep]))
+            inliers = keep & (np.abs(residuals) <=
+                              self.residual_threshold * max(spread, 1e-7))
+            if inliers.sum() < 2 or np.array_equal(inliers, keep):
+                break
+            keep = inliers
+            mean_time, skew, intercept = self._fitLine(
+                local_times[keep], differences[keep])
+        residuals = differences[keep] - (
+            intercept + skew * (local_times[keep] - mean_time))
+
+        count = int(keep.sum())
+        latest = local_times[keep].max()
+        uncertainty = np.nan
+        if count > 2:
+            sxx = np.sum((local_times[keep] - mean_time) ** 2)
+            sigma = np.sqrt(np.sum(residuals ** 2) / (count - 2))
+            uncertainty = sigma * np.sqrt(
+                1.0 / count + (latest - mean_time) ** 2 / sxx)
+        self._params = (latest,
+                        intercept - skew * mean_time,
+                        1.0 + skew,
+                        uncertainty,
+                        np.median(rtts[keep]),
+                        count)
+        return True
+
+    @staticmethod
+    def _fitLine(times, differences):
+        mean_time = times.mean()
+        if len(times) > 1 and np.ptp(times) > 0:
+            skew, intercept = np.polyfit(times - mean_time, differences, 1)
+        else:
+            skew, intercept = 0.0, differences.mean()
+        return mean_time, skew, intercept
+
+    @property
+    def time(self):
+        return self._params[0]
+
+    @property
+    def offset(self):
+        return self._params[1]
+
+    @property
+    def drift(self):
+        return self._params[2]
+
+    @property
+    def uncertainty(self):
+        return self._params[3]
+
+    @property
+    def rtt(self):
+        return self._params[4]
+
+    @property
+    def sample_count(self):
+        return self._params[5]
+
+    def local2RemoteTime(self, local_time=None):
+        """Converts local time(s) to the corresponding remote time(s).
+
+        :param local_time: (float or numpy.ndarray) Local time(s), or None for
+                           the current time.
+        :return: (float or numpy.ndarray)
+        """
+        if local_time is None:
+            local_time = getTime()
+        _, offset, drift = self._params[:3]
+        return drift * np.asarray(local_time) + offset
+
+    def remote2LocalTime(self, remote_time):
+        """Converts remote time(s), e.g. the times of iohub events, to the
+        corresponding local time(s).
+
+        :param remote_time: (float or numpy.ndarray) Remote time(s).
+        :return: (float or numpy.ndarray)
+        """
+        _, offset, drift = self._params[:3]
+        return (np.asarray(remote_time) - offset) / drift
+
+    def asRecord(self):
+        """Current parameters as a dict, with the keys in fields.
+
+        :return: (dict)
+        """
+        return dict(zip(self.fields, (float(v) for v in self._params)))
+
+    @classmethod
+    def fromRecord(cls, record):
+        """Create a model with the parameters of a record from asRecord, or a
+        row of the clock_sync table of an ioDataStore file.
+
+        :param record: (dict or numpy.void)
+        :return: (ClockSyncModel)
+        """
+        model = cls()
+        model._params = tuple(record[field] for field in cls.fields)
+        return model
+
+    def __repr__(self):
+        return ('ClockSyncModel(offset={:.6f}, drift={:.9f}, '
+                'uncertainty={:.6f}, rtt={:.6f}, sample_count={})').format(
+                    self.offset, self.drift, self.uncertainty, self.rtt,
+                    self.sample_count)
+
+
+class ClockSyncService(threading.Thread):
+    """Background thread which sends time sync requests to an iohub server
+    every interval seconds and fits a ClockSyncModel to them.
+
+    Each sync sends batch_size requests, one after the other, and adds the
+    one with the shortest round trip to the model. The service uses its own
+    socket, so it doesn't interfere with other requests to the server.
+
+    :param remote_address: (tuple) Host and UDP port of the iohub server.
+    :param interval: (float) Seconds between syncs.
+    :param batch_size: (int) Requests sent per sync.
+    :param store_interval: (float) Seconds between sending the model to the
+                           iohub server to save in the ioDataStore file, or
+                           None not to save it.
+    :param model: (ClockSyncModel) Model to fit, by default a new one.
+    :param timeout: (float) Seconds to wait for each reply.
+    """
+
+    def __init__(self, remote_address, interval=1.0, batch_size=5,
+                 store_interval=None, model=None, timeout=0.5):
+        threading.Thread.__init__(self, name='ioHubClockSync', daemon=True)
+        self.remote_address = tuple(remote_address)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.store_interval = store_interval
+        self.model = model or ClockSyncModel()
+        self._sync_socket = UDPClientConnection(
+            remote_host=self.remote_address[0],
+            remote_port=self.remote_address[1],
+            rcvBufferLength=MAX_PACKET_SIZE, timeout=timeout)
+        self._request_id = 0
+        self._stop_event = threading.Event()
+        self._last_store_time = None
+
+    def sample(self):
+        """Send batch_size time sync requests.
+
+        :return: (tuple) local time, remote time and round trip time of the
+                 fastest round trip, or None if there were no replies.
+        """
+        best = None
+        for _ in range(self.batch_size):
+            self._request_id += 1
+            request_id = self._request_id
+            send_time = getTime()
+            self._sync_socket.sendTo(['SYNC_REQ', request_id])
+            while True:
+                reply = self._sync_socket.receive()
+                if reply is None:
+                    # timed out
+                    break
+                reply = reply[0]
+                # skip late replies to earlier requests
+                if reply[0] == 'SYNC_REPLY' and len(reply) > 2 and \
+                        reply[2] == request_id:
+                    break
+            receive_time = getTime()
+            if reply is None:
+                continue
+            rtt = receive_time - send_time
+            if best is None or rtt < best[2]:
+                best = ((send_time + receive_time) / 2.0, reply[1], rtt)
+        return best
+
+    def sync(self):
+        """Add a sample to the model and refit it.
+
+        :return: (bool) True if the iohub server replied.
+        """
+        sample = self.sample()
+        if sample is None:
+            return False
+        self.model.addSample(*sample)
+        self.model.fit()
+        return True
+
+    def storeModel(self):
+        """Send the current model to the iohub server, to be saved in the
+        ioDataStore file (if one is open)."""
+        # the reply is skipped by the next sample
+        self._sync_socket.sendTo(
+            ('RPC', 'addClockSyncModel', (self.model.asRecord(),)))
+        self._last_store_time = getTime()
+
+    def run(self):
+        try:
+            self.sync()
+            while not self._stop_event.wait(self.interval):
+                if not self.sync():
+                    continue
+                if self.store_interval is not None and (
+                        self._last_store_time is None or
+                        getTime() - self._last_store_time >=
+                        self.store_interval):
+                    self.storeModel()
+        except Exception: # pylint: disable=broad-except
+            print2err('** Exception in ClockSyncService: ')
+            printExceptionDetailsToStdErr()
+        finally:
+            self._sync_socket.close()
+
+    def stop(self, store=True):
+        """Stop syncing, and wait for the thread to finish.
+
+        :param store: (bool) Send the model to be saved a last time first.
+        """
+        if store and self.store_interval is not None and self.is_alive():
+            self.storeModel()
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
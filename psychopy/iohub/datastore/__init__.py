@@ -13,7 +13,7 @@ from ..constants import EventConstants
 from ..errors import ioHubError, printExceptionDetailsToStdErr, print2err
 
 import tables
-from tables import parameters, StringCol, UInt32Col, UInt16Col, NoSuchNodeError
+from tables import parameters, StringCol, UInt32Col, UInt16Col, Float64Col, NoSuchNodeError
 
 if Version(tables.__version__) < Version('3'):
     from tables import openFile as open_file
@@ -288,6 +288,31 @@ class DataStoreFile():
                 printExceptionDetailsToStdErr()
         return False
 
+    def addClockSyncModel(self, model):
+        """Add a row to the clock_sync table, made the first time it's
+        needed, holding a model of the iohub server's clock against the
+        experiment process's (see psychopy.iohub.clocksync.ClockSyncModel).
+        """
+        try:
+            clock_sync_table = self.TABLES.get('CLOCK_SYNC')
+            if clock_sync_table is None:
+                data_collection = self.emrtFile.root.data_collection
+                try:
+                    clock_sync_table = getattr(data_collection, _f_get_child)('clock_sync')
+                except NoSuchNodeError:
+                    clock_sync_table = getattr(self.emrtFile, create_table)(
+                        data_collection, 'clock_sync', ClockSyncModels,
+                        title='iohub Server Clock Models (remote_time = drift * local_time + offset).')
+                self.TABLES['CLOCK_SYNC'] = clock_sync_table
+            values = (self.active_experiment_id or 0, self.active_session_id or 0, model['time'], model['offset'],
+                      model['drift'], model['uncertainty'], model['rtt'], model['sample_count'])
+            clock_sync_table.append([values, ])
+            self.bufferedFlush()
+            return True
+        except Exception:
+            printExceptionDetailsToStdErr()
+        return False
+
     def checkForExperimentAndSessionIDs(self, event=None):
         if self.active_experiment_id is None or self.active_session_id is None:
             exp_id = self.active_experiment_id
@@ -437,3 +462,14 @@ class SessionMetaData(tables.IsDescription):
     name = StringCol(256, pos=4)
     comments = StringCol(4096, pos=5)
     user_variables = StringCol(16384, pos=6)  # Holds json encoded version of user variable dict for session
+
+
+class ClockSyncModels(tables.IsDescription):
+    experiment_id = UInt32Col(pos=1)
+    session_id = UInt32Col(pos=2)
+    time = Float64Col(pos=3)  # experiment process time of the latest sample used
+    offset = Float64Col(pos=4)
+    drift = Float64Col(pos=5)
+    uncertainty = Float64Col(pos=6)
+    rtt = Float64Col(pos=7)
+    sample_count = UInt32Col(pos=8)
@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Part of the PsychoPy library
+# Copyright (C) 2012-2020 iSolver Software Solutions (C) 2021 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+"""
+Chunked queries of the event tables in an ioHub DataStore file.
+
+An EventQuery reads the requested columns of an event table, either all of
+it or split into time windows (e.g. one per trial), a chunk of rows at a time
+rather than one row (or one column) at a time. Each chunk is a numpy
+structured array holding just the requested columns, so results can be
+streamed to a file (see DelimitedWriter and ParquetWriter) without the whole
+table being held in memory.
+
+Rows in a time window are found by:
+
+    * a binary search of the time column, if the table is in time order (the
+      usual case, as events are saved as they arrive), so only the rows in
+      the window are read;
+    * the PyTables index of the time column otherwise, creating it if the
+      file is writable;
+    * an index of the time column kept in memory, if the file is read only.
+
+PyTables indexes are also created (if the file is writable) for any of the
+time, session_id, trial_id and type columns named in a query's condition, so
+PyTables can use them when selecting rows. Indexes are saved in the file, so
+are only created once.
+"""
+import re
+
+import numpy
+from numpy.lib import recfunctions
+
+from ..errors import print2err
+
+# Columns which PyTables indexes are created for on demand
+INDEXED_COLUMNS = ('time', 'session_id', 'trial_id', 'type')
+
+# Number of rows to read at a time
+DEFAULT_CHUNK_SIZE = 2 ** 16
+
+
+def createIndexes(table, columns=INDEXED_COLUMNS):
+    """
+    Create a PyTables index for each of the given columns of an ioHub DataStore table which doesn't
+    have one already. Columns the table doesn't have are ignored, as are all columns if the file
+    was opened read only.
+
+    :param table: (tables.Table) The table to index.
+    :param columns: (list) Names of the columns to index.
+    :return: (list) Names of the given columns which are indexed.
+    """
+    indexed = []
+    for name in columns:
+        if name not in table.colnames:
+            continue
+        column = table.cols._f_col(name)
+        if not column.is_indexed:
+            if table._v_file.mode == 'r':
+                continue
+            try:
+                column.create_index()
+            except Exception as e:
+                print2err('createIndexes: Could not index column %s of %s: %s' % (name, table._v_pathname, e))
+                continue
+        indexed.append(name)
+    if indexed and table._v_file.mode != 'r':
+        table.flush()
+    return indexed
+
+
+def _formatColumn(values, emptyValue='.', widenFloats=False):
+    """
+    Text of each value in a column, as written to a delimited file. Floats are written as str(numpy.float32)
+    etc. would, unless widenFloats is True.
+    """
+    if values.ndim > 1:
+        return [str(v) for v in values]
+    if values.dtype.kind == 'S':
+        values = numpy.char.decode(values, 'utf-8')
+    if values.dtype.kind == 'U':
+        if emptyValue is not None:
+            values = numpy.where(values == '', emptyValue, values)
+        return values.tolist()
+    if values.dtype.kind == 'f' and widenFloats:
+        # as for the values of rows read one at a time, which PyTables gives as Python floats
+        values = values.astype(numpy.float64)
+    return values.astype(str).tolist()
+
+
+def _quote(values, delimiter):
+    """
+    Values quoted as in a csv file, if they contain the delimiter, quotes or new lines.
+    """
+    return ['"%s"' % v.replace('"', '""') if (delimiter in v or '"' in v or '\n' in v) else v
+            for v in values]
+
+
+class EventQuery:
+    """
+    Chunked reads of columns of an ioHub DataStore event table, optionally split into time windows.
+
+    Args:
+        table (tables.Table): The event table to query.
+
+        fields (list): Names of the columns to read, or None for all of them.
+
+        condition (str): PyTables condition rows must meet, e.g. '(type == 52) & (session_id == 1)',
+        or None for all rows.
+
+        condvars (dict): Values of any variables used in condition, other than columns.
+
+        chunkSize (int): Most rows to read (and return) at a time.
+
+        orderBy (str): Name of a column to sort the rows of each time window (or of the table) by,
+        or None to keep the order of the table. Each time window is read in one go if set.
+
+        index (bool): Whether to create PyTables indexes for the columns used by the query
+        (see createIndexes). Only possible if the file was opened writable.
+    """
+
+    def __init__(self, table, fields=None, condition=None, condvars=None, chunkSize=DEFAULT_CHUNK_SIZE,
+                 orderBy=None, index=True):
+        if fields is None:
+            fields = table.colnames
+        for name in fields:
+            if name not in table.colnames:
+                raise ValueError('EventQuery: %s does not have a column named %s' % (table._v_pathname, name))
+        self.table = table
+        self.fields = list(fields)
+        self.condition = condition or None
+        self.condvars = dict(condvars or {})
+        self.chunkSize = max(int(chunkSize), 1)
+        self.orderBy = orderBy
+        self.index = index
+        self._times = None
+        self._timeOrder = None
+        self._timeSorted = None
+        if index and self.condition:
+            # index the columns the condition selects by, so PyTables can use them
+            used = set(re.findall(r'[A-Za-z_]\w*', self.condition))
+            createIndexes(table, [name for name in INDEXED_COLUMNS if name in used])
+
+    @property
+    def dtype(self):
+        """The dtype of the chunks returned."""
+        return numpy.dtype([(name, self.table.coldtypes[name]) for name in self.fields])
+
+    def _project(self, rows):
+        if list(rows.dtype.names) == self.fields:
+            return rows
+        return recfunctions.repack_fields(rows[self.fields])
+
+    def _loadTimes(self):
+        """
+        Read the time column (a chunk at a time) and check whether it's in order.
+        """
+        if self._timeSorted is not None:
+            return
+        table = self.table
+        times = numpy.empty(table.nrows, dtype=numpy.float64)
+        for start in range(0, table.nrows, self.chunkSize):
+            stop = min(start + self.chunkSize, table.nrows)
+            times[start:stop] = table.read(start, stop, field='time')
+        self._times = times
+        self._timeSorted = bool(numpy.all(times[1:] >= times[:-1]))
+        if not self._timeSorted:
+            if self.index and createIndexes(self.table, ['time']):
+                # PyTables will find the rows of each window, so times aren't needed
+                self._times = None
+            else:
+                # file is read only, so keep an index in memory
+                self._timeOrder = numpy.argsort(times, kind='stable')
+                self._times = times[self._timeOrder]
+
+    def _readRange(self, start, stop):
+        """
+        Rows from start to stop which meet the condition, a chunk at a time.
+        """
+        for chunkStart in range(start, stop, self.chunkSize):
+            chunkStop = min(chunkStart + self.chunkSize, stop)
+            if self.condition:
+                rows = self.table.read_where(self.condition, self.condvars, start=chunkStart, stop=chunkStop)
+            else:
+                rows = self.table.read(chunkStart, chunkStop)
+            if len(rows):
+                yield rows
+
+    def _readCoordinates(self, coords, condition=None):
+        """
+        Rows at the given coordinates which meet condition, a chunk at a time.
+        """
+        for chunkStart in range(0, len(coords), self.chunkSize):
+            rows = self.table.read_coordinates(coords[chunkStart:chunkStart + self.chunkSize])
+            if condition:
+                import numexpr
+                columns = {name: rows[name] for name in rows.dtype.names if rows[name].ndim == 1}
+                columns.update(self.condvars)
+                rows = rows[numexpr.evaluate(condition, local_dict=columns)]
+            if len(rows):
+                yield rows
+
+    def _readWindow(self, tstart, tstop):
+        """
+        Rows with tstart <= time <= tstop which meet the condition, a chunk at a time.
+        """
+        self._loadTimes()
+        if self._timeSorted:
+            start = int(numpy.searchsorted(self._times, tstart, side='left'))
+            stop = int(numpy.searchsorted(self._times, tstop, side='right'))
+            return self._readRange(start, stop)
+        if self._timeOrder is None:
+            # time column is indexed
+            condition = '(time >= tstart) & (time <= tstop)'
+            if self.condition:
+                condition += ' & (%s)' % self.condition
+            condvars = dict(self.condvars, tstart=tstart, tstop=tstop)
+            coords = self.table.get_where_list(condition, condvars, sort=True)
+            return self._readCoordinates(coords)
+        start = numpy.searchsorted(self._times, tstart, side='left')
+        stop = numpy.searchsorted(self._times, tstop, side='right')
+        coords = numpy.sort(self._timeOrder[start:stop])
+        return self._readCoordinates(coords, self.condition)
+
+    def _sorted(self, chunks):
+        """
+        Chunks of rows sorted by orderBy, after reading them all.
+        """
+        chunks = list(chunks)
+        if not chunks:
+            return
+        rows = numpy.concatenate(chunks)
+        rows = rows[numpy.argsort(rows[self.orderBy], kind='stable')]
+        for start in range(0, len(rows), self.chunkSize):
+            yield rows[start:start + self.chunkSize]
+
+    def iterChunks(self, windows=None):
+        """
+        Read the query's columns a chunk of rows at a time.
+
+        :param windows: (list) (tstart, tstop) time of each window to read the rows of, or None to read
+                        the whole table. Windows may overlap.
+        :return: (generator) (window index, chunk) for each chunk, where chunk is a structured array
+                 of the query's columns. The window index is None if windows is None.
+        """
+        if self.orderBy is not None and self.orderBy not in self.table.colnames:
+            raise ValueError('EventQuery: %s does not have a column named %s' % (self.table._v_pathname,
+                                                                                 self.orderBy))
+        if windows is None:
+            chunks = self._readRange(0, self.table.nrows)
+            if self.orderBy is not None:
+                chunks = self._sorted(chunks)
+            for rows in chunks:
+                yield None, self._project(rows)
+            return
+        for wix, (tstart, tstop) in enumerate(windows):
+            chunks = self._readWindow(tstart, tstop)
+            if self.orderBy is not None:
+                chunks = self._sorted(chunks)
+            for rows in chunks:
+                yield wix, self._project(rows)
+
+    def read(self, windows=None):
+        """
+        Read the query's columns in one go.
+
+        :param windows: (list) (tstart, tstop) time of each window, or None to read the whole table.
+        :return: (numpy.ndarray or list) A structured array of the query's columns, or one per window.
+        """
+        if windows is None:
+            chunks = [rows for wix, rows in self.iterChunks()]
+            return numpy.concatenate(chunks) if chunks else numpy.empty(0, dtype=self.dtype)
+        byWindow = [[] for w in windows]
+        for wix, rows in self.iterChunks(windows):
+            byWindow[wix].append(rows)
+        return [numpy.concatenate(chunks) if chunks else numpy.empty(0, dtype=self.dtype)
+                for chunks in byWindow]
+
+    def write(self, writer, windows=None, prefixes=None):
+        """
+        Stream the query's columns to a writer (e.g. a DelimitedWriter or ParquetWriter).
+
+        :param writer: Object with a write(chunk, prefix) method.
+        :param windows: (list) (tstart, tstop) time of each window, or None to read the whole table.
+        :param prefixes: (list) Values to write before the columns of each row, one list per window
+                         (or a single list if windows is None).
+        :return: (int) Number of rows written.
+        """
+        count = 0
+        for wix, rows in self.iterChunks(windows):
+            if prefixes is None:
+                prefix = ()
+            elif wix is None:
+                prefix = prefixes
+            else:
+                prefix = prefixes[wix]
+            writer.write(rows, prefix)
+            count += len(rows)
+        return count
+
+
+class DelimitedWriter:
+    """
+    Writes chunks of rows from an EventQuery to a delimited text file (e.g. tab delimited or csv). Unless
+    tab delimited, text containing the delimiter is quoted.
+
+    Args:
+        path (str): The file to write.
+
+        columnNames (list): Names of the columns, written as the first line. None to not write a header.
+
+        delimiter (str): Text between values.
+
+        emptyValue (str): Text to write in place of empty strings in the chunks, or None to leave them empty.
+
+        widenFloats (bool): Write float32 values as the Python floats they equal (e.g. 0.30000001192092896
+        rather than 0.3), as PyTables gives them when rows are read one at a time.
+    """
+
+    def __init__(self, path, columnNames=None, delimiter='\t', emptyValue='.', widenFloats=False):
+        self.path = path
+        self.delimiter = delimiter
+        self.emptyValue = emptyValue
+        self.widenFloats = widenFloats
+        self._file = open(path, 'w', encoding='utf-8')
+        if columnNames is not None:
+            self._file.write(delimiter.join(columnNames))
+            self._file.write('\n')
+
+    def write(self, chunk, prefix=()):
+        """
+        Write a line for each row of chunk, starting with the (str) values in prefix.
+        """
+        if not len(chunk):
+            return
+        delimiter = self.delimiter
+        quote = delimiter != '\t'
+        columns = []
+        for name in chunk.dtype.names:
+            values = _formatColumn(chunk[name], self.emptyValue, self.widenFloats)
+            if quote and chunk.dtype[name].kind in 'SU':
+                values = _quote(values, delimiter)
+            columns.append(values)
+        if prefix:
+            start = delimiter.join(_quote(prefix, delimiter) if quote else prefix)
+            columns.insert(0, [start] * len(chunk))
+        lines = [delimiter.join(row) for row in zip(*columns)]
+        self._file.write('\n'.join(lines))
+        self._file.write('\n')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ParquetWriter:
+    """
+    Writes chunks of rows from an EventQuery to a Parquet file. Requires pyarrow.
+
+    Args:
+        path (str): The file to write.
+
+        prefixNames (list): Names of the columns for the values given as prefix to write(), if any.
+    """
+
+    def __init__(self, path, prefixNames=()):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('ParquetWriter requires pyarrow, which is not installed.')
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.prefixNames = list(prefixNames)
+        self._writer = None
+
+    def write(self, chunk, prefix=()):
+        """
+        Write the rows of chunk, with a column of each value in prefix.
+        """
+        if not len(chunk):
+            return
+        pa = self._pa
+        arrays = [pa.array([str(v)] * len(chunk)) for v in prefix]
+        names = list(self.prefixNames[:len(prefix)])
+        names += ['prefix_%d' % i for i in range(len(names), len(prefix))]
+        for name in chunk.dtype.names:
+            values = chunk[name]
+            if values.dtype.kind == 'S':
+                values = numpy.char.decode(values, 'utf-8')
+            if values.ndim > 1:
+                arrays.append(pa.array(list(values)))
+            else:
+                arrays.append(pa.array(values))
+            names.append(name)
+        batch = pa.Table.from_arrays(arrays, names=names)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, batch.schema)
+        self._writer.write_table(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
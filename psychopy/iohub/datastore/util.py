@@ -11,6 +11,7 @@ import json
 import numpy
 
 from ..errors import print2err
+from .query import EventQuery, DelimitedWriter, ParquetWriter, createIndexes, INDEXED_COLUMNS, DEFAULT_CHUNK_SIZE
 
 from packaging.version import Version
 import tables
@@ -101,11 +102,14 @@ def getEyeSampleTypesInFile(hdf5FilePath):
 
 def saveEventReport(hdf5FilePath=None, eventType=None, eventFields=[], useConditionsTable=False,
                     usePsychopyDataFile=None, columnNames=[],
-                    trialStart=None, trialStop=None, timeMargins=(0.0, 0.0)
+                    trialStart=None, trialStop=None, timeMargins=(0.0, 0.0), outputFormat='txt'
                     ):
     """
     Save a tab delimited event report from an iohub .hdf5 data file.
 
+    Events are read and written a chunk at a time, so reports can be saved for files too large to fit in memory.
+    The report can also be saved as a csv file (outputFormat='csv') or, if pyarrow is installed, a Parquet file
+    (outputFormat='parquet').
 
     Events can optionally be split into groups using either a Psychopy .csv data file (usePsychopyDataFile),
     iohub experiment message events, or the hdf5 condition variables table (useConditionsTable=True).
@@ -126,11 +130,14 @@ def saveEventReport(hdf5FilePath=None, eventType=None, eventFields=[], useCondit
     :param trialStart: (str or None)
     :param trialStop: (str or None)
     :param timeMargins: ([float, float] or None)
-    :return:
+    :param outputFormat: (str) 'txt' (tab delimited), 'csv' or 'parquet'.
+    :return: (str, int) Path of the report and the number of events saved.
     """
     # Select the hdf5 file to process.
     if usePsychopyDataFile is True and useConditionsTable is True:
         raise RuntimeError("saveEventReport: useConditionsTable and usePsychopyDataFile can both not be True")
+    if outputFormat not in ('txt', 'csv', 'parquet'):
+        raise ValueError("saveEventReport: outputFormat must be 'txt', 'csv' or 'parquet', not %s" % outputFormat)
 
     if not hdf5FilePath:
         selectedFilePath = displayDataFileSelectionDialog(os.getcwd())
@@ -214,15 +221,15 @@ def saveEventReport(hdf5FilePath=None, eventType=None, eventFields=[], useCondit
     cvTable = None
     if useConditionsTable is True:
         # Use hdf5 conditions table columns 'trialStart' and 'trialStop' to group events
+        try:
+            cvColumnNames = datafile.getConditionVariableNames()[2:]
+        except Exception as e:
+            #datastore Conditions table must not exist
+            datafile.close()
+            raise RuntimeError("saveEventReport: Error calling datafile.getConditionVariableNames().\n{}".format(e))
+
         if trialStart is None or trialStop is None:
             # If either trialStart and trialStop are None, display selection dialogs
-            try:
-                cvColumnNames = datafile.getConditionVariableNames()[2:]
-            except Exception as e:
-                #datastore Conditions table must not exist
-                datafile.close()
-                raise RuntimeError("saveEventReport: Error calling datafile.getConditionVariableNames().\n{}".format(e))
-
             if trialStart is None:
                 trialStart = displayEventTableSelectionDialog("Select Event Grouping Start Time Column",
                                                               "Columns", list(cvColumnNames))
@@ -268,98 +275,72 @@ def saveEventReport(hdf5FilePath=None, eventType=None, eventFields=[], useCondit
         raise RuntimeError("Warning: saveEventReport requires trialStart and trialStop to be strings or both None."
                            " No report saved.")
 
-    if eventType == 'MessageEvent':
-        # Sort experiment messages by time since they may not be ordered chronologically.
-        event_table = event_table.read()
-        event_table.sort(order='time')
-
-    ecount = 0
-    # Open a file to save the tab delimited output to.
-    output_file_name = os.path.join(dpath, "%s.%s.txt" % (dfile[:-5], eventType))
-    with open(output_file_name, 'w') as output_file:
-        # Save header row to file
-        if trial_times:
-            if useConditionsTable:
-                cvtColumnNames = datafile.getConditionVariableNames()[2:]
-                if columnNames:
-                    for cname in columnNames:
-                        if cname not in cvtColumnNames:
-                            datafile.close()
-                            raise ValueError("saveEventReport: .hdf5 conditions table column '%s' not found." % cname)
-                    column_names = list(columnNames) + eventFields
-                else:
-                    column_names = list(cvtColumnNames) + eventFields
-                    columnNames = list(cvtColumnNames)
-
-            elif hasattr(psychoResults, 'columns'):
-                if columnNames:
-                    for cname in columnNames:
-                        if cname not in psychoResults.columns:
-                            datafile.close()
-                            raise ValueError(
-                                "saveEventReport: psychopyDataFileColumn '%s' not found in .csv file." % cname)
-                    column_names = list(columnNames) + eventFields
-                else:
-                    column_names = list(psychoResults.columns) + eventFields
-                    columnNames = list(psychoResults.columns)
+    # Experiment messages may not be ordered chronologically, so sort them by time.
+    query = EventQuery(event_table, fields=eventFields, orderBy='time' if eventType == 'MessageEvent' else None)
+
+    # Get the header row and, for each trial, the values written before the event fields.
+    windows = None
+    prefixes = None
+    if trial_times:
+        if useConditionsTable:
+            cvtColumnNames = datafile.getConditionVariableNames()[2:]
+            if columnNames:
+                for cname in columnNames:
+                    if cname not in cvtColumnNames:
+                        datafile.close()
+                        raise ValueError("saveEventReport: .hdf5 conditions table column '%s' not found." % cname)
+                column_names = list(columnNames) + eventFields
             else:
-                column_names = ['TRIAL_INDEX', trialStart, trialStop] + eventFields
-        else:
-            column_names = eventFields
-
-        output_file.write('\t'.join(column_names))
-        output_file.write('\n')
-
-        event_groupings = []
-        if trial_times:
-            # Split events into trials
+                column_names = list(cvtColumnNames) + eventFields
+                columnNames = list(cvtColumnNames)
+            cvRows = cvTable.read()
+            prefixes = []
             for tindex, tstart, tstop in trial_times:
-                if eventType == 'MessageEvent':
-                    event_groupings.append(event_table[(event_table['time'] >= tstart) & (event_table['time']
-                                                                                          <= tstop)])
-                else:
-                    event_groupings.append(event_table.where("(time >= %f) & (time <= %f)" % (tstart, tstop)))
-        else:
-            # Report events without splitting them into trials
-            if eventType == 'MessageEvent':
-                event_groupings.append(event_table)
-            else:
-                event_groupings.append(event_table.iterrows())
-
-        # Save a row for each event within the trial period
-        for tid, trial_events in enumerate(event_groupings):
-            for event in trial_events:
-                event_data = []
-                for c in eventFields:
-                    cv = event[c]
+                cvrowdat = []
+                for c in columnNames:
+                    cv = cvRows[c][tindex]
                     if type(cv) == numpy.bytes_:
-                        cv = event[c].decode('utf-8')
-                    if type(cv) == str and len(cv) == 0:
-                        cv = '.'
-                    event_data.append(str(cv))
-                if trial_times:
-                    tindex, tstart, tstop = trial_times[tid]
-                    if useConditionsTable:
-                        cvRow=cvTable.read(tindex, tindex+1)
-                        cvrowdat = [cvRow[c][0] for c in columnNames]
-                        for ri, cv in enumerate(cvrowdat):
-                            if type(cv) == numpy.bytes_:
-                                cvrowdat[ri] = cvrowdat[ri].decode('utf-8')
-                            else:
-                                cvrowdat[ri] = str(cvrowdat[ri])
-                            if type(cv) == str and len(cv) == 0:
-                                cvrowdat[ri] = '.'
-                        output_file.write('\t'.join(cvrowdat + event_data))
-                    elif hasattr(psychoResults, 'columns'):
-                        drow = psychoResults.iloc[tindex]
-                        prowdat = [str(drow[c]) for c in columnNames]
-                        output_file.write('\t'.join(prowdat + event_data))
+                        cvrowdat.append(cv.decode('utf-8'))
                     else:
-                        output_file.write('\t'.join([str(tindex), str(tstart), str(tstop)] + event_data))
-                else:
-                    output_file.write('\t'.join(event_data))
-                output_file.write('\n')
-                ecount += 1
+                        cvrowdat.append(str(cv))
+                prefixes.append(cvrowdat)
+
+        elif hasattr(psychoResults, 'columns'):
+            if columnNames:
+                for cname in columnNames:
+                    if cname not in psychoResults.columns:
+                        datafile.close()
+                        raise ValueError(
+                            "saveEventReport: psychopyDataFileColumn '%s' not found in .csv file." % cname)
+                column_names = list(columnNames) + eventFields
+            else:
+                column_names = list(psychoResults.columns) + eventFields
+                columnNames = list(psychoResults.columns)
+            prefixes = []
+            for tindex, tstart, tstop in trial_times:
+                drow = psychoResults.iloc[tindex]
+                prefixes.append([str(drow[c]) for c in columnNames])
+        else:
+            column_names = ['TRIAL_INDEX', trialStart, trialStop] + eventFields
+            prefixes = [[str(tindex), str(tstart), str(tstop)] for tindex, tstart, tstop in trial_times]
+        windows = [(tstart, tstop) for tindex, tstart, tstop in trial_times]
+        if eventType != 'MessageEvent':
+            # Trial start and stop times are compared to (non message) event times to the microsecond.
+            windows = [(float('%f' % tstart), float('%f' % tstop)) for tstart, tstop in windows]
+    else:
+        column_names = eventFields
+
+    # Save a row for each event (within each trial period), a chunk of events at a time.
+    output_file_name = os.path.join(dpath, "%s.%s.%s" % (dfile[:-5], eventType, outputFormat))
+    if outputFormat == 'parquet':
+        writer = ParquetWriter(output_file_name, prefixNames=column_names[:len(column_names) - len(eventFields)])
+    else:
+        # as before, messages (read into an array to be sorted) keep float32 values, while other events (read a
+        # row at a time) give them as Python floats
+        writer = DelimitedWriter(output_file_name, column_names, delimiter='\t' if outputFormat == 'txt' else ',',
+                                 widenFloats=eventType != 'MessageEvent')
+    with writer:
+        ecount = query.write(writer, windows, prefixes)
 
     # Done report creation, close input file
     datafile.close()
@@ -762,12 +743,16 @@ class ExperimentDataAccessUtility:
 
                 cvNames = self.getConditionVariableNames()
 
+                # condition variable rows often share a where clause (e.g. those of one session), so only
+                # read the events for each where clause once
+                readCache = dict()
+
                 # no further where clause building needed; get reseults and
                 # return
                 if startConditions is None and endConditions is None:
                     for cv in filteredConditionVariableList:
 
-                        wclause = '( experiment_id == {0} ) & ( SESSION_ID == {1} )'.format(self._experimentID,
+                        wclause = '( experiment_id == {0} ) & ( session_id == {1} )'.format(self._experimentID,
                                                                                             cv.SESSION_ID)
 
                         wclause += ' & ( type == {0} ) '.format(event_type_id)
@@ -775,10 +760,8 @@ class ExperimentDataAccessUtility:
                         if filter_id is not None:
                             wclause += '& ( filter_id == {0} ) '.format(filter_id)
 
-                        resultSetList.append([])
-
-                        for ename in event_attribute_names:
-                            resultSetList[-1].append(getattr(deviceEventTable, read_where)(wclause, field=ename))
+                        resultSetList.append(self._readEventAttributes(deviceEventTable, event_attribute_names,
+                                                                       wclause, readCache))
                         resultSetList[-1].append(wclause)
                         resultSetList[-1].append(cv)
 
@@ -819,8 +802,8 @@ class ExperimentDataAccessUtility:
                         wclause = wclause[:-3]
                         wclause += ' ) '
 
-                    for ename in event_attribute_names:
-                        resultSetList[-1].append(getattr(deviceEventTable, read_where)(wclause, field=ename))
+                    resultSetList[-1] = self._readEventAttributes(deviceEventTable, event_attribute_names, wclause,
+                                                                  readCache)
                     resultSetList[-1].append(wclause)
                     resultSetList[-1].append(cv)
 
@@ -831,6 +814,69 @@ class ExperimentDataAccessUtility:
 
             return None
 
+    @staticmethod
+    def _readEventAttributes(table, event_attribute_names, wclause, readCache):
+        """
+        Read the values of all event attributes for events matching a where clause in one pass of the table.
+        Returns a list of arrays, one per attribute.
+        """
+        if wclause not in readCache:
+            rows = EventQuery(table, fields=event_attribute_names, condition=wclause).read()
+            readCache[wclause] = [numpy.ascontiguousarray(rows[ename]) for ename in event_attribute_names]
+        return list(readCache[wclause])
+
+    def createIndexes(self, event_type, columns=INDEXED_COLUMNS):
+        """
+        Create PyTables indexes for columns of the DataStore table containing events of the specified type,
+        so queries selecting by those columns are faster. Indexes are saved to the file, so the
+        ExperimentDataAccessUtility must have been created with mode='a'. Columns the table doesn't have are
+        ignored.
+
+        Args:
+            event_type (str or int): The event type, as for getEventTable.
+
+            columns (list): Names of the columns to index. Defaults to time, session_id, trial_id and type.
+
+        Returns:
+            (list): Names of the columns which are indexed.
+        """
+        if self.mode == 'r':
+            raise ExperimentDataAccessException('createIndexes: DataStore file must be opened with mode="a" to '
+                                                'create indexes.')
+        return createIndexes(self.getEventTable(event_type), columns)
+
+    def queryEvents(self, event_type, fields=None, condition=None, chunkSize=DEFAULT_CHUNK_SIZE, orderBy=None):
+        """
+        Returns an EventQuery to read events of the specified type a chunk at a time, either all of them or
+        split into time windows (e.g. one per trial). PyTables indexes for the columns the query selects by are
+        created if the ExperimentDataAccessUtility was created with mode='a'.
+
+        Args:
+            event_type (str or int): The event type, as for getEventTable.
+
+            fields (list): Names of the event attributes to read, or None for all.
+
+            condition (str): PyTables condition events must meet, e.g. '(session_id == 1)', or None for all.
+
+            chunkSize (int): Most events to read at a time.
+
+            orderBy (str): Name of an attribute to sort events (within each time window) by, or None.
+
+        Returns:
+            (EventQuery): The query. Use its iterChunks, read or write methods to get the events.
+
+        Example:
+            Save the gaze position of every eye sample in each trial to a csv file, a chunk at a time::
+
+                query = datafile.queryEvents('BinocularEyeSampleEvent', ['time', 'left_gaze_x', 'left_gaze_y'])
+                with DelimitedWriter('samples.csv', ['trial'] + query.fields, delimiter=',') as writer:
+                    query.write(writer, windows=trialTimes, prefixes=[[str(i)] for i in range(len(trialTimes))])
+        """
+        table = self.getEventTable(event_type)
+        if table is None:
+            raise ExperimentDataAccessException('queryEvents: No DataStore table for event type %s' % event_type)
+        return EventQuery(table, fields=fields, condition=condition, chunkSize=chunkSize, orderBy=orderBy)
+
     def getEventIterator(self, event_type):
         """
         **Docstr TBC.**
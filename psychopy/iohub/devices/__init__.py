@@ -18,6 +18,7 @@ import numpy as np
 from .computer import Computer
 from ..errors import print2err, printExceptionDetailsToStdErr
 from ..util import convertCamelToSnake
+from ..constants import EventConstants
 
 
 class ioDeviceError(Exception):
@@ -293,7 +294,11 @@ class Device(ioObject):
             being returned. False results in events being left in the device event buffer.
 
             asType (str): Optional kwarg giving the object type to return events as. Valid values
-            are 'namedtuple' (the default), 'dict', 'list', or 'object'.
+            are 'namedtuple' (the default), 'dict', 'list', 'object', or 'numpy'. For 'numpy', the
+            events are returned as a structured array (NUMPY_DTYPE) per event type, packed by
+            packEventArrays. String fields are then limited to their width in NUMPY_DTYPE (e.g.
+            128 bytes of utf-8 for MessageEvent.text); longer values are cut, as they are when
+            saved to the ioDataStore file.
 
         Returns:
             (list): New events that the ioHub has received since the last getEvents() or clearEvents()
@@ -350,6 +355,8 @@ class Device(ioObject):
             currentEvents = sorted(
                 currentEvents, key=itemgetter(
                     DeviceEvent.EVENT_HUB_TIME_INDEX))
+        if kwargs.get('asType', kwargs.get('as_type')) == 'numpy':
+            return packEventArrays(currentEvents)
         return currentEvents
 
     def clearEvents(
@@ -947,6 +954,63 @@ class DeviceEvent(ioObject):
     def createEventAsNamedTuple(cls, valueList):
         return cls.namedTupleClass(*valueList)
 
+    @classmethod
+    def createEventsAsArray(cls, eventValueLists):
+        """Structured array (NUMPY_DTYPE) of events in list form.
+
+        String fields are utf-8 encoded, and cut to the width of their field
+        in NUMPY_DTYPE (as they are when saved to the ioDataStore file). The
+        first time a value of a field is cut, a warning is printed.
+        """
+        string_fields = [(i, name) for i, name in
+                         enumerate(cls.NUMPY_DTYPE.names)
+                         if cls.NUMPY_DTYPE[name].kind == 'S']
+        if string_fields:
+            # numpy only encodes ascii str values itself
+            eventValueLists = [list(values) for values in eventValueLists]
+            for values in eventValueLists:
+                for i, name in string_fields:
+                    if isinstance(values[i], str):
+                        values[i] = values[i].encode('utf-8')
+                    width = cls.NUMPY_DTYPE[name].itemsize
+                    if (isinstance(values[i], bytes) and
+                            len(values[i]) > width and
+                            (cls, name) not in _truncated_fields):
+                        _truncated_fields.add((cls, name))
+                        print2err('Warning: {}.{} values longer than {} bytes '
+                                  'are cut to fit the event array.'.format(
+                                      cls.__name__, name, width))
+        return np.array([tuple(values) for values in eventValueLists],
+                        dtype=cls.NUMPY_DTYPE)
+
+
+# (event class, field name) of string fields which have had values cut by
+# DeviceEvent.createEventsAsArray
+_truncated_fields = set()
+
+
+def packEventArrays(events):
+    """Pack iohub events (in list form) into the reply format used for
+    getEvents(asType='numpy'): an [event_type_id, data] pair for each event
+    type, data being the bytes of a structured array of the events of that
+    type, with the event class's NUMPY_DTYPE. The order of events of each
+    type is kept.
+
+    The client makes arrays from the bytes without copying them
+    (see psychopy.iohub.client.eventarrays).
+
+    :param events: (list) Events in list form.
+    :return: (list) [event_type_id, bytes] pairs.
+    """
+    events_by_type = {}
+    for event in events:
+        events_by_type.setdefault(
+            event[DeviceEvent.EVENT_TYPE_ID_INDEX], []).append(event)
+    return [[event_type,
+             EventConstants.getClass(event_type).createEventsAsArray(
+                 type_events).tobytes()]
+            for event_type, type_events in events_by_type.items()]
+
 
 #
 # Import Devices and DeviceEvents
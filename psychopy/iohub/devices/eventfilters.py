@@ -213,6 +213,40 @@ class MovingWindowFilter():
             if self.isFull():
                 return None, self.filteredValue()
 
+    def addValues(self, values):
+        """Add an array of field values to the moving window at once, rather
+        than calling add with each value (without events, in list form).
+
+        Returns an array of the filtered value after adding each value, for
+        each value added once the window was full, i.e. the values add would
+        have returned, calculated for all windows at once by filteredValues.
+        The window then holds the last values added, so the next call carries
+        on from them.
+
+        """
+        ring_buffer = self._filtering_buffer
+        length = ring_buffer.max_size
+        values = np.asarray(values, dtype=ring_buffer._dtype)
+        # the values already in the window, which the first windows include
+        history_length = min(len(ring_buffer), length - 1)
+        history = ring_buffer.getElements()[length - history_length:].copy()
+        ring_buffer.extend(values)
+        data = np.concatenate([history, values])
+        if len(data) < length:
+            return np.empty(0, dtype=ring_buffer._dtype)
+        return self.filteredValues(
+            np.lib.stride_tricks.sliding_window_view(data, length))
+
+    def filteredValues(self, windows):
+        """Returns the filtered value of each row of windows, a 2D array of
+        window values (oldest first), as filteredValue would for each.
+
+        Sub classes which replace filteredValue should replace this method to
+        match.
+
+        """
+        return windows.mean(axis=1)
+
     def isFull(self):
         return self._filtering_buffer.isFull()
 
@@ -238,6 +272,9 @@ class PassThroughFilter(MovingWindowFilter):
     def filteredValue(self):
         return self._filtering_buffer[0]
 
+    def filteredValues(self, windows):
+        return windows[:, 0]
+
 # ------
 
 
@@ -254,6 +291,9 @@ class MedianFilter(MovingWindowFilter):
     def filteredValue(self):
         return np.median(self._filtering_buffer.getElements())
 
+    def filteredValues(self, windows):
+        return np.median(windows, axis=1)
+
 # ------
 
 
@@ -281,6 +321,10 @@ class WeightedAverageFilter(MovingWindowFilter):
             self._weights,
             'valid')
 
+    def filteredValues(self, windows):
+        # np.convolve reverses the weights
+        return windows @ self._weights[::-1]
+
 
 # ------
 
@@ -312,21 +356,300 @@ class StampFilter(MovingWindowFilter):
             self.sub_filter = StampFilter(**kwargs)
 
     def filteredValue(self):
-        if self.sub_filter:
-            return self.sub_filter.filteredValue()
-
         e1, e2, e3 = self._filtering_buffer[0:3]
-        if not(e1 < e2 and e2 < e3) or not (e3 < e2 and e2 < e1):
-            return (e1 + e3) / 2.0
-        return e2
+        # flat stretches count as monotonic, so a single sample spike on a
+        # flat signal is removed rather than spread over its neighbours
+        if e1 <= e2 <= e3 or e3 <= e2 <= e1:
+            return e2
+        return (e1 + e3) / 2.0
+
+    def filteredValues(self, windows):
+        e1, e2, e3 = windows.T
+        monotonic = ((e1 <= e2) & (e2 <= e3)) | ((e3 <= e2) & (e2 <= e1))
+        return np.where(monotonic, e2, (e1 + e3) / 2.0)
 
     def add(self, event):
+        """Add an event (or value), as for MovingWindowFilter.add. With a
+        level over 1, the window holds the values returned by the sub filter,
+        so each level filters the output of the one below.
+        """
+        if self.sub_filter is None:
+            return MovingWindowFilter.add(self, event)
+        sub_result = self.sub_filter.add(event)
+        if sub_result is None:
+            return None
+        sub_event, value = sub_result
+        self._filtering_buffer.append(value)
+        if sub_event is not None:
+            self._events.append(sub_event)
+        if not self.isFull():
+            return None
+        filtered = self.filteredValue()
+        if sub_event is None:
+            return None, filtered
+        if self._inplace:
+            self._events[self._active_index][
+                self._event_field_index] = filtered
+        return self._events[self._active_index], filtered
+
+    def addValues(self, values):
+        """Add an array of field values at once (see
+        MovingWindowFilter.addValues). With a level over 1, the values are
+        filtered by each level in turn, so the result is the same as calling
+        add with each value.
+        """
         if self.sub_filter:
-            sub_result = self.sub_filter.add(event)
-            if sub_result:
-                self._filtering_buffer.append(sub_result[1])
-                self._events.append(event)
-        return MovingWindowFilter.add(self, event)
+            values = self.sub_filter.addValues(values)
+        return MovingWindowFilter.addValues(self, values)
+
+# ------
+
+################## Structured Event Array Filters ########################
+
+
+class EventArrayFilter():
+    """Base class for filters which filter fields of iohub events held in a
+    numpy structured array (with the NUMPY_DTYPE of the event class), such as
+    all the events read from a device in one poll, with one call.
+
+    Filters keep their state between calls, so a stream of events can be
+    filtered a batch at a time and the result is the same as filtering all
+    the events at once. Filters which need events after the one being
+    filtered hold back the last 'delay' events of each batch until the next
+    call; call flush() at the end of the stream to get them.
+
+    Sub classes must implement filterEvents.
+
+    :param fields: (list) Names of the event fields to filter.
+
+    """
+    delay = 0
+
+    def __init__(self, fields):
+        if isinstance(fields, str):
+            fields = [fields, ]
+        self.fields = list(fields)
+        self.reset()
+
+    def reset(self):
+        """Forget all events given so far, to start filtering a new stream."""
+        self._pending = None
+
+    def filterEvents(self, events):
+        """Filter the next batch of events.
+
+        :param events: (numpy.ndarray) Events, oldest first.
+        :return: (numpy.ndarray) Copy of the events which can be filtered so
+                 far (all but the last 'delay' events given), with the fields
+                 filtered.
+        """
+        raise RuntimeError('filterEvents method must be implemented by subclass.')
+
+    def flush(self):
+        """Get the events held back so far, filtered as if the last event
+        continued, and reset the filter.
+
+        :return: (numpy.ndarray) Events held back, or None if no events were
+                 given.
+        """
+        pending = self._pending
+        self.reset()
+        return pending
+
+
+class MovingWindowEventFilter(EventArrayFilter):
+    """Filters each event using a window of 'length' events centred on it.
+
+    The first and last events of a stream are filtered as if the first and
+    last values of each field were repeated before and after them.
+
+    Sub classes must implement filterWindows.
+
+    :param fields: (list) Names of the event fields to filter.
+    :param length: (int) Number of events in the window. Must be odd.
+
+    """
+
+    def __init__(self, fields, length=3):
+        if length % 2 == 0:
+            raise ValueError('MovingWindowEventFilter length must be odd.')
+        self.length = length
+        self.delay = length // 2
+        EventArrayFilter.__init__(self, fields)
+
+    def reset(self):
+        EventArrayFilter.reset(self)
+        # values of each field of the 'delay' events before those pending
+        self._context = None
+
+    def filterWindows(self, windows):
+        """Returns the filtered value for each row of windows, a 2D array
+        of 'length' field values (oldest first) centred on each event.
+        """
+        raise RuntimeError('filterWindows method must be implemented by subclass.')
+
+    def filterEvents(self, events):
+        return self._filter(events)
+
+    def flush(self):
+        if self._pending is None:
+            return None
+        filtered = self._filter(self._pending[:0], final=True)
+        self.reset()
+        return filtered
+
+    def _filter(self, events, final=False):
+        if self._pending is not None:
+            events = np.concatenate([self._pending, events])
+        if len(events) == 0:
+            return events.copy()
+        if self._context is None:
+            self._context = {field: np.repeat(events[field][:1], self.delay)
+                             for field in self.fields}
+        ready = len(events) if final else max(len(events) - self.delay, 0)
+        filtered = events[:ready].copy()
+        for field in self.fields:
+            values = np.concatenate(
+                [self._context[field], events[field]]).astype(np.float64)
+            if final:
+                values = np.concatenate(
+                    [values, np.repeat(values[-1:], self.delay)])
+            if ready:
+                filtered[field] = self.filterWindows(
+                    np.lib.stride_tricks.sliding_window_view(
+                        values[:ready + 2 * self.delay], self.length))
+            self._context[field] = values[ready:ready + self.delay]
+        self._pending = events[ready:].copy()
+        return filtered
+
+
+class MedianEventFilter(MovingWindowEventFilter):
+    """Replaces each value with the median of the window centred on it.
+
+    :param fields: (list) Names of the event fields to filter.
+    :param length: (int) Number of events in the window. Must be odd.
+
+    """
+
+    def filterWindows(self, windows):
+        return np.median(windows, axis=1)
+
+
+class SavitzkyGolayEventFilter(MovingWindowEventFilter):
+    """Savitzky-Golay filter: replaces each value with that of a polynomial
+    fitted (by least squares) to the window centred on it, or with its
+    derivative (e.g. to get velocity from position).
+
+    :param fields: (list) Names of the event fields to filter.
+    :param length: (int) Number of events in the window. Must be odd.
+    :param order: (int) Order of the polynomial, less than length.
+    :param deriv: (int) Order of the derivative to return, 0 for the smoothed
+                  value.
+    :param sampling_rate: (float) Rate (Hz) of the events, needed for
+                          derivatives to be per second.
+
+    """
+
+    def __init__(self, fields, length=7, order=2, deriv=0, sampling_rate=1.0):
+        from scipy import signal
+        MovingWindowEventFilter.__init__(self, fields, length)
+        self.order = order
+        self.deriv = deriv
+        self.sampling_rate = sampling_rate
+        self._coeffs = signal.savgol_coeffs(
+            length, order, deriv=deriv, delta=1.0 / sampling_rate, use='dot')
+
+    def filterWindows(self, windows):
+        return windows @ self._coeffs
+
+
+class StampeEventFilter(MovingWindowEventFilter):
+    """Heuristic filter for removing single sample spikes, as done by
+    StampFilter (created by Dave Stampe of SR Research): with a window of
+    three values, if the middle value isn't between the other two (or equal
+    to one of them) it's replaced by their mean.
+
+    :param fields: (list) Names of the event fields to filter.
+    :param level: (int) Number of times to apply the filter, each level
+                  filtering the output of the one before.
+
+    """
+
+    def __init__(self, fields, level=1):
+        self.level = level
+        self._sub_filter = None
+        if level > 1:
+            self._sub_filter = StampeEventFilter(fields, level - 1)
+        MovingWindowEventFilter.__init__(self, fields, 3)
+
+    def reset(self):
+        MovingWindowEventFilter.reset(self)
+        if self._sub_filter:
+            self._sub_filter.reset()
+
+    def filterWindows(self, windows):
+        e1, e2, e3 = windows.T
+        monotonic = ((e1 <= e2) & (e2 <= e3)) | ((e3 <= e2) & (e2 <= e1))
+        return np.where(monotonic, e2, (e1 + e3) / 2.0)
+
+    def filterEvents(self, events):
+        if self._sub_filter:
+            events = self._sub_filter.filterEvents(events)
+        return MovingWindowEventFilter.filterEvents(self, events)
+
+    def flush(self):
+        if self._sub_filter is None:
+            return MovingWindowEventFilter.flush(self)
+        held = self._sub_filter.flush()
+        if held is None:
+            return MovingWindowEventFilter.flush(self)
+        filtered = MovingWindowEventFilter.filterEvents(self, held)
+        return np.concatenate(
+            [filtered, MovingWindowEventFilter.flush(self)])
+
+
+class ButterworthEventFilter(EventArrayFilter):
+    """Causal low pass Butterworth filter, so no events are held back (but
+    the filtered values lag behind by an amount depending on the cutoff).
+
+    The filter starts in the steady state for the first value of each field,
+    as if that value had been given for ever.
+
+    :param fields: (list) Names of the event fields to filter.
+    :param cutoff: (float) Cutoff frequency (Hz).
+    :param sampling_rate: (float) Rate (Hz) of the events.
+    :param order: (int) Order of the filter.
+
+    """
+
+    def __init__(self, fields, cutoff, sampling_rate, order=2):
+        from scipy import signal
+        self._lfilter = signal.lfilter
+        self.cutoff = cutoff
+        self.sampling_rate = sampling_rate
+        self.order = order
+        self._b, self._a = signal.butter(order, cutoff, fs=sampling_rate)
+        self._initial_state = signal.lfilter_zi(self._b, self._a)
+        EventArrayFilter.__init__(self, fields)
+
+    def reset(self):
+        EventArrayFilter.reset(self)
+        self._state = None
+
+    def filterEvents(self, events):
+        filtered = events.copy()
+        if len(events) == 0:
+            return filtered
+        if self._state is None:
+            self._state = {
+                field: self._initial_state * float(events[field][0])
+                for field in self.fields}
+        for field in self.fields:
+            filtered[field], self._state[field] = self._lfilter(
+                self._b, self._a, events[field].astype(np.float64),
+                zi=self._state[field])
+        self._pending = events[:0].copy()
+        return filtered
 
 # ------
 
@@ -0,0 +1,547 @@
+# -*- coding: utf-8 -*-
+# Part of the psychopy.iohub library.
+# Copyright (C) 2012-2020 iSolver Software Solutions (C) 2021 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+"""
+Batch (offline) version of the ioHub eye tracker sample event parser.
+
+EyeTrackerEventParser classifies samples one at a time as they arrive, which
+is far too slow for parsing a whole recording afterwards (e.g. the samples
+read from an ioDataStore file). parseSamples does the same parsing on an array
+of samples with NumPy: samples are converted to monocular samples, missing
+data is interpolated, velocities and adaptive velocity thresholds are
+calculated, and samples are classified as fixation, saccade or missing
+(blink), giving the same samples and parsed events as the online parser
+(with PassThroughFilter position and velocity filters) when stored.
+
+The adaptive velocity threshold of each sample depends on the positive
+velocities of the samples before it (3 seconds of them by default), so is
+calculated for all samples at once from sorted copies of the velocity history
+taken every few samples. Where the result is too close to a velocity (so
+could classify a sample differently), or the calculation is otherwise not
+certain to match, the threshold is calculated exactly as the online parser
+does.
+
+Example:
+
+    from psychopy.iohub.constants import EventConstants
+    from psychopy.iohub.datastore.util import ExperimentDataAccessUtility
+    from psychopy.iohub.devices.eyetracker.filters.batch import parseSamples
+
+    datafile = ExperimentDataAccessUtility('.', 'events.hdf5')
+    table = datafile.getEventTable('BinocularEyeSampleEvent')
+    samples, events = parseSamples(
+        table.read_where('session_id == 1'),
+        display_device=dict(mm_size=dict(width=500, height=280),
+                            pixel_res=(1920, 1080), eye_distance=600),
+        sampling_rate=1000)
+    fixations = events[EventConstants.FIXATION_END]
+"""
+import numpy as np
+from ....constants import EventConstants
+from ....util.visualangle import VisualAngleCalc
+from ..eye_events import (MonocularEyeSampleEvent, FixationStartEvent,
+                          FixationEndEvent, SaccadeStartEvent, SaccadeEndEvent,
+                          BlinkStartEvent, BlinkEndEvent)
+from .parser import velocityThreshold, LEFT_EYE
+
+FIX = 0
+SAC = 1
+MIS = 2
+
+# relative error allowed in the thresholds calculated from the sorted
+# velocity history, before calculating them exactly instead
+_TOLERANCE = 1e-9
+# samples between sorted copies of the velocity history, and copies sorted
+# at once
+_ANCHOR_STEP = 16
+_ANCHORS_PER_GROUP = 256
+_MAX_ITERATIONS = 200
+
+_START_FIELDS = ('gaze_x', 'gaze_y', 'angle_x', 'angle_y', 'raw_x', 'raw_y',
+                 'pupil_measure1', 'pupil_measure1_type', 'velocity_x',
+                 'velocity_y', 'velocity_xy')
+
+
+def parseSamples(samples, display_device, sampling_rate,
+                 adaptive_vel_thresh_history=3.0, filter_id=23):
+    """
+    Parse a whole recording of eye samples at once.
+
+    :param samples: (numpy.ndarray) BinocularEyeSampleEvent or
+        MonocularEyeSampleEvent structured array (e.g. read from an ioDataStore
+        file) of a single recording, in time order.
+    :param display_device: (dict) Display the samples were recorded on, with
+        'mm_size' (dict of 'width' and 'height'), 'pixel_res' and
+        'eye_distance', as given to EyeTrackerEventParser.
+    :param sampling_rate: (float) Sampling rate of the eye tracker.
+    :param adaptive_vel_thresh_history: (float) Duration (sec) of the velocity
+        history used for the adaptive velocity thresholds.
+    :param filter_id: (int) filter_id given to the parsed samples and events.
+    :return: (tuple) MonocularEyeSampleEvent array of the parsed samples (one
+        for each sample given) and dict of parsed event arrays by event type
+        (EventConstants.FIXATION_START, FIXATION_END, SACCADE_START,
+        SACCADE_END, BLINK_START and BLINK_END).
+    """
+    mm_size = display_device.get('mm_size')
+    if mm_size:
+        mm_size = mm_size['width'], mm_size['height'],
+    visual_angle_calc = VisualAngleCalc(mm_size,
+                                        display_device.get('pixel_res'),
+                                        display_device.get('eye_distance'))
+    return parseRecording(samples, visual_angle_calc.pix2deg,
+                          int(adaptive_vel_thresh_history * sampling_rate),
+                          filter_id)
+
+
+def parseRecording(samples, pix2deg, history_length, filter_id=23):
+    """
+    Parse a whole recording of eye samples at once, given the function
+    converting gaze positions to angles and the number of velocities used for
+    the adaptive velocity thresholds (see parseSamples).
+    """
+    names = samples.dtype.names
+    binocular = 'left_gaze_x' in names
+    status = samples['status']
+    if binocular:
+        unknown = ~np.isin(status, (0, 2, 20, 22))
+        if unknown.any():
+            raise ValueError('Unknown Sample Status: %d'
+                             % status[unknown.argmax()])
+        valid = status != 22
+    else:
+        valid = status == 0
+
+    # Monocular samples, with float fields as float64 until stored.
+    mono = np.zeros(len(samples), dtype=MonocularEyeSampleEvent.NUMPY_DTYPE)
+    values = dict()
+    for field in mono.dtype.names:
+        if field in names:
+            mono[field] = samples[field]
+        elif field == 'eye':
+            mono[field] = LEFT_EYE
+        elif field.endswith('_type'):
+            mono[field] = samples['left_%s' % field]
+        else:
+            left = samples['left_%s' % field].astype(np.float64)
+            right = samples['right_%s' % field].astype(np.float64)
+            values[field] = np.where(status == 0, (left + right) / 2.0,
+                                     np.where(status == 20, right, left))
+    for field in mono.dtype.names:
+        if field not in values and mono.dtype[field].kind == 'f':
+            values[field] = samples[field].astype(np.float64)
+    mono['type'] = EventConstants.MONOCULAR_EYE_SAMPLE
+    mono['filter_id'] = filter_id
+    events = {event_type: np.zeros(0, event_class.NUMPY_DTYPE)
+              for event_type, event_class in _EVENT_CLASSES.items()}
+
+    valid_ix = np.flatnonzero(valid)
+    if not len(valid_ix):
+        _storeValues(mono, values)
+        return mono, events
+    first, last = valid_ix[0], valid_ix[-1]
+
+    # Angles of valid samples, and of missing ones interpolated between the
+    # valid samples either side.
+    angle_x, angle_y = pix2deg(values['gaze_x'][valid],
+                               values['gaze_y'][valid])
+    angle_x = _fill(values['angle_x'], valid, angle_x)
+    angle_y = _fill(values['angle_y'], valid, angle_y)
+    pupil = values['pupil_measure1'].copy()
+    missing = np.flatnonzero(~valid[first:last + 1]) + first
+    if len(missing):
+        prev_valid = valid_ix[np.searchsorted(valid_ix, missing) - 1]
+        next_valid = valid_ix[np.searchsorted(valid_ix, missing)]
+        # as np.linspace, starting from the stored (float32) previous angle
+        offset = (missing - prev_valid).astype(np.float64)
+        steps = (next_valid - prev_valid).astype(np.float64)
+        for interp, start in ((angle_x, _float32(angle_x[prev_valid])),
+                              (angle_y, _float32(angle_y[prev_valid])),
+                              (pupil, pupil[prev_valid])):
+            step = (interp[next_valid] - start) / steps
+            interp[missing] = offset * step + start
+
+    # Velocity of each sample from the stored angles of the sample before.
+    time = samples['time'].astype(np.float64)
+    velocity_x = values['velocity_x'].copy()
+    velocity_y = values['velocity_y'].copy()
+    velocity_xy = values['velocity_xy'].copy()
+    parsed = slice(first, last + 1)
+    stored_x = _float32(angle_x)
+    stored_y = _float32(angle_y)
+    if first > 0:
+        # before the first valid sample, angles are not stored as parsed
+        stored_x[first - 1] = values['angle_x'][first - 1]
+        stored_y[first - 1] = values['angle_y'][first - 1]
+        prev = slice(first - 1, last)
+    else:
+        parsed = slice(1, last + 1)
+        prev = slice(0, last)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dx = np.abs(angle_x[parsed] - stored_x[prev])
+        dy = np.abs(angle_y[parsed] - stored_y[prev])
+        dt = time[parsed] - time[prev]
+        velocity_x[parsed] = dx / dt
+        velocity_y[parsed] = dy / dt
+        velocity_xy[parsed] = np.hypot(dx / dt, dy / dt)
+    parsed = slice(first, last + 1)
+    for name, data in (('angle_x', angle_x), ('angle_y', angle_y),
+                       ('velocity_x', velocity_x), ('velocity_y', velocity_y),
+                       ('velocity_xy', velocity_xy)):
+        data[parsed] = _float32(data[parsed])
+        values[name] = data
+    values['pupil_measure1'] = pupil
+
+    # Adaptive velocity thresholds of valid samples, kept in raw_x and raw_y.
+    raw_x = values['raw_x']
+    raw_y = values['raw_y']
+    raw_x[valid_ix] = adaptiveThresholds(velocity_x[valid_ix], history_length)
+    raw_y[valid_ix] = adaptiveThresholds(velocity_y[valid_ix], history_length)
+
+    # Sample categories, and events at each change of category (except the
+    # first, which has no start event).
+    category = np.full(last + 1 - first, MIS, dtype=np.int8)
+    is_valid = valid[parsed]
+    with np.errstate(invalid='ignore'):
+        saccade = ((velocity_x[parsed] >= raw_x[parsed])
+                   | (velocity_y[parsed] >= raw_y[parsed]))
+    category[is_valid] = np.where(saccade[is_valid], SAC, FIX)
+    run_starts = np.flatnonzero(np.diff(category)) + 1
+    run_category = category[run_starts]
+    run_ends = np.append(run_starts[1:] - 1, len(category) - 1) + first
+    run_starts += first
+    # the last event is left open
+    closed = np.arange(len(run_starts)) < len(run_starts) - 1
+
+    _storeValues(mono, values)
+    for cat, start_type, end_type in _CATEGORY_EVENTS:
+        is_cat = run_category == cat
+        events[start_type] = _startEvents(
+            start_type, mono, values, run_starts[is_cat], filter_id)
+        is_cat &= closed
+        events[end_type] = _endEvents(
+            end_type, mono, values, run_starts[is_cat],
+            run_ends[is_cat], filter_id)
+    return mono, events
+
+
+_CATEGORY_EVENTS = (
+    (FIX, EventConstants.FIXATION_START, EventConstants.FIXATION_END),
+    (SAC, EventConstants.SACCADE_START, EventConstants.SACCADE_END),
+    (MIS, EventConstants.BLINK_START, EventConstants.BLINK_END))
+_EVENT_CLASSES = {event_class.EVENT_TYPE_ID: event_class for event_class in (
+    FixationStartEvent, FixationEndEvent, SaccadeStartEvent, SaccadeEndEvent,
+    BlinkStartEvent, BlinkEndEvent)}
+_AVERAGED_FIELDS = ('gaze_x', 'gaze_y', 'pupil_measure1', 'velocity_x',
+                    'velocity_y', 'velocity_xy')
+
+
+def _float32(values):
+    """Values as stored by the parser's field filters."""
+    return np.asarray(values, dtype=np.float32).astype(np.float64)
+
+
+def _fill(values, mask, masked_values):
+    values = values.copy()
+    values[mask] = masked_values
+    return values
+
+
+def _storeValues(mono, values):
+    for name, data in values.items():
+        mono[name] = data
+
+
+def _sampleValues(mono, values, field, ix):
+    if field in values:
+        return values[field][ix]
+    return mono[field][ix]
+
+
+def _eventArray(event_type, mono, ix, filter_id):
+    """Event array with the fields common to all events, from the samples at
+    ix."""
+    events = np.zeros(len(ix), _EVENT_CLASSES[event_type].NUMPY_DTYPE)
+    for field in ('experiment_id', 'session_id', 'device_id', 'event_id',
+                  'device_time', 'logged_time', 'time', 'eye', 'status'):
+        events[field] = mono[field][ix]
+    events['type'] = event_type
+    events['filter_id'] = filter_id
+    return events
+
+
+def _startEvents(event_type, mono, values, starts, filter_id):
+    events = _eventArray(event_type, mono, starts, filter_id)
+    if event_type != EventConstants.BLINK_START:
+        for field in _START_FIELDS:
+            events[field] = _sampleValues(mono, values, field, starts)
+    return events
+
+
+def _endEvents(event_type, mono, values, starts, ends, filter_id):
+    events = _eventArray(event_type, mono, ends, filter_id)
+    time = mono['time']
+    events['duration'] = time[ends] - time[starts]
+    if event_type == EventConstants.BLINK_END:
+        return events
+    for field in _START_FIELDS:
+        events['start_%s' % field] = _sampleValues(mono, values, field, starts)
+        events['end_%s' % field] = _sampleValues(mono, values, field, ends)
+    if event_type == EventConstants.FIXATION_END:
+        averaged = _AVERAGED_FIELDS
+        events['average_pupil_measure1_type'] = mono['pupil_measure1_type'][ends]
+    else:
+        averaged = _AVERAGED_FIELDS[3:]
+        gaze_x = values['gaze_x']
+        gaze_y = values['gaze_y']
+        x_diff = gaze_x[ends] - gaze_x[starts]
+        y_diff = gaze_y[ends] - gaze_y[starts]
+        events['amplitude_x'] = x_diff
+        events['amplitude_y'] = y_diff
+        events['angle'] = np.rad2deg(np.arctan2(y_diff, x_diff))
+    # averaged over a row per event for events of each length, which sums
+    # the same way as the online parser's mean of each event's samples
+    lengths = ends - starts + 1
+    for length in np.unique(lengths):
+        ix = np.flatnonzero(lengths == length)
+        samples = starts[ix, None] + np.arange(length)
+        for field in averaged:
+            event_values = values[field][samples]
+            events['average_%s' % field][ix] = event_values.mean(axis=1)
+            if field.startswith('velocity'):
+                events['peak_%s' % field][ix] = event_values.max(axis=1)
+    return events
+
+
+def adaptiveThresholds(velocities, history_length):
+    """
+    Adaptive velocity threshold (see parser.velocityThreshold) of each of a
+    sequence of velocities, as calculated by EyeTrackerEventParser from a
+    history of the last history_length positive velocities. Thresholds are NaN
+    for velocities which are not positive, or until the history is full.
+
+    :param velocities: (numpy.ndarray) Velocities, in the order they were
+        given to the parser.
+    :param history_length: (int) Number of velocities in the history.
+    :return: (numpy.ndarray) float64 thresholds.
+    """
+    velocities = np.asarray(velocities)
+    thresholds = np.full(len(velocities), np.nan)
+    positive = np.flatnonzero(velocities > 0.0)
+    history = velocities[positive].astype(np.float64)
+    # thresholds are calculated from the history once it is full, i.e. when
+    # adding the (history_length + 1)th positive velocity
+    queries = np.arange(history_length, len(history))
+    if not len(queries):
+        return thresholds
+    if history_length < 2 * _ANCHOR_STEP or not np.isfinite(history).all():
+        query_thresholds = np.zeros(len(queries))
+        uncertain = np.ones(len(queries), dtype=bool)
+    else:
+        query_thresholds, uncertain = _approxThresholds(
+            history, history_length, queries)
+    for q in np.flatnonzero(uncertain):
+        query_thresholds[q] = velocityThreshold(
+            _historyBuffer(history, queries[q], history_length))
+    thresholds[positive[queries]] = query_thresholds
+    return thresholds
+
+
+def _historyBuffer(history, c, history_length):
+    """The parser's ring buffer of velocities after adding history[c]."""
+    slots = np.arange(history_length)
+    return history[c - (c - slots) % history_length]
+
+
+def _slidingMin(values, length):
+    """Minimum of values[c - length + 1:c + 1] at each c (from length - 1)."""
+    blocks = -(-len(values) // length)
+    padded = np.full(blocks * length, np.inf)
+    padded[:len(values)] = values
+    padded.shape = blocks, length
+    prefix = np.minimum.accumulate(padded, axis=1).ravel()
+    suffix = np.minimum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    c = np.arange(length - 1, len(values))
+    minimum = np.full(len(values), np.nan)
+    minimum[c] = np.minimum(suffix[c - length + 1], prefix[c])
+    return minimum
+
+
+def _float32Keys(thresholds):
+    """Integer keys ordering float32 values the same as the values, such that
+    a float32 value is below a threshold if its key is below the threshold's.
+    """
+    rounded = np.maximum(np.nan_to_num(thresholds, nan=0.0), 0.0).astype(
+        np.float32)
+    below = rounded.astype(np.float64) < thresholds
+    rounded[below] = np.nextafter(rounded[below], np.float32(np.inf))
+    return rounded.view(np.int32).astype(np.int64)
+
+
+class _SortedHistories(object):
+    """
+    Sorted copies of the velocity history every _ANCHOR_STEP velocities (the
+    anchors), giving the count, sum and sum of squares of the velocities below
+    a threshold in the history at any velocity from the nearest anchor before
+    it, corrected for the few velocities added and removed since (which are
+    sorted too).
+    """
+    def __init__(self, history, history_length, queries):
+        L = history_length
+        step = _ANCHOR_STEP
+        anchor = (queries - (L - 1)) // step
+        windows = np.lib.stride_tricks.sliding_window_view(history, L)[
+            anchor[0] * step:(anchor[-1] + 1) * step:step]
+        self.L = L
+        # (velocities are float32 values, which sort faster as float32)
+        self.sorted = np.sort(windows.astype(np.float32), axis=1).astype(
+            np.float64)
+        self.row = anchor - anchor[0]
+        self.sum1, self.sum2 = _cumulativeSums(
+            self.sorted - self.sorted[:, L // 2, None])
+        self.keys = _rowKeys(self.sorted)
+
+        # velocities added (weight 1) and removed (weight -1) since the anchor,
+        # sorted by velocity, with the weight in the lowest bits of the sort
+        # key (velocities neither added nor removed yet are sorted last)
+        added = L - 1 + anchor[:, None] * step + np.arange(1, step)
+        changed = np.tile(added <= queries[:, None], 2)
+        changes = np.concatenate(
+            [history[np.minimum(added, len(history) - 1)],
+             history[added - L]], axis=1).astype(np.float32)
+        changes[~changed] = np.inf
+        keys = changes.view(np.int32).astype(np.int64) << 2
+        keys[:, :step - 1] |= 2
+        keys[:, step - 1:] |= 1
+        keys[~changed] &= ~3
+        keys.sort(axis=1)
+        code = keys & 3
+        self.weight = (code == 2).astype(np.int64) - (code == 1)
+        self.changes = (keys >> 2).astype(np.int32).view(np.float32).astype(
+            np.float64)
+        deviations = np.where(self.weight != 0, self.changes - self.ref(
+            np.arange(len(queries)))[:, None], 0.0)
+        self.change_count = np.zeros((len(queries), 2 * step - 1),
+                                     dtype=np.int64)
+        self.change_count[:, 1:] = np.cumsum(self.weight, axis=1)
+        self.change_sum1, self.change_sum2 = _cumulativeSums(
+            deviations * self.weight, deviations * deviations * self.weight)
+        self.change_keys = _rowKeys(self.changes)
+
+    def ref(self, ix):
+        """Velocity the sums of deviations are from, for queries ix."""
+        return self.sorted[self.row[ix], self.L // 2]
+
+    def total(self):
+        """Count, sum and sum of squares of deviations of whole histories."""
+        row = self.row
+        n = np.full(len(row), self.L)
+        s1 = self.sum1[row, -1] + self.change_sum1[:, -1]
+        s2 = self.sum2[row, -1] + self.change_sum2[:, -1]
+        return n, s1, s2
+
+    def below(self, thresholds, ix):
+        """Count, sum and sum of squares of deviations of velocities below
+        thresholds in histories ix, and whether any velocity is too close to
+        its threshold to be sure which side it's on."""
+        keys = _float32Keys(thresholds)
+        margin = np.abs(thresholds) * _TOLERANCE
+        row = self.row[ix]
+        count = _rowSearch(self.keys, row, keys, self.L)
+        near = _near(self.sorted, row, count, thresholds, margin)
+        changes = _rowSearch(self.change_keys, ix, keys,
+                             self.changes.shape[1])
+        near |= _near(self.changes, ix, changes, thresholds, margin)
+        return (count + self.change_count[ix, changes],
+                self.sum1[row, count] + self.change_sum1[ix, changes],
+                self.sum2[row, count] + self.change_sum2[ix, changes],
+                near)
+
+    def meanStd(self, n, s1, s2, ix):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_dev = s1 / n
+            var = np.maximum(s2 / n - mean_dev ** 2, 0.0)
+        return self.ref(ix) + mean_dev, np.sqrt(var)
+
+
+def _cumulativeSums(deviations, squares=None):
+    """Cumulative sums of deviations and of their squares along rows, each
+    starting from 0."""
+    if squares is None:
+        squares = deviations * deviations
+    sums = []
+    for values in (deviations, squares):
+        cumulative = np.empty((values.shape[0], values.shape[1] + 1))
+        cumulative[:, 0] = 0.0
+        np.cumsum(values, axis=1, out=cumulative[:, 1:])
+        sums.append(cumulative)
+    return sums
+
+
+def _rowKeys(sorted_rows):
+    """Keys of the float32 values of sorted rows, sorted across all rows."""
+    return (sorted_rows.astype(np.float32).view(np.int32)
+            + (np.arange(len(sorted_rows), dtype=np.int64) << 32)[:, None]
+            ).ravel()
+
+
+def _rowSearch(row_keys, row, keys, row_length):
+    """Number of values in each row below the thresholds with keys."""
+    return np.searchsorted(row_keys, keys + (row.astype(np.int64) << 32)
+                           ) - row * row_length
+
+
+def _near(sorted_rows, row, count, thresholds, margin):
+    """Whether the values either side of thresholds in sorted rows are within
+    margin of them."""
+    near = np.zeros(len(row), dtype=bool)
+    for has, offset in ((count > 0, -1), (count < sorted_rows.shape[1], 0)):
+        near[has] |= np.abs(sorted_rows[row[has], count[has] + offset]
+                            - thresholds[has]) <= margin[has]
+    return near
+
+
+def _approxThresholds(history, history_length, queries):
+    """Thresholds at each query (index into history), from sorted copies of
+    the history, and whether each might differ from the exact threshold."""
+    minimum = _slidingMin(history, history_length)
+    thresholds = np.zeros(len(queries))
+    uncertain = np.zeros(len(queries), dtype=bool)
+    per_group = _ANCHOR_STEP * _ANCHORS_PER_GROUP
+    for group_start in range(0, len(queries), per_group):
+        group = slice(group_start, group_start + per_group)
+        thresholds[group], uncertain[group] = _approxGroupThresholds(
+            history, history_length, queries[group], minimum)
+    return thresholds, uncertain
+
+
+def _approxGroupThresholds(history, history_length, queries, minimum):
+    sorted_histories = _SortedHistories(history, history_length, queries)
+    everything = np.arange(len(queries))
+    n, s1, s2 = sorted_histories.total()
+    mean, std = sorted_histories.meanStd(n, s1, s2, everything)
+    threshold = minimum[queries] + std * 3.0
+    n, s1, s2, uncertain = sorted_histories.below(threshold, everything)
+    active = everything
+    for iteration in range(_MAX_ITERATIONS):
+        if not len(active):
+            break
+        mean, std = sorted_histories.meanStd(
+            n[active], s1[active], s2[active], active)
+        new_threshold = mean + 3.0 * std
+        # (no velocities below the threshold is left to the exact calculation)
+        uncertain[active] |= n[active] == 0
+        n_a, s1_a, s2_a, near = sorted_histories.below(new_threshold, active)
+        n[active], s1[active], s2[active] = n_a, s1_a, s2_a
+        uncertain[active] |= near
+        change = np.abs(new_threshold - threshold[active])
+        uncertain[active] |= np.abs(change - 1.0) <= _TOLERANCE * (
+            np.abs(new_threshold) + np.abs(threshold[active]) + 1.0)
+        threshold[active] = new_threshold
+        active = active[change >= 1.0]
+    uncertain[active] = True
+    # thresholds too close to the velocity itself could classify it either way
+    velocity = history[queries]
+    uncertain |= np.abs(velocity - threshold) <= _TOLERANCE * np.abs(threshold)
+    uncertain |= ~np.isfinite(threshold)
+    return threshold, uncertain
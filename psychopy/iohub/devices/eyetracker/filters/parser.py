@@ -152,6 +152,23 @@ RIGHT_EYE = 2
 BOTH_EYE = 3
 
 
+def velocityThreshold(velocities):
+    """Adaptive velocity threshold for the velocities in `velocities`: starting
+    from the minimum plus 3 SD, the threshold is set to the mean plus 3 SD of
+    the velocities below it until it changes by less than 1.
+    """
+    PT = velocities.min() + velocities.std() * 3.0
+    velocity_below_thresh = velocities[velocities < PT]
+    PTd = 2.0
+    pt_list = [PT, ]
+    while PTd >= 1.0:
+        PT = velocity_below_thresh.mean() + 3.0 * velocity_below_thresh.std()
+        velocity_below_thresh = velocities[velocities < PT]
+        PTd = np.abs(PT - pt_list[-1])
+        pt_list.append(PT)
+    return PT
+
+
 class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
 
     def __init__(self, **kwargs):
@@ -192,10 +209,10 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
             vel_filter_class, vel_filter_kwargs = eventfilters.PassThroughFilter, {}
 
         self.adaptive_x_vthresh_buffer = np.zeros(
-            self.vel_thresh_history_dur * sampling_rate)
+            int(self.vel_thresh_history_dur * sampling_rate))
         self.x_vthresh_buffer_index = 0
         self.adaptive_y_vthresh_buffer = np.zeros(
-            self.vel_thresh_history_dur * sampling_rate)
+            int(self.vel_thresh_history_dur * sampling_rate))
         self.y_vthresh_buffer_index = 0
 
         pos_filter_kwargs['event_type'] = MONOCULAR_EYE_SAMPLE
@@ -309,8 +326,6 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
         if self.isValidSample(sample):
             x_velocity_threshold = sample[self.io_event_ix('raw_x')]
             y_velocity_threshold = sample[self.io_event_ix('raw_y')]
-            if x_velocity_threshold == np.NaN:
-                return None
             sample_vx = sample[self.io_event_ix('velocity_x')]
             sample_vy = sample[self.io_event_ix('velocity_y')]
             if sample_vx >= x_velocity_threshold or sample_vy >= y_velocity_threshold:
@@ -426,23 +441,32 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
                 else:
                     self.y_vthresh_buffer_index += 1
                 if full:
-                    PT = current_velocity_buffer.min() + current_velocity_buffer.std() * 3.0
-                    velocity_below_thresh = current_velocity_buffer[
-                        current_velocity_buffer < PT]
-                    PTd = 2.0
-                    pt_list = [PT, ]
-                    while PTd >= 1.0:
-                        if len(pt_list) > 0:
-                            PT = velocity_below_thresh.mean() + 3.0 * velocity_below_thresh.std()
-                            velocity_below_thresh = current_velocity_buffer[
-                                current_velocity_buffer < PT]
-                            PTd = np.abs(PT - pt_list[-1])
-                        pt_list.append(PT)
-                    vthresh_values.append(PT)
+                    vthresh_values.append(
+                        velocityThreshold(current_velocity_buffer))
             if len(vthresh_values) != v + 1:
-                vthresh_values.append(np.NaN)
+                vthresh_values.append(np.nan)
         return vthresh_values
 
+    def parseSamples(self, samples):
+        """Parse a whole recording of samples at once, rather than one sample
+        at a time as they arrive. See `batch.parseSamples`, which this calls
+        with the display, sampling rate and threshold history of the parser.
+
+        Only supported when the parser uses PassThroughFilter for positions
+        and velocities (the default).
+        """
+        from .batch import parseRecording
+        for field_filter in (self.x_position_filter, self.y_position_filter,
+                             self.x_velocity_filter, self.y_velocity_filter,
+                             self.xy_velocity_filter):
+            if not isinstance(field_filter, eventfilters.PassThroughFilter):
+                raise ValueError(
+                    'Batch parsing only supports PassThroughFilter, not %s'
+                    % type(field_filter).__name__)
+        return parseRecording(samples, self.pix2deg,
+                              len(self.adaptive_x_vthresh_buffer),
+                              self.filter_id)
+
     def reset(self):
         eventfilters.DeviceEventFilter.reset(self)
         self._last_parser_sample = None
@@ -549,10 +573,12 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
         current_event[io_ix('velocity_xy')] = np.hypot(dx / dt, dy / dt)
 
     def _convertMonoFields(self, prev_event, current_event):
-        if self.isValidSample(current_event):
-            self._convertPosToAngles(self, current_event)
+        mono_evt = list(current_event)
+        if self.isValidSample(mono_evt):
+            self._convertPosToAngles(mono_evt)
             if prev_event:
-                self._addVelocity(prev_event, current_event)
+                self._addVelocity(prev_event, mono_evt)
+        return mono_evt
 
     def _convertToMonoAveraged(self, prev_event, current_event):
         mono_evt = []
@@ -825,7 +851,7 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
                     'time')] - existing_start_event[self.io_event_ix('time')],
                 xDiff,
                 yDiff,
-                np.rad2deg(np.arctan(yDiff, xDiff)),
+                np.rad2deg(np.arctan2(yDiff, xDiff)),
                 existing_start_event[gx],
                 existing_start_event[gy],
                 0.0,
@@ -29,6 +29,7 @@ from .util import convertCamelToSnake, win32MessagePump
 from .util import yload, yLoader
 from .constants import DeviceConstants, EventConstants
 from .devices import DeviceEvent, import_device, importDeviceModule
+from .devices import packEventArrays
 from .devices import Computer
 from .devices.deviceConfigValidation import validateDeviceConfiguration
 getTime = Computer.getTime
@@ -92,7 +93,11 @@ class udpServer(DatagramServer):
             request_type = str(request_type, 'utf-8') # convert bytes to string for compatibility
 
         if request_type == 'SYNC_REQ':
-            self.sendResponse(['SYNC_REPLY', getTime()], replyTo)
+            reply = ['SYNC_REPLY', getTime()]
+            if request:
+                # request id, so the client can match replies to requests
+                reply.append(request.pop(0))
+            self.sendResponse(reply, replyTo)
             return True
         elif request_type == 'PING':
             _ = request.pop(0) #client time
@@ -103,7 +108,12 @@ class udpServer(DatagramServer):
                                payload, replyTo], replyTo)
             return True
         elif request_type == 'GET_EVENTS':
-            return self.handleGetEvents(replyTo)
+            as_type = None
+            if request:
+                as_type = request.pop(0)
+                if isinstance(as_type, bytes):
+                    as_type = str(as_type, 'utf-8')
+            return self.handleGetEvents(replyTo, as_type)
         elif request_type == 'EXP_DEVICE':
             return self.handleExperimentDeviceRequest(request, replyTo)
         elif request_type == 'CUSTOM_TASK':
@@ -215,7 +225,7 @@ class udpServer(DatagramServer):
         edata = ('CUSTOM_TASK_REPLY', request)
         self.sendResponse(edata, replyTo)
 
-    def handleGetEvents(self, replyTo):
+    def handleGetEvents(self, replyTo, as_type=None):
         try:
             self.iohub.processDeviceEvents()
             currentEvents = list(self.iohub.eventBuffer)
@@ -225,6 +235,8 @@ class udpServer(DatagramServer):
                 currentEvents = sorted(
                     currentEvents, key=itemgetter(
                         DeviceEvent.EVENT_HUB_TIME_INDEX))
+                if as_type == 'numpy':
+                    currentEvents = packEventArrays(currentEvents)
                 self.sendResponse(
                     ('GET_EVENTS_RESULT', currentEvents), replyTo)
             else:
@@ -488,6 +500,14 @@ class udpServer(DatagramServer):
             return dsfile.extendConditionVariableTable(exp_id, sess_id, data)
         return False
 
+    def addClockSyncModel(self, model):
+        """Save a model of the iohub server's clock against the experiment
+        process's (see psychopy.iohub.clocksync) to the ioDataStore file."""
+        dsfile = self.iohub.dsfile
+        if dsfile:
+            return dsfile.addClockSyncModel(convertByteStrings(model))
+        return False
+
     def clearEventBuffer(self, clear_device_level_buffers=False):
         """
 
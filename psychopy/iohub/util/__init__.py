@@ -665,6 +665,27 @@ class NumPyRingBuffer():
         self._npa[(i % self.max_size) + self.max_size] = element
         self._index += 1
 
+    def extend(self, elements):
+        """Add each element of the sequence elements to the end of the
+        RingBuffer, in order, as if append was called with each one but
+        without looping in Python. If more than max_size elements are given,
+        only the last max_size are kept.
+
+        :param numpy.array elements: Elements to add to the RingBuffer.
+        :returns None:
+
+        """
+        elements = numpy.asarray(elements, dtype=self._dtype)
+        count = len(elements)
+        if count == 0:
+            return
+        kept = elements[-self.max_size:]
+        positions = (numpy.arange(count - len(kept), count) +
+                     self._index) % self.max_size
+        self._npa[positions] = kept
+        self._npa[positions + self.max_size] = kept
+        self._index += count
+
     def getElements(self):
         """Return the numpy array being used by the RingBuffer, the length of
         which will be equal to the number of elements added to the list, or the
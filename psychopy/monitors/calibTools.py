@@ -24,7 +24,10 @@ import sys
 from copy import deepcopy, copy
 
 import numpy as np
-from scipy import interpolate
+from psychopy.contrib.lazy_import import lazy_import
+# scipy.interpolate is slow to import and only needed for calibration and
+# colour space conversions, so don't import it until then
+lazy_import(globals(), "from scipy import interpolate")
 import json_tricks  # allows json to dump/load np.arrays and dates
 
 DEBUG = False
@@ -33,6 +33,7 @@ import inspect
 import collections
 import hashlib
 import importlib, importlib.metadata
+import json
 from psychopy import logging
 from psychopy.preferences import prefs
 from .util import PluginStub, PluginRequiredError
@@ -55,6 +56,11 @@ _loaded_plugins_ = collections.OrderedDict()  # use OrderedDict for Py2 compatib
 # calling `scanPlugins`. We are caching entry points to avoid having to rescan
 # packages for them.
 _installed_plugins_ = collections.OrderedDict()
+_plugins_scanned_ = False
+
+# Version of the plugin index file format, files with any other version are
+# ignored and rewritten.
+_pluginIndexVersion = 1
 
 # Keep track of plugins that failed to load here
 _failed_plugins_ = []
@@ -260,8 +266,8 @@ def computeChecksum(fpath, method='sha256', writeOut=None):
     with open(fpath, "rb") as f:
         chunk = f.read(4096)
         while chunk != b"":
-            chunk = f.read(4096)
             hashobj.update(chunk)
+            chunk = f.read(4096)
 
     checksumStr = hashobj.hexdigest()
 
@@ -410,7 +416,163 @@ def installPlugin(package, local=True, upgrade=False, forceReinstall=False,
         noDeps=noDeps)
 
 
-def scanPlugins():
+def _getPluginIndexPath():
+    """Get the path to the plugin index file for this Python environment.
+
+    Each interpreter gets its own index, as environments can share a user
+    preferences folder but have different packages installed.
+
+    Returns
+    -------
+    pathlib.Path
+        Path to the index file, which may not exist yet.
+
+    """
+    envKey = hashlib.md5(sys.executable.encode('utf-8')).hexdigest()[:12]
+
+    return Path(prefs.paths['userCacheDir']) / 'plugins' / (
+        'pluginIndex_{}.json'.format(envKey))
+
+
+def _getPathMTime(path):
+    """Modification time (ns) of a directory or file on the search path, or
+    `None` if it doesn't exist.
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _entryPointsChecksum(metadataPath):
+    """Checksum of the `entry_points.txt` file in a distribution's metadata
+    folder, or `None` if it can't be read.
+    """
+    try:
+        return computeChecksum(
+            os.path.join(metadataPath, 'entry_points.txt'), method='md5')
+    except OSError:
+        return None
+
+
+def _scanPath(path):
+    """Find distributions with PsychoPy entry points in a single search path.
+
+    Parameters
+    ----------
+    path : str
+        Entry of `sys.path` (or the user packages folder) to search.
+
+    Returns
+    -------
+    list[dict]
+        Entry for each distribution which has PsychoPy entry points, with its
+        name, metadata folder, checksum of its `entry_points.txt` file and
+        entry points as `[group, name, value]` lists. This is the form they
+        are stored in the plugin index.
+
+    """
+    found = []
+    for dist in importlib.metadata.distributions(path=[path]):
+        entryPoints = [
+            [ep.group, ep.name, ep.value] for ep in dist.entry_points
+            if ep.group.startswith("psychopy")]  # skip non-PsychoPy groups
+        if not entryPoints:
+            continue
+        if sys.version.startswith("3.8") or sys.version.startswith("3.9"):
+            distName = dist.metadata['name']
+        else:
+            distName = dist.name
+        # only distributions found on the file system have a metadata folder
+        metadataPath = getattr(dist, '_path', None)
+        if metadataPath is not None:
+            metadataPath = str(metadataPath)
+        found.append({
+            'name': distName,
+            'metadataPath': metadataPath,
+            'checksum': (_entryPointsChecksum(metadataPath)
+                         if metadataPath is not None else None),
+            'entryPoints': entryPoints,
+        })
+
+    return found
+
+
+def _loadPluginIndex():
+    """Load the plugin index for this Python environment.
+
+    Returns
+    -------
+    dict
+        Entries of the index by search path, empty if there is no index (or
+        it can't be read).
+
+    """
+    indexPath = _getPluginIndexPath()
+    if not indexPath.is_file():
+        return {}
+    try:
+        with open(indexPath, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError) as err:
+        logging.debug(
+            "Could not read plugin index `{}`: {}".format(indexPath, err))
+        return {}
+    if index.get('version') != _pluginIndexVersion or \
+            index.get('python') != sys.version:
+        return {}
+
+    return index.get('paths', {})
+
+
+def _savePluginIndex(paths):
+    """Write the plugin index for this Python environment.
+
+    Parameters
+    ----------
+    paths : dict
+        Entries of the index by search path.
+
+    """
+    indexPath = _getPluginIndexPath()
+    index = {
+        'version': _pluginIndexVersion,
+        'python': sys.version,
+        'paths': paths,
+    }
+    try:
+        indexPath.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so other processes never read a
+        # partially written index
+        tmpPath = indexPath.with_name(
+            indexPath.name + '.{}.tmp'.format(os.getpid()))
+        with open(tmpPath, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmpPath, indexPath)
+    except OSError as err:
+        logging.debug(
+            "Could not write plugin index `{}`: {}".format(indexPath, err))
+
+
+def _isPathEntryValid(entry, mtime):
+    """Check whether the index entry for a search path is still up to date.
+
+    An entry is stale if the path has been modified since it was scanned
+    (which happens whenever a package is installed or removed there) or if
+    the entry points of any plugin found there have changed.
+    """
+    if entry is None or entry.get('mtime') != mtime:
+        return False
+    for plugin in entry.get('plugins', []):
+        if plugin['metadataPath'] is None:
+            return False  # can't check this one, so always rescan
+        if _entryPointsChecksum(plugin['metadataPath']) != plugin['checksum']:
+            return False
+
+    return True
+
+
+def scanPlugins(refresh=False):
     """Scan the system for installed plugins.
 
     This function scans installed packages for the current Python environment
@@ -420,6 +582,18 @@ def scanPlugins():
     called automatically when PsychoPy starts, so you do not need to call this
     unless packages have been added since the session began.
 
+    Results are kept in an index file in the user cache folder, so that
+    packages are only rescanned for entry points when something has changed.
+    Each path on `sys.path` (plus the user packages folder) is rescanned if
+    its modification time has changed since it was last scanned, or if the
+    `entry_points.txt` file of any plugin found there has a different
+    checksum.
+
+    Parameters
+    ----------
+    refresh : bool
+        If `True`, ignore the index and rescan every path.
+
     Returns
     -------
     int
@@ -427,28 +601,47 @@ def scanPlugins():
         return the names of the found plugins.
 
     """
-    global _installed_plugins_
+    global _installed_plugins_, _plugins_scanned_
     _installed_plugins_ = {}  # clear the cache
-    # iterate through installed packages
-    for dist in importlib.metadata.distributions(path=sys.path + [USER_PACKAGES_PATH]):
+    oldIndex = {} if refresh else _loadPluginIndex()
+    newIndex = {}
+    nRescanned = 0
+    # iterate through paths in the same order they are searched for packages
+    for path in sys.path + [USER_PACKAGES_PATH]:
+        # `''` is the current directory, so index it by its absolute path
+        key = os.path.abspath(path)
+        if key in newIndex:  # path listed twice, no need to check again
+            entry = newIndex[key]
+        else:
+            mtime = _getPathMTime(key)
+            entry = oldIndex.get(key)
+            if not _isPathEntryValid(entry, mtime):
+                entry = {'mtime': mtime, 'plugins': _scanPath(path)}
+                nRescanned += 1
+            newIndex[key] = entry
         # map all entry points
-        for ep in dist.entry_points:
-            # skip entry points which don't target PsychoPy
-            if not ep.group.startswith("psychopy"):
-                continue
+        for plugin in entry['plugins']:
+            distName = plugin['name']
             # make sure we have an entry for this distribution
-            if sys.version.startswith("3.8") or sys.version.startswith("3.9"):
-                distName = dist.metadata['name']
-            else:
-                distName = dist.name
             if distName not in _installed_plugins_:
                 _installed_plugins_[distName] = {}
-            # make sure we have an entry for this group
-            if ep.group not in _installed_plugins_[distName]:
-                _installed_plugins_[distName][ep.group] = {}
-            # map entry point
-            _installed_plugins_[distName][ep.group][ep.name] = ep
-    
+            for group, name, value in plugin['entryPoints']:
+                # make sure we have an entry for this group
+                if group not in _installed_plugins_[distName]:
+                    _installed_plugins_[distName][group] = {}
+                # map entry point
+                _installed_plugins_[distName][group][name] = \
+                    importlib.metadata.EntryPoint(
+                        name=name, value=value, group=group)
+
+    # only write the index out if anything has changed
+    if nRescanned or set(newIndex) != set(oldIndex):
+        _savePluginIndex(newIndex)
+    logging.debug(
+        "Scanned for plugins, {} of {} paths rescanned.".format(
+            nRescanned, len(newIndex)))
+    _plugins_scanned_ = True
+
     return len(_installed_plugins_)
 
 
@@ -525,6 +718,8 @@ def listPlugins(which='all'):
     elif which == 'failed':
         return list(_failed_plugins_)  # copy
     else:
+        if not _plugins_scanned_:  # read the index if we haven't yet
+            scanPlugins()
         return list(_installed_plugins_.keys())
 
 
@@ -662,6 +857,9 @@ def loadPlugin(plugin):
         logging.info('Plugin `{}` already loaded. Skipping.'.format(plugin))
         return True  # already loaded, return True
 
+    if not _plugins_scanned_:  # read the index if we haven't yet
+        scanPlugins()
+
     try:
         entryMap = _installed_plugins_[plugin]
     except KeyError:
@@ -188,17 +188,22 @@ def compileScript(infile=None, version=None, outfile=None):
         targetOutput : string
             The Python or JavaScript target type
         """
+        # experiments open in Builder are compiled repeatedly, so reuse code
+        # from the last compile for any Routines which haven't changed
+        incremental = thisExp is infile
         # Write script
         if targetOutput == "PsychoJS":
             # Write module JS code
-            script = thisExp.writeScript(outfile, target=targetOutput, modular=True)
+            script = thisExp.writeScript(outfile, target=targetOutput, modular=True,
+                                         incremental=incremental)
             # Write no module JS code
             outfileNoModule = outfile.replace('.js', '-legacy-browsers.js')  # For no JS module script
-            scriptNoModule = thisExp.writeScript(outfileNoModule, target=targetOutput, modular=False)
+            scriptNoModule = thisExp.writeScript(outfileNoModule, target=targetOutput, modular=False,
+                                                 incremental=incremental)
             # Store scripts in list
             scriptDict = [(outfile, script), (outfileNoModule, scriptNoModule)]
         else:
-            script = thisExp.writeScript(outfile, target=targetOutput)
+            script = thisExp.writeScript(outfile, target=targetOutput, incremental=incremental)
             scriptDict = [(outfile, script)]
 
         # Output script to file
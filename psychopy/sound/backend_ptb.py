@@ -20,6 +20,7 @@ from psychopy.tools import filetools as ft
 from .exceptions import SoundFormatError, DependencyError
 from ._base import _SoundBase, HammingWindow
 from .audioclip import AudioClip
+from .soundbank import SoundBank
 from ..hardware import DeviceManager
 
 try:
@@ -36,7 +37,9 @@ import numpy as np
 
 __all__ = [
     "SoundPTB",
-    "Sound"
+    "Sound",
+    "soundBank",
+    "preloadSounds"
 ]
 
 
@@ -86,6 +89,81 @@ def init(rate=48000, stereo=True, buffer=128):
     pass  # for compatibility with other backends
 
 
+# sound files decoded and converted for playback, shared by all Sounds
+soundBank = SoundBank()
+
+
+def _getSpeaker(speaker):
+    """Get a SpeakerDevice from a SpeakerDevice, the name of a managed
+    speaker, or anything else SpeakerDevice accepts (e.g. None for the
+    default).
+    """
+    # if given the name of a managed speaker, get it
+    if isinstance(speaker, str) and DeviceManager.getDevice(speaker):
+        speaker = DeviceManager.getDevice(speaker)
+    # make sure speaker is a SpeakerDevice
+    if not isinstance(speaker, SpeakerDevice):
+        speaker = SpeakerDevice(speaker)
+
+    return speaker
+
+
+def preloadSounds(files, speaker=None):
+    """Decode, resample and convert sound files up front, ready to be played
+    on a given speaker, so that setting a Sound to one of them (e.g. on each
+    trial) doesn't need to read the file again.
+
+    Parameters
+    ----------
+    files : list of str or Path
+        Paths to the sound files.
+    speaker : SpeakerDevice, str or None
+        Speaker the sounds will be played on (or the name of one), or None
+        for the default.
+
+    Returns
+    -------
+    list of psychopy.sound.soundbank.BankedSound
+        The sounds, in the same order as `files`.
+    """
+    speaker = _getSpeaker(speaker)
+    sounds = soundBank.load(
+        files,
+        sampleRateHz=speaker.sampleRateHz,
+        channels=2 if speaker.channels > 1 else 1,
+        resample=speaker.resample)
+    # create buffers on the audio device now too, so they're ready to use
+    for snd in sounds:
+        _getBufferHandle(snd)
+
+    return sounds
+
+
+def _getBufferHandle(snd, trackHandle=None):
+    """Handle of a buffer on the audio device holding the samples of a
+    BankedSound, creating it if needed. Returns None if buffers can't be
+    created (in which case samples have to be copied to each track).
+    """
+    handle = snd.getHandle(default=None)
+    if handle is None:
+        # buffers don't belong to any one track, the track is only given to check the data fits it
+        if trackHandle is None:
+            trackHandle = []
+        try:
+            handle = audio.PsychPortAudio(
+                'CreateBuffer', trackHandle, snd.clip.samples)
+        except Exception as err:
+            logging.debug(
+                "Could not create audio buffer for {}: {}".format(
+                    snd.filename, err))
+            handle = False
+        snd.addHandle(
+            handle,
+            release=lambda h: h and audio.PsychPortAudio('DeleteBuffer', h, 0))
+
+    return handle or None
+
+
 class SoundPTB(_SoundBase):
     """Play a variety of sounds using the new PsychPortAudio library
     """
@@ -125,13 +203,7 @@ class SoundPTB(_SoundBase):
         :param autoLog: whether to automatically log every change
         :param syncToWin: if you want start/stop to sync with win flips add this
         """
-        # if given the name of a managed speaker, get it
-        if isinstance(speaker, str) and DeviceManager.getDevice(speaker):
-            speaker = DeviceManager.getDevice(speaker)
-        # make sure speaker is a SpeakerDevice
-        if not isinstance(speaker, SpeakerDevice):
-            speaker = SpeakerDevice(speaker)
-        self.speaker = speaker
+        self.speaker = _getSpeaker(speaker)
         
         self.sound = value
         self.name = name
@@ -246,6 +318,56 @@ class SoundPTB(_SoundBase):
         self.loops = self._loopsRequested
         # start with the base class method
         _SoundBase.setSound(self, value, secs, octave, hamming, log)
+
+    def _setSndFromFile(self, filename):
+        # sounds played whole and fully buffered can come from the sound bank
+        trimmed = (self.startTime and self.startTime > 0) or (self.stopTime and self.stopTime > 0)
+        if self.preBuffer != -1 or trimmed:
+            return _SoundBase._setSndFromFile(self, filename)
+        try:
+            snd = soundBank.get(
+                filename,
+                sampleRateHz=self.speaker.sampleRateHz,
+                channels=2 if self.speaker.channels > 1 else 1,
+                resample=self.speaker.resample
+            )
+        except ValueError:
+            # e.g. an empty file, which is handled as a special case
+            return _SoundBase._setSndFromFile(self, filename)
+        self._setSndFromBank(snd)
+
+    def _setSndFromBank(self, snd):
+        """
+        Set current sound from a sound file which has already been decoded and converted (see
+        `psychopy.sound.soundbank`), leaving this object as if it had been set from the file.
+        """
+        self.sndFile = None
+        self.sampleRate = snd.fileSampleRateHz
+        if self.channels == -1:  # if channels was auto then set to file val
+            self.channels = snd.fileChannels
+        self.t = 0
+        self.duration = snd.fileDuration
+        self.durationFrames = int(round(self.duration * self.sampleRate))
+        self.sndArr = snd.fileSamples
+        self._nSamples = snd.fileSamples.shape[0]
+        self.sourceType = "array"
+        self._channelCheck(self.sndArr)
+        # store clip
+        self.clip = snd.clip
+        if self.stopTime == -1:
+            self.duration = snd.duration
+        # create/update track, swapping in the buffer already on the device if we can
+        if self.track:
+            self.track.stop()
+        else:
+            self.track = audio.Slave(self.stream.handle, volume=self.volume)
+        handle = _getBufferHandle(snd, self.track.handle)
+        if handle is not None:
+            audio.PsychPortAudio('FillBuffer', self.track.handle, handle)
+        else:
+            self.track.fill_buffer(snd.clip.samples)
+        # seek to start
+        self.seek(0)
     
     def _setSndFromClip(self, clip: AudioClip):
         # store clip
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Sound files decoded, resampled and converted ready for playback.
+
+Setting a Sound from a file means reading and decoding the file, resampling
+it to the rate of the speaker and converting it to stereo or mono, which for
+tasks reusing a handful of sound files on every trial (e.g. oddball designs)
+means doing the same work over and over. A `SoundBank` keeps the result for
+each file, keyed by the path, sample rate and number of channels, so it's
+only done once. Files can be loaded into the bank up front (e.g. before the
+first trial) with `SoundBank.load`, in which case they're kept for the
+session, and files used by Sounds are kept too, up to a maximum size, after
+which the least recently used are forgotten.
+
+A backend can also keep handles of its own for each sound (e.g. a buffer on
+the audio device, see `BankedSound.addHandle`), so that setting a Sound from
+the bank is just a matter of swapping which buffer it plays.
+"""
+
+__all__ = ["SoundBank", "BankedSound"]
+
+import collections
+import os
+
+import numpy as np
+
+from psychopy import logging
+from .audioclip import AudioClip
+from .exceptions import DependencyError
+
+try:
+    import soundfile as sf
+except Exception:
+    raise DependencyError("soundfile not working")
+
+
+def _fileStamp(filename):
+    """Modification time and size of a file, so changes can be noticed.
+    """
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class BankedSound:
+    """A sound file decoded and converted for playback at a given sample rate
+    and number of channels.
+
+    Attributes
+    ----------
+    filename : str
+        Absolute path of the file.
+    fileSampleRateHz : int
+        Sample rate of the file.
+    fileChannels : int
+        Number of channels in the file.
+    fileSamples : numpy.ndarray
+        Samples as decoded from the file (float32, one column per channel).
+        Read-only, as they're shared by every Sound using this file.
+    clip : AudioClip
+        Samples resampled and converted, ready for playback.
+    pinned : bool
+        True if the sound was loaded up front, so will be kept for the
+        session.
+
+    """
+    def __init__(self, filename, sampleRateHz, channels, resample=True):
+        self.filename = filename
+        self.stamp = _fileStamp(filename)
+        self.pinned = False
+        self._handles = []
+        with sf.SoundFile(filename) as f:
+            self.fileSampleRateHz = f.samplerate
+            self.fileChannels = f.channels
+            # read as many frames as a Sound would (see _SoundBase._setSndFromFile)
+            duration = float(len(f)) / f.samplerate
+            samples = f.read(frames=int(f.samplerate * duration))
+        samples = np.asarray(samples).astype('float32')
+        if not len(samples):
+            raise ValueError("Sound file {} is empty".format(filename))
+        if samples.ndim == 1:
+            samples.shape = [len(samples), 1]
+        samples.flags.writeable = False
+        self.fileSamples = samples
+        # resample and convert, as a Sound would
+        clip = AudioClip(samples=samples, sampleRateHz=self.fileSampleRateHz)
+        if resample and clip.sampleRateHz != sampleRateHz:
+            clip.resample(targetSampleRateHz=sampleRateHz)
+        if channels > 1:
+            clip = clip.asStereo()
+        else:
+            clip = clip.asMono()
+        clip.samples.flags.writeable = False
+        self.clip = clip
+
+    @property
+    def duration(self):
+        """Duration (s) of the sound, after resampling.
+        """
+        return self.clip.samples.shape[0] / self.clip.sampleRateHz
+
+    @property
+    def fileDuration(self):
+        """Duration (s) of the sound file.
+        """
+        return float(len(self.fileSamples)) / self.fileSampleRateHz
+
+    @property
+    def nBytes(self):
+        """Memory taken by the samples.
+        """
+        return self.fileSamples.nbytes + self.clip.samples.nbytes
+
+    def isStale(self):
+        """True if the file has changed (or gone) since it was loaded.
+        """
+        try:
+            return _fileStamp(self.filename) != self.stamp
+        except OSError:
+            return True
+
+    def addHandle(self, handle, release=None):
+        """Keep a backend's handle for this sound (e.g. of a buffer on the
+        audio device), to be released by calling `release(handle)` when the
+        sound is removed from the bank.
+        """
+        self._handles.append((handle, release))
+
+    def getHandle(self, default=None):
+        """The first handle added by `addHandle`, or `default`.
+        """
+        if self._handles:
+            return self._handles[0][0]
+        return default
+
+    def release(self):
+        """Release any handles kept for this sound.
+        """
+        for handle, release in self._handles:
+            if release is None:
+                continue
+            try:
+                release(handle)
+            except Exception as err:
+                logging.debug(
+                    "Could not release handle for {}: {}".format(
+                        self.filename, err))
+        self._handles = []
+
+
+class SoundBank:
+    """Sound files decoded, resampled and converted ready for playback, by
+    path, sample rate and number of channels (see module docs).
+
+    Parameters
+    ----------
+    maxBytes : int
+        Most memory (in bytes) to use for sounds which weren't loaded up
+        front. Sounds which were are always kept.
+
+    Attributes
+    ----------
+    hits : int
+        Number of times a sound was taken from the bank.
+    misses : int
+        Number of times a sound had to be decoded.
+
+    Examples
+    --------
+    Load the sounds for an oddball task before the first trial, so that
+    setting a Sound to either file on each trial is near instant::
+
+        from psychopy.sound import backend_ptb
+
+        backend_ptb.preloadSounds(["standard.wav", "deviant.wav"])
+
+    """
+    def __init__(self, maxBytes=256 * 2 ** 20):
+        self.maxBytes = maxBytes
+        self._sounds = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._sounds)
+
+    def __contains__(self, key):
+        """Whether a sound is in the bank, given `(filename, sampleRateHz,
+        channels)`.
+        """
+        return any(thisKey[:3] == self._key(*key)[:3] for thisKey in self._sounds)
+
+    @staticmethod
+    def _key(filename, sampleRateHz, channels, resample=True):
+        return (os.path.abspath(str(filename)), int(sampleRateHz), int(channels),
+                bool(resample))
+
+    @property
+    def nBytes(self):
+        """Memory taken by all the sounds in the bank.
+        """
+        return sum(snd.nBytes for snd in self._sounds.values())
+
+    def get(self, filename, sampleRateHz, channels, resample=True, add=True):
+        """Get a sound from the bank, decoding it (and adding it to the bank)
+        if it isn't there yet or the file has changed.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Path to the sound file.
+        sampleRateHz : int
+            Sample rate the sound will be played at.
+        channels : int
+            Number of channels the sound will be played with (1 or 2).
+        resample : bool
+            Whether to resample the sound to `sampleRateHz`. If False, the
+            sound is kept at the sample rate of the file.
+        add : bool
+            Whether to decode and add the sound if it isn't in the bank,
+            otherwise return None.
+
+        Returns
+        -------
+        BankedSound or None
+            The sound, ready for playback.
+
+        Raises
+        ------
+        ValueError
+            If the file has no samples.
+        """
+        return self._get(filename, sampleRateHz, channels, resample, add)
+
+    def _get(self, filename, sampleRateHz, channels, resample=True, add=True,
+             pin=False):
+        key = self._key(filename, sampleRateHz, channels, resample)
+        snd = self._sounds.get(key)
+        if snd is not None and snd.isStale():
+            # a changed file stays pinned once loaded again
+            pin = pin or snd.pinned
+            self._remove(key)
+            snd = None
+        if snd is not None:
+            self.hits += 1
+            self._sounds.move_to_end(key)
+            snd.pinned = snd.pinned or pin
+            return snd
+        if not add:
+            return None
+        self.misses += 1
+        snd = BankedSound(key[0], key[1], key[2], resample=resample)
+        snd.pinned = pin
+        self._sounds[key] = snd
+        self._trim()
+
+        return snd
+
+    def load(self, files, sampleRateHz, channels, resample=True):
+        """Decode, resample and convert sound files up front, keeping them
+        for the session.
+
+        Parameters
+        ----------
+        files : list of str or Path
+            Paths to the sound files.
+        sampleRateHz : int
+            Sample rate the sounds will be played at.
+        channels : int
+            Number of channels the sounds will be played with (1 or 2).
+        resample : bool
+            Whether to resample the sounds to `sampleRateHz`.
+
+        Returns
+        -------
+        list of BankedSound
+            The sounds, in the same order as `files`.
+        """
+        sounds = []
+        for filename in files:
+            snd = self._get(
+                filename, sampleRateHz, channels, resample=resample, pin=True)
+            sounds.append(snd)
+        logging.info(
+            "Loaded {} sounds into sound bank ({:.1f} MB)".format(
+                len(sounds), self.nBytes / 2 ** 20))
+
+        return sounds
+
+    def _remove(self, key):
+        self._sounds.pop(key).release()
+
+    def remove(self, filename, sampleRateHz=None, channels=None):
+        """Remove a sound file from the bank, at a given sample rate and
+        number of channels or (if None) at any.
+        """
+        filename = os.path.abspath(str(filename))
+        for key in list(self._sounds):
+            if key[0] == filename and sampleRateHz in (None, key[1]) \
+                    and channels in (None, key[2]):
+                self._remove(key)
+
+    def clear(self):
+        """Remove all sounds from the bank.
+        """
+        for key in list(self._sounds):
+            self._remove(key)
+        self.hits = self.misses = 0
+
+    def _trim(self):
+        """Forget the least recently used sounds (which weren't loaded up
+        front) until within `maxBytes`.
+        """
+        unpinned = [key for key, snd in self._sounds.items() if not snd.pinned]
+        nBytes = sum(self._sounds[key].nBytes for key in unpinned)
+        for key in unpinned:
+            if nBytes <= self.maxBytes:
+                break
+            nBytes -= self._sounds[key].nBytes
+            self._remove(key)
@@ -17,7 +17,7 @@ inputs to convert multiple color values at once.
 """
 
 __all__ = ['srgbTF', 'rec709TF', 'cielab2rgb', 'cielch2rgb', 'dkl2rgb',
-           'dklCart2rgb', 'rgb2dklCart', 'hsv2rgb', 'rgb2lms', 'lms2rgb',
+           'rgb2dkl', 'dklCart2rgb', 'rgb2dklCart', 'hsv2rgb', 'rgb2lms', 'lms2rgb',
            'rgb2hsv', 'rescaleColor']
 
 import numpy
@@ -452,6 +452,51 @@ def dkl2rgb(dkl, conversionMatrix=None):
         return numpy.transpose(rgb)
 
 
+def rgb2dkl(rgb, conversionMatrix=None):
+    """Convert from RGB to DKL color space (elevation, azimuth, radius), the
+    inverse of `dkl2rgb`.
+
+    Parameters
+    ----------
+    rgb : `array_like`
+        1-, 2-, 3-D vector of RGB coordinates to convert. The last dimension
+        should be length-3 in all cases, specifying a single coordinate.
+    conversionMatrix : `array_like` or None
+        DKL to RGB conversion matrix, as for `dkl2rgb`. If None, the matrix
+        for generic Sony Trinitron phosphors is used.
+
+    Returns
+    -------
+    ndarray
+        DKL values (azimuth from 0 to 360) with the same shape as the input.
+
+    """
+    rgb, orig_shape, orig_dim = unpackColors(rgb)
+
+    if conversionMatrix is None:
+        conversionMatrix = numpy.asarray([
+            # (note that dkl has to be in cartesian coords first!)
+            # LUMIN    %L-M    %L+M-S
+            [1.0000, 1.0000, -0.1462],  # R
+            [1.0000, -0.3900, 0.2094],  # G
+            [1.0000, 0.0180, -1.0000]])  # B
+        logging.warning('This monitor has not been color-calibrated. '
+                        'Using default DKL conversion matrix.')
+
+    LUM, RG, BY = numpy.dot(numpy.linalg.inv(conversionMatrix), rgb.T)
+    dkl = numpy.empty_like(rgb)
+    dkl[:, 0] = numpy.degrees(numpy.arctan2(LUM, numpy.hypot(RG, BY)))
+    dkl[:, 1] = numpy.degrees(numpy.arctan2(BY, RG)) % 360
+    dkl[:, 2] = numpy.sqrt(LUM ** 2 + RG ** 2 + BY ** 2)
+
+    if orig_dim == 1:
+        dkl = dkl[0]
+    elif orig_dim == 3:
+        dkl = numpy.reshape(dkl, orig_shape)
+
+    return dkl
+
+
 def dklCart2rgb(LUM, LM, S, conversionMatrix=None):
     """Like dkl2rgb except that it uses cartesian coords (LM,S,LUM)
     rather than spherical coords for DKL (elev, azim, contr).
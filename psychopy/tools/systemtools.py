@@ -28,7 +28,11 @@ __all__ = [
     'getSerialPorts',
     'systemProfilerMacOS',
     'getInstalledDevices',
-    'isPsychopyInFocus'
+    'isPsychopyInFocus',
+    'invalidateDeviceCache',
+    'addDeviceChangeListener',
+    'removeDeviceChangeListener',
+    'DEVICE_CACHE_TTL'
 ]
 
 # Keep imports to a minimum here! We don't want to import the whole stack to
@@ -44,6 +48,10 @@ import os
 import glob
 import subprocess as sp
 import json
+import copy
+import struct
+import threading
+import time
 from psychopy.preferences import prefs
 from psychopy import logging
 
@@ -86,11 +94,343 @@ def isVM_CI():
     elif ("{}".format(os.environ.get('CONDA')).lower() == 'true'):
         return 'conda'
 
+# ------------------------------------------------------------------------------
+# Device inventory cache
+#
+# Enumerating devices means probing the OS (and opening every serial port), which
+# can take hundreds of milliseconds. Results are kept in a process-wide cache
+# shared by the getter functions below, `getInstalledDevices()` and the
+# `DeviceManager`. On Linux, device nodes being added or removed under `/dev`
+# (by udev) are watched with inotify, and only the affected kinds of device are
+# enumerated again. Elsewhere (or if inotify isn't available) cached results
+# expire after `DEVICE_CACHE_TTL` seconds. In case a change is missed (e.g. if
+# the inotify event queue overflows), they also expire after
+# `DEVICE_CACHE_WATCHED_TTL` seconds while watching.
+#
+
+DEVICE_CACHE_TTL = 10.0  # seconds, used if device nodes can't be watched
+DEVICE_CACHE_WATCHED_TTL = 60.0  # seconds, used while watching device nodes
+
+# inotify constants, from <sys/inotify.h>
+_IN_ATTRIB = 0x00000004
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_inotifyEventHeader = struct.Struct('iIII')
+
+
+def _devNodeKinds(dirName, nodeName):
+    """Kinds of device which may have changed when the node `nodeName` in
+    the directory `dirName` (relative to `/dev`) is added or removed.
+    """
+    if dirName == '':
+        if nodeName.startswith('tty'):
+            return {'serial'}
+        elif nodeName.startswith('video'):
+            return {'camera'}
+        elif nodeName == 'input':
+            return {'keyboard'}
+        elif nodeName == 'snd':
+            return {'audio'}
+    elif dirName == 'input':
+        return {'keyboard'}
+    elif dirName == 'snd':
+        return {'audio'}
+
+    return set()
+
+
+class _DeviceNodeWatcher:
+    """Watch directories of device nodes with inotify (Linux only), calling
+    `callback` with the set of device kinds which may have changed.
+
+    Parameters
+    ----------
+    root : str
+        Directory of device nodes to watch, along with its `subDirs`.
+    subDirs : list of str
+        Subdirectories of `root` to watch.
+    callback : callable
+        Called from the watcher thread with a set of device kinds, or `None`
+        if events were lost (so any kind of device may have changed).
+
+    """
+    def __init__(self, root, subDirs, callback):
+        import ctypes
+        import ctypes.util
+
+        self.root = root
+        self.subDirs = subDirs
+        self.callback = callback
+        self._libc = ctypes.CDLL(
+            ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches = {}  # watch descriptor -> directory (relative to root)
+        self._addWatch('')
+        for subDir in subDirs:
+            self._addWatch(subDir)
+        self._thread = threading.Thread(
+            target=self._run, name='DeviceNodeWatcher', daemon=True)
+        self._thread.start()
+
+    def _addWatch(self, dirName):
+        import ctypes
+
+        path = os.path.join(self.root, dirName)
+        if not os.path.isdir(path):
+            return
+        mask = (_IN_CREATE | _IN_DELETE | _IN_ATTRIB | _IN_MOVED_FROM |
+                _IN_MOVED_TO | _IN_DELETE_SELF)
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(path), mask)
+        if wd >= 0:
+            self._watches[wd] = dirName
+        elif dirName == '':
+            raise OSError(
+                ctypes.get_errno(), "Cannot watch '{}'".format(path))
+
+    def _run(self):
+        while True:
+            try:
+                buffer = os.read(self._fd, 4096)
+            except OSError:
+                return  # closed
+            if not buffer:
+                return
+            changed = set()
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = _inotifyEventHeader.unpack_from(
+                    buffer, offset)
+                offset += _inotifyEventHeader.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                name = os.fsdecode(name)
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    # events were dropped, so anything may have changed
+                    changed = None
+                    break
+                dirName = self._watches.get(wd)
+                if dirName is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    del self._watches[wd]  # directory removed
+                    continue
+                kinds = _devNodeKinds(dirName, name)
+                if (mask & _IN_ISDIR and dirName == '' and
+                        name in self.subDirs and mask & _IN_CREATE):
+                    self._addWatch(name)
+                changed.update(kinds)
+            if changed is None or changed:
+                try:
+                    self.callback(changed)
+                except Exception as err:
+                    logging.error(
+                        "Error handling device changes: {}".format(err))
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _DeviceInventory:
+    """Cache of enumerated devices, by kind of device (e.g. `'serial'`).
+
+    An entry is used until it's invalidated, either explicitly or because
+    the device nodes for its kind of device changed, or until it expires:
+    after `DEVICE_CACHE_TTL` seconds if changes can't be watched, otherwise
+    after `DEVICE_CACHE_WATCHED_TTL` seconds (in case a change was missed).
+
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}  # kind -> (time enumerated, devices)
+        self._listeners = []
+        self._watcher = None
+        self._watchStarted = False
+
+    @property
+    def isWatching(self):
+        """`True` if changes to device nodes are being watched.
+        """
+        return self._watcher is not None
+
+    def _startWatching(self):
+        """Start watching for device changes, if supported on this system.
+        """
+        self._watchStarted = True
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            self._watcher = _DeviceNodeWatcher(
+                '/dev', ['input', 'snd'], self._onDevicesChanged)
+        except Exception as err:
+            logging.debug(
+                "Cannot watch for device changes, cached devices will expire "
+                "after {} s: {}".format(DEVICE_CACHE_TTL, err))
+            self._watcher = None
+
+    def _onDevicesChanged(self, kinds):
+        with self._lock:
+            if kinds is None:
+                # events were lost, so forget everything
+                kinds = set(self._entries) | {
+                    'audio', 'camera', 'keyboard', 'serial'}
+            for kind in kinds:
+                self._entries.pop(kind, None)
+            listeners = list(self._listeners)
+        logging.debug("Devices changed: {}".format(sorted(kinds)))
+        for listener in listeners:
+            listener(kinds)
+
+    def get(self, kind, getter, refresh=False):
+        """Get the devices of `kind`, enumerating them with `getter` if
+        they're not cached (or `refresh` is `True`). Returns a copy, which can
+        be safely modified.
+        """
+        with self._lock:
+            if not self._watchStarted:
+                self._startWatching()
+            entry = self._entries.get(kind)
+            if entry is not None and not refresh:
+                enumerated, devices = entry
+                ttl = (DEVICE_CACHE_WATCHED_TTL if self._watcher is not None
+                       else DEVICE_CACHE_TTL)
+                if time.monotonic() - enumerated < ttl:
+                    return copy.deepcopy(devices)
+            devices = getter()
+            self._entries[kind] = (time.monotonic(), devices)
+
+            return copy.deepcopy(devices)
+
+    def invalidate(self, kind=None):
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(kind, None)
+
+    def addListener(self, listener):
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def removeListener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+
+_deviceInventory = _DeviceInventory()
+
+
+def invalidateDeviceCache(deviceKind=None):
+    """Forget cached devices, so that they're enumerated again next time
+    they're requested.
+
+    Parameters
+    ----------
+    deviceKind : str or None
+        Kind of device to forget, one of `'audio'`, `'camera'`, `'keyboard'`
+        or `'serial'`. If `None`, all cached devices are forgotten.
+
+    """
+    _deviceInventory.invalidate(deviceKind)
+
+
+def addDeviceChangeListener(listener):
+    """Call a function when devices are connected or disconnected.
+
+    This is only supported on Linux, where device nodes are watched for
+    changes. The listener is called from a background thread with a `set` of
+    the kinds of device which changed (see :func:`invalidateDeviceCache`),
+    after their cached entries have been forgotten.
+
+    Parameters
+    ----------
+    listener : callable
+        Function taking a single argument.
+
+    Returns
+    -------
+    bool
+        `True` if device changes are being watched (i.e. `listener` will be
+        called), otherwise `False`.
+
+    """
+    _deviceInventory.addListener(listener)
+    with _deviceInventory._lock:
+        if not _deviceInventory._watchStarted:
+            _deviceInventory._startWatching()
+
+    return _deviceInventory.isWatching
+
+
+def removeDeviceChangeListener(listener):
+    """Stop calling a function added with :func:`addDeviceChangeListener`.
+    """
+    _deviceInventory.removeListener(listener)
+
+
 # ------------------------------------------------------------------------------
 # Audio playback and capture devices
 #
 
-def getAudioDevices():
+def _enumerateAudioDevices():
+    """Enumerate audio devices for :func:`getAudioDevices`.
+    """
+    # use the PTB backend for audio
+    import psychtoolbox.audio as audio
+
+    try:
+        enforceWASAPI = bool(prefs.hardware["audioForceWASAPI"])
+    except KeyError:
+        enforceWASAPI = True  # use default if option not present in settings
+
+    # query PTB for devices
+    try:
+        if enforceWASAPI and sys.platform == 'win32':
+            allDevs = audio.get_devices(device_type=13)
+        else:
+            allDevs = audio.get_devices()
+    except Exception as err:
+        # if device detection fails, log warning rather than raising error
+        logging.warning(str(err))
+        allDevs = []
+
+    # make sure we have an array of descriptors
+    allDevs = [allDevs] if isinstance(allDevs, dict) else allDevs
+
+    # format the PTB dictionary to PsychoPy standards
+    toReturn = {}
+    for dev in allDevs:
+        thisAudioDev = {
+            'index': int(dev['DeviceIndex']),
+            'name': dev['DeviceName'],
+            'hostAPI': dev['HostAudioAPIName'],
+            'outputChannels': int(dev['NrOutputChannels']),
+            'outputLatency': (
+                dev['LowOutputLatency'], dev['HighOutputLatency']),
+            'inputChannels': int(dev['NrInputChannels']),
+            'inputLatency': (
+                dev['LowInputLatency'], dev['HighInputLatency']),
+            'defaultSampleRate': dev['DefaultSampleRate'],
+            'audioLib': AUDIO_LIBRARY_PTB
+        }
+
+        toReturn[thisAudioDev['name']] = thisAudioDev
+
+    return toReturn
+
+
+def getAudioDevices(refresh=False):
     """Get all audio devices.
 
     This function gets all audio devices attached to the system, either playback
@@ -102,6 +442,12 @@ def getAudioDevices():
     default. To get all audio devices (including non-WASAPI ones), set the
     preference `audioForceWASAPI` to `False`.
 
+    Parameters
+    ----------
+    refresh : bool
+        Enumerate the audio devices again rather than using the cached result (see
+        :func:`invalidateDeviceCache`). Default is `False`.
+
     Returns
     -------
     dict
@@ -156,51 +502,11 @@ def getAudioDevices():
     devices.
 
     """
-    # use the PTB backend for audio
-    import psychtoolbox.audio as audio
-
-    try:
-        enforceWASAPI = bool(prefs.hardware["audioForceWASAPI"])
-    except KeyError:
-        enforceWASAPI = True  # use default if option not present in settings
-
-    # query PTB for devices
-    try:
-        if enforceWASAPI and sys.platform == 'win32':
-            allDevs = audio.get_devices(device_type=13)
-        else:
-            allDevs = audio.get_devices()
-    except Exception as err:
-        # if device detection fails, log warning rather than raising error
-        logging.warning(str(err))
-        allDevs = []
-
-    # make sure we have an array of descriptors
-    allDevs = [allDevs] if isinstance(allDevs, dict) else allDevs
-
-    # format the PTB dictionary to PsychoPy standards
-    toReturn = {}
-    for dev in allDevs:
-        thisAudioDev = {
-            'index': int(dev['DeviceIndex']),
-            'name': dev['DeviceName'],
-            'hostAPI': dev['HostAudioAPIName'],
-            'outputChannels': int(dev['NrOutputChannels']),
-            'outputLatency': (
-                dev['LowOutputLatency'], dev['HighOutputLatency']),
-            'inputChannels': int(dev['NrInputChannels']),
-            'inputLatency': (
-                dev['LowInputLatency'], dev['HighInputLatency']),
-            'defaultSampleRate': dev['DefaultSampleRate'],
-            'audioLib': AUDIO_LIBRARY_PTB
-        }
+    return _deviceInventory.get(
+        'audio', _enumerateAudioDevices, refresh=refresh)
 
-        toReturn[thisAudioDev['name']] = thisAudioDev
-
-    return toReturn
 
-
-def getAudioCaptureDevices():
+def getAudioCaptureDevices(refresh=False):
     """Get audio capture devices (i.e. microphones) installed on the system.
 
     This command is supported on Windows, MacOSX and Linux. On Windows, WASAPI
@@ -210,6 +516,12 @@ def getAudioCaptureDevices():
 
     Uses the `psychtoolbox` library to obtain the relevant information.
 
+    Parameters
+    ----------
+    refresh : bool
+        Enumerate the audio devices again rather than using the cached result
+        (see :func:`invalidateDeviceCache`). Default is `False`.
+
     Returns
     -------
     dict
@@ -218,7 +530,7 @@ def getAudioCaptureDevices():
         :func:`getAudioDevices()` examples to see the format of the output.
 
     """
-    allDevices = getAudioDevices()  # gat all devices
+    allDevices = getAudioDevices(refresh)  # gat all devices
 
     inputDevices = []  # dict for input devices
 
@@ -236,7 +548,7 @@ def getAudioCaptureDevices():
     return inputDevices
 
 
-def getAudioPlaybackDevices():
+def getAudioPlaybackDevices(refresh=False):
     """Get audio playback devices (i.e. speakers) installed on the system.
 
     This command is supported on Windows, MacOSX and Linux. On Windows, WASAPI
@@ -246,6 +558,12 @@ def getAudioPlaybackDevices():
 
     Uses the `psychtoolbox` library to obtain the relevant information.
 
+    Parameters
+    ----------
+    refresh : bool
+        Enumerate the audio devices again rather than using the cached result
+        (see :func:`invalidateDeviceCache`). Default is `False`.
+
     Returns
     -------
     dict
@@ -254,7 +572,7 @@ def getAudioPlaybackDevices():
         :func:`getAudioDevices()` examples to see the format of the output.
 
     """
-    allDevices = getAudioDevices()  # gat all devices
+    allDevices = getAudioDevices(refresh)  # gat all devices
 
     outputDevices = {}  # dict for output devices
 
@@ -557,12 +875,33 @@ _cameraGetterFuncTbl = {
 }
 
 
-def getCameras():
+def _enumerateCameras():
+    """Enumerate cameras for :func:`getCameras`.
+    """
+    systemName = platform.system()  # get the system name
+
+    # lookup the function for the given platform
+    getCamerasFunc = _cameraGetterFuncTbl.get(systemName, None)
+    if getCamerasFunc is None:  # if unsupported
+        raise OSError(
+            "Cannot get cameras, unsupported platform '{}'.".format(
+                systemName))
+
+    return getCamerasFunc()
+
+
+def getCameras(refresh=False):
     """Get information about installed cameras and their formats on this system.
 
     The command presently only works on Window and MacOSX. Linux support for
     cameras is not available yet.
 
+    Parameters
+    ----------
+    refresh : bool
+        Enumerate the cameras again rather than using the cached result (see
+        :func:`invalidateDeviceCache`). Default is `False`.
+
     Returns
     -------
     dict
@@ -570,27 +909,61 @@ def getCameras():
         `CameraInfo` objects.
 
     """
-    systemName = platform.system()  # get the system name
-
-    # lookup the function for the given platform
-    getCamerasFunc = _cameraGetterFuncTbl.get(systemName, None)
-    if getCamerasFunc is None:  # if unsupported
-        raise OSError(
-            "Cannot get cameras, unsupported platform '{}'.".format(
-                systemName))
-
-    return getCamerasFunc()
+    return _deviceInventory.get('camera', _enumerateCameras, refresh=refresh)
 
 
 # ------------------------------------------------------------------------------
 # Keyboards
 #
 
-def getKeyboards():
+def _enumerateKeyboards():
+    """Enumerate keyboards for :func:`getKeyboards`.
+    """
+    # use PTB to query keyboards, might want to also use IOHub at some point
+    from psychtoolbox import hid
+
+    # use PTB to query for keyboards
+    indices, names, keyboards = hid.get_keyboard_indices()
+
+    toReturn = []
+    if not indices:
+        return toReturn  # just return if no keyboards found
+
+    # ensure these are all the same length
+    assert len(indices) == len(names) == len(keyboards), \
+        "Got inconsistent array length from `get_keyboard_indices()`"
+
+    missingNameIdx = 0  # for keyboard with empty names
+    for i, kbIdx in enumerate(indices):
+        name = names[i]
+        if not name:
+            name = ' '.join(('Generic Keyboard', str(missingNameIdx)))
+            missingNameIdx += 1
+
+        keyboard = keyboards[i]
+        keyboard['device_name'] = name
+
+        # reformat values since PTB returns everything as a float
+        for key, val in keyboard.items():
+            if isinstance(val, float) and key not in ('version',):
+                keyboard[key] = int(val)
+
+        toReturn.append(keyboard)
+
+    return toReturn
+
+
+def getKeyboards(refresh=False):
     """Get information about attached keyboards.
 
     This command works on Windows, MacOSX and Linux.
 
+    Parameters
+    ----------
+    refresh : bool
+        Enumerate the keyboards again rather than using the cached result (see
+        :func:`invalidateDeviceCache`). Default is `False`.
+
     Returns
     -------
     dict
@@ -654,45 +1027,70 @@ def getKeyboards():
         }
 
     """
-    # use PTB to query keyboards, might want to also use IOHub at some point
-    from psychtoolbox import hid
-
-    # use PTB to query for keyboards
-    indices, names, keyboards = hid.get_keyboard_indices()
-
-    toReturn = []
-    if not indices:
-        return toReturn  # just return if no keyboards found
+    return _deviceInventory.get(
+        'keyboard', _enumerateKeyboards, refresh=refresh)
 
-    # ensure these are all the same length
-    assert len(indices) == len(names) == len(keyboards), \
-        "Got inconsistent array length from `get_keyboard_indices()`"
 
-    missingNameIdx = 0  # for keyboard with empty names
-    for i, kbIdx in enumerate(indices):
-        name = names[i]
-        if not name:
-            name = ' '.join(('Generic Keyboard', str(missingNameIdx)))
-            missingNameIdx += 1
+# ------------------------------------------------------------------------------
+# Connectivity
+#
 
-        keyboard = keyboards[i]
-        keyboard['device_name'] = name
+def _enumerateSerialPorts():
+    """Enumerate serial ports for :func:`getSerialPorts`.
+    """
+    try:
+        import serial  # pyserial
+    except ImportError:
+        raise ImportError("Cannot import `pyserial`, check your installation.")
 
-        # reformat values since PTB returns everything as a float
-        for key, val in keyboard.items():
-            if isinstance(val, float) and key not in ('version',):
-                keyboard[key] = int(val)
+    # get port names
+    thisSystem = platform.system()
+    if thisSystem == 'Windows':
+        portNames = [
+            'COM{}'.format(i + 1) for i in range(SERIAL_MAX_ENUM_PORTS)]
+    elif thisSystem == 'Darwin':
+        portNames = glob.glob('/dev/tty.*') + glob.glob('/dev/cu.*')
+        portNames.sort()  # ensure we get things back in the same order
+    elif thisSystem == 'Linux' or thisSystem == 'Linux2':
+        portNames = glob.glob('/dev/tty[A-Za-z]*')
+        portNames.sort()  # ditto
+    else:
+        raise EnvironmentError(
+            "System '{}' is not supported by `getSerialPorts()`".format(
+                thisSystem))
 
-        toReturn.append(keyboard)
+    # enumerate over ports now that we have the names
+    portEnumIdx = 0
+    toReturn = []
+    for name in portNames:
+        try:
+            with serial.Serial(name) as ser:
+                portConf = {   # port information dict
+                    'device_name': name,
+                    'index': portEnumIdx,
+                    'port': ser.port,
+                    'baudrate': ser.baudrate,
+                    'bytesize': ser.bytesize,
+                    'parity': ser.parity,
+                    'stopbits': ser.stopbits,
+                    # 'timeout': ser.timeout,
+                    # 'writeTimeout': ser.write_timeout,
+                    # 'interByteTimeout': ser.inter_byte_timeout,
+                    'xonxoff': ser.xonxoff,
+                    'rtscts': ser.rtscts,
+                    'dsrdtr': ser.dsrdtr,
+                    # 'rs485_mode': ser.rs485_mode
+                }
+                toReturn.append(portConf)
+                portEnumIdx += 1
+        except (OSError, serial.SerialException):
+            # no port found with `name` or cannot be opened
+            pass
 
     return toReturn
 
 
-# ------------------------------------------------------------------------------
-# Connectivity
-#
-
-def getSerialPorts():
+def getSerialPorts(refresh=False):
     """Get serial ports attached to this system.
 
     Serial ports are used for inter-device communication using the RS-232/432
@@ -709,6 +1107,12 @@ def getSerialPorts():
     same name or enum index when a device is connected or after a system
     reboot.
 
+    Parameters
+    ----------
+    refresh : bool
+        Enumerate the serial ports again rather than using the cached result (see
+        :func:`invalidateDeviceCache`). Default is `False`.
+
     Returns
     -------
     dict
@@ -753,56 +1157,8 @@ def getSerialPorts():
         }
 
     """
-    try:
-        import serial  # pyserial
-    except ImportError:
-        raise ImportError("Cannot import `pyserial`, check your installation.")
-
-    # get port names
-    thisSystem = platform.system()
-    if thisSystem == 'Windows':
-        portNames = [
-            'COM{}'.format(i + 1) for i in range(SERIAL_MAX_ENUM_PORTS)]
-    elif thisSystem == 'Darwin':
-        portNames = glob.glob('/dev/tty.*') + glob.glob('/dev/cu.*')
-        portNames.sort()  # ensure we get things back in the same order
-    elif thisSystem == 'Linux' or thisSystem == 'Linux2':
-        portNames = glob.glob('/dev/tty[A-Za-z]*')
-        portNames.sort()  # ditto
-    else:
-        raise EnvironmentError(
-            "System '{}' is not supported by `getSerialPorts()`".format(
-                thisSystem))
-
-    # enumerate over ports now that we have the names
-    portEnumIdx = 0
-    toReturn = []
-    for name in portNames:
-        try:
-            with serial.Serial(name) as ser:
-                portConf = {   # port information dict
-                    'device_name': name,
-                    'index': portEnumIdx,
-                    'port': ser.port,
-                    'baudrate': ser.baudrate,
-                    'bytesize': ser.bytesize,
-                    'parity': ser.parity,
-                    'stopbits': ser.stopbits,
-                    # 'timeout': ser.timeout,
-                    # 'writeTimeout': ser.write_timeout,
-                    # 'interByteTimeout': ser.inter_byte_timeout,
-                    'xonxoff': ser.xonxoff,
-                    'rtscts': ser.rtscts,
-                    'dsrdtr': ser.dsrdtr,
-                    # 'rs485_mode': ser.rs485_mode
-                }
-                toReturn.append(portConf)
-                portEnumIdx += 1
-        except (OSError, serial.SerialException):
-            # no port found with `name` or cannot be opened
-            pass
-
-    return toReturn
+    return _deviceInventory.get(
+        'serial', _enumerateSerialPorts, refresh=refresh)
 
 
 # ------------------------------------------------------------------------------
@@ -1140,13 +1496,6 @@ def systemProfilerMacOS(dataTypes=None, detailLevel='basic', timeout=180):
     return json.loads(systemProfilerRet.decode("utf-8"))  # convert to string
 
 
-# Cache data from the last call of `getInstalledDevices()` to avoid having to
-# query the system again. This is useful for when we want to access the same
-# data multiple times in a script.
-
-_installedDeviceCache = None  # cache for installed devices
-
-
 def getInstalledDevices(deviceType='all', refresh=False):
     """Get information about installed devices.
 
@@ -1159,7 +1508,8 @@ def getInstalledDevices(deviceType='all', refresh=False):
         Type of device to query. Possible values are `'all'`, `'speaker'`,
         `'microphone'`, `'keyboard'`, or `'serial'`. Default is `'all'`.
     refresh : bool
-        Whether to refresh the cache of installed devices. Default is `False`.
+        Whether to enumerate devices again rather than using the device
+        inventory cache (see :func:`invalidateDeviceCache`). Default is `False`.
 
     Returns
     -------
@@ -1208,7 +1558,7 @@ def getInstalledDevices(deviceType='all', refresh=False):
             Supported microphone settings for connected audio capture devices.
         
         """
-        allAudioDevices = getAudioDevices()
+        allAudioDevices = getAudioDevices(refresh)
 
         # get all microphones by name
         foundDevices = []
@@ -1261,7 +1611,7 @@ def getInstalledDevices(deviceType='all', refresh=False):
             Supported camera settings for connected cameras.
 
         """
-        allCameras = getCameras()
+        allCameras = getCameras(refresh)
 
         # colect settings for each camera we found
         deviceSettings = []
@@ -1293,33 +1643,28 @@ def getInstalledDevices(deviceType='all', refresh=False):
             "Requested device type '{}' is not supported.".format(deviceType)
         )
     
-    global _installedDeviceCache  # use the global cache
-    if not refresh and _installedDeviceCache is not None:
-        toReturn = _installedDeviceCache
+    # the getters only enumerate devices if they aren't in the device inventory
+    # cache (or `refresh` is set)
+    toReturn = {}
+    toReturn.update(_getInstalledAudioDevices())  # audio devices
+    toReturn.update({'keyboard': getKeyboards(refresh)})  # keyboards
+    toReturn.update({'serial': getSerialPorts(refresh)})  # serial ports
+    if not platform.system().startswith('Linux'):  # cameras
+        toReturn.update(_getInstalledCameras())
     else:
-        # refresh device cache if requested or if it's empty
-        toReturn = {}
-        toReturn.update(_getInstalledAudioDevices())  # audio devices
-        toReturn.update({'keyboard': getKeyboards()})  # keyboards 
-        toReturn.update({'serial': getSerialPorts()})  # serial ports
-        if not platform.system().startswith('Linux'):  # cameras
-            toReturn.update(_getInstalledCameras())
-        else:
-            logging.error(
-                "Cannot get camera settings on Linux, not supported.")
-
-        _installedDeviceCache = toReturn  # update the cache
+        logging.error(
+            "Cannot get camera settings on Linux, not supported.")
 
     # append supported actions from device manager
     from psychopy.hardware.manager import _deviceMethods
-    for deviceType in toReturn:
+    for thisType in toReturn:
         # get supported actions for this device type
-        actions = _deviceMethods.get(deviceType, {})
+        actions = _deviceMethods.get(thisType, {})
         # we only want the names here
         actions = list(actions)
         # append to each dict
-        for i in range(len(toReturn[deviceType])):
-            toReturn[deviceType][i]['actions'] = actions
+        for i in range(len(toReturn[thisType])):
+            toReturn[thisType][i]['actions'] = actions
 
     if deviceType != 'all':  # return only the requested device type
         return toReturn[deviceType]
@@ -6,8 +6,15 @@
 # Distributed under the terms of the GNU General Public License (GPL).
 
 """Container for all visual-related functions and classes
+
+Stimulus classes are imported the first time they're used (e.g. when
+`visual.TextBox2` is first accessed) rather than when `psychopy.visual` is
+imported, so scripts only pay for importing the stimuli they use. Set the
+environment variable `PSYCHOPYEAGERVISUAL=1` to import all of them up front
+instead (e.g. to find import errors early).
 """
 
+import os
 import sys
 if sys.platform == 'win32':
     from pyglet.libs import win32  # pyglet patch for ANACONDA install
@@ -31,31 +38,29 @@ from psychopy.visual.backends import gamma
 from .basevisual import BaseVisualStim
 # non-private helpers
 from .helpers import pointInPolygon, polygonsOverlap
-from .image import ImageStim
-from .text import TextStim
-from .form import Form
-from .brush import Brush
-from .textbox2.textbox2 import TextBox2
-from .button import ButtonStim
-from .roi import ROI
-from .target import TargetStim
 # window, should always be loaded first
 from .window import Window, getMsPerFrame, openWindows
 
 # needed for backwards-compatibility
 
-# need absolute imports within lazyImports
-
-# A newer alternative lib is apipkg but then we have to specify all the vars
-# that will be included, not just the lazy ones? Syntax is:
-# import apipkg
-# apipkg.initpkg(__name__, {
-#        'GratingStim': "psychopy.visual.grating:GratingStim",
-# })
+# need absolute imports within lazyImports. These are resolved by a module
+# level __getattr__ on first access (see `lazy_attributes`), so the names
+# below are the real classes once used and can be subclassed, used with
+# isinstance etc.
 
 from psychopy.constants import STOPPED, FINISHED, PLAYING, NOT_STARTED
 
 lazyImports = """
+# commonly used stimuli
+from psychopy.visual.image import ImageStim
+from psychopy.visual.text import TextStim
+from psychopy.visual.form import Form
+from psychopy.visual.brush import Brush
+from psychopy.visual.textbox2.textbox2 import TextBox2
+from psychopy.visual.button import ButtonStim
+from psychopy.visual.roi import ROI
+from psychopy.visual.target import TargetStim
+
 # stimuli derived from object or MinimalStim
 from psychopy.visual.aperture import Aperture  # uses BaseShapeStim, ImageStim
 from psychopy.visual.custommouse import CustomMouse
@@ -114,8 +119,11 @@ from psychopy.visual.stim3d import PlaneStim
 from psychopy.visual.stim3d import ObjMeshStim
 
 """
-try:
-    from psychopy.contrib.lazy_import import lazy_import
-    lazy_import(globals(), lazyImports)
-except Exception:
+if os.environ.get('PSYCHOPYEAGERVISUAL', '0') == '1':
     exec(lazyImports)
+else:
+    try:
+        from psychopy.contrib.lazy_import import lazy_attributes
+        lazy_attributes(globals(), lazyImports)
+    except Exception:
+        exec(lazyImports)
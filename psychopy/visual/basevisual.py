@@ -151,6 +151,8 @@ class MinimalStim(AttributeGetSetMixin):
         on every frame flip!
         """
         self.__dict__['autoDraw'] = value
+        # the window copies what to draw on the next flip
+        self.win._drawList = None
         toDraw = self.win._toDraw
         toDrawDepths = self.win._toDrawDepths
         beingDrawn = (self in toDraw)
@@ -1721,6 +1723,9 @@ class PointerMixin:
             self.mouse = Mouse(visible=self.win.mouseVisible, win=self.win)
 
         self.__dict__['clickable'] = value
+        # the window checks what needs clicking when it next flips
+        if getattr(self, 'win', None) is not None:
+            self.win._drawList = None
 
 
 class DraggingMixin:
@@ -1791,6 +1796,9 @@ class DraggingMixin:
             self.mouse.lastPos = self.mouse.getPos()
         # store value
         self.__dict__['draggable'] = value
+        # the window checks what needs dragging when it next flips
+        if getattr(self, 'win', None) is not None:
+            self.win._drawList = None
 
 
 class BaseVisualStim(MinimalStim, WindowMixin, LegacyVisualMixin):
@@ -148,8 +148,10 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
                  contrast=1.0,
                  depth=0,
                  element=None,
+                 batchElements=True,
                  signalDots='same',
                  noiseDots='direction',
+                 seed=None,
                  name=None,
                  autoLog=None):
         """
@@ -213,6 +215,12 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
             ``.setPos([x,y])`` method (e.g. a GratingStim, TextStim...)!!
             DotStim assumes that the element uses pixels as units.
             ``None`` defaults to dots.
+        batchElements : bool
+            If `True` (default) and `element` is a `GratingStim`, all the dots
+            are drawn in a single call as instances of the element (in the
+            manner of `ElementArrayStim`), rather than drawing the element once
+            per dot. Set to `False` to always call the element's ``.draw()``
+            method for each dot.
         signalDots : str
             If 'same' then the signal and noise dots are constant. If different
             then the choice of which is signal and which is noise gets
@@ -226,6 +234,11 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
             random, but constant direction. For 'walk' noise dots vary their
             direction every frame, but keep a constant speed. This value can be
             set using the `noiseDots` property after initialization.
+        seed : int or None
+            Seed for the random number generator which places and moves the
+            dots, so that the same seed gives the same dots. If `None`, the
+            generator is seeded from `numpy.random`, so dots are still
+            reproducible after calling `numpy.random.seed()`.
         name : str, optional
             Optional name to use for logging.
         autoLog : bool
@@ -241,6 +254,8 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
                                       autoLog=False)  # set at end of init
 
         self.nDots = nDots
+        self.seed = seed  # creates the random number generator
+        self._allocateDotBuffers()
         # pos and size are ambiguous for dots so DotStim explicitly has
         # fieldPos = pos, fieldSize=size and then dotSize as additional param
         self.fieldPos = fieldPos  # self.pos is also set here
@@ -254,6 +269,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         self.fieldShape = fieldShape
         self.__dict__['dir'] = dir
         self.speed = speed
+        self.batchElements = batchElements
         self.element = element
         self.dotLife = dotLife
         self.signalDots = signalDots
@@ -280,12 +296,11 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         # all dots have the same speed
         self._dotsSpeed = np.ones(self.nDots, dtype=float) * self.speed
         # abs() means we can ignore the -1 case (no life)
-        self._dotsLife = np.abs(dotLife) * np.random.rand(self.nDots)
-        # pre-allocate array for flagging dead dots
-        self._deadDots = np.zeros(self.nDots, dtype=bool)
+        self._dotsLife = np.abs(dotLife) * self._rng.random(self.nDots)
         # set directions (only used when self.noiseDots='direction')
-        self._dotsDir = np.random.rand(self.nDots) * _2pi
+        self._dotsDir = self._rng.random(self.nDots) * _2pi
         self._dotsDir[self._signalDots] = self.dir * _piOver180
+        self._updateDirCache()
 
         self._update_dotsXY()
 
@@ -309,6 +324,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         """*'sqr'* or 'circle'. Defines the envelope used to present the dots.
         If changed while drawing, dots outside new envelope will be respawned.
         """
+        self._discardPrecomputed()
         self.__dict__['fieldShape'] = fieldShape
 
     @property
@@ -342,8 +358,9 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
 
         :ref:`operations <attrib-operations>` are supported.
         """
+        self._discardPrecomputed()
         self.__dict__['dotLife'] = dotLife
-        self._dotsLife = abs(self.dotLife) * np.random.rand(self.nDots)
+        self._dotsLife = abs(self.dotLife) * self._rng.random(self.nDots)
 
     @attributeSetter
     def signalDots(self, signalDots):
@@ -353,6 +370,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         randomised on each frame. This corresponds to Scase et al's (1996)
         categories of RDK.
         """
+        self._discardPrecomputed()
         self.__dict__['signalDots'] = signalDots
 
     @attributeSetter
@@ -375,9 +393,95 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         DotStim assumes that the element uses pixels as units.
         ``None`` defaults to dots.
 
-        See `ElementArrayStim` for a faster implementation of this idea.
+        If the element is a `GratingStim` and `batchElements` is `True`, all
+        the dots are drawn together in a single call. Changes made to the
+        element's attributes are picked up on the next draw.
         """
         self.__dict__['element'] = element
+        self._elementArray = None  # instances of the old element
+        self._elementArrayKeys = (None, None)
+
+    @attributeSetter
+    def batchElements(self, value):
+        """bool. Draw all instances of `element` in a single call, if it's a
+        `GratingStim`. If `False`, the element's ``.draw()`` method is called
+        once per dot.
+        """
+        self.__dict__['batchElements'] = bool(value)
+
+    def _canBatchElement(self):
+        """Whether the current element can be drawn for all dots at once.
+        """
+        if not self.batchElements or self.element is None:
+            return False
+        from psychopy.visual.grating import GratingStim
+        # subclasses (e.g. RadialStim) draw themselves differently
+        return type(self.element) is GratingStim
+
+    def _updateElementArray(self):
+        """Get the `ElementArrayStim` which draws the instances of `element`,
+        (re)creating or updating it if the element has changed since the last
+        frame.
+        """
+        from psychopy.visual.elementarray import ElementArrayStim
+        element = self.element
+
+        def _key(value):
+            # arrays can't be compared, so use their identity
+            if isinstance(value, np.ndarray):
+                return id(value)
+            return value
+
+        # changes to these need new textures, so a new ElementArrayStim
+        texKey = (self.nDots, element.units, _key(element.tex),
+                  _key(element.mask), element.texRes, element.interpolate)
+        opacity = 1.0 if element.opacity is None else element.opacity
+        paramKey = (tuple(element.size), element.ori,
+                    tuple(element._cycles), tuple(element.phase),
+                    tuple(np.ravel(element._foreColor.rgba)),
+                    element.contrast, opacity)
+        oldTexKey, oldParamKey = self._elementArrayKeys
+        if self._elementArray is not None and texKey == oldTexKey and \
+                paramKey == oldParamKey:
+            return self._elementArray
+
+        # ElementArrayStim takes sfs as cycles per element for these units,
+        # otherwise as cycles per unit (like GratingStim.sf)
+        if element.units in ('norm', 'pix', 'height'):
+            sfs = element._cycles
+        else:
+            sfs = element._cycles / element.size
+        if self._elementArray is None or texKey != oldTexKey:
+            self._elementArray = ElementArrayStim(
+                self.win, units=element.units, fieldPos=(0.0, 0.0),
+                fieldShape='sqr', nElements=self.nDots,
+                xys=np.zeros((self.nDots, 2)), sizes=element.size,
+                oris=element.ori, sfs=sfs, phases=element.phase,
+                colors=element._foreColor.rgb, colorSpace='rgb',
+                contrs=element.contrast, opacities=opacity,
+                elementTex=element.tex, elementMask=element.mask,
+                texRes=element.texRes, interpolate=element.interpolate,
+                autoLog=False)
+        else:
+            elementArray = self._elementArray
+            elementArray.setSizes(element.size, log=False)
+            elementArray.setOris(element.ori, log=False)
+            elementArray.setSfs(sfs, log=False)
+            elementArray.setPhases(element.phase, log=False)
+            elementArray.setColors(element._foreColor.rgb, 'rgb', log=False)
+            elementArray.setContrs(element.contrast, log=False)
+            elementArray.setOpacities(opacity, log=False)
+        self._elementArrayKeys = (texKey, paramKey)
+
+        return self._elementArray
+
+    def _drawElementArray(self, win):
+        """Draw every dot as an instance of `element` in a single call.
+        """
+        elementArray = self._updateElementArray()
+        # same positions as when drawing the element once per dot
+        elementArray.xys = self.verticesPix + self.fieldPos
+        elementArray.draw(win)
 
     @attributeSetter
     def fieldPos(self, pos):
@@ -421,6 +525,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         """
         # Isn't there a way to use BaseVisualStim.pos.__doc__ as docstring
         # here?
+        self._discardPrecomputed()
         self.size = size  # using BaseVisualStim. we'll store this as both
         self.__dict__['fieldSize'] = self.size
 
@@ -435,6 +540,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         """
         if not 0 <= coherence <= 1:
             raise ValueError('DotStim.coherence must be between 0 and 1')
+        self._discardPrecomputed()
 
         _cohDots = coherence * self.nDots
 
@@ -449,8 +555,9 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         # otherwise would be signal dots adopt random directions when the become
         # sinal dots in later trails
         if self.noiseDots in ('direction', 'position', 'walk'):
-            self._dotsDir = np.random.rand(self.nDots) * _2pi
+            self._dotsDir = self._rng.random(self.nDots) * _2pi
             self._dotsDir[self._signalDots] = self.dir * _piOver180
+            self._updateDirCache()
 
     def setFieldCoherence(self, val, op='', log=None):
         """Usually you can use 'stim.attribute = value' syntax instead, but use 
@@ -463,6 +570,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         """float (degrees). direction of the coherent dots. :ref:`operations 
         <attrib-operations>` are supported.
         """
+        self._discardPrecomputed()
         # check which dots are signal before setting new dir
         signalDots = self._dotsDir == (self.dir * _piOver180)
         self.__dict__['dir'] = dir
@@ -470,6 +578,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         # dots currently moving in the signal direction also need to update
         # their direction
         self._dotsDir[signalDots] = self.dir * _piOver180
+        self._updateDirCache()
 
     def setDir(self, val, op='', log=None):
         """Usually you can use 'stim.attribute = value' syntax instead, but use 
@@ -482,6 +591,7 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         """float. speed of the dots (in *units*/frame). :ref:`operations 
         <attrib-operations>` are supported.
         """
+        self._discardPrecomputed()
         self.__dict__['speed'] = speed
 
     def setSpeed(self, val, op='', log=None):
@@ -491,11 +601,21 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         """
         setAttribute(self, 'speed', val, log, op)
 
+    @attributeSetter
+    def seed(self, seed):
+        """None or int. Seed for the random number generator which places and
+        moves the dots. Setting this restarts the generator, call
+        `refreshDots()` too to give the dots new positions from it. If `None`,
+        the generator is seeded from `numpy.random`.
+        """
+        self.__dict__['seed'] = seed
+        if seed is None:
+            seed = np.random.randint(0, 2 ** 31)
+        self._rng = np.random.default_rng(seed)
+
     def _drawLegacyGL(self, win):
         """Legacy draw method for DotStim.
         """
-        self._update_dotsXY()
-
         GL.glPushMatrix()  # push before drawing, pop after
 
         # draw the dots
@@ -519,6 +639,8 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
             GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
             GL.glDrawArrays(GL.GL_POINTS, 0, self.nDots)
             GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        elif self._canBatchElement():
+            self._drawElementArray(win)
         else:
             # we don't want to do the screen scaling twice so for each dot
             # subtract the screen centre
@@ -594,6 +716,8 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
                 'GL_POINTS')
 
             gt.useProgram(None)
+        elif self._canBatchElement():
+            self._drawElementArray(win)
         else:
             # we don't want to do the screen scaling twice so for each dot
             # subtract the screen centre
@@ -628,8 +752,8 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
 
         """
         if self.fieldShape == 'circle':
-            length = np.sqrt(np.random.uniform(0, 1, (nDots,)))
-            angle = np.random.uniform(0., _2pi, (nDots,))
+            length = np.sqrt(self._rng.uniform(0, 1, (nDots,)))
+            angle = self._rng.uniform(0., _2pi, (nDots,))
 
             newDots = np.zeros((nDots, 2))
             newDots[:, 0] = length * np.cos(angle)
@@ -637,32 +761,105 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
 
             newDots *= self.fieldSize * .5
         else:
-            newDots = np.random.uniform(-0.5, 0.5, size = (nDots, 2)) * self.fieldSize
+            newDots = self._rng.uniform(-0.5, 0.5, size=(nDots, 2)) * self.fieldSize
 
         return newDots
 
     def refreshDots(self):
         """Callable user function to choose a new set of dots."""
+        self._discardPrecomputed()
         self.vertices = self._verticesBase = self._dotsXY = self._newDotsXY(self.nDots)
 
-        # Don't allocate another array if the new number of dots is equal to
+        # Don't allocate more arrays if the new number of dots is equal to
         # the last.
         if self.nDots != len(self._deadDots):
-            self._deadDots = np.zeros(self.nDots, dtype=bool)
+            self._allocateDotBuffers()
+            # lives and directions for the new number of dots
+            self.dotLife = self.dotLife
+            self.coherence = self.coherence
+
+    def _allocateDotBuffers(self):
+        """Allocate the work arrays used to update the dots, so that updating
+        them on each frame doesn't need to create any new arrays.
+        """
+        nDots = self.nDots
+        self._deadDots = np.zeros(nDots, dtype=bool)  # dots to replace
+        self._workBool = np.zeros(nDots, dtype=bool)
+        self._workN = np.zeros(nDots)
+        self._workXY = np.zeros((nDots, 2))
+        self._newXY = np.zeros((nDots, 2))  # positions of replaced dots
+        # cos and sin of each dot's direction, only recalculated when
+        # directions change (which, for signal dots, is only when `dir` does)
+        self._dotsCos = np.zeros(nDots)
+        self._dotsSin = np.zeros(nDots)
+        # order of the dots, shuffled when signalDots='different'
+        self._shuffleIdx = np.arange(nDots)
+        self._precomputed = None
+        self._precomputedIndex = 0
+        self._precomputedStates = None
+
+    def _updateDirCache(self):
+        """Recalculate cos and sin of every dot's direction, needed whenever
+        `_dotsDir` is changed other than by `_stepDots`.
+        """
+        np.cos(self._dotsDir, out=self._dotsCos)
+        np.sin(self._dotsDir, out=self._dotsSin)
 
-    def _update_dotsXY(self):
-        """The user shouldn't call this - its gets done within draw().
+    def _permuteDots(self, order):
+        """Reorder the directions of the dots (and which are signal dots)
+        in place.
         """
+        for name in ('_dotsDir', '_dotsCos', '_dotsSin'):
+            values = getattr(self, name)
+            np.take(values, order, out=self._workN)
+            # swap, so the old array becomes the work array
+            setattr(self, name, self._workN)
+            self._workN = values
+        signalDots = self._signalDots
+        np.take(signalDots, order, out=self._workBool)
+        self._signalDots = self._workBool
+        self._workBool = signalDots
+
+    def _fillNewDotsXY(self, nDots):
+        """Like `_newDotsXY`, but fills (and returns) the start of a
+        preallocated array rather than creating a new one.
+        """
+        newDots = self._newXY[:nDots]
+        self._rng.random(out=newDots)
+        if self.fieldShape == 'circle':
+            # first column is used for the radius, second for the angle
+            length = self._workN[:nDots]
+            angle = self._workXY[:nDots, 0]
+            np.sqrt(newDots[:, 0], out=length)
+            np.multiply(newDots[:, 1], _2pi, out=angle)
+            np.cos(angle, out=newDots[:, 0])
+            np.sin(angle, out=newDots[:, 1])
+            newDots *= length[:, np.newaxis]
+            newDots *= self.fieldSize * .5
+        else:
+            newDots -= 0.5
+            newDots *= self.fieldSize
+
+        return newDots
+
+    def _stepDots(self):
+        """Move the dots on by one frame, replacing dead and out-of-bounds
+        dots, without creating any new arrays of dots.
+        """
+        rng = self._rng
+        verts = self._verticesBase
+        deadDots = self._deadDots
+
         # Find dead dots, update positions, get new positions for
         # dead and out-of-bounds
         # renew dead dots
         if self.dotLife > 0:  # if less than zero ignore it
             # decrement. Then dots to be reborn will be negative
             self._dotsLife -= 1
-            self._deadDots[:] = (self._dotsLife <= 0)
-            self._dotsLife[self._deadDots] = self.dotLife
+            np.less_equal(self._dotsLife, 0, out=deadDots)
+            self._dotsLife[deadDots] = self.dotLife
         else:
-            self._deadDots[:] = False
+            deadDots.fill(False)
 
         # update XY based on speed and dir
         # NB self._dotsDir is in radians, but self.dir is in degs
@@ -670,63 +867,163 @@ class DotStim(BaseVisualStim, ColorMixin, ContainerMixin):
         if self.signalDots == 'different':
             #  **up to version 1.70.00 this was the other way around,
             # not in keeping with Scase et al**
-            # noise and signal dots change identity constantly
-            np.random.shuffle(self._dotsDir)
-            # and then update _signalDots from that
-            self._signalDots = (self._dotsDir == (self.dir * _piOver180))
+            # noise and signal dots change identity constantly, shuffling
+            # the dots' order shuffles their directions and which are signal
+            # dots together
+            rng.shuffle(self._shuffleIdx)
+            if self.noiseDots == 'walk':
+                # all directions are set below, so only shuffle which dots
+                # are signal dots
+                np.take(self._signalDots, self._shuffleIdx, out=self._workBool)
+                self._signalDots, self._workBool = \
+                    self._workBool, self._signalDots
+            else:
+                self._permuteDots(self._shuffleIdx)
 
         # update the locations of signal and noise; 0 radians=East!
-        reshape = np.reshape
         if self.noiseDots == 'walk':
-            # noise dots are ~self._signalDots
-            sig = np.random.rand(np.sum(~self._signalDots))
-            self._dotsDir[~self._signalDots] = sig * _2pi
-            # then update all positions from dir*speed
-            cosDots = reshape(np.cos(self._dotsDir), (self.nDots,))
-            sinDots = reshape(np.sin(self._dotsDir), (self.nDots,))
-            self._verticesBase[:, 0] += self.speed * cosDots
-            self._verticesBase[:, 1] += self.speed * sinDots
-        elif self.noiseDots == 'direction':
-            # simply use the stored directions to update position
-            cosDots = reshape(np.cos(self._dotsDir), (self.nDots,))
-            sinDots = reshape(np.sin(self._dotsDir), (self.nDots,))
-            self._verticesBase[:, 0] += self.speed * cosDots
-            self._verticesBase[:, 1] += self.speed * sinDots
-        elif self.noiseDots == 'position':
-            # update signal dots
-            sd = self._signalDots
-            sdSum = self._signalDots.sum()
-            cosDots = reshape(np.cos(self._dotsDir[sd]), (sdSum,))
-            sinDots = reshape(np.sin(self._dotsDir[sd]), (sdSum,))
-            self._verticesBase[sd, 0] += self.speed * cosDots
-            self._verticesBase[sd, 1] += self.speed * sinDots
-            # update noise dots
-            self._deadDots[:] = self._deadDots + (~self._signalDots)
-
-        # handle boundaries of the field
+            # noise dots get a new random direction every frame (it's quicker
+            # to draw one for every dot then put back the signal direction
+            # than to pick out the noise dots)
+            rng.random(out=self._dotsDir)
+            self._dotsDir *= _2pi
+            np.copyto(self._dotsDir, self.dir * _piOver180,
+                      where=self._signalDots)
+            self._updateDirCache()
+        # then update all positions from dir*speed (for 'position', noise
+        # dots are given new positions below, so moving them is harmless)
+        step = self._workN
+        np.multiply(self._dotsCos, self.speed, out=step)
+        verts[:, 0] += step
+        np.multiply(self._dotsSin, self.speed, out=step)
+        verts[:, 1] += step
+        if self.noiseDots == 'position':
+            # noise dots take a new random position every frame
+            noiseDots = np.logical_not(self._signalDots, out=self._workBool)
+            np.logical_or(deadDots, noiseDots, out=deadDots)
+
+        # handle boundaries of the field, by flagging dots out of bounds
+        outOfBounds = self._workBool
         if self.fieldShape in (None, 'square', 'sqr'):
-            out0 = (np.abs(self._verticesBase[:, 0]) > .5 * self.fieldSize[0])
-            out1 = (np.abs(self._verticesBase[:, 1]) > .5 * self.fieldSize[1])
-            outofbounds = out0 + out1
+            absXY = np.abs(verts, out=self._workXY)
+            np.greater(absXY[:, 0], .5 * self.fieldSize[0], out=outOfBounds)
+            np.logical_or(deadDots, outOfBounds, out=deadDots)
+            np.greater(absXY[:, 1], .5 * self.fieldSize[1], out=outOfBounds)
         else:
             # transform to a normalised circle (radius = 1 all around)
             # then to polar coords to check
             # the normalised XY position (where radius should be < 1)
-            normXY = self._verticesBase / .5 / self.fieldSize
-            # add out-of-bounds to those that need replacing
-            outofbounds = np.hypot(normXY[:, 0], normXY[:, 1]) > 1.
-
-        # update any dead dots
-        nDead = self._deadDots.sum()
-        if nDead:
-            self._verticesBase[self._deadDots, :] = self._newDotsXY(nDead)
-
-        # Reposition any dots that have gone out of bounds. Net effect is to
-        # place dot one step inside the boundary on the other side of the
-        # aperture.
-        nOutOfBounds = outofbounds.sum()
-        if nOutOfBounds:
-            self._verticesBase[outofbounds, :] = self._newDotsXY(nOutOfBounds)
+            normXY = np.divide(verts, .5 * self.fieldSize, out=self._workXY)
+            normXY *= normXY
+            radius2 = np.add(normXY[:, 0], normXY[:, 1], out=self._workN)
+            np.greater(radius2, 1., out=outOfBounds)
+        np.logical_or(deadDots, outOfBounds, out=deadDots)
+
+        # replace dead and out of bounds dots with new ones, placed at random
+        # in the field
+        nReplace = np.count_nonzero(deadDots)
+        if nReplace:
+            verts[deadDots] = self._fillNewDotsXY(nReplace)
+
+    def precomputeFrames(self, nFrames):
+        """Work out where the dots will be on each of the next `nFrames`
+        frames now, rather than as each frame is drawn.
+
+        Call this between trials (e.g. during the inter-trial interval), then
+        drawing the dots during the trial only needs to look up their
+        positions. Once the precomputed frames have been drawn, the dots carry
+        on moving from the last one as normal. Changing the dots' parameters
+        (e.g. `coherence`, `dir`, `speed` or `fieldSize`), or calling
+        `refreshDots()`, discards any precomputed frames which haven't been
+        drawn yet.
+
+        Together with `seed`, this also gives a record of the dots'
+        trajectories, which can be saved with the data.
+
+        Parameters
+        ----------
+        nFrames : int
+            Number of frames to precompute.
+
+        Returns
+        -------
+        ndarray
+            `nFrames` x `nDots` x 2 array (read-only) of the dots' positions
+            on each frame, relative to the centre of the field, in the
+            stimulus units.
+
+        Examples
+        --------
+        Precompute the dots for a 2 s trial at 144 Hz, and save their
+        trajectories::
+
+            dots = visual.DotStim(win, nDots=500, seed=trialN)
+            trajectories = dots.precomputeFrames(288)
+            numpy.save('dots_trial%i.npy' % trialN, trajectories)
+
+        """
+        self._discardPrecomputed()
+        nFrames = int(nFrames)
+        # the state of every dot (and of the random number generator) before
+        # the first frame and after each, so that discarding the frames not
+        # yet drawn can put everything back as it was after the last drawn
+        states = {
+            name: np.empty((nFrames + 1,) + getattr(self, name).shape,
+                           dtype=getattr(self, name).dtype)
+            for name in self._dotStateNames}
+        rngStates = [self._rng.bit_generator.state]
+        for name in self._dotStateNames:
+            states[name][0] = getattr(self, name)
+        for frameN in range(1, nFrames + 1):
+            self._stepDots()
+            for name in self._dotStateNames:
+                states[name][frameN] = getattr(self, name)
+            rngStates.append(self._rng.bit_generator.state)
+        frames = states['_verticesBase'][1:]
+        frames.flags.writeable = False
+        self._precomputed = frames
+        self._precomputedIndex = 0
+        self._precomputedStates = (states, rngStates)
+
+        return frames
+
+    # everything about the dots which changes from frame to frame
+    _dotStateNames = (
+        '_verticesBase', '_dotsLife', '_dotsDir', '_signalDots',
+        '_shuffleIdx')
+
+    def _discardPrecomputed(self):
+        """Forget any precomputed frames which haven't been drawn yet, putting
+        the dots (positions, lives, directions and which are signal dots) and
+        the random number generator back as they were after the last frame
+        drawn.
+
+        Call this before changing any of the dots' parameters, so that the
+        change applies from the last frame drawn.
+        """
+        if getattr(self, '_precomputed', None) is None:
+            return
+        states, rngStates = self._precomputedStates
+        frameN = self._precomputedIndex
+        for name in self._dotStateNames:
+            getattr(self, name)[...] = states[name][frameN]
+        self._rng.bit_generator.state = rngStates[frameN]
+        self._updateDirCache()
+        self._precomputed = self._precomputedStates = None
+
+    def _update_dotsXY(self):
+        """The user shouldn't call this - its gets done within draw().
+        """
+        if self._precomputed is not None:
+            # take positions from the precomputed frames
+            self._verticesBase[:] = self._precomputed[self._precomputedIndex]
+            self._precomputedIndex += 1
+            if self._precomputedIndex == len(self._precomputed):
+                # carry on from the last frame (which is where the dots'
+                # lives and directions have got to)
+                self._precomputed = self._precomputedStates = None
+        else:
+            self._stepDots()
 
         self.vertices = self._verticesBase / self.fieldSize
 
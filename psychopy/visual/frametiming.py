@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2025 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Timing of each phase of `Window.flip`, kept for the last few thousand
+flips.
+
+`Window.recordFrameIntervals` only keeps the time between flips, in a list
+which grows for as long as it's on. When `Window.recordFrameTiming` is True
+the window instead stamps the time at the end of each phase of every flip
+(see `phases`) and adds them to its `FrameTimings`, a fixed-size ring buffer,
+so when a frame is dropped it can be seen whether drawing, the buffer swap or
+the callbacks scheduled with `callOnFlip` took the time. Functions can also be
+called whenever a frame is dropped (see `FrameTimings.addDroppedFrameCallback`).
+
+Each record holds:
+
+    frame : int
+        Number of the record, counting from 0 (or the last `clear`).
+    start, autoDraw, editables, swap, flip, callbacks, end : float
+        Time (s, on the `logging.defaultClock`) at the start of the flip and
+        at the end of each phase (see `phases`). `flip` is the time returned
+        by `Window.flip`.
+    interval : float
+        Time (s) since the `flip` of the previous record, or NaN for the first
+        flip after recording (re)started.
+    dropped : bool
+        Whether `interval` was over the threshold for a dropped frame.
+
+"""
+
+__all__ = ["FrameTimings", "phases"]
+
+import numpy as np
+
+# times stamped in each flip, in the order they happen, with what happens in
+# the phase ending at each
+phases = (
+    'start',  # flip called
+    'autoDraw',  # stimuli with autoDraw drawn
+    'editables',  # focus of editable stimuli (e.g. TextBox2) updated
+    'swap',  # buffers swapped
+    'flip',  # waited for the flip (if waitBlanking)
+    'callbacks',  # functions scheduled with callOnFlip called
+    'end',  # messages logged and background drawn for the next frame
+)
+
+recordDtype = np.dtype(
+    [('frame', np.int64)] + [(phase, np.float64) for phase in phases]
+    + [('interval', np.float64), ('dropped', np.bool_)])
+
+
+class FrameTimings:
+    """Timing records of the last `size` flips of a window (see module docs).
+
+    Parameters
+    ----------
+    size : int
+        Number of flips to keep. Once full, each new record replaces the
+        oldest.
+    threshold : float or None
+        Interval (s) between flips over which a frame counts as dropped. If
+        None, the window's `refreshThreshold` is used.
+
+    Attributes
+    ----------
+    nFrames : int
+        Number of flips recorded (including those no longer kept).
+    nDropped : int
+        Number of dropped frames among them.
+
+    Examples
+    --------
+    Record the timing of each flip during a trial, and print how long each
+    phase of the flip took for any dropped frames::
+
+        win.recordFrameTiming = True
+        ...  # run the trial
+        win.recordFrameTiming = False
+
+        timings = win.frameTiming.read()
+        durations = win.frameTiming.phaseDurations(timings)
+        for i in np.flatnonzero(timings['dropped']):
+            print(timings['frame'][i], durations[i])
+
+    Log the timing of each dropped frame as it happens::
+
+        def logDropped(record):
+            logging.warning("Dropped frame: %s" % (record,))
+
+        win.frameTiming.addDroppedFrameCallback(logDropped)
+
+    """
+    def __init__(self, size=3600, threshold=None):
+        self.size = int(size)
+        self.threshold = threshold
+        self._records = np.zeros(self.size, dtype=recordDtype)
+        self._droppedCallbacks = []
+        self.clear()
+
+    def __len__(self):
+        return min(self.nFrames, self.size)
+
+    def clear(self):
+        """Forget all records (and the number of frames and dropped frames).
+        """
+        self.nFrames = 0
+        self.nDropped = 0
+        self._lastFlip = None
+
+    def resetInterval(self):
+        """Don't count the time until the next flip as a frame interval (e.g.
+        after a pause in recording).
+        """
+        self._lastFlip = None
+
+    def addFrame(self, times, refreshThreshold=None):
+        """Add the record of a flip, calling the dropped frame callbacks if
+        the frame was dropped.
+
+        Parameters
+        ----------
+        times : sequence of float
+            Time at the start of the flip and at the end of each phase (see
+            `phases`).
+        refreshThreshold : float or None
+            Threshold for a dropped frame, if `threshold` is None.
+
+        """
+        flipTime = times[4]
+        if self._lastFlip is None:
+            interval = np.nan
+            dropped = False
+        else:
+            interval = flipTime - self._lastFlip
+            threshold = self.threshold
+            if threshold is None:
+                threshold = refreshThreshold
+            dropped = threshold is not None and interval > threshold
+        self._lastFlip = flipTime
+        frame = self.nFrames
+        self._records[frame % self.size] = (frame, *times, interval, dropped)
+        self.nFrames += 1
+        if dropped:
+            self.nDropped += 1
+            record = self._records[frame % self.size].copy()
+            for callback in list(self._droppedCallbacks):
+                callback(record)
+
+    def read(self, since=None):
+        """Get the records kept, oldest first.
+
+        Parameters
+        ----------
+        since : int or None
+            Only get records after the frame with this number, e.g. the last
+            frame of the previous `read`, to stream the records as they come.
+
+        Returns
+        -------
+        numpy.ndarray
+            Records (see module docs), with fields named by `recordDtype`.
+
+        """
+        first = max(self.nFrames - self.size, 0)
+        if since is not None:
+            first = max(first, since + 1)
+        frames = np.arange(first, self.nFrames)
+        return self._records[frames % self.size]
+
+    def phaseDurations(self, records=None):
+        """Time taken by each phase of the flip.
+
+        Parameters
+        ----------
+        records : numpy.ndarray or None
+            Records from `read`. If None, all records kept are used.
+
+        Returns
+        -------
+        numpy.ndarray
+            Duration (s) of each phase of each record, with a field for each
+            phase after 'start'.
+
+        """
+        if records is None:
+            records = self.read()
+        durations = np.zeros(
+            len(records), dtype=[(phase, np.float64) for phase in phases[1:]])
+        for previous, phase in zip(phases[:-1], phases[1:]):
+            durations[phase] = records[phase] - records[previous]
+        return durations
+
+    def addDroppedFrameCallback(self, callback):
+        """Call `callback(record)` at the end of each flip where a frame was
+        dropped, with the record of the flip (see module docs).
+        """
+        self._droppedCallbacks.append(callback)
+
+    def removeDroppedFrameCallback(self, callback):
+        """Stop calling a function added by `addDroppedFrameCallback`.
+        """
+        self._droppedCallbacks.remove(callback)
+
+    def save(self, fileName, since=None):
+        """Save the records kept to a comma-separated values file, with a
+        header row.
+        """
+        records = self.read(since)
+        np.savetxt(fileName, records, delimiter=',', comments='',
+                   header=','.join(recordDtype.names),
+                   fmt=['%i'] + ['%.6f'] * (len(phases) + 1) + ['%i'])
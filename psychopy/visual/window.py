@@ -25,7 +25,6 @@ import math
 # try to find avbin (we'll overload pyglet's load_library tool and then
 # add some paths
 from ..colors import Color, colorSpaces
-from .textbox2 import TextBox2
 
 import pyglet
 
@@ -75,7 +74,7 @@ if sys.platform == 'win32':
 import psychopy  # so we can get the __path__
 from psychopy import core, platform_specific, logging, prefs, monitors
 import psychopy.event
-from . import backends, image
+from . import backends
 
 # tools must only be imported *after* event or MovieStim breaks on win32
 # (JWP has no idea why!)
@@ -85,10 +84,9 @@ from psychopy.tools.monitorunittools import convertToPix
 import psychopy.tools.viewtools as viewtools
 import psychopy.tools.gltools as gltools
 import psychopy.tools.mathtools as mathtools
-from .text import TextStim
-from .grating import GratingStim
 from .helpers import setColor
 from . import globalVars
+from .frametiming import FrameTimings
 
 try:
     from PIL import Image
@@ -589,8 +587,16 @@ class Window():
         self.nDroppedFrames = 0
         self.frameIntervals = []
         self._frameTimes = deque(maxlen=1000)  # 1000 keeps overhead low
+        # timing of each phase of the last few thousand flips
+        self.frameTiming = FrameTimings()
+        self.recordFrameTiming = False
 
         self._toDraw = []
+        # copy of _toDraw to draw on flip, made again when it's None (e.g.
+        # after autoDraw is set), and whether drawing each stimulus is all
+        # there is to do (no dragging, clicking or validators)
+        self._drawList = None
+        self._drawListIsSimple = False
         self._heldDraw = []
         self._toDrawDepths = []
         self._eventDispatchers = []
@@ -864,6 +870,9 @@ class Window():
         is not being updated, i.e., during any slow, non-frame-time-critical
         sections of your code, including inter-trial-intervals,
         ``event.waitkeys()``, ``core.wait()``, or ``image.setImage()``.
+        Intervals are kept for as long as this is on; to keep a fixed number,
+        along with the timing of each phase of the flip, see
+        :py:attr:`~Window.recordFrameTiming`.
 
         Examples
         --------
@@ -884,6 +893,37 @@ class Window():
         self.__dict__['recordFrameIntervals'] = value
         self.frameClock.reset()
 
+    @attributeSetter
+    def recordFrameTiming(self, value):
+        """Record the timing of each phase of every flip.
+
+        When `True`, each call to :py:attr:`~Window.flip()` stamps the time at
+        the end of each of its phases (drawing stimuli, swapping buffers,
+        calling functions scheduled with :py:attr:`~Window.callOnFlip()` etc.)
+        and adds them to :py:attr:`~Window.frameTiming`, which keeps the last
+        few thousand (see :py:mod:`psychopy.visual.frametiming`). Unlike
+        :py:attr:`~Window.recordFrameIntervals`, this takes the same memory
+        however long it's on.
+
+        Examples
+        --------
+        Record the timing of each flip, calling a function whenever a frame
+        is dropped::
+
+            win.frameTiming.addDroppedFrameCallback(print)
+            win.recordFrameTiming = True
+
+        Get the records so far, and how long each phase of each flip took::
+
+            records = win.frameTiming.read()
+            durations = win.frameTiming.phaseDurations(records)
+
+        """
+        if value and not self.__dict__.get('recordFrameTiming', False):
+            # don't count the time it was off as a frame interval
+            self.frameTiming.resetInterval()
+        self.__dict__['recordFrameTiming'] = value
+
     def setRecordFrameIntervals(self, value=True, log=None):
         """Usually you can use 'stim.attribute = value' syntax instead,
         but use this method if you need to suppress the log message.
@@ -907,10 +947,14 @@ class Window():
         if not fileName:
             fileName = 'lastFrameIntervals.log'
         if len(self.frameIntervals):
-            intervalStr = str(self.frameIntervals)[1:-1]
-            f = open(fileName, 'w')
-            f.write(intervalStr)
-            f.close()
+            # written a chunk at a time, rather than as one long string
+            chunkSize = 10000
+            with open(fileName, 'w') as f:
+                for start in range(0, len(self.frameIntervals), chunkSize):
+                    if start:
+                        f.write(', ')
+                    chunk = self.frameIntervals[start:start + chunkSize]
+                    f.write(str(chunk)[1:-1])
         if clear:
             self.frameIntervals = []
             self.frameClock.reset()
@@ -1192,6 +1236,18 @@ class Window():
         """
         Window.backend.dispatchEvents()
 
+    def _updateDrawList(self):
+        """Copy the stimuli to draw on flip, noting whether any need more
+        than drawing (dragging or clicking), so that when none do `flip` can
+        just draw them. Stimuli set the list to None when any of that
+        changes.
+        """
+        self._drawList = list(self._toDraw)
+        self._drawListIsSimple = not any(
+            getattr(thisStim, "draggable", False)
+            or getattr(thisStim, "clickable", False)
+            for thisStim in self._drawList)
+
     def clearAutoDraw(self):
         """
         Remove all autoDraw components, meaning they get autoDraw set to False and are not
@@ -1258,23 +1314,37 @@ class Window():
             win.flip(clearBuffer=False)
 
         """
+        # stamp the time at the end of each phase, if recording frame timing
+        frameTiming = self.frameTiming if self.recordFrameTiming else None
+        if frameTiming is not None:
+            getTime = logging.defaultClock.getTime
+            phaseTimes = [getTime()]
+
         # draw message/splash if needed
         if self._showSplash:
             self._splashTextbox.draw()
 
         if self._toDraw:
-            for thisStim in self._toDraw:
-                # draw
-                thisStim.draw()
-                # draw validation rect if needed
-                if thisStim in self.validators:
-                    self.validators[thisStim].draw()
-                # handle dragging
-                if getattr(thisStim, "draggable", False):
-                    thisStim.doDragging()
-                    
-                if getattr(thisStim, "clickable", False):
-                    thisStim.doPointerActions()
+            if self._drawList is None or \
+                    len(self._drawList) != len(self._toDraw):
+                self._updateDrawList()
+            if self._drawListIsSimple and not self.validators:
+                # nothing to do but draw
+                for thisStim in self._drawList:
+                    thisStim.draw()
+            else:
+                for thisStim in self._toDraw:
+                    # draw
+                    thisStim.draw()
+                    # draw validation rect if needed
+                    if thisStim in self.validators:
+                        self.validators[thisStim].draw()
+                    # handle dragging
+                    if getattr(thisStim, "draggable", False):
+                        thisStim.doDragging()
+
+                    if getattr(thisStim, "clickable", False):
+                        thisStim.doPointerActions()
 
         else:
             self.backend.setCurrent()
@@ -1296,9 +1366,11 @@ class Window():
 
         # disable lighting
         self.useLights = False
+        if frameTiming is not None:
+            phaseTimes.append(getTime())
 
         # Check for mouse clicks on editables
-        if hasattr(self, '_editableChildren'):
+        if getattr(self, '_editableChildren', None):
             # Make sure _editableChildren has actually been created
             editablesOnScreen = []
             for thisObj in self._editableChildren:
@@ -1319,6 +1391,8 @@ class Window():
             # If there is only one editable on screen, make sure it starts off with focus
             if sum(editablesOnScreen) == 1:
                 self.currentEditable = self._editableChildren[editablesOnScreen.index(True)]()
+        if frameTiming is not None:
+            phaseTimes.append(getTime())
 
         flipThisFrame = self._startOfFlip()
         if self.useFBO and flipThisFrame:
@@ -1354,6 +1428,8 @@ class Window():
         self._afterFBOrender()
 
         self.backend.swapBuffers(flipThisFrame)
+        if frameTiming is not None:
+            phaseTimes.append(getTime())
 
         if self.useFBO and flipThisFrame:
             # set rendering back to the framebuffer object
@@ -1424,11 +1500,15 @@ class Window():
         self._frameTimes.append(self._frameTime)
 
         # run scheduled functions immediately after flip completes
-        n_items = len(self._toCall)
-        for i in range(n_items):
-            self._toCall[i]['function'](*self._toCall[i]['args'], **self._toCall[i]['kwargs'])
-        # leave newly scheduled functions for next flip
-        del self._toCall[:n_items]
+        if self._toCall:
+            n_items = len(self._toCall)
+            for i in range(n_items):
+                self._toCall[i]['function'](*self._toCall[i]['args'], **self._toCall[i]['kwargs'])
+            # leave newly scheduled functions for next flip
+            del self._toCall[:n_items]
+        if frameTiming is not None:
+            phaseTimes.append(now)
+            phaseTimes.append(getTime())
 
         # do bookkeeping
         if self.recordFrameIntervals:
@@ -1452,13 +1532,14 @@ class Window():
                                         "about them!")
 
         # log events
-        for logEntry in self._toLog:
-            # {'msg':msg, 'level':level, 'obj':copy.copy(obj)}
-            logging.log(msg=logEntry['msg'],
-                        level=logEntry['level'],
-                        t=now,
-                        obj=logEntry['obj'])
-        del self._toLog[:]
+        if self._toLog:
+            for logEntry in self._toLog:
+                # {'msg':msg, 'level':level, 'obj':copy.copy(obj)}
+                logging.log(msg=logEntry['msg'],
+                            level=logEntry['level'],
+                            t=now,
+                            obj=logEntry['obj'])
+            del self._toLog[:]
 
         # keep the system awake (prevent screen-saver or sleep)
         platform_specific.sendStayAwake()
@@ -1471,6 +1552,10 @@ class Window():
         if self._showPilotingIndicator:
             self._pilotingIndicator.draw()
 
+        if frameTiming is not None:
+            phaseTimes.append(getTime())
+            frameTiming.addFrame(phaseTimes, self.refreshThreshold)
+
         #    If self.waitBlanking is True, then return the time that
         # GL.glFinish() returned, set as the 'now' variable. Otherwise
         # return None as before
@@ -3117,7 +3202,8 @@ class Window():
             self._backgroundImage = value
         else:
             # Otherwise, try to make an image from value (start off as if backgroundFit was None)
-            self._backgroundImage = image.ImageStim(self, image=value, size=None, pos=(0, 0))
+            from .image import ImageStim
+            self._backgroundImage = ImageStim(self, image=value, size=None, pos=(0, 0))
 
         # Set background fit again now that we have an image
         if hasattr(self, "_backgroundFit"):
@@ -3584,6 +3670,7 @@ class Window():
         """
         # if we haven't made the indicator yet, do that now
         if self._pilotingIndicator is None:
+            from .textbox2 import TextBox2
             self._pilotingIndicator = TextBox2(
                 self, text=_translate("PILOTING: Switch to run mode before testing."),
                 letterHeight=0.1, alignment="bottom left",
@@ -3623,6 +3710,7 @@ class Window():
             self._showSplash = True
         
         if self._splashTextbox is None:  # create the textbox
+            from .textbox2 import TextBox2
             self._splashTextbox = TextBox2(
                 self, text=msg,
                 units="norm", size=(2, 2), alignment="center",  # full screen and centred
@@ -3757,6 +3845,9 @@ class Window():
 
         """
 
+        from .text import TextStim
+        from .grating import GratingStim
+
         # lower bound of 60 samples--need enough to estimate the SD
         nFrames = max(60, nFrames)
         num2avg = 12  # how many to average from around the median